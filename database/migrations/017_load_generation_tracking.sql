@@ -0,0 +1,19 @@
+-- MIGRATION: 017_load_generation_tracking
+-- GOAL: Tag every completed OpenLien delivery load with a monotonically increasing
+--       load generation so property lookup caches can invalidate in one comparison
+
+SET search_path TO datnest, public;
+
+-- Generation counter - bumped once per finished file load (any status: the table changed)
+CREATE SEQUENCE IF NOT EXISTS load_generation_seq START WITH 1;
+
+ALTER TABLE data_processing_audit
+    ADD COLUMN IF NOT EXISTS load_generation BIGINT;
+
+-- Cache readers only ever ask for the newest generation
+CREATE INDEX IF NOT EXISTS idx_audit_load_generation
+    ON data_processing_audit(load_generation DESC)
+    WHERE load_generation IS NOT NULL;
+
+COMMENT ON COLUMN data_processing_audit.load_generation IS
+    'Delivery load generation assigned on completion - cached property documents from older generations are stale';
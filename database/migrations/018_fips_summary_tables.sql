@@ -0,0 +1,78 @@
+-- MIGRATION: 018_fips_summary_tables
+-- GOAL: Per-FIPS row counts, per-column completeness and value histograms maintained
+--       incrementally by the loader, so audits stop scanning 150M property rows
+
+SET search_path TO datnest, public;
+
+-- =====================================================
+-- SUMMARY TABLES
+-- =====================================================
+
+-- One row per county: rows loaded and the PID range seen
+CREATE TABLE IF NOT EXISTS fips_summary (
+    fips_code VARCHAR(10) PRIMARY KEY,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    min_pid BIGINT,
+    max_pid BIGINT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- One row per county and properties column; value_* only for monetary/size columns
+CREATE TABLE IF NOT EXISTS fips_column_summary (
+    fips_code VARCHAR(10) NOT NULL,
+    column_name VARCHAR(100) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    non_null_count BIGINT NOT NULL DEFAULT 0,
+    value_count BIGINT,
+    value_sum NUMERIC,
+    value_min NUMERIC,
+    value_max NUMERIC,
+    PRIMARY KEY (fips_code, column_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_fips_column_summary_column
+    ON fips_column_summary(column_name);
+
+-- Log-scale histogram (20 buckets per decade, bucket = floor(log10(value) * 20);
+-- values <= 0 land in bucket -1000). Percentiles are read off the cumulative counts.
+CREATE TABLE IF NOT EXISTS fips_value_histogram (
+    fips_code VARCHAR(10) NOT NULL,
+    column_name VARCHAR(100) NOT NULL,
+    bucket INTEGER NOT NULL,
+    row_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (fips_code, column_name, bucket)
+);
+
+-- =====================================================
+-- ROLLUP VIEWS
+-- =====================================================
+
+CREATE OR REPLACE VIEW vw_state_summary AS
+SELECT
+    left(fips_code, 2) AS state_fips,
+    COUNT(*) AS county_count,
+    SUM(row_count) AS row_count,
+    MIN(min_pid) AS min_pid,
+    MAX(max_pid) AS max_pid
+FROM fips_summary
+GROUP BY left(fips_code, 2);
+
+-- Share of populated cells per county and data category
+CREATE OR REPLACE VIEW vw_fips_category_completeness AS
+SELECT
+    c.fips_code,
+    c.category,
+    COUNT(*) AS column_count,
+    SUM(c.non_null_count) AS non_null_cells,
+    MAX(s.row_count) * COUNT(*) AS total_cells,
+    ROUND(100.0 * SUM(c.non_null_count) / NULLIF(MAX(s.row_count) * COUNT(*), 0), 2) AS completeness_pct
+FROM fips_column_summary c
+JOIN fips_summary s ON s.fips_code = c.fips_code
+GROUP BY c.fips_code, c.category;
+
+COMMENT ON TABLE fips_summary IS
+    'Per-FIPS load summary - updated in the same transaction as each loader chunk COPY';
+COMMENT ON TABLE fips_column_summary IS
+    'Per-FIPS non-null counts for every properties column plus sum/min/max for value columns';
+COMMENT ON TABLE fips_value_histogram IS
+    'Per-FIPS log-scale value histograms (20 buckets/decade) used for approximate percentiles';
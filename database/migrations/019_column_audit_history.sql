@@ -0,0 +1,38 @@
+-- MIGRATION: 019_column_audit_history
+-- GOAL: Keep every single-scan column audit (src/analyzers/column_audit.py) so field
+--       population can be trended across loads without re-scanning datnest.properties
+
+SET search_path TO datnest, public;
+
+CREATE TABLE IF NOT EXISTS column_audit_runs (
+    id SERIAL PRIMARY KEY,
+    run_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    label VARCHAR(100),
+    sample_percent NUMERIC(6,3),            -- NULL = full scan
+    rows_scanned BIGINT NOT NULL,
+    estimated_total_rows BIGINT NOT NULL,
+    column_count INTEGER NOT NULL,
+    duration_seconds NUMERIC(10,2),
+    load_generation BIGINT                  -- Newest load generation at audit time (migration 017)
+);
+
+CREATE TABLE IF NOT EXISTS column_audit_history (
+    run_id INTEGER NOT NULL REFERENCES column_audit_runs(id) ON DELETE CASCADE,
+    column_name VARCHAR(100) NOT NULL,
+    data_type VARCHAR(50) NOT NULL,
+    non_null_count BIGINT NOT NULL,
+    fill_pct NUMERIC(6,2),
+    min_value TEXT,
+    max_value TEXT,
+    PRIMARY KEY (run_id, column_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_column_audit_history_column
+    ON column_audit_history(column_name, run_id DESC);
+
+-- Latest audited fill rate per column
+CREATE OR REPLACE VIEW vw_latest_column_audit AS
+SELECT h.*, r.run_at, r.sample_percent, r.rows_scanned
+FROM column_audit_history h
+JOIN column_audit_runs r ON r.id = h.run_id
+WHERE h.run_id = (SELECT MAX(id) FROM column_audit_runs);
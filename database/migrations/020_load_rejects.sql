@@ -0,0 +1,23 @@
+-- MIGRATION: 020_load_rejects
+-- GOAL: Keep the individual rows Postgres refused during COPY (src/pipeline/copy_writer.py)
+--       so one bad row no longer costs a 25k-row chunk and the rest of it still loads
+
+SET search_path TO datnest, public;
+
+CREATE TABLE IF NOT EXISTS load_rejects (
+    id BIGSERIAL PRIMARY KEY,
+    rejected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    audit_id BIGINT,                        -- data_processing_audit.id of the load (NULL for untracked loads)
+    table_name VARCHAR(100) NOT NULL,
+    source_file VARCHAR(200),
+    chunk_num INTEGER,
+    row_number INTEGER NOT NULL,            -- 1-based row within the chunk
+    sqlstate VARCHAR(5),
+    error_message TEXT,
+    raw_row TEXT NOT NULL                   -- The COPY line as sent (tab separated, \N for NULL)
+);
+
+CREATE INDEX IF NOT EXISTS idx_load_rejects_audit ON load_rejects(audit_id);
+CREATE INDEX IF NOT EXISTS idx_load_rejects_source ON load_rejects(source_file, chunk_num);
+
+COMMENT ON TABLE load_rejects IS 'Rows isolated by COPY bisection; fix and re-COPY raw_row, then delete';
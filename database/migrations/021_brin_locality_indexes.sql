@@ -0,0 +1,34 @@
+-- MIGRATION: 021_brin_locality_indexes
+-- GOAL: Compact BRIN indexes for FIPS and date range queries on a table loaded in
+--       (fips_code, apn) order (enhanced_production_load(sort_chunks=True) or finalize --cluster)
+
+SET search_path TO datnest, public;
+
+-- A BRIN index keeps one min/max summary per range of heap pages: kilobytes where a btree
+-- takes gigabytes, and only as selective as the physical order of the column. fips_code
+-- follows the sorted load directly; the delivery's dates follow it as far as
+-- pg_stats.correlation says - src/analyzers/brin_comparison.py measures both before the
+-- btrees below are dropped.
+CREATE INDEX IF NOT EXISTS idx_properties_fips_brin
+    ON properties USING brin(fips_code) WITH (pages_per_range = 32, autosummarize = on);
+
+CREATE INDEX IF NOT EXISTS idx_properties_qvm_date_brin
+    ON properties USING brin(qvm_asof_date) WITH (pages_per_range = 32, autosummarize = on);
+
+CREATE INDEX IF NOT EXISTS idx_properties_last_sale_date_brin
+    ON properties USING brin(last_sale_date) WITH (pages_per_range = 32, autosummarize = on);
+
+CREATE INDEX IF NOT EXISTS idx_properties_last_sale_recording_date_brin
+    ON properties USING brin(last_sale_recording_date) WITH (pages_per_range = 32, autosummarize = on);
+
+-- Once brin_comparison.py shows the BRIN range scans within budget, the btrees they
+-- replace can go (kept here on purpose until then):
+--   DROP INDEX IF EXISTS idx_properties_qvm_date;
+--   DROP INDEX IF EXISTS idx_properties_last_sale_date;
+
+COMMENT ON INDEX idx_properties_fips_brin IS
+    'BRIN over the (fips_code, apn) physical order - county range scans without a btree';
+COMMENT ON INDEX idx_properties_qvm_date_brin IS
+    'BRIN candidate to replace idx_properties_qvm_date - compare with brin_comparison.py';
+COMMENT ON INDEX idx_properties_last_sale_date_brin IS
+    'BRIN candidate to replace idx_properties_last_sale_date - compare with brin_comparison.py';
@@ -0,0 +1,14 @@
+-- MIGRATION: 022_property_address_lookup_index
+-- GOAL: Index the normalized site address + ZIP that PropertyCache.get_by_address()
+--       looks up, so a cache miss is an index probe instead of a sequential scan
+
+SET search_path TO datnest, public;
+
+-- The expressions must stay identical to ADDRESS_KEY_SQL in src/utils/property_cache.py:
+-- whitespace runs collapsed, trimmed, street upper-cased, ZIP+4 cut to the 5-digit ZIP
+CREATE INDEX IF NOT EXISTS idx_properties_address_key
+    ON properties ((upper(btrim(regexp_replace(property_full_street_address, '\s+', ' ', 'g')))),
+                   (left(btrim(regexp_replace(property_zip_code, '\s+', ' ', 'g')), 5)));
+
+COMMENT ON INDEX idx_properties_address_key IS
+    'Normalized address key for property lookup cache misses - see ADDRESS_KEY_SQL in property_cache.py';
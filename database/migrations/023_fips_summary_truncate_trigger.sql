@@ -0,0 +1,23 @@
+-- MIGRATION: 023_fips_summary_truncate_trigger
+-- GOAL: Never leave the FIPS summaries describing rows that are gone - any TRUNCATE of
+--       properties empties them, whichever loader or script issued it
+
+SET search_path TO datnest, public;
+
+-- Loaders that maintain the summaries (apply_chunk_statistics) refill them chunk by chunk,
+-- and the batch4a, production_copy and bulletproof loaders finish with ensure_fips_summaries(),
+-- which rebuilds them if any loaded rows are missing. After any other load they stay empty,
+-- summaries_available() is false and the converted audits print an error and fail (no table
+-- scan fallback) until `python src/utils/fips_summary.py --rebuild`.
+CREATE OR REPLACE FUNCTION reset_fips_summaries()
+RETURNS TRIGGER AS $$
+BEGIN
+    TRUNCATE datnest.fips_summary, datnest.fips_column_summary, datnest.fips_value_histogram;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS reset_fips_summaries_on_truncate ON properties;
+CREATE TRIGGER reset_fips_summaries_on_truncate
+    AFTER TRUNCATE ON properties
+    FOR EACH STATEMENT EXECUTE FUNCTION reset_fips_summaries();
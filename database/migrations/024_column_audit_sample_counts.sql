@@ -0,0 +1,32 @@
+-- MIGRATION: 024_column_audit_sample_counts
+-- GOAL: Sampled column audits (--sample) store the sample size and the table-wide estimate
+--       next to each count, so reports never compare sample counts with row totals
+
+SET search_path TO datnest, public;
+
+-- non_null_count stays the count in the rows scanned; for full scans the three agree
+ALTER TABLE column_audit_history
+    ADD COLUMN IF NOT EXISTS sample_rows BIGINT,
+    ADD COLUMN IF NOT EXISTS estimated_non_null_count BIGINT;
+
+-- Runs recorded before this migration: scale by the run's own sample
+UPDATE column_audit_history h
+SET sample_rows = r.rows_scanned,
+    estimated_non_null_count = CASE WHEN r.rows_scanned > 0
+        THEN round(h.non_null_count::numeric * r.estimated_total_rows / r.rows_scanned)::bigint
+        ELSE 0 END
+FROM column_audit_runs r
+WHERE r.id = h.run_id AND h.sample_rows IS NULL;
+
+COMMENT ON COLUMN column_audit_history.non_null_count IS
+    'Non-null values in the rows scanned - a sample count when column_audit_runs.sample_percent is set';
+COMMENT ON COLUMN column_audit_history.estimated_non_null_count IS
+    'non_null_count scaled to the whole table (estimated_total_rows / rows_scanned)';
+
+-- h.* gained columns: recreate rather than replace
+DROP VIEW IF EXISTS vw_latest_column_audit;
+CREATE VIEW vw_latest_column_audit AS
+SELECT h.*, r.run_at, r.sample_percent, r.rows_scanned, r.estimated_total_rows
+FROM column_audit_history h
+JOIN column_audit_runs r ON r.id = h.run_id
+WHERE h.run_id = (SELECT MAX(id) FROM column_audit_runs);
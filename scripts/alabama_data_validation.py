@@ -7,13 +7,13 @@ Comprehensive QA Session: Validate captured Alabama data against expected counts
 import os
 import sys
 import psycopg2
-import pandas as pd
-from collections import defaultdict
 
 # Add src directory to path  
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import get_db_config
+from utils.fips_summary import (summaries_available, total_rows, state_row_counts, column_coverage,
+                                value_summary, value_percentiles, category_completeness)
 
 def analyze_alabama_data_completeness():
     """Comprehensive analysis of Alabama data completeness and patterns"""
@@ -28,191 +28,113 @@ def analyze_alabama_data_completeness():
         conn = psycopg2.connect(**get_db_config())
         cursor = conn.cursor()
         
+        # All counts come from the per-FIPS summary tables (migration 018) - no table scans
+        if not summaries_available(cursor):
+            print("❌ FIPS summaries are empty - run: python src/utils/fips_summary.py --rebuild")
+            return False
+        
+        def pct(count, total):
+            return count / total * 100 if total else 0.0
+        
+        def print_coverage(columns, total):
+            counts = column_coverage(cursor, [column for column, _ in columns])
+            for column, label in columns:
+                print(f"   {label}: {counts[column]:,} / {total:,} ({pct(counts[column], total):.1f}%)")
+            return counts
+        
         # Get total record count
         print("📋 ANALYZING ALABAMA DATA PATTERNS...")
-        cursor.execute("SELECT COUNT(*) FROM datnest.properties;")
-        total_records = cursor.fetchone()[0]
+        total_records = total_rows(cursor)
         print(f"   📊 Total records in database: {total_records:,}")
         
-        # Analyze state distribution
+        # Analyze state distribution (state taken from the FIPS code)
         print("\n🗺️  STATE DISTRIBUTION ANALYSIS:")
-        cursor.execute("""
-            SELECT property_state, COUNT(*) as count
-            FROM datnest.properties 
-            WHERE property_state IS NOT NULL
-            GROUP BY property_state 
-            ORDER BY count DESC;
-        """)
-        
-        state_counts = cursor.fetchall()
         alabama_count = 0
-        for state, count in state_counts:
+        for state, count in state_row_counts(cursor):
             if state == 'AL':
                 alabama_count = count
-                print(f"   🎯 Alabama (AL): {count:,} records ({count/total_records*100:.1f}%)")
+                print(f"   🎯 Alabama (AL): {count:,} records ({pct(count, total_records):.1f}%)")
             elif count > 100:  # Show significant states
-                print(f"   📍 {state}: {count:,} records ({count/total_records*100:.1f}%)")
+                print(f"   📍 {state}: {count:,} records ({pct(count, total_records):.1f}%)")
         
         if alabama_count == 0:
-            print("   ⚠️  No Alabama records found with property_state = 'AL'")
-            # Check other potential Alabama indicators
-            cursor.execute("""
-                SELECT COUNT(*) FROM datnest.properties 
-                WHERE property_city_name ILIKE '%alabama%' 
-                OR fips_code LIKE '01%';
-            """)
-            alt_alabama = cursor.fetchone()[0]
-            if alt_alabama > 0:
-                print(f"   🔍 Alternative Alabama indicators found: {alt_alabama:,} records")
-                alabama_count = alt_alabama
+            print("   ⚠️  No Alabama records found under FIPS state code 01")
         
         # QVM Analysis
         print("\n💎 QVM (VALUATION) DATA ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total_properties,
-                COUNT(CASE WHEN estimated_value IS NOT NULL THEN 1 END) as with_qvm,
-                COUNT(CASE WHEN confidence_score IS NOT NULL THEN 1 END) as with_confidence,
-                AVG(estimated_value) as avg_value,
-                MIN(estimated_value) as min_value,
-                MAX(estimated_value) as max_value
-            FROM datnest.properties;
-        """)
-        
-        qvm_stats = cursor.fetchone()
-        total_props, with_qvm, with_confidence, avg_val, min_val, max_val = qvm_stats
-        
-        print(f"   📊 Properties with QVM data: {with_qvm:,} / {total_props:,} ({with_qvm/total_props*100:.1f}%)")
-        print(f"   📊 Properties with confidence: {with_confidence:,} / {total_props:,} ({with_confidence/total_props*100:.1f}%)")
-        if avg_val:
-            print(f"   💰 Average value: ${avg_val:,.0f}")
-            print(f"   💰 Value range: ${min_val:,.0f} - ${max_val:,.0f}")
+        qvm_counts = print_coverage([('estimated_value', '📊 Properties with QVM data'),
+                                     ('confidence_score', '📊 Properties with confidence')], total_records)
+        with_qvm = qvm_counts['estimated_value']
+        qvm_values = value_summary(cursor, 'estimated_value')
+        if qvm_values['avg']:
+            qvm_median = value_percentiles(cursor, 'estimated_value', (0.5,))[0.5]
+            print(f"   💰 Average value: ${qvm_values['avg']:,.0f} (median ≈ ${qvm_median:,.0f})")
+            print(f"   💰 Value range: ${qvm_values['min']:,.0f} - ${qvm_values['max']:,.0f}")
         
         # Building Characteristics Analysis
         print("\n🏠 BUILDING CHARACTERISTICS ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN building_area_total IS NOT NULL THEN 1 END) as with_area,
-                COUNT(CASE WHEN number_of_bedrooms IS NOT NULL THEN 1 END) as with_bedrooms,
-                COUNT(CASE WHEN number_of_bathrooms IS NOT NULL THEN 1 END) as with_bathrooms,
-                COUNT(CASE WHEN year_built IS NOT NULL THEN 1 END) as with_year_built,
-                AVG(building_area_total) as avg_sqft,
-                AVG(number_of_bedrooms) as avg_bedrooms,
-                AVG(number_of_bathrooms) as avg_bathrooms
-            FROM datnest.properties;
-        """)
-        
-        building_stats = cursor.fetchone()
-        total, with_area, with_beds, with_baths, with_year, avg_sqft, avg_beds, avg_baths = building_stats
-        
-        print(f"   🏠 Building area: {with_area:,} / {total:,} ({with_area/total*100:.1f}%)")
-        print(f"   🛏️  Bedrooms: {with_beds:,} / {total:,} ({with_beds/total*100:.1f}%)")
-        print(f"   🛁 Bathrooms: {with_baths:,} / {total:,} ({with_baths/total*100:.1f}%)")
-        print(f"   📅 Year built: {with_year:,} / {total:,} ({with_year/total*100:.1f}%)")
+        building_counts = print_coverage([('building_area_total', '🏠 Building area'),
+                                          ('number_of_bedrooms', '🛏️  Bedrooms'),
+                                          ('number_of_bathrooms', '🛁 Bathrooms'),
+                                          ('year_built', '📅 Year built')], total_records)
+        with_area = building_counts['building_area_total']
+        avg_sqft = value_summary(cursor, 'building_area_total')['avg']
         if avg_sqft:
             print(f"   📐 Average sq ft: {avg_sqft:,.0f}")
-            print(f"   🛏️  Average bedrooms: {avg_beds:.1f}")
-            print(f"   🛁 Average bathrooms: {avg_baths:.1f}")
+            print(f"   🛏️  Average bedrooms: {value_summary(cursor, 'number_of_bedrooms')['avg'] or 0:.1f}")
+            print(f"   🛁 Average bathrooms: {value_summary(cursor, 'number_of_bathrooms')['avg'] or 0:.1f}")
         
         # Property Sale Analysis
         print("\n💰 PROPERTY SALE DATA ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN lsale_price IS NOT NULL THEN 1 END) as with_sale_price,
-                COUNT(CASE WHEN lsale_date IS NOT NULL THEN 1 END) as with_sale_date,
-                COUNT(CASE WHEN seller_name IS NOT NULL THEN 1 END) as with_seller,
-                AVG(lsale_price) as avg_sale_price,
-                MIN(lsale_date) as earliest_sale,
-                MAX(lsale_date) as latest_sale
-            FROM datnest.properties;
-        """)
-        
-        sale_stats = cursor.fetchone()
-        if sale_stats and sale_stats[0]:
-            total, with_price, with_date, with_seller, avg_price, earliest, latest = sale_stats
-            print(f"   💰 Sale prices: {with_price:,} / {total:,} ({with_price/total*100:.1f}%)")
-            print(f"   📅 Sale dates: {with_date:,} / {total:,} ({with_date/total*100:.1f}%)")
-            print(f"   👤 Seller info: {with_seller:,} / {total:,} ({with_seller/total*100:.1f}%)")
-            if avg_price:
-                print(f"   💰 Average sale price: ${avg_price:,.0f}")
-            if earliest and latest:
-                print(f"   📅 Sale date range: {earliest} to {latest}")
+        print_coverage([('lsale_price', '💰 Sale prices'),
+                        ('lsale_recording_date', '📅 Sale dates')], total_records)
+        avg_price = value_summary(cursor, 'lsale_price')['avg']
+        if avg_price:
+            print(f"   💰 Average sale price: ${avg_price:,.0f}")
         
         # Ownership Analysis
         print("\n👤 OWNERSHIP DATA ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN owner1lastname IS NOT NULL THEN 1 END) as with_owner1,
-                COUNT(CASE WHEN owner2lastname IS NOT NULL THEN 1 END) as with_owner2,
-                COUNT(CASE WHEN mailing_address IS NOT NULL THEN 1 END) as with_mailing
-            FROM datnest.properties;
-        """)
-        
-        owner_stats = cursor.fetchone()
-        if owner_stats and owner_stats[0]:
-            total, with_owner1, with_owner2, with_mailing = owner_stats
-            print(f"   👤 Primary owner: {with_owner1:,} / {total:,} ({with_owner1/total*100:.1f}%)")
-            print(f"   👥 Secondary owner: {with_owner2:,} / {total:,} ({with_owner2/total*100:.1f}%)")
-            print(f"   📮 Mailing address: {with_mailing:,} / {total:,} ({with_mailing/total*100:.1f}%)")
+        owner_counts = print_coverage([('owner1_last_name', '👤 Primary owner'),
+                                       ('owner2_last_name', '👥 Secondary owner'),
+                                       ('co_mail_street_address', '📮 Mailing address')], total_records)
+        with_owner1 = owner_counts['owner1_last_name']
         
         # Tax/Assessment Analysis
         print("\n💵 TAX & ASSESSMENT DATA ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN total_assessed_value IS NOT NULL THEN 1 END) as with_assessed,
-                COUNT(CASE WHEN assessment_year IS NOT NULL THEN 1 END) as with_year,
-                COUNT(CASE WHEN tax_amount IS NOT NULL THEN 1 END) as with_tax_amount,
-                AVG(total_assessed_value) as avg_assessed,
-                AVG(tax_amount) as avg_tax
-            FROM datnest.properties;
-        """)
-        
-        tax_stats = cursor.fetchone()
-        if tax_stats and tax_stats[0]:
-            total, with_assessed, with_year, with_tax, avg_assessed, avg_tax = tax_stats
-            print(f"   💵 Assessed values: {with_assessed:,} / {total:,} ({with_assessed/total*100:.1f}%)")
-            print(f"   📅 Assessment years: {with_year:,} / {total:,} ({with_year/total*100:.1f}%)")
-            print(f"   💰 Tax amounts: {with_tax:,} / {total:,} ({with_tax/total*100:.1f}%)")
-            if avg_assessed:
-                print(f"   💵 Average assessed value: ${avg_assessed:,.0f}")
-            if avg_tax:
-                print(f"   💰 Average tax amount: ${avg_tax:,.0f}")
+        print_coverage([('total_assessed_value', '💵 Assessed values'),
+                        ('assessment_year', '📅 Assessment years'),
+                        ('tax_amount', '💰 Tax amounts')], total_records)
+        avg_assessed = value_summary(cursor, 'total_assessed_value')['avg']
+        avg_tax = value_summary(cursor, 'tax_amount')['avg']
+        if avg_assessed:
+            print(f"   💵 Average assessed value: ${avg_assessed:,.0f}")
+        if avg_tax:
+            print(f"   💰 Average tax amount: ${avg_tax:,.0f}")
         
         # Financing Analysis
         print("\n💰 FINANCING DATA ANALYSIS:")
-        cursor.execute("""
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN first_mtg_amount IS NOT NULL THEN 1 END) as with_mtg1,
-                COUNT(CASE WHEN second_mtg_amount IS NOT NULL THEN 1 END) as with_mtg2,
-                COUNT(CASE WHEN first_mtg_lender_name IS NOT NULL THEN 1 END) as with_lender,
-                AVG(first_mtg_amount) as avg_mtg1,
-                AVG(second_mtg_amount) as avg_mtg2
-            FROM datnest.properties;
-        """)
-        
-        financing_stats = cursor.fetchone()
-        if financing_stats and financing_stats[0]:
-            total, with_mtg1, with_mtg2, with_lender, avg_mtg1, avg_mtg2 = financing_stats
-            print(f"   💰 First mortgages: {with_mtg1:,} / {total:,} ({with_mtg1/total*100:.1f}%)")
-            print(f"   💰 Second mortgages: {with_mtg2:,} / {total:,} ({with_mtg2/total*100:.1f}%)")
-            print(f"   🏦 Lender info: {with_lender:,} / {total:,} ({with_lender/total*100:.1f}%)")
-            if avg_mtg1:
-                print(f"   💰 Average 1st mortgage: ${avg_mtg1:,.0f}")
-            if avg_mtg2:
-                print(f"   💰 Average 2nd mortgage: ${avg_mtg2:,.0f}")
+        print_coverage([('mtg01_loan_amount', '💰 First mortgages'),
+                        ('mtg02_loan_amount', '💰 Second mortgages'),
+                        ('mtg01_lender_name', '🏦 Lender info')], total_records)
+        avg_mtg1 = value_summary(cursor, 'mtg01_loan_amount')['avg']
+        avg_mtg2 = value_summary(cursor, 'mtg02_loan_amount')['avg']
+        if avg_mtg1:
+            print(f"   💰 Average 1st mortgage: ${avg_mtg1:,.0f}")
+        if avg_mtg2:
+            print(f"   💰 Average 2nd mortgage: ${avg_mtg2:,.0f}")
+        
+        # Category completeness for Alabama counties only
+        print("\n📋 ALABAMA CATEGORY COMPLETENESS (FIPS 01xxx):")
+        for category, completeness in category_completeness(cursor, fips_prefix='01'):
+            print(f"   📋 {category}: {completeness:.1f}%")
         
         # Generate Alabama-specific recommendations
         print("\n🎯 ALABAMA DATA VALIDATION SUMMARY:")
         print(f"   📊 Total properties analyzed: {total_records:,}")
         print(f"   🗺️  Alabama properties identified: {alabama_count:,}")
-        print(f"   💎 QVM coverage: {with_qvm/total_props*100:.1f}%")
-        print(f"   🏠 Building data coverage: {with_area/total*100:.1f}%")
-        print(f"   👤 Ownership data coverage: {with_owner1/total*100:.1f}%")
+        print(f"   💎 QVM coverage: {pct(with_qvm, total_records):.1f}%")
+        print(f"   🏠 Building data coverage: {pct(with_area, total_records):.1f}%")
+        print(f"   👤 Ownership data coverage: {pct(with_owner1, total_records):.1f}%")
         
         print("\n📋 READY FOR COUNT DOCUMENT VALIDATION:")
         print("   🔍 System can now compare against your expected Alabama counts")
@@ -3,9 +3,14 @@
 Analyze Other_Rooms field data to understand data quality issue
 """
 
-import pandas as pd
 import csv
 import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.tsv_sampler import sample_rows
+from pipeline.parquet_cache import PARQUET_AVAILABLE, is_cache_current, read_cached
 
 def analyze_other_rooms():
     """Analyze actual Other_Rooms data in TSV file"""
@@ -34,7 +39,11 @@ def analyze_other_rooms():
             
             # Sample data to understand values
             print("📊 Sampling Other_Rooms data...")
-            df_sample = pd.read_csv(file_path, sep='\t', nrows=1000, usecols=['Other_Rooms'], dtype=str)
+            if PARQUET_AVAILABLE and is_cache_current(file_path):
+                # Converted once: read the single column for every row
+                df_sample = read_cached(file_path, columns=['Other_Rooms'], convert=False)
+            else:
+                df_sample = sample_rows(file_path, 1000, seed=42, columns=['Other_Rooms'])
             
             print(f"📈 Total sample records: {len(df_sample)}")
             print(f"📊 Unique values in Other_Rooms:")
@@ -15,8 +15,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import psycopg2
 from config import get_db_config
+from analyzers.column_audit import run_column_audit, empty_columns
 
-def comprehensive_field_audit():
+def comprehensive_field_audit(sample_percent=None):
     """Three-way audit: Database vs TSV vs Loader"""
     
     print("🔍 COMPREHENSIVE FIELD AUDIT - QA SESSION")
@@ -80,6 +81,18 @@ def comprehensive_field_audit():
         print(f"✅ Database columns loaded: {len(db_columns)} fields")
         print(f"📊 Database capacity: {len(db_columns)} columns operational")
         
+        # Population of every column from one scan - catches columns mapped but never filled
+        audit = run_column_audit(cursor, sample_percent=sample_percent)
+        never_populated = empty_columns(audit)
+        print(f"📊 Column population: {len(audit['columns']) - len(never_populated)}/{len(audit['columns'])} "
+              f"columns hold data ({audit['rows_scanned']:,} rows scanned in {audit['duration_seconds']:.1f}s)")
+        if never_populated:
+            print(f"⚠️  Never-populated columns: {len(never_populated)}")
+            for column in never_populated[:10]:
+                print(f"      - {column}")
+            if len(never_populated) > 10:
+                print(f"      ... and {len(never_populated) - 10} more")
+        
     except Exception as e:
         print(f"❌ Database analysis failed: {e}")
         return False
@@ -241,7 +254,9 @@ def comprehensive_field_audit():
     return gap_size < 60  # Success if gap is manageable
 
 if __name__ == "__main__":
-    success = comprehensive_field_audit()
+    # Optional: --sample <percent> for a quick TABLESAMPLE check instead of a full scan
+    sample_percent = float(sys.argv[sys.argv.index('--sample') + 1]) if '--sample' in sys.argv else None
+    success = comprehensive_field_audit(sample_percent)
     
     if success:
         print(f"\n🎉 AUDIT COMPLETE - Clear path to 100% data capture!")
@@ -10,6 +10,10 @@ import csv
 import pandas as pd
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.column_sketches import load_profile_for, profile_path_for, print_profile
+
 # Set CSV limits for large files
 csv.field_size_limit(2147483647)
 
@@ -137,6 +141,14 @@ def analyze_tsv_file_structure():
     except Exception as e:
         print(f"   ❌ Error in content analysis: {e}")
     
+    # STEP 3B: Full-data profile written by the loader (no sampling, no rescan)
+    print(f"\n📊 STEP 3B: FULL-DATA COLUMN PROFILE")
+    profile = load_profile_for(tsv_path)
+    if profile is None:
+        print(f"   ⚠️  No profile yet - the loader writes {os.path.basename(profile_path_for(tsv_path))} when run with --profile-columns")
+    else:
+        print_profile(profile, ['fips_code', 'property_state', 'apn', 'current_owner_name'], top_k=10)
+    
     # STEP 4: File naming and structure validation
     print(f"\n📂 STEP 4: FILE STRUCTURE VALIDATION")
     print(f"   📋 Expected: Alabama + Alaska (alphabetical)")
@@ -12,8 +12,9 @@ import psycopg2
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import get_db_config
+from analyzers.column_audit import run_column_audit
 
-def analyze_database_architecture():
+def analyze_database_architecture(sample_percent=None):
     """Analyze database schema to understand column architecture"""
     
     print("🔍 DATABASE ARCHITECTURE ANALYSIS - QA SESSION")
@@ -85,6 +86,24 @@ def analyze_database_architecture():
         sale_cols = [col for col in columns if any(term in col[0].lower() for term in ['sale', 'price', 'date', 'transfer', 'transaction'])]
         print(f"   💰 Sales/Transaction: {len(sale_cols)}")
         
+        # Population per column group - one scan for all columns (column_audit.py)
+        print()
+        print("🔬 POPULATION BY COLUMN GROUP:")
+        audit = run_column_audit(cursor, sample_percent=sample_percent)
+        mode = f"{sample_percent}% sample" if sample_percent else "full scan"
+        print(f"   📊 {audit['rows_scanned']:,} rows scanned ({mode}, {audit['duration_seconds']:.1f}s)")
+        column_groups = [
+            ('💰 Financing (MTG)', mtg_cols), ('🏠 Building', building_cols), ('📍 Location', location_cols),
+            ('👤 Ownership', owner_cols), ('💵 Tax/Assessment', tax_cols), ('🌱 Land', land_cols),
+            ('📋 Legal/Parcel', legal_cols), ('💎 QVM/Valuation', qvm_cols), ('💰 Sales/Transaction', sale_cols)
+        ]
+        for label, group in column_groups:
+            audited = [audit['columns'][col[0]] for col in group if col[0] in audit['columns']]
+            if audited:
+                populated = sum(1 for column in audited if column['non_null'])
+                avg_fill = sum(column['fill_pct'] for column in audited) / len(audited)
+                print(f"   {label}: {populated}/{len(audited)} columns populated, {avg_fill:.1f}% avg fill")
+        
         print()
         print("📊 SAMPLE COLUMN ANALYSIS (First 30 columns):")
         for i, (name, dtype, nullable, default) in enumerate(columns[:30]):
@@ -135,5 +154,7 @@ def analyze_database_architecture():
         return False
 
 if __name__ == "__main__":
-    success = analyze_database_architecture()
+    # Optional: --sample <percent> for a quick TABLESAMPLE check instead of a full scan
+    sample_percent = float(sys.argv[sys.argv.index('--sample') + 1]) if '--sample' in sys.argv else None
+    success = analyze_database_architecture(sample_percent)
     exit(0 if success else 1) 
\ No newline at end of file
@@ -10,6 +10,10 @@ import csv
 import pandas as pd
 import codecs
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.column_sketches import load_profile_for
+
 # Set CSV limits for large files
 csv.field_size_limit(2147483647)
 
@@ -84,6 +88,22 @@ def diagnose_column_misalignment():
             for field in missing_fields:
                 print(f"      {field}")
         
+        # Whole-file check from the loader's column profile: coordinates must be numeric
+        print(f"\n📊 STEP 2B: FULL-DATA PROFILE CHECK")
+        profile = load_profile_for(tsv_path)
+        if profile is None:
+            print("   ⚠️  No column profile for this file yet - falling back to row samples")
+        else:
+            for column in ['latitude', 'longitude', 'property_state']:
+                sketch = profile.columns.get(column)
+                if sketch is None:
+                    continue
+                summary = sketch.summary(top_k=3)
+                print(f"   📋 {column}: numeric={sketch.numeric}, range [{summary['min']} .. {summary['max']}], "
+                      f"{100 * (1 - summary['null_rate']):.1f}% populated")
+                if column in ('latitude', 'longitude') and sketch.numeric is False:
+                    print(f"      🚨 Non-numeric values in {column} across the full file - column misalignment")
+        
         # Sample data to check for column alignment issues
         print(f"\n🔍 STEP 3: SAMPLE DATA ANALYSIS")
         
@@ -7,9 +7,16 @@ Comprehensive QA Session: Analyze if Alabama data bleeds into multiple TSV files
 import os
 import sys
 import glob
-import pandas as pd
 from pathlib import Path
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.tsv_sampler import sample_rows, estimate_row_count
+from pipeline.line_index import load_line_index, files_for_state
+
+SAMPLE_SIZE = 1000
+SAMPLE_SEED = 42
+
 def analyze_file_boundaries():
     """Analyze TSV file boundaries to determine Alabama data distribution"""
     
@@ -60,6 +67,20 @@ def analyze_file_boundaries():
         file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
         print(f"      {i}. {file_path} ({file_size:.1f} MB)")
     
+    # Exact answer from the line-index FIPS runs (built once per file, then read from the sidecar)
+    print(f"\n📇 STATE DISTRIBUTION FROM LINE INDEX:")
+    for file_path in tsv_files:
+        state_counts = load_line_index(file_path).fips_row_counts()
+        states = ', '.join(f"{state or '??'}={count:,}" for state, count in sorted(state_counts.items()))
+        print(f"   📂 {os.path.basename(file_path)}: {states}")
+    
+    alabama_files = files_for_state(tsv_files, '01')
+    print(f"\n🎯 Alabama (FIPS 01) found in {len(alabama_files)} file(s):")
+    for file_path, count in alabama_files.items():
+        print(f"   📍 {os.path.basename(file_path)}: {count:,} rows")
+    if len(alabama_files) > 1:
+        print("   ⚠️  Alabama bleeds across file boundaries")
+    
     # Analyze each file for Alabama content
     print(f"\n🗺️  ANALYZING ALABAMA CONTENT IN EACH FILE:")
     
@@ -67,9 +88,10 @@ def analyze_file_boundaries():
         try:
             print(f"\n📂 FILE {i}: {os.path.basename(file_path)}")
             
-            # Read just the first few rows to check structure
-            sample_df = pd.read_csv(file_path, sep='\t', nrows=100, low_memory=False)
-            total_rows_estimate = sum(1 for line in open(file_path, 'r'))
+            # Uniform random rows from the whole file (the top is a single county)
+            sample_df = sample_rows(file_path, SAMPLE_SIZE, seed=SAMPLE_SEED)
+            sample_size = max(len(sample_df), 1)
+            total_rows_estimate = estimate_row_count(file_path, seed=SAMPLE_SEED)
             
             print(f"   📊 Estimated total rows: {total_rows_estimate:,}")
             print(f"   📋 Columns: {len(sample_df.columns)}")
@@ -83,11 +105,11 @@ def analyze_file_boundaries():
                 for state_col in state_columns:
                     alabama_in_sample = (sample_df[state_col] == 'AL').sum()
                     if alabama_in_sample > 0:
-                        print(f"      🎯 Alabama records in sample ({state_col}): {alabama_in_sample}/100")
+                        print(f"      🎯 Alabama records in sample ({state_col}): {alabama_in_sample}/{sample_size}")
                     
                 # Estimate Alabama percentage
                 if alabama_in_sample > 0:
-                    estimated_alabama_pct = (alabama_in_sample / 100) * 100
+                    estimated_alabama_pct = (alabama_in_sample / sample_size) * 100
                     estimated_alabama_total = int((total_rows_estimate * estimated_alabama_pct) / 100)
                     print(f"      📈 Estimated Alabama in file: ~{estimated_alabama_total:,} records ({estimated_alabama_pct:.1f}%)")
             
@@ -102,7 +124,7 @@ def analyze_file_boundaries():
                     if sample_df[city_col].dtype == 'object':
                         alabama_city_matches = sample_df[city_col].str.lower().isin(alabama_cities).sum()
                         if alabama_city_matches > 0:
-                            print(f"      🏙️  Alabama cities in sample: {alabama_city_matches}/100")
+                            print(f"      🏙️  Alabama cities in sample: {alabama_city_matches}/{sample_size}")
             
         except Exception as e:
             print(f"   ❌ Error analyzing {file_path}: {e}")
@@ -14,6 +14,7 @@ import psycopg2
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import get_db_config
+from utils.fips_summary import summaries_available, pid_range
 
 # Set CSV limits for large files
 csv.field_size_limit(2147483647)
@@ -36,15 +37,11 @@ def identify_missing_records_location():
         conn = psycopg2.connect(**get_db_config())
         cursor = conn.cursor()
         
-        cursor.execute("""
-            SELECT 
-                MIN(quantarium_internal_pid::int) as min_pid,
-                MAX(quantarium_internal_pid::int) as max_pid,
-                COUNT(*) as total_loaded
-            FROM datnest.properties;
-        """)
-        
-        min_pid, max_pid, total_loaded = cursor.fetchone()
+        # PID range and row count from the per-FIPS summaries (no full-table scan)
+        if not summaries_available(cursor):
+            print("❌ FIPS summaries are empty - run: python src/utils/fips_summary.py --rebuild")
+            return False
+        min_pid, max_pid, total_loaded = pid_range(cursor)
         print(f"📊 DATABASE PID ANALYSIS:")
         print(f"   Min PID: {min_pid:,}")
         print(f"   Max PID: {max_pid:,}")
@@ -115,32 +115,28 @@ def check_second_tsv_file():
         
         # Quick analysis of second file
         try:
-            import pandas as pd
-            import csv
-            csv.field_size_limit(2147483647)
+            from pipeline.line_index import load_line_index, files_for_state
+
+            # Exact state row counts from the line-index FIPS runs (no sampling)
+            state_counts = load_line_index(tsv_path2).fips_row_counts()
+            total = sum(state_counts.values()) or 1
             
-            # Sample beginning of second file
-            df_sample = pd.read_csv(
-                tsv_path2,
-                sep='\t',
-                nrows=10000,
-                dtype=str,
-                encoding='utf-8',
-                engine='python',
-                quoting=csv.QUOTE_NONE,
-                on_bad_lines='skip'
-            )
+            print(f"\n   🔍 Second file content (all {total:,} records, from line index):")
+            fips_map = {'01': 'Alabama', '02': 'Alaska', '04': 'Arizona', '05': 'Arkansas', '06': 'California'}
+            for fips, count in sorted(state_counts.items(), key=lambda item: -item[1])[:5]:
+                state_name = fips_map.get(fips, f'State {fips}')
+                pct = (count / total) * 100
+                print(f"      {state_name} ({fips}): {count:,} ({pct:.1f}%)")
             
-            if 'FIPS_Code' in df_sample.columns:
-                fips_codes = df_sample['FIPS_Code'].fillna('UNKNOWN').str[:2]
-                fips_counts = fips_codes.value_counts().head(5)
-                
-                print(f"\n   🔍 Second file content (first 10K records):")
-                fips_map = {'01': 'Alabama', '02': 'Alaska', '04': 'Arizona', '05': 'Arkansas', '06': 'California'}
-                for fips, count in fips_counts.items():
-                    state_name = fips_map.get(fips, f'State {fips}')
-                    pct = (count / len(df_sample)) * 100
-                    print(f"      {state_name} ({fips}): {count:,} ({pct:.1f}%)")
+            # Which delivery files hold Alaska at all
+            tsv_dir = os.path.dirname(tsv_path2)
+            all_files = sorted(os.path.join(tsv_dir, f) for f in os.listdir(tsv_dir) if f.endswith('.TSV'))
+            alaska_files = files_for_state(all_files, '02')
+            print(f"\n   🗺️  Alaska (02) rows by file:")
+            for file_path, count in alaska_files.items():
+                print(f"      {os.path.basename(file_path)}: {count:,}")
+            if not alaska_files:
+                print("      ❌ No Alaska rows in any delivery file")
             
         except Exception as e:
             print(f"   ❌ Error analyzing second file: {e}")
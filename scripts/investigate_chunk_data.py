@@ -4,8 +4,12 @@ Quick investigation: What's different about chunk 3 vs successful chunks 1,2?
 Focus on LSale_Price values
 """
 
-import pandas as pd
-import csv
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.line_index import load_line_index
 
 def investigate_chunk_data():
     tsv_path = r"C:\DataNest-TSV-Files\extracted-tsv\Quantarium_OpenLien_20250414_00001.TSV"
@@ -13,18 +17,9 @@ def investigate_chunk_data():
     print("🔍 INVESTIGATING CHUNK DATA DIFFERENCES")
     print("=" * 50)
     
-    # Read chunks and examine LSale_Price
-    chunk_reader = pd.read_csv(
-        tsv_path,
-        sep='\t',
-        chunksize=25000,
-        dtype=str,
-        encoding='utf-8',
-        engine='python',
-        quoting=csv.QUOTE_NONE,
-        on_bad_lines='skip',
-        na_values=['']
-    )
+    # Read chunks via the line-offset sidecar
+    line_index = load_line_index(tsv_path)
+    chunk_reader = (line_index.read_chunk(n, 25000) for n in range(1, line_index.chunk_count(25000) + 1))
     
     for chunk_num, chunk in enumerate(chunk_reader, 1):
         if chunk_num > 5:  # Only check first 5 chunks
@@ -9,66 +9,28 @@ import sys
 import time
 import psycopg2
 import pandas as pd
+import numpy as np
 import csv
 import tempfile
-import re
 
 # Add src directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from config import get_db_config
+from pipeline.line_index import load_line_index
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.value_codecs import CodecReport, decode_numeric, decode_numeric_columns, integer_array
 
 # Set CSV limits
 csv.field_size_limit(2147483647)
 
-def clean_utf8_errors(text):
-    """Remove null bytes and other UTF8 problematic characters"""
-    if pd.isna(text) or text is None:
-        return None
-    text_str = str(text)
-    # Remove null bytes (0x00) that cause UTF8 errors
-    text_str = text_str.replace('\x00', '')
-    # Remove other problematic control characters
-    text_str = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x84\x86-\x9f]', '', text_str)
-    return text_str if text_str else None
-
-def robust_numeric_clean(value, field_name):
-    """Enhanced numeric cleaning that handles Y/N values and other text"""
-    if pd.isna(value) or value is None:
-        return None
-    
-    value_str = str(value).strip().upper()
-    
-    # Handle empty values
-    if value_str in ['', 'NAN', 'NULL', 'N/A', 'NA']:
-        return None
-    
-    # Handle Y/N values (convert to NULL - these are not numeric)
-    if value_str in ['Y', 'N', 'YES', 'NO', 'TRUE', 'FALSE']:
-        print(f"   🔧 Converting non-numeric '{value_str}' to NULL in {field_name}")
-        return None
-    
-    # Try to extract numeric value
-    try:
-        # Remove common non-numeric characters
-        cleaned = re.sub(r'[^\d.-]', '', value_str)
-        if cleaned and cleaned not in ['-', '.', '-.']:
-            return float(cleaned)
-        else:
-            return None
-    except (ValueError, TypeError):
-        return None
-
 def process_chunk_robust(chunk_data, field_mapping, chunk_num):
     """Process chunk with enhanced error handling for the 3 known issues"""
     try:
         print(f"🔧 Processing chunk {chunk_num} with enhanced error handling: {len(chunk_data):,} rows")
         
-        # Step 1: Handle UTF8 encoding errors (Fix for Chunk 17)
-        print(f"   🧹 Cleaning UTF8 encoding issues...")
-        for col in chunk_data.columns:
-            if chunk_data[col].dtype == 'object':  # String columns
-                chunk_data[col] = chunk_data[col].apply(clean_utf8_errors)
+        # Step 1: UTF8 encoding errors (Fix for Chunk 17) are cleaned on the raw bytes by the
+        # ByteSanitizer before parsing - see recover_failed_chunks
         
         # Step 2: Fast bulk mapping with missing column handling (Fix for Chunk 1)
         print(f"   📊 Mapping fields with missing column protection...")
@@ -103,29 +65,30 @@ def process_chunk_robust(chunk_data, field_mapping, chunk_num):
             if field in clean_data.columns:
                 clean_data[field] = clean_data[field].fillna('UNKNOWN')
         
-        # Numeric fields with robust cleaning (Fix for Chunk 8)
+        # Numeric and integer fields with robust whole-column cleaning (Fix for Chunk 8)
+        # Y/N flags and other text become NULL; counted per column instead of printed per value
         numeric_fields = ['building_area_total', 'lot_size_square_feet', 'latitude', 'longitude']
-        for field in numeric_fields:
-            if field in clean_data.columns:
-                print(f"   🔢 Cleaning numeric field: {field}")
-                clean_data[field] = clean_data[field].apply(lambda x: robust_numeric_clean(x, field))
-        
-        # Integer fields with robust cleaning (Fix for Chunk 8)
         integer_fields = ['year_built', 'number_of_bedrooms', 'estimated_value', 'lsale_price', 
                          'total_assessed_value', 'price_range_min', 'price_range_max', 'confidence_score']
+        codec_report = CodecReport()
+        decode_numeric_columns(clean_data, numeric_fields, codec_report)
+        
         for field in integer_fields:
             if field in clean_data.columns:
-                print(f"   🔢 Cleaning integer field: {field}")
-                clean_data[field] = clean_data[field].apply(lambda x: robust_numeric_clean(x, field))
-                # Convert to int where not null
-                clean_data[field] = clean_data[field].apply(lambda x: int(x) if pd.notna(x) and x is not None else None)
+                # Truncate like int() did, into a nullable Int64 column; oversized values become NULL
+                values, counts = decode_numeric(clean_data[field])
+                integers, out_of_range = integer_array(np.trunc(values))
+                clean_data[field] = integers
+                counts.update(valid=int((~integers.isna()).sum()), out_of_range=counts['out_of_range'] + out_of_range)
+                codec_report.add(field, counts)
+        for line in codec_report.lines():
+            print(f"   🔧 {line}")
         
-        # String fields with UTF8 cleaning
+        # String fields (already byte-sanitized)
         string_cols = [col for col in clean_data.columns 
                       if col not in numeric_fields + integer_fields]
         for field in string_cols:
             if field in clean_data.columns:
-                clean_data[field] = clean_data[field].apply(clean_utf8_errors)
                 clean_data[field] = clean_data[field].fillna('')
         
         # Convert empty strings to None for proper NULL handling
@@ -180,44 +143,37 @@ def recover_failed_chunks(tsv_file_path, failed_chunks=[1, 8, 17]):
     total_recovered = 0
     
     try:
-        # Read file and process specific chunks
-        print(f"📖 Reading TSV file to target failed chunks...")
-        chunk_reader = pd.read_csv(
-            tsv_file_path,
-            sep='\t',
-            chunksize=chunk_size,
-            dtype=str,
-            encoding='utf-8',
-            engine='python',
-            quoting=csv.QUOTE_NONE,
-            on_bad_lines='skip',
-            na_values=['']
-        )
+        # Seek straight to each failed chunk via the line-offset sidecar
+        print(f"📇 Loading line index for target failed chunks...")
+        line_index = load_line_index(tsv_file_path)
+        print(f"   {line_index.total_rows:,} rows, {line_index.chunk_count(chunk_size)} chunks of {chunk_size:,}")
+        # NUL/control bytes and invalid UTF-8 are fixed once per chunk, before parsing
+        sanitizer = ByteSanitizer()
         
-        for chunk_num, chunk in enumerate(chunk_reader, 1):
-            if chunk_num in failed_chunks:
-                print(f"\n🎯 PROCESSING FAILED CHUNK {chunk_num}:")
-                
-                # Enhanced processing
-                clean_data, chunk_id = process_chunk_robust(chunk, field_mapping, chunk_num)
-                
-                if clean_data is not None:
-                    # Insert into existing database (append mode)
-                    inserted = insert_recovery_data(clean_data, chunk_id)
-                    total_recovered += inserted
-                    print(f"   ✅ Recovered {inserted:,} records from chunk {chunk_num}")
-                else:
-                    print(f"   ❌ Failed to recover chunk {chunk_num}")
+        for chunk_num in sorted(failed_chunks):
+            if chunk_num > line_index.chunk_count(chunk_size):
+                print(f"\n⚠️  Chunk {chunk_num} is past the end of the file")
+                continue
+            print(f"\n🎯 PROCESSING FAILED CHUNK {chunk_num}:")
+            chunk = line_index.read_chunk(chunk_num, chunk_size, sanitizer=sanitizer)
+            
+            # Enhanced processing
+            clean_data, chunk_id = process_chunk_robust(chunk, field_mapping, chunk_num)
             
-            # Stop after processing all target chunks
-            if chunk_num >= max(failed_chunks):
-                break
+            if clean_data is not None:
+                # Insert into existing database (append mode)
+                inserted = insert_recovery_data(clean_data, chunk_id)
+                total_recovered += inserted
+                print(f"   ✅ Recovered {inserted:,} records from chunk {chunk_num}")
+            else:
+                print(f"   ❌ Failed to recover chunk {chunk_num}")
         
         elapsed = time.time() - start_time
         
         print(f"\n🎉 RECOVERY OPERATION COMPLETE!")
         print(f"📊 Records recovered: {total_recovered:,}")
         print(f"⏱️  Recovery time: {elapsed:.1f} seconds")
+        print(f"🧹 Sanitized: {sanitizer.summary()}")
         
         # Validate final database state
         validate_recovery_results(total_recovered)
@@ -15,6 +15,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import psycopg2
 from config import get_db_config
+from utils.fips_summary import completeness_lines
 
 def ultimate_business_readiness_audit():
     """Comprehensive audit for ultimate property management system readiness"""
@@ -78,6 +79,9 @@ def ultimate_business_readiness_audit():
         ownership_status = "✅ COMPLETE" if ownership_completion == 100 else "❌ INCOMPLETE"
         
         print(f"   Status: Property Location {location_status}, Ownership {ownership_status}")
+
+        for line in completeness_lines(cursor, ('Property Location', 'Ownership')):
+            print(f"   {line}")
         
         # =====================================================
         # 2. API ENDPOINT READINESS
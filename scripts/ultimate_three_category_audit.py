@@ -15,6 +15,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import psycopg2
 from config import get_db_config
+from utils.fips_summary import completeness_lines
 
 def ultimate_three_category_audit():
     """Comprehensive audit for three completed categories"""
@@ -92,6 +93,9 @@ def ultimate_three_category_audit():
         
         overall_completion = (location_completion + ownership_completion + land_completion) / 3
         print(f"   🎯 Overall Three-Category Completion: {overall_completion:.1f}%")
+
+        for line in completeness_lines(cursor, ('Property Location', 'Ownership', 'Land Characteristics')):
+            print(f"   {line}")
         
         # =====================================================
         # 2. ADVANCED API CAPABILITIES
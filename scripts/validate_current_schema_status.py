@@ -12,8 +12,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 import psycopg2
 from config import get_db_config
+from analyzers.column_audit import run_column_audit, empty_columns
 
-def validate_current_schema_status():
+def validate_current_schema_status(sample_percent=None):
     """Validate complete schema status after all batch migrations"""
     
     print("📊 CURRENT SCHEMA STATUS VALIDATION")
@@ -149,30 +150,27 @@ def validate_current_schema_status():
         if missing_fields:
             print(f"   🔍 Missing Fields: {missing_fields}")
         
-        # Data validation (if any data exists)
-        cursor.execute("SELECT COUNT(*) FROM properties")
-        record_count = cursor.fetchone()[0]
+        # Data validation - every column's population from one scan (column_audit.py)
+        audit = run_column_audit(cursor, sample_percent=sample_percent)
+        record_count = audit['estimated_total_rows']
         
         print(f"\n📊 DATA STATUS:")
-        print(f"   🏠 Total Records: {record_count:,}")
-        
-        if record_count > 0:
-            # Sample some key fields
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) FILTER (WHERE estimated_value IS NOT NULL) as qvm_count,
-                    COUNT(*) FILTER (WHERE property_city_name IS NOT NULL) as location_count,
-                    COUNT(*) FILTER (WHERE current_owner_name IS NOT NULL) as owner_count,
-                    COUNT(*) FILTER (WHERE lot_size_square_feet IS NOT NULL) as land_count
-                FROM properties
-            """)
+        print(f"   🏠 Total Records: {record_count:,}" + (f" (estimated from {sample_percent}% sample)" if sample_percent else ""))
+        
+        if audit['rows_scanned'] > 0:
+            key_fields = [('💰 QVM Data', 'estimated_value'), ('📍 Location Data', 'property_city_name'),
+                          ('👤 Owner Data', 'current_owner_name'), ('🌱 Land Data', 'lot_size_square_feet')]
+            for label, field in key_fields:
+                column = audit['columns'].get(field)
+                if column:
+                    print(f"   {label}: {column['estimated_non_null']:,} records ({column['fill_pct']:.1f}%)")
             
-            qvm, location, owner, land = cursor.fetchone()
-            
-            print(f"   💰 QVM Data: {qvm:,} records ({qvm/record_count*100:.1f}%)")
-            print(f"   📍 Location Data: {location:,} records ({location/record_count*100:.1f}%)")
-            print(f"   👤 Owner Data: {owner:,} records ({owner/record_count*100:.1f}%)")
-            print(f"   🌱 Land Data: {land:,} records ({land/record_count*100:.1f}%)")
+            # Expected fields that exist but were never populated point at loader mapping gaps
+            empty = set(empty_columns(audit))
+            empty_expected = [f for f in confirmed_fields if f in empty]
+            print(f"   ⚠️  Expected fields with no data: {len(empty_expected)}")
+            if empty_expected:
+                print(f"   🔍 Empty Fields: {sorted(empty_expected)}")
         
         conn.close()
         return total_columns, len(confirmed_fields), len(missing_fields)
@@ -182,7 +180,9 @@ def validate_current_schema_status():
         return 0, 0, 0
 
 if __name__ == "__main__":
-    total_cols, present_fields, missing_fields = validate_current_schema_status()
+    # Optional: --sample <percent> for a quick TABLESAMPLE check instead of a full scan
+    sample_percent = float(sys.argv[sys.argv.index('--sample') + 1]) if '--sample' in sys.argv else None
+    total_cols, present_fields, missing_fields = validate_current_schema_status(sample_percent)
     
     if total_cols > 200:
         print(f"\n🚀 SCHEMA STATUS: EXCELLENT")
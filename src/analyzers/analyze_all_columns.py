@@ -4,8 +4,14 @@ Analyze All 449 TSV Columns - Ensure no data loss
 """
 
 import csv
+import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.column_sketches import load_profile_for
+
 # CRITICAL: Set CSV field size limit FIRST
 try:
     csv.field_size_limit(2147483647)
@@ -121,12 +127,30 @@ def check_current_mapping_coverage():
     for tsv_col, db_col in current_mapping.items():
         print(f"  {tsv_col} → {db_col}")
 
+def report_profile_population(file_path):
+    """Full-data column population from the loader's streaming profile (no rescan)"""
+    profile = load_profile_for(file_path)
+    if profile is None:
+        print(f"\n⚠️  No column profile for {os.path.basename(file_path)} - run the loader with --profile-columns first")
+        return None
+    
+    empty = [column for column, sketch in profile.columns.items() if sketch.null_rate == 1.0]
+    print(f"\n📊 FULL-DATA PROFILE: {profile.rows:,} rows, {len(profile.columns)} loaded columns")
+    print(f"   ✅ Columns with data: {len(profile.columns) - len(empty)}")
+    print(f"   ❌ Columns always empty: {len(empty)}")
+    for column in empty[:10]:
+        print(f"      - {column}")
+    if len(empty) > 10:
+        print(f"      ... and {len(empty) - 10} more")
+    return profile
+
 if __name__ == "__main__":
     print("🔍 Complete Column Analysis")
     print("=" * 60)
     
     tsv_cols, db_cols = analyze_tsv_columns()
     check_current_mapping_coverage()
+    report_profile_population(r"C:\DataNest-TSV-Files\extracted-tsv\Quantarium_OpenLien_20250414_00001.TSV")
     
     print(f"\n🚨 CRITICAL ISSUE:")
     print(f"   Database schema: {len(db_cols)} columns")
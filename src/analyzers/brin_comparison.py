@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+DataNest BRIN vs Btree Comparison
+Index size, physical correlation and range-scan latency for each btree/BRIN pair (migration 021).
+
+For each column the same range query - one histogram bucket from pg_stats, about 1% of
+the rows - is run under EXPLAIN (ANALYZE, BUFFERS) once per index. The other index of
+the pair is dropped inside a transaction that is always rolled back, so the planner can
+only pick the one being measured; that DROP holds an ACCESS EXCLUSIVE lock on the table
+for the length of the query, so run this off-hours, never during a load.
+
+pg_stats.correlation near ±1 means the column follows the physical order and BRIN will
+be selective; near 0 means BRIN reads most of the table and the btree should stay.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+SCHEMA = 'datnest'
+TABLE = 'properties'
+DEFAULT_REPEAT = 3
+
+# (column, btree index, BRIN index)
+COMPARISONS = (
+    ('fips_code', 'idx_properties_fips_apn', 'idx_properties_fips_brin'),
+    ('qvm_asof_date', 'idx_properties_qvm_date', 'idx_properties_qvm_date_brin'),
+    ('last_sale_date', 'idx_properties_last_sale_date', 'idx_properties_last_sale_date_brin'),
+    ('last_sale_recording_date', None, 'idx_properties_last_sale_recording_date_brin'),
+)
+
+
+def index_sizes(cursor, names: Sequence[str]) -> Dict[str, Optional[int]]:
+    """Bytes per index (None when it does not exist)"""
+    sizes = {}
+    for name in names:
+        cursor.execute("SELECT pg_relation_size(to_regclass(%s))", (f"{SCHEMA}.{name}",))
+        sizes[name] = cursor.fetchone()[0]
+    return sizes
+
+
+def column_stats(cursor, column: str, table: str = TABLE) -> Tuple[Optional[float], List[str]]:
+    """(correlation, histogram bounds as text) from pg_stats - needs a recent ANALYZE"""
+    cursor.execute("""
+        SELECT correlation, histogram_bounds::text
+        FROM pg_stats
+        WHERE schemaname = %s AND tablename = %s AND attname = %s
+    """, (SCHEMA, table, column))
+    row = cursor.fetchone()
+    if row is None:
+        return None, []
+    correlation, bounds = row
+    return correlation, parse_array(bounds)
+
+
+def parse_array(text: Optional[str]) -> List[str]:
+    """A one-dimensional Postgres array literal of dates/codes: {a,b,"c d"}"""
+    if not text:
+        return []
+    return [item.strip('"') for item in text.strip('{}').split(',') if item]
+
+
+def middle_bucket(bounds: Sequence[str]) -> Optional[Tuple[str, str]]:
+    """The histogram bucket in the middle - ~1/len(buckets) of the non-null rows"""
+    if len(bounds) < 2:
+        return None
+    middle = (len(bounds) - 1) // 2
+    return bounds[middle], bounds[middle + 1]
+
+
+def plan_summary(plan: Dict) -> Dict:
+    """Execution time, buffers and the indexes a JSON EXPLAIN (ANALYZE, BUFFERS) used"""
+    indexes = []
+
+    def walk(node):
+        if 'Index Name' in node:
+            indexes.append(node['Index Name'])
+        for child in node.get('Plans', []):
+            walk(child)
+
+    top = plan['Plan']
+    walk(top)
+    return {
+        'ms': plan['Execution Time'],
+        'blocks': top.get('Shared Hit Blocks', 0) + top.get('Shared Read Blocks', 0),
+        'rows': top.get('Actual Rows', 0),
+        'indexes': indexes,
+    }
+
+
+def measure_range_scan(conn, column: str, low: str, high: str, index: str, hide: Sequence[str],
+                       repeat: int = DEFAULT_REPEAT, table: str = TABLE) -> Dict:
+    """Median of `repeat` runs of the range count with only `index` available"""
+    cursor = conn.cursor()
+    runs = []
+    for _ in range(repeat):
+        try:
+            for name in hide:
+                cursor.execute(f"DROP INDEX IF EXISTS {SCHEMA}.{name}")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+                           f"SELECT count(*) FROM {SCHEMA}.{table} WHERE {column} BETWEEN %s AND %s", (low, high))
+            runs.append(plan_summary(cursor.fetchone()[0][0]))
+        finally:
+            conn.rollback()  # Always - the hidden index must come back
+    cursor.close()
+    best = sorted(runs, key=lambda run: run['ms'])[len(runs) // 2]
+    return dict(best, ms=statistics.median(run['ms'] for run in runs), index=index)
+
+
+def compare(conn, comparisons=COMPARISONS, repeat: int = DEFAULT_REPEAT) -> List[Dict]:
+    """One result per column: sizes, correlation, range and each index's scan"""
+    cursor = conn.cursor()
+    results = []
+    for column, btree, brin in comparisons:
+        names = [name for name in (btree, brin) if name]
+        sizes = index_sizes(cursor, names)
+        correlation, bounds = column_stats(cursor, column)
+        conn.rollback()
+        result = {'column': column, 'btree': btree, 'brin': brin, 'sizes': sizes, 'correlation': correlation,
+                  'range': middle_bucket(bounds), 'scans': []}
+        present = [name for name in names if sizes[name] is not None]
+        if result['range'] is not None:
+            for name in present:
+                hide = [other for other in present if other != name]
+                result['scans'].append(measure_range_scan(conn, column, *result['range'], name, hide, repeat))
+        results.append(result)
+    cursor.close()
+    return results
+
+
+def _size(nbytes: Optional[int]) -> str:
+    if nbytes is None:
+        return 'missing'
+    if nbytes >= 1024 ** 3:
+        return f"{nbytes / 1024 ** 3:,.1f} GB"
+    return f"{nbytes / 1024 ** 2:,.1f} MB"
+
+
+def report_lines(results: Sequence[Dict]) -> List[str]:
+    lines = []
+    for result in results:
+        correlation = result['correlation']
+        lines.append(f"{result['column']}: correlation {correlation:+.2f}" if correlation is not None
+                     else f"{result['column']}: no pg_stats (run ANALYZE)")
+        for name, nbytes in result['sizes'].items():
+            lines.append(f"   {name}: {_size(nbytes)}")
+        if result['range'] is not None:
+            lines.append(f"   range {result['range'][0]} .. {result['range'][1]}:")
+        for scan in result['scans']:
+            used = ', '.join(scan['indexes']) or 'no index'
+            lines.append(f"   {scan['index']}: {scan['ms']:,.1f} ms, {scan['blocks']:,} blocks ({used})")
+        scans = {scan['index']: scan for scan in result['scans']}
+        btree, brin = result['btree'], result['brin']
+        if btree in scans and brin in scans:
+            lines.append(f"   → BRIN is {result['sizes'][btree] / max(result['sizes'][brin], 1):,.0f}x smaller, "
+                         f"{scans[brin]['ms'] / max(scans[btree]['ms'], 0.001):.1f}x the btree's scan time")
+    return lines
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare btree and BRIN index size and range-scan latency")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Runs per index (median reported)")
+    parser.add_argument("--columns", help="Only these columns, comma separated")
+    args = parser.parse_args()
+
+    import psycopg2
+    from config import get_db_config
+
+    comparisons = COMPARISONS
+    if args.columns:
+        wanted = set(args.columns.split(','))
+        comparisons = [comparison for comparison in COMPARISONS if comparison[0] in wanted]
+
+    conn = psycopg2.connect(**get_db_config())
+    print(f"📐 BRIN vs BTREE on {SCHEMA}.{TABLE} (median of {args.repeat})")
+    for line in report_lines(compare(conn, comparisons, args.repeat)):
+        print(f"   {line}")
+    conn.close()
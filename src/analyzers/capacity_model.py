@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+DataNest Capacity Model
+Live ETA for running loads and wall-time predictions for worker counts and RDS sizes.
+
+Both come from measurements instead of constants. A loader's <file>.telemetry.jsonl gives
+the bytes of the source read so far (the 'read' stage) and the recent byte rate, so a
+file's ETA is its remaining bytes over that rate, and a delivery's is the remaining
+bytes of every unfinished file over the combined rate of the running ones.
+
+The same logs (or a benchmark_suite result) split each source byte's cost into client
+stages (read, sanitize, clean, encode...) and database stages (connect, copy, commit...).
+A load is then bounded by whichever runs out first:
+
+    workers      each loader runs its stages in turn: workers / (client + db seconds per byte)
+    client CPU   cores / client seconds per byte
+    database     min(writers, instance vCPUs) / db seconds per byte - one COPY uses one core
+    storage      the instance's EBS bandwidth / WRITE_AMPLIFICATION (heap, WAL, indexes)
+
+so the table shows how far scaling RDS helps before the loaders' own CPU is the limit.
+The database cost is measured at the writer count and instance of the logged run; it is
+a model for deciding what to try, not a promise.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.telemetry import telemetry_path_for
+from pipeline.tsv_reader import source_size
+
+DB_STAGES = ('connect', 'copy', 'stats', 'commit', 'verify')
+CLIENT_BENCHMARK_CASES = ('reader', 'sanitizer', 'decode_dates', 'decode_numeric', 'decode_integer', 'copy_encode')
+ETA_WINDOW_CHUNKS = 10          # Rate over the last 10 chunks - recent enough to follow a slowdown
+STALE_SECONDS = 15 * 60         # No chunk for 15 minutes: the load is stalled (or was killed)
+WRITE_AMPLIFICATION = 3.0       # Bytes written to storage per source byte: heap + WAL + indexes
+MB = 1024 ** 2
+
+# RDS instance class -> (vCPUs, memory GB, sustained EBS throughput MB/s)
+INSTANCES = {
+    'db.r5.large': (2, 16, 81),
+    'db.r5.xlarge': (4, 32, 144),
+    'db.r5.2xlarge': (8, 64, 288),
+    'db.r5.4xlarge': (16, 128, 594),
+    'db.r5.8xlarge': (32, 256, 850),
+    'db.r5.12xlarge': (48, 384, 1188),
+    'db.r5.16xlarge': (64, 512, 1700),
+    'db.r5.24xlarge': (96, 768, 2375),
+}
+DEFAULT_INSTANCE = os.getenv('DATANEST_DB_INSTANCE', 'db.r5.4xlarge')
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return 'unknown'
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    if seconds < 3 * 86400:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.1f} days"
+
+
+def read_telemetry(file_path: str, run_id: Optional[str] = None) -> List[Dict]:
+    """Chunk records of the file's latest run (or of run_id)"""
+    path = telemetry_path_for(file_path)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if not records:
+        return []
+    run_id = run_id or records[-1]['run_id']
+    return [record for record in records if record['run_id'] == run_id]
+
+
+def source_bytes(record: Dict) -> int:
+    """Bytes of the source file a chunk covered"""
+    read = record.get('stages', {}).get('read')
+    return int(read['bytes']) if read else int(record.get('bytes', 0))
+
+
+# =====================================================
+# Live ETA
+# =====================================================
+
+def file_progress(file_path: str, now: Optional[float] = None, window: int = ETA_WINDOW_CHUNKS,
+                  stale_seconds: float = STALE_SECONDS) -> Dict:
+    """Bytes done, recent rate and ETA of one file from its telemetry log"""
+    now = time.time() if now is None else now
+    total = source_size(file_path)
+    records = read_telemetry(file_path)
+    progress = {'file': os.path.basename(file_path), 'total_bytes': total, 'done_bytes': 0, 'rows': 0,
+                'bytes_per_sec': None, 'eta_seconds': None, 'status': 'pending'}
+    if not records:
+        return progress
+
+    done = sum(source_bytes(record) for record in records)
+    recent = records[-window:]
+    recent_seconds = sum(record['seconds'] for record in recent)
+    rate = sum(source_bytes(record) for record in recent) / recent_seconds if recent_seconds > 0 else None
+    remaining = max(total - done, 0)
+    if remaining <= total * 0.001:
+        status = 'done'
+    elif now - records[-1]['ts'] > stale_seconds:
+        status = 'stalled'
+    else:
+        status = 'running'
+    progress.update(done_bytes=min(done, total), rows=sum(record['rows'] for record in records),
+                    bytes_per_sec=rate, status=status, run_id=records[-1]['run_id'],
+                    eta_seconds=0.0 if status == 'done' else (remaining / rate if rate else None))
+    return progress
+
+
+def delivery_progress(file_paths: Sequence[str], workers: int = 1, now: Optional[float] = None) -> Dict:
+    """Every file's progress plus the delivery's ETA.
+
+    The delivery rate is the sum of the running files' rates; with none running, the median
+    rate a file has reached so far times the worker count stands in for it.
+    """
+    files = [file_progress(path, now=now) for path in file_paths]
+    total = sum(progress['total_bytes'] for progress in files)
+    done = sum(progress['done_bytes'] for progress in files)
+    remaining = sum(progress['total_bytes'] - progress['done_bytes'] for progress in files
+                    if progress['status'] != 'done')
+    running = [progress['bytes_per_sec'] for progress in files
+               if progress['status'] == 'running' and progress['bytes_per_sec']]
+    measured = [progress['bytes_per_sec'] for progress in files if progress['bytes_per_sec']]
+    if running:
+        rate = sum(running)
+    elif measured:
+        unfinished = sum(1 for progress in files if progress['status'] != 'done')
+        rate = statistics.median(measured) * max(min(workers, unfinished), 1)
+    else:
+        rate = None
+    return {
+        'files': files,
+        'total_bytes': total,
+        'done_bytes': done,
+        'bytes_per_sec': rate,
+        'eta_seconds': 0.0 if not remaining else (remaining / rate if rate else None),
+    }
+
+
+def eta_lines(delivery: Dict) -> List[str]:
+    lines = []
+    for progress in delivery['files']:
+        share = progress['done_bytes'] / progress['total_bytes'] if progress['total_bytes'] else 0.0
+        rate = f"{progress['bytes_per_sec'] / MB:,.1f} MB/s" if progress['bytes_per_sec'] else '-'
+        lines.append(f"{progress['file']}: {progress['status']}, {share:.1%} of "
+                     f"{progress['total_bytes'] / MB:,.0f} MB, {rate}, ETA {format_duration(progress['eta_seconds'])}")
+    share = delivery['done_bytes'] / delivery['total_bytes'] if delivery['total_bytes'] else 0.0
+    lines.append(f"Delivery: {share:.1%} of {delivery['total_bytes'] / MB:,.0f} MB, "
+                 f"ETA {format_duration(delivery['eta_seconds'])}")
+    return lines
+
+
+# =====================================================
+# Capacity model
+# =====================================================
+
+class CapacityModel:
+    """Client and database seconds per source byte, and what they allow at scale"""
+
+    def __init__(self, client_seconds_per_byte: float, db_seconds_per_byte: float, rows_per_byte: float,
+                 source: str, measured_instance: str = DEFAULT_INSTANCE, measured_writers: int = 1):
+        self.client_seconds_per_byte = client_seconds_per_byte
+        self.db_seconds_per_byte = db_seconds_per_byte
+        self.rows_per_byte = rows_per_byte
+        self.source = source
+        self.measured_instance = measured_instance
+        self.measured_writers = measured_writers
+
+    @classmethod
+    def from_telemetry(cls, telemetry_paths: Iterable[str], **kwargs) -> 'CapacityModel':
+        """Stage totals of every chunk in the given <file>.telemetry.jsonl logs"""
+        client = db = 0.0
+        nbytes = rows = 0
+        paths = list(telemetry_paths)
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    nbytes += source_bytes(record)
+                    rows += record['rows']
+                    for stage, counts in record['stages'].items():
+                        if stage in DB_STAGES:
+                            db += counts['seconds']
+                        else:
+                            client += counts['seconds']
+        if not nbytes:
+            raise ValueError(f"No chunk records in {paths}")
+        return cls(client / nbytes, db / nbytes, rows / nbytes,
+                   source=f"telemetry ({len(paths)} log(s), {nbytes / MB:,.0f} MB)", **kwargs)
+
+    @classmethod
+    def from_benchmark(cls, results: Dict, **kwargs) -> 'CapacityModel':
+        """benchmark_suite results: client cost from the pipeline cases, database from end_to_end.
+
+        Codec cases time a sample frame, so their cost is scaled per row, then to the
+        reader's bytes per row.
+        """
+        cases = results['cases']
+        reader = cases['reader']
+        bytes_per_row = reader['bytes'] / reader['rows']
+        client = 0.0
+        for case in CLIENT_BENCHMARK_CASES:
+            if case in cases and cases[case]['rows']:
+                client += cases[case]['seconds'] / cases[case]['rows'] / bytes_per_row
+        db = 0.0
+        end_to_end = cases.get('end_to_end')
+        if end_to_end and end_to_end['bytes']:
+            db = max(end_to_end['seconds'] / end_to_end['bytes'] - client, 0.0)
+        return cls(client, db, 1 / bytes_per_row, source=f"benchmark ({results['rows']:,} synthetic rows)", **kwargs)
+
+    def predict(self, total_bytes: int, workers: int, writers: Optional[int] = None,
+                instance: str = DEFAULT_INSTANCE, client_cores: Optional[int] = None) -> Dict:
+        """Wall time of a load of total_bytes and which limit sets it.
+
+        writers=None means each worker writes its own chunks (the loaders today); a separate
+        writer count models a pool of COPY connections fed by the workers.
+        """
+        vcpus, _, storage_mb_per_sec = INSTANCES[instance]
+        cores = client_cores or os.cpu_count() or 1
+        client, db = self.client_seconds_per_byte, self.db_seconds_per_byte
+        limits = {
+            'workers': workers / (client + db) if writers is None else workers / client,
+            'client CPU': cores / client,
+            'storage': storage_mb_per_sec * MB / WRITE_AMPLIFICATION,
+        }
+        if db > 0:
+            writers = workers if writers is None else writers
+            limits['writers' if writers <= vcpus else 'database vCPUs'] = min(writers, vcpus) / db
+        bottleneck = min(limits, key=limits.get)
+        rate = limits[bottleneck]
+        return {
+            'instance': instance,
+            'workers': workers,
+            'writers': writers if writers is not None else workers,
+            'bytes_per_sec': rate,
+            'rows_per_sec': rate * self.rows_per_byte,
+            'seconds': total_bytes / rate,
+            'bottleneck': bottleneck,
+        }
+
+    def table(self, total_bytes: int, worker_counts: Sequence[int], instances: Sequence[str],
+              writers: Optional[int] = None, client_cores: Optional[int] = None) -> List[Dict]:
+        return [self.predict(total_bytes, workers, writers, instance, client_cores)
+                for instance in instances for workers in worker_counts]
+
+    def summary(self) -> str:
+        db = (f"{self.db_seconds_per_byte * MB:.2f}s database" if self.db_seconds_per_byte
+              else "no database stages (dry run?)")
+        return (f"{self.client_seconds_per_byte * MB:.2f}s client + {db} per MB of source, "
+                f"{self.rows_per_byte * MB:,.0f} rows/MB - from {self.source}")
+
+
+def prediction_lines(predictions: Sequence[Dict]) -> List[str]:
+    lines = [f"{'instance':<16}{'workers':>8}{'writers':>8}{'rows/s':>10}{'MB/s':>8}  {'wall time':<11}bound by"]
+    for prediction in predictions:
+        lines.append(f"{prediction['instance']:<16}{prediction['workers']:>8}{prediction['writers']:>8}"
+                     f"{prediction['rows_per_sec']:>10,.0f}{prediction['bytes_per_sec'] / MB:>8,.1f}  "
+                     f"{format_duration(prediction['seconds']):<11}{prediction['bottleneck']}")
+    return lines
+
+
+def find_delivery_files(directory: str = '.') -> List[str]:
+    """Quantarium_OpenLien_*.TSV/.zip sources in a directory, in name order"""
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                  if name.startswith('Quantarium_OpenLien_') and name.lower().endswith(('.tsv', '.zip')))
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(part) for part in value.split(',') if part]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live load ETA and wall-time predictions from measurements")
+    parser.add_argument("files", nargs="*", help="Delivery sources (default: Quantarium_OpenLien_* here)")
+    parser.add_argument("--telemetry", nargs="+", help="Telemetry logs to model from (default: the files' own)")
+    parser.add_argument("--benchmark", help="benchmark_suite --output JSON to model from instead")
+    parser.add_argument("--workers", type=_int_list, default=[1, 2, 4, 8, 16])
+    parser.add_argument("--writers", type=int, help="Separate COPY writer pool size (default: one per worker)")
+    parser.add_argument("--instances", default='db.r5.xlarge,db.r5.2xlarge,db.r5.4xlarge,db.r5.8xlarge')
+    parser.add_argument("--cores", type=int, help="Client cores (default: this machine's)")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Refresh the ETA every N seconds")
+    args = parser.parse_args()
+
+    files = args.files or find_delivery_files()
+    if not files:
+        print("❌ No delivery files given or found")
+        sys.exit(1)
+
+    while True:
+        delivery = delivery_progress(files, workers=max(args.workers))
+        print(f"⏳ LIVE ETA ({time.strftime('%H:%M:%S')})")
+        for line in eta_lines(delivery):
+            print(f"   {line}")
+        if not args.watch:
+            break
+        time.sleep(args.watch)
+
+    if args.benchmark:
+        with open(args.benchmark, encoding='utf-8') as f:
+            model = CapacityModel.from_benchmark(json.load(f))
+    else:
+        logs = args.telemetry or [telemetry_path_for(path) for path in files
+                                  if os.path.exists(telemetry_path_for(path))]
+        if not logs:
+            print("⚠️  No telemetry yet - run a loader (or pass --benchmark) to model capacity")
+            sys.exit(0)
+        model = CapacityModel.from_telemetry(logs)
+
+    print(f"\n📐 CAPACITY MODEL: {model.summary()}")
+    remaining = delivery['total_bytes'] - delivery['done_bytes']
+    print(f"   Predicted wall time for the remaining {remaining / 1024 ** 3:,.1f} GB:")
+    predictions = model.table(remaining, args.workers, args.instances.split(','), args.writers, args.cores)
+    for line in prediction_lines(predictions):
+        print(f"   {line}")
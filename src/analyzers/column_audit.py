@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+DataNest Single-Scan Column Audit
+Population counts for every datnest.properties column (plus min/max for numeric and date
+columns) from ONE parallel sequential scan, instead of a query per column or category.
+
+Sampled mode reads a TABLESAMPLE SYSTEM block sample for quick checks: non_null is the count
+in the sample, estimated_non_null the count scaled to the whole table. Each run can be
+recorded in datnest.column_audit_runs / column_audit_history (migrations 019, 024).
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.data_dictionary import category_for_column
+
+# information_schema data types that also get min/max
+RANGE_TYPES = {
+    'smallint', 'integer', 'bigint', 'numeric', 'real', 'double precision',
+    'date', 'timestamp without time zone', 'timestamp with time zone',
+}
+
+SYSTEM_COLUMNS = ('id', 'created_at', 'updated_at')
+
+
+def fetch_columns(cursor, table: str = 'properties', schema: str = 'datnest') -> List[Tuple[str, str]]:
+    """[(column_name, data_type)] in table order"""
+    cursor.execute("""
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s
+        ORDER BY ordinal_position
+    """, (schema, table))
+    return cursor.fetchall()
+
+
+def build_audit_query(columns: Sequence[Tuple[str, str]], table: str = 'datnest.properties',
+                      sample_percent: Optional[float] = None, seed: Optional[int] = None) -> str:
+    """One aggregate query over the whole table.
+
+    Per-column aggregates are packed into three arrays so a 500+ column table stays well
+    under Postgres' 1664-entry target-list limit.
+    """
+    counts = ', '.join(f'count("{name}")' for name, _ in columns)
+    ranged = [name for name, data_type in columns if data_type in RANGE_TYPES]
+    minimums = ', '.join(f'min("{name}")::text' for name in ranged) or 'NULL'
+    maximums = ', '.join(f'max("{name}")::text' for name in ranged) or 'NULL'
+
+    sample = ''
+    if sample_percent is not None:
+        sample = f' TABLESAMPLE SYSTEM ({float(sample_percent)})'
+        if seed is not None:
+            sample += f' REPEATABLE ({int(seed)})'
+
+    return (f"SELECT count(*), ARRAY[{counts}]::bigint[], "
+            f"ARRAY[{minimums}]::text[], ARRAY[{maximums}]::text[] "
+            f"FROM {table}{sample}")
+
+
+def run_column_audit(cursor, sample_percent: Optional[float] = None, seed: Optional[int] = None,
+                     parallel_workers: Optional[int] = None, include_system_columns: bool = False) -> Dict:
+    """Audit every properties column in one scan and return the parsed results"""
+    columns = [(name, data_type) for name, data_type in fetch_columns(cursor)
+               if include_system_columns or name not in SYSTEM_COLUMNS]
+
+    if parallel_workers is not None:
+        # SET LOCAL only lasts for the current transaction
+        cursor.execute(f"SET LOCAL max_parallel_workers_per_gather = {int(parallel_workers)}")
+
+    start = time.time()
+    cursor.execute(build_audit_query(columns, sample_percent=sample_percent, seed=seed))
+    rows_scanned, counts, minimums, maximums = cursor.fetchone()
+    duration = time.time() - start
+
+    estimated_total = rows_scanned
+    if sample_percent:
+        estimated_total = int(round(rows_scanned * 100.0 / sample_percent))
+    scale = estimated_total / rows_scanned if rows_scanned else 0.0
+
+    ranged = iter(zip(minimums or [], maximums or []))
+    results = {}
+    for (name, data_type), non_null in zip(columns, counts):
+        minimum, maximum = next(ranged) if data_type in RANGE_TYPES else (None, None)
+        results[name] = {
+            'data_type': data_type,
+            'category': category_for_column(name),
+            'non_null': int(non_null),
+            'estimated_non_null': int(round(non_null * scale)),
+            'fill_pct': non_null / rows_scanned * 100 if rows_scanned else 0.0,
+            'min': minimum,
+            'max': maximum,
+        }
+
+    return {
+        'rows_scanned': int(rows_scanned),
+        'estimated_total_rows': int(estimated_total),
+        'sample_percent': sample_percent,
+        'duration_seconds': duration,
+        'columns': results,
+    }
+
+
+def category_fill_rates(audit: Dict) -> Dict[str, Dict]:
+    """Roll column results up to data categories"""
+    categories = {}
+    for name, column in audit['columns'].items():
+        entry = categories.setdefault(column['category'], {'columns': 0, 'populated': 0, 'fill_pct': 0.0})
+        entry['columns'] += 1
+        entry['populated'] += 1 if column['non_null'] else 0
+        entry['fill_pct'] += column['fill_pct']
+    for entry in categories.values():
+        entry['fill_pct'] /= entry['columns']
+    return categories
+
+
+def empty_columns(audit: Dict) -> List[str]:
+    """Columns with no populated value in the scanned rows"""
+    return [name for name, column in audit['columns'].items() if column['non_null'] == 0]
+
+
+def record_audit(cursor, audit: Dict, label: Optional[str] = None) -> int:
+    """Persist an audit run to the history tables and return the run id"""
+    from psycopg2.extras import execute_values
+    from utils.load_audit import current_load_generation
+
+    cursor.execute("""
+        INSERT INTO datnest.column_audit_runs
+            (label, sample_percent, rows_scanned, estimated_total_rows, column_count, duration_seconds,
+             load_generation)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        RETURNING id
+    """, (label, audit['sample_percent'], audit['rows_scanned'], audit['estimated_total_rows'],
+          len(audit['columns']), round(audit['duration_seconds'], 2), current_load_generation(cursor)))
+    run_id = cursor.fetchone()[0]
+
+    execute_values(cursor, """
+        INSERT INTO datnest.column_audit_history
+            (run_id, column_name, data_type, non_null_count, sample_rows, estimated_non_null_count,
+             fill_pct, min_value, max_value)
+        VALUES %s
+    """, [(run_id, name, column['data_type'], column['non_null'], audit['rows_scanned'],
+           column['estimated_non_null'], round(column['fill_pct'], 2), column['min'], column['max'])
+          for name, column in audit['columns'].items()], page_size=1000)
+    return run_id
+
+
+def print_audit(audit: Dict, show_columns: bool = False) -> None:
+    mode = f"{audit['sample_percent']}% TABLESAMPLE" if audit['sample_percent'] else "full scan"
+    print(f"📊 Column audit ({mode}): {audit['rows_scanned']:,} rows scanned, "
+          f"~{audit['estimated_total_rows']:,} total, {len(audit['columns'])} columns "
+          f"in {audit['duration_seconds']:.1f}s")
+
+    print("\n📋 FILL RATE BY CATEGORY:")
+    for category, entry in sorted(category_fill_rates(audit).items()):
+        print(f"   📂 {category}: {entry['fill_pct']:.1f}% avg fill, "
+              f"{entry['populated']}/{entry['columns']} columns populated")
+
+    empty = empty_columns(audit)
+    print(f"\n❌ Empty columns: {len(empty)}")
+    for name in empty[:20]:
+        print(f"      - {name}")
+    if len(empty) > 20:
+        print(f"      ... and {len(empty) - 20} more")
+
+    if show_columns:
+        print("\n🔍 COLUMN DETAIL:")
+        for name, column in audit['columns'].items():
+            value_range = f" [{column['min']} .. {column['max']}]" if column['min'] is not None else ""
+            print(f"   {name:45s} {column['fill_pct']:6.1f}%{value_range}")
+
+
+if __name__ == "__main__":
+    import psycopg2
+    from config import get_db_config
+
+    parser = argparse.ArgumentParser(description="Single-scan population audit of datnest.properties")
+    parser.add_argument("--sample", type=float, help="TABLESAMPLE SYSTEM percent (e.g. 1 for a quick check)")
+    parser.add_argument("--seed", type=int, help="REPEATABLE seed for sampled audits")
+    parser.add_argument("--workers", type=int, help="max_parallel_workers_per_gather for the scan")
+    parser.add_argument("--label", help="Label stored with the history row")
+    parser.add_argument("--no-history", action="store_true", help="Do not record the run")
+    parser.add_argument("--columns", action="store_true", help="Print per-column detail")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**get_db_config())
+    cursor = conn.cursor()
+    audit = run_column_audit(cursor, sample_percent=args.sample, seed=args.seed, parallel_workers=args.workers)
+    print_audit(audit, show_columns=args.columns)
+    if not args.no_history:
+        run_id = record_audit(cursor, audit, label=args.label)
+        print(f"\n🔖 Recorded audit run {run_id}")
+    conn.commit()
+    cursor.close()
+    conn.close()
@@ -2,22 +2,46 @@
 """
 DataNest Dataset Scale Analysis
 Critical analysis of true dataset size and loading optimization requirements
+
+Sizes, rates and load times come from the delivery files present and the capacity model
+(analyzers/capacity_model.py, fed by loader telemetry or a benchmark baseline); the
+original hand-entered figures are only used when neither exists yet.
 """
 
 import os
+import sys
 import time
 
-def analyze_full_dataset_scale():
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from analyzers.capacity_model import (DEFAULT_INSTANCE, CapacityModel, find_delivery_files, format_duration,
+                                      prediction_lines)
+from pipeline.telemetry import telemetry_path_for
+from pipeline.tsv_reader import source_size
+from utils.benchmark_suite import load_baseline
+
+def measured_capacity_model(files):
+    """Model from the files' telemetry logs, else this machine's benchmark baseline, else None"""
+    logs = [telemetry_path_for(path) for path in files if os.path.exists(telemetry_path_for(path))]
+    if logs:
+        return CapacityModel.from_telemetry(logs)
+    baseline = load_baseline()
+    if baseline and 'reader' in baseline.get('cases', {}):
+        return CapacityModel.from_benchmark(baseline)
+    return None
+
+def analyze_full_dataset_scale(directory='.'):
     """Analyze the true scale of the Quantarium dataset"""
     
     print("🚨 CRITICAL DATASET SCALE ANALYSIS")
     print("=" * 60)
     
     # Current file analysis
-    sample_file = "Quantarium_OpenLien_20250414_00001.TSV"
-    if os.path.exists(sample_file):
-        file_size_gb = os.path.getsize(sample_file) / (1024**3)
-        print(f"📁 Sample file size: {file_size_gb:.2f} GB")
+    files = find_delivery_files(directory)
+    if files:
+        file_size_gb = sum(source_size(path) for path in files) / len(files) / (1024**3)
+        print(f"📁 Mean file size: {file_size_gb:.2f} GB over {len(files)} delivery file(s)")
     else:
         file_size_gb = 6.1  # User stated 6+ GB
         print(f"📁 Sample file size: {file_size_gb:.2f} GB (user reported)")
@@ -32,8 +56,14 @@ def analyze_full_dataset_scale():
     print(f"  - Total unzipped size: {total_size_gb:.1f} GB")
     print(f"  - Total compressed size: ~{total_size_gb/6:.1f} GB (estimated)")
     
-    # Record estimates (based on sample results)
-    records_per_gb = 5000 / file_size_gb  # From our sample loading
+    model = measured_capacity_model(files)
+    total_bytes = total_size_gb * 1024**3
+    
+    # Record estimates (measured rows per byte when a load or benchmark has run)
+    if model is not None:
+        records_per_gb = model.rows_per_byte * 1024**3
+    else:
+        records_per_gb = 5000 / file_size_gb  # From our sample loading
     total_records = records_per_gb * total_size_gb
     
     print(f"\n📈 RECORD ESTIMATES:")
@@ -42,13 +72,23 @@ def analyze_full_dataset_scale():
     print(f"  - QVM records (38.4%): ~{total_records * 0.384:,.0f}")
     
     # Current performance analysis
-    current_rate = 13  # records/second from sample test
+    if model is not None:
+        single = model.predict(total_bytes, workers=1, instance=DEFAULT_INSTANCE)
+        current_rate = single['rows_per_sec']
+        print(f"\n⚠️  CURRENT LOADING PERFORMANCE ({model.summary()}):")
+    else:
+        current_rate = 13  # records/second from sample test
+        print(f"\n⚠️  CURRENT LOADING PERFORMANCE (no telemetry or benchmark baseline yet - early sample figure):")
     
-    print(f"\n⚠️  CURRENT LOADING PERFORMANCE:")
-    print(f"  - Current rate: {current_rate} records/second")
-    print(f"  - Time for one file: {(records_per_gb * file_size_gb) / current_rate / 3600:.1f} hours")
-    print(f"  - Time for all files: {total_records / current_rate / 3600 / 24:.1f} DAYS")
+    print(f"  - Current rate: {current_rate:,.0f} records/second (one loader)")
+    print(f"  - Time for one file: {format_duration(records_per_gb * file_size_gb / current_rate)}")
+    print(f"  - Time for all files: {format_duration(total_records / current_rate)}")
     print(f"  - Database size estimate: {total_size_gb * 0.8:.1f} GB")
+    if model is not None:
+        print(f"\n📐 PREDICTED WALL TIME (python src/analyzers/capacity_model.py for live ETA):")
+        predictions = model.table(total_bytes, [1, 4, 8, 16], ['db.r5.xlarge', 'db.r5.4xlarge', 'db.r5.8xlarge'])
+        for line in prediction_lines(predictions):
+            print(f"  {line}")
     
     print(f"\n🎯 OPTIMIZATION TARGETS:")
     target_rate = 10000  # records/second target
@@ -9,7 +9,6 @@ import csv
 import psycopg2
 import pandas as pd
 import numpy as np
-import tempfile
 import os
 import time
 import sys
@@ -18,6 +17,17 @@ from decimal import Decimal
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from pipeline.tsv_reader import read_tsv_chunks, Quarantine
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.chunk_sizer import ChunkSizer
+from pipeline.telemetry import LoadTelemetry
+from pipeline.value_codecs import (CodecReport, decode_date_columns, decode_integer_columns, integer_targets,
+                                   text_date_columns)
+from analyzers.column_audit import fetch_columns
+from pipeline.copy_writer import copy_with_bisection, record_rejects, describe_rejects
+from utils.load_audit import start_load_audit, complete_load_audit
+from utils.fips_summary import chunk_fips_statistics, apply_chunk_statistics, reset_fips_summaries, ensure_fips_summaries
+
 # CRITICAL: Set CSV field size limit FIRST
 try:
     csv.field_size_limit(2147483647)
@@ -253,35 +263,42 @@ def bulletproof_load_with_validation():
     print(f"📊 Target: 95 → {len(field_mapping)} working fields with COMPLETE financing intelligence")
     print()
     
+    audit_id = None
     total_loaded = 0
     total_errors_fixed = 0
-    chunk_size = 10000  # Smaller chunks for better error handling
+    failed_records = 0
     
     try:
-        # Truncate table for fresh bulletproof load
+        # Truncate table + FIPS summaries for fresh bulletproof load and open the audit row (completion bumps the load generation)
         conn = psycopg2.connect(**CONN_PARAMS)
         cursor = conn.cursor()
         cursor.execute("SET search_path TO datnest, public")
         cursor.execute("TRUNCATE TABLE properties RESTART IDENTITY CASCADE")
+        reset_fips_summaries(cursor)
+        audit_id = start_load_audit(cursor, os.path.basename(file_path), os.path.getsize(file_path))
         conn.commit()
+        # Integer columns are range-checked against their actual type (SMALLINT/INTEGER/BIGINT),
+        # date columns stored as VARCHAR(8) keep YYYYMMDD text
+        schema_columns = fetch_columns(cursor)
+        integer_column_targets = integer_targets(schema_columns)
         cursor.close()
         conn.close()
         print("✅ Table truncated for fresh bulletproof load")
         
         # Read file in chunks with bulletproof processing
-        print(f"📖 Processing file in {chunk_size:,} row chunks...")
-        
-        chunk_reader = pd.read_csv(
-            file_path,
-            sep='\t',
-            chunksize=chunk_size,
-            dtype=str,
-            encoding='utf-8',
-            engine='python',
-            quoting=csv.QUOTE_NONE,
-            on_bad_lines='skip',
-            na_values=['']  # Treat empty strings as NaN
-        )
+        # Chunk size adapts to measured rows/sec within the RSS budget (<file>.chunksizes.jsonl)
+        chunk_sizer = ChunkSizer.for_file(file_path, initial_rows=10000)
+        print(f"📖 Processing file in adaptive chunks, starting at {chunk_sizer.rows:,} rows...")
+        
+        # C-engine chunked reader; control bytes and invalid UTF-8 cleaned before parsing
+        sanitizer = ByteSanitizer()
+        # Lines with extra fields go to <file>.quarantine.tsv instead of vanishing
+        quarantine = Quarantine(file_path)
+        # Per-stage timings, rows and bytes: <file>.telemetry.jsonl (+ Prometheus textfile if configured)
+        telemetry = LoadTelemetry.for_file(file_path)
+        chunk_reader = read_tsv_chunks(file_path, chunksize=chunk_sizer, sanitizer=sanitizer, telemetry=telemetry,
+                                       quarantine=quarantine)
+        codec_report = CodecReport()
         
         start_time = time.time()
         
@@ -366,23 +383,13 @@ def bulletproof_load_with_validation():
                 'total_financing_history_count', 'mtg01_pre_foreclosure_status'
             ]
             
-            for field in integer_fields:
-                if field in clean_data.columns:
-                    print(f"   🔧 Converting {field} to integer...")
-                    
-                    # Step 1: Convert to numeric (handles "70.0" → 70.0)
-                    numeric_series = pd.to_numeric(clean_data[field], errors='coerce')
-                    
-                    # Step 2: Convert float to integer (70.0 → 70)
-                    integer_series = numeric_series.round().astype('Int64', errors='ignore')
-                    
-                    # Step 3: Replace with None where invalid
-                    clean_data[field] = integer_series.where(pd.notna(integer_series), None)
-                    
-                    # Count conversions for tracking
-                    converted_count = pd.notna(integer_series).sum()
-                    print(f"     ✅ Converted {converted_count:,} {field} values to integer")
-                    total_errors_fixed += converted_count
+            # Parsed, rounded ("70.0" -> 70) and range-checked straight into Int64 columns - no
+            # float/object round trip; counts per column in codec_report
+            decode_integer_columns(clean_data, integer_fields, codec_report, targets=integer_column_targets)
+            converted_count = sum(int(clean_data[field].notna().sum()) for field in integer_fields
+                                  if field in clean_data.columns)
+            print(f"   🔧 Converted {converted_count:,} integer values")
+            total_errors_fixed += converted_count
             
             # 4. Handle string fields (optional)
             string_fields = [
@@ -437,18 +444,12 @@ def bulletproof_load_with_validation():
                 'mtg01_pre_fcl_filing_date', 'mtg01_pre_fcl_auction_date'
             ]
             
-            for field in date_fields:
-                if field in clean_data.columns:
-                    print(f"   📅 Converting {field} to date...")
-                    try:
-                        # Convert YYYYMMDD to proper date format
-                        date_series = pd.to_datetime(clean_data[field], format='%Y%m%d', errors='coerce')
-                        clean_data[field] = date_series.where(pd.notna(date_series), None)
-                        converted_count = pd.notna(date_series).sum()
-                        print(f"     ✅ Converted {converted_count:,} {field} values to date")
-                    except Exception as e:
-                        print(f"     ⚠️  Date conversion warning: {e}")
-                        clean_data[field] = None
+            # YYYYMMDD -> datetime64 (8-digit text for VARCHAR(8) columns) in one pass per column;
+            # impossible dates become NULL and are counted
+            decode_date_columns(clean_data, date_fields, codec_report,
+                                keep_text=text_date_columns(schema_columns, date_fields))
+            print(f"   📅 Dates: {sum(codec_report.columns.get(f, {}).get('valid', 0) for f in date_fields):,} "
+                  f"valid so far, {sum(codec_report.rejected(f) for f in date_fields):,} rejected")
             
             # 6. Handle boolean/categorical fields (EVIDENCE-BASED)
             categorical_fields = ['owner_occupied']
@@ -458,27 +459,39 @@ def bulletproof_load_with_validation():
                     # Keep as string for now - will analyze patterns first
                     clean_data[field] = clean_data[field].fillna('')
             
-            # Create temp file and COPY with bulletproof error handling
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='', encoding='utf-8') as tmp_file:
-                clean_data.to_csv(tmp_file, sep='\t', header=False, index=False, na_rep='\\N')
-                tmp_file_path = tmp_file.name
+            telemetry.lap('clean', rows=len(clean_data))
+            
+            # Build COPY text in memory - bisection needs the individual lines on failure
+            copy_text = clean_data.to_csv(sep='\t', header=False, index=False, na_rep='\\N')
+            telemetry.lap('encode', rows=len(clean_data), nbytes=len(copy_text))
             
             # COPY to database with bulletproof error handling
             conn = psycopg2.connect(**CONN_PARAMS)
             cursor = conn.cursor()
             cursor.execute("SET search_path TO datnest, public")
+            telemetry.lap('connect')
+            chunk_rejected = 0
             
             try:
-                with open(tmp_file_path, 'r', encoding='utf-8') as f:
-                    cursor.copy_from(
-                        f,
-                        'properties',
-                        columns=tuple(clean_data.columns),
-                        sep='\t',
-                        null='\\N'
-                    )
+                # A bad row no longer drops the chunk: it is bisected out to datnest.load_rejects
+                copy_result = copy_with_bisection(cursor, 'properties', tuple(clean_data.columns), copy_text)
+                loaded_rows = clean_data
+                if copy_result.rejects:
+                    record_rejects(cursor, copy_result.rejects, 'properties', os.path.basename(file_path), chunk_num,
+                                   audit_id)
+                    loaded_rows = clean_data.drop(clean_data.index[[r.row_number - 1 for r in copy_result.rejects]])
+                    print(f"   🚧 {len(copy_result.rejects)} rows rejected ({copy_result.copies} COPYs), "
+                          f"{copy_result.loaded:,} loaded - see datnest.load_rejects")
+                    for line in describe_rejects(copy_result.rejects):
+                        print(f"      {line}")
+                telemetry.lap('copy', rows=copy_result.loaded, nbytes=len(copy_text))
                 
+                # Per-FIPS summary deltas for the rows that actually loaded - same transaction
+                apply_chunk_statistics(cursor, chunk_fips_statistics(loaded_rows))
+                telemetry.lap('stats', rows=len(loaded_rows))
                 conn.commit()
+                telemetry.lap('commit', rows=copy_result.loaded)
+                chunk_rejected = len(copy_result.rejects)
                 
                 # Immediate verification - BULLETPROOF
                 cursor.execute("SELECT COUNT(*) FROM datnest.properties WHERE price_range_max IS NOT NULL")
@@ -496,6 +509,7 @@ def bulletproof_load_with_validation():
                 
                 success_message = "   ✅ CHUNK SUCCESS - All data types accepted!"
                 print(success_message)
+                telemetry.lap('verify')
                 
             except Exception as e:
                 print(f"   ❌ Database error in chunk {chunk_num}: {e}")
@@ -506,6 +520,7 @@ def bulletproof_load_with_validation():
                     print(f"   ⚠️  Missing fields in TSV: {missing_fields[:5]}...")  # Show first 5
                 
                 conn.rollback()
+                chunk_rejected = len(clean_data)
                 
                 # Enhanced error recovery for power batch
                 print(f"   🔄 Power Batch Recovery: Continuing with next chunk...")
@@ -515,15 +530,17 @@ def bulletproof_load_with_validation():
                 cursor.close()
                 conn.close()
             
-            # Cleanup
-            os.unlink(tmp_file_path)
-            
             total_loaded += len(clean_data)
+            failed_records += chunk_rejected
             chunk_elapsed = time.time() - chunk_start
             overall_elapsed = time.time() - start_time
             
             print(f"✅ Chunk {chunk_num}: {len(clean_data):,} records in {chunk_elapsed:.1f}s")
             print(f"📈 Total: {total_loaded:,} records, {total_loaded/overall_elapsed:.0f} rec/sec overall")
+            chunk_sizer.chunk_done(len(chunk), telemetry.stage_seconds())
+            print(f"📏 Chunk size: {chunk_sizer.describe()}")
+            telemetry.chunk_done(chunk_num, len(clean_data), failed=chunk_rejected,
+                                 chunk_size=chunk_sizer.decisions[-1]['rows'])
             print()
             
             # Progress checkpoint every 20 chunks
@@ -534,6 +551,8 @@ def bulletproof_load_with_validation():
                 print()
         
         total_elapsed = time.time() - start_time
+        telemetry.close()
+        quarantine.close()
         
         # Final bulletproof verification
         print("\n🎉 BULLETPROOF LOAD COMPLETE!")
@@ -541,14 +560,44 @@ def bulletproof_load_with_validation():
         print(f"📊 Total records: {total_loaded:,}")
         print(f"⏱️  Total time: {total_elapsed/60:.1f} minutes")
         print(f"📈 Average rate: {total_loaded/total_elapsed:.0f} records/second")
+        if quarantine.total or quarantine.short_lines:
+            print(f"🚧 Bad lines: {quarantine.summary()}")
+        if quarantine.total:
+            print(f"   📄 {quarantine.path} - retry with: python src/pipeline/tsv_reader.py --reprocess <file>")
+        print(f"🧹 Sanitized: {sanitizer.summary()}")
+        print(f"📏 Chunk size: {chunk_sizer.summary()} - log: {chunk_sizer.log_path}")
+        print(f"⏱️  Stages: {', '.join(telemetry.summary_lines())} - log: {telemetry.jsonl_path}")
+        if telemetry.profiler is not None:
+            for line in telemetry.profiler.summary_lines():
+                print(f"🔥 {line}")
+            print(f"   📄 {telemetry.profiler.output_dir} (collapsed stacks, hot functions, allocations)")
+        for line in codec_report.lines():
+            print(f"🔧 {line}")
         print(f"🔧 Total fixes applied: {total_errors_fixed:,}")
         
-        # Comprehensive field verification
-        print(f"\n🔍 COMPREHENSIVE FIELD VERIFICATION:")
         conn = psycopg2.connect(**CONN_PARAMS)
         cursor = conn.cursor()
         cursor.execute("SET search_path TO datnest, public")
         
+        # Close the audit row - bumps the load generation so lookup caches refresh
+        # Quarantined lines count as failed records of this file
+        failed_records += quarantine.total
+        load_status = 'completed' if failed_records == 0 else 'partial'
+        generation = complete_load_audit(cursor, audit_id, total_loaded + quarantine.total,
+                                         total_loaded + quarantine.total - failed_records,
+                                         failed_records, status=load_status)
+        conn.commit()
+        print(f"🔖 Audit {audit_id}: {load_status} (load generation {generation})")
+        
+        # Audits read only the summaries - rebuild them if any loaded rows are missing from them
+        rebuilt_counties = ensure_fips_summaries(cursor, total_loaded + quarantine.total - failed_records)
+        conn.commit()
+        if rebuilt_counties is not None:
+            print(f"🔄 FIPS summaries rebuilt from datnest.properties ({rebuilt_counties:,} counties)")
+        
+        # Comprehensive field verification
+        print(f"\n🔍 COMPREHENSIVE FIELD VERIFICATION:")
+        
         verification_fields = {
             # Core QVM Intelligence (WORKING)
             'estimated_value': 'ESTIMATED_VALUE',
@@ -670,6 +719,16 @@ def bulletproof_load_with_validation():
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        if audit_id is not None:
+            try:
+                conn = psycopg2.connect(**CONN_PARAMS)
+                cursor = conn.cursor()
+                complete_load_audit(cursor, audit_id, total_loaded, total_loaded - failed_records,
+                                    failed_records, status='failed', error_message=str(e)[:1000])
+                conn.commit()
+                conn.close()
+            except Exception as audit_error:
+                print(f"⚠️  Could not record failed load in audit: {audit_error}")
         return False
 
 if __name__ == "__main__":
@@ -15,6 +15,13 @@ import sys
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+from pipeline.tsv_reader import read_tsv_chunks, Quarantine
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.chunk_sizer import ChunkSizer
+from pipeline.telemetry import LoadTelemetry
+from utils.load_audit import start_load_audit, complete_load_audit
+from utils.fips_summary import chunk_fips_statistics, apply_chunk_statistics, reset_fips_summaries, ensure_fips_summaries
+
 # CRITICAL: Set CSV field size limit FIRST
 try:
     csv.field_size_limit(2147483647)
@@ -59,33 +66,35 @@ def load_full_file_with_copy():
         'PA_Longitude': 'longitude'
     }
     
+    audit_id = None
     total_loaded = 0
-    chunk_size = 50000  # Process 50K rows at a time
     
     try:
-        # Truncate table for fresh start
+        # Truncate table + FIPS summaries for fresh start and open the audit row (completion bumps the load generation)
         conn = psycopg2.connect(**CONN_PARAMS)
         cursor = conn.cursor()
         cursor.execute("SET search_path TO datnest, public")
         cursor.execute("TRUNCATE TABLE properties RESTART IDENTITY CASCADE")
+        reset_fips_summaries(cursor)
+        audit_id = start_load_audit(cursor, os.path.basename(file_path), os.path.getsize(file_path))
         conn.commit()
         cursor.close()
         conn.close()
         print("✅ Table truncated for fresh production load")
         
         # Read file in chunks
-        print(f"📖 Processing file in {chunk_size:,} row chunks...")
+        # Chunk size adapts to measured rows/sec within the RSS budget (<file>.chunksizes.jsonl)
+        chunk_sizer = ChunkSizer.for_file(file_path, initial_rows=50000)
+        print(f"📖 Processing file in adaptive chunks, starting at {chunk_sizer.rows:,} rows...")
         
-        chunk_reader = pd.read_csv(
-            file_path,
-            sep='\t',
-            chunksize=chunk_size,
-            dtype=str,
-            encoding='utf-8',
-            engine='python',
-            quoting=csv.QUOTE_NONE,
-            on_bad_lines='skip'
-        )
+        # C-engine chunked reader; control bytes and invalid UTF-8 cleaned before parsing
+        sanitizer = ByteSanitizer()
+        # Lines with extra fields go to <file>.quarantine.tsv instead of vanishing
+        quarantine = Quarantine(file_path)
+        # Per-stage timings, rows and bytes: <file>.telemetry.jsonl (+ Prometheus textfile if configured)
+        telemetry = LoadTelemetry.for_file(file_path)
+        chunk_reader = read_tsv_chunks(file_path, chunksize=chunk_sizer, sanitizer=sanitizer, telemetry=telemetry,
+                                       quarantine=quarantine)
         
         start_time = time.time()
         
@@ -120,15 +129,19 @@ def load_full_file_with_copy():
                 if field in clean_data.columns:
                     clean_data[field] = clean_data[field].fillna('')
             
+            telemetry.lap('clean', rows=len(clean_data))
+            
             # Create temp file and COPY
             with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='') as tmp_file:
                 clean_data.to_csv(tmp_file, sep='\t', header=False, index=False, na_rep='\\N')
                 tmp_file_path = tmp_file.name
+            telemetry.lap('encode', rows=len(clean_data), nbytes=os.path.getsize(tmp_file_path))
             
             # COPY to database
             conn = psycopg2.connect(**CONN_PARAMS)
             cursor = conn.cursor()
             cursor.execute("SET search_path TO datnest, public")
+            telemetry.lap('connect')
             
             with open(tmp_file_path, 'r') as f:
                 cursor.copy_from(
@@ -138,8 +151,13 @@ def load_full_file_with_copy():
                     sep='\t',
                     null='\\N'
                 )
+            telemetry.lap('copy', rows=len(clean_data), nbytes=os.path.getsize(tmp_file_path))
             
+            # Per-FIPS summary deltas in the same transaction - '\\N' cells are NULLs once COPYed
+            apply_chunk_statistics(cursor, chunk_fips_statistics(clean_data.mask(clean_data == '\\N')))
+            telemetry.lap('stats', rows=len(clean_data))
             conn.commit()
+            telemetry.lap('commit', rows=len(clean_data))
             cursor.close()
             conn.close()
             
@@ -152,6 +170,9 @@ def load_full_file_with_copy():
             
             print(f"✅ Chunk {chunk_num}: {len(clean_data):,} records in {chunk_elapsed:.1f}s")
             print(f"📈 Total: {total_loaded:,} records, {total_loaded/overall_elapsed:.0f} rec/sec overall")
+            chunk_sizer.chunk_done(len(chunk), telemetry.stage_seconds())
+            print(f"📏 Chunk size: {chunk_sizer.describe()}")
+            telemetry.chunk_done(chunk_num, len(clean_data), chunk_size=chunk_sizer.decisions[-1]['rows'])
             
             # Progress checkpoint every 10 chunks
             if chunk_num % 10 == 0:
@@ -159,10 +180,41 @@ def load_full_file_with_copy():
                 print(f"🕐 Checkpoint: {chunk_num} chunks, {elapsed_min:.1f} minutes elapsed")
         
         total_elapsed = time.time() - start_time
+        telemetry.close()
+        quarantine.close()
+        
+        # Close the audit row - bumps the load generation so lookup caches refresh
+        # Quarantined lines count as failed records of this file
+        load_status = 'completed' if quarantine.total == 0 else 'partial'
+        conn = psycopg2.connect(**CONN_PARAMS)
+        cursor = conn.cursor()
+        generation = complete_load_audit(cursor, audit_id, total_loaded + quarantine.total, total_loaded,
+                                         quarantine.total, status=load_status)
+        conn.commit()
+        # Audits read only the summaries - rebuild them if any loaded rows are missing from them
+        rebuilt_counties = ensure_fips_summaries(cursor, total_loaded)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
         print(f"\n🎉 FILE COMPLETE!")
         print(f"📊 Total records: {total_loaded:,}")
         print(f"⏱️  Total time: {total_elapsed/60:.1f} minutes")
         print(f"📈 Average rate: {total_loaded/total_elapsed:.0f} records/second")
+        print(f"🔖 Audit {audit_id}: {load_status} (load generation {generation})")
+        if rebuilt_counties is not None:
+            print(f"🔄 FIPS summaries rebuilt from datnest.properties ({rebuilt_counties:,} counties)")
+        if quarantine.total or quarantine.short_lines:
+            print(f"🚧 Bad lines: {quarantine.summary()}")
+        if quarantine.total:
+            print(f"   📄 {quarantine.path} - retry with: python src/pipeline/tsv_reader.py --reprocess <file>")
+        print(f"🧹 Sanitized: {sanitizer.summary()}")
+        print(f"📏 Chunk size: {chunk_sizer.summary()} - log: {chunk_sizer.log_path}")
+        print(f"⏱️  Stages: {', '.join(telemetry.summary_lines())} - log: {telemetry.jsonl_path}")
+        if telemetry.profiler is not None:
+            for line in telemetry.profiler.summary_lines():
+                print(f"🔥 {line}")
+            print(f"   📄 {telemetry.profiler.output_dir} (collapsed stacks, hot functions, allocations)")
         
         return True
         
@@ -170,6 +222,16 @@ def load_full_file_with_copy():
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        if audit_id is not None:
+            try:
+                conn = psycopg2.connect(**CONN_PARAMS)
+                cursor = conn.cursor()
+                complete_load_audit(cursor, audit_id, total_loaded, total_loaded,
+                                    status='failed', error_message=str(e)[:1000])
+                conn.commit()
+                conn.close()
+            except Exception as audit_error:
+                print(f"⚠️  Could not record failed load in audit: {audit_error}")
         return False
 
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+DataNest Adaptive Chunk Sizer
+Picks and adjusts the rows-per-chunk of a load at runtime instead of a hard-coded size.
+
+The sizer is handed to read_tsv_chunks(chunksize=sizer) and told when each chunk is done.
+It hill-climbs on measured rows/sec - doubling while throughput improves, then reversing
+with a shrinking step until it settles - and caps the size so the worker's RSS stays
+inside a budget (DATANEST_WORKER_RSS_MB, default 2048). The best size is remembered per
+file layout (column count and line width) in chunk_sizes.json next to the data, so the
+next file of that layout starts there, and every decision is logged to
+<file>.chunksizes.jsonl; ChunkSizer.from_log() replays a logged load's sizes exactly.
+"""
+
+import json
+import math
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.tsv_reader import iter_blocks, read_header
+
+# Optional - /proc/self/statm covers Linux without it
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+DEFAULT_RSS_BUDGET_MB = int(os.getenv('DATANEST_WORKER_RSS_MB', 2048))
+BUDGET_HEADROOM = 0.8        # Size chunks for 80% of the budget - parse buffers spike above the average
+MIN_ROWS = 1000
+MAX_ROWS = 500000
+ROW_QUANTUM = 500            # Sizes are rounded so logs stay readable and reproducible
+COARSE_STEP = 2.0            # First moves double/halve the size
+FINE_STEP = 2.0 ** 0.25      # Starting from a remembered size, only search nearby
+MIN_STEP = 1.05              # Converged once the step is below 5%
+RATE_TOLERANCE = 0.02        # Throughput must beat the best by 2% to count as better
+WARMUP_CHUNKS = 1            # The first chunk pays connection and cache warm-up - not measured
+
+LAYOUT_SAMPLE_BYTES = 1024 * 1024
+SIZES_FILE = 'chunk_sizes.json'
+CHUNK_LOG_SUFFIX = '.chunksizes.jsonl'
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes, None where it cannot be read"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def layout_key(path: str) -> str:
+    """Column count and line-width bucket (power of two) of a .tsv or .zip"""
+    columns = len(read_header(path))
+    blocks = iter_blocks(path, block_bytes=LAYOUT_SAMPLE_BYTES, prefetch=False)
+    try:
+        first_block = next(blocks, b'')
+    finally:
+        blocks.close()
+    lines = max(first_block.count(b'\n') - 1, 1)  # Minus the header line
+    width = 1 << (max(len(first_block) // lines, 1) - 1).bit_length()  # Next power of two
+    return f"{columns}cols/{width}B"
+
+
+def sizes_path_for(file_path: str) -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), SIZES_FILE)
+
+
+def chunk_log_path_for(file_path: str) -> str:
+    return file_path + CHUNK_LOG_SUFFIX
+
+
+def read_chunk_log(log_path: str) -> List[Dict]:
+    with open(log_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _quantize(rows: float) -> int:
+    return max(ROW_QUANTUM, int(round(rows / ROW_QUANTUM)) * ROW_QUANTUM)
+
+
+class ChunkSizer:
+    """Callable chunk size for read_tsv_chunks; call chunk_done(rows) after each chunk"""
+
+    def __init__(self, initial_rows: int = 25000, rss_budget_mb: Optional[int] = None,
+                 min_rows: int = MIN_ROWS, max_rows: int = MAX_ROWS, adaptive: bool = True,
+                 layout: Optional[str] = None, state_path: Optional[str] = None,
+                 log_path: Optional[str] = None, replay: Optional[List[int]] = None,
+                 clock: Callable[[], float] = time.perf_counter,
+                 rss: Callable[[], Optional[int]] = current_rss):
+        self.rss_budget = (rss_budget_mb or DEFAULT_RSS_BUDGET_MB) * 1024 ** 2
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.adaptive = adaptive and not replay
+        self.layout = layout
+        self.state_path = state_path
+        self.log_path = log_path
+        self.replay = list(replay) if replay else None
+        self.clock = clock
+        self.rss = rss
+
+        remembered = self._remembered()
+        self.rows = self.replay[0] if self.replay else (remembered or initial_rows)
+        self.step = FINE_STEP if remembered else COARSE_STEP
+        self.direction = 1
+        self.best_rows = self.rows
+        self.best_rate = 0.0
+        self.converged = not self.adaptive
+        self.rss_growth = 0
+        self.largest_chunk = 0
+        self.baseline_rss = rss()
+        self.decisions: List[Dict] = []
+        self._last_tick: Optional[float] = None
+        if self.log_path:
+            open(self.log_path, 'w').close()  # One log per load
+
+    @classmethod
+    def for_file(cls, file_path: str, initial_rows: int = 25000, **kwargs) -> 'ChunkSizer':
+        """Sizer remembering its best size per layout, logging next to the file"""
+        kwargs.setdefault('layout', layout_key(file_path))
+        kwargs.setdefault('state_path', sizes_path_for(file_path))
+        kwargs.setdefault('log_path', chunk_log_path_for(file_path))
+        return cls(initial_rows, **kwargs)
+
+    @classmethod
+    def from_log(cls, log_path: str, **kwargs) -> 'ChunkSizer':
+        """Replays the chunk sizes of a logged load, in order"""
+        return cls(replay=[decision['rows'] for decision in read_chunk_log(log_path)], **kwargs)
+
+    def _remembered(self) -> Optional[int]:
+        if not (self.adaptive and self.layout and self.state_path and os.path.exists(self.state_path)):
+            return None
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f).get(self.layout)
+
+    def __call__(self) -> int:
+        if self._last_tick is None:
+            self._last_tick = self.clock()
+        return self.rows
+
+    @property
+    def bytes_per_row(self) -> float:
+        """RSS high-water growth over the largest chunk - freed memory is rarely returned to the OS"""
+        return self.rss_growth / self.largest_chunk if self.largest_chunk else 0.0
+
+    @property
+    def memory_cap(self) -> int:
+        """Most rows a chunk may hold within the RSS budget"""
+        if not self.bytes_per_row or self.baseline_rss is None:
+            return self.max_rows
+        free = max(self.rss_budget * BUDGET_HEADROOM - self.baseline_rss, 0)
+        return max(self.min_rows, int(free / self.bytes_per_row))
+
+    def _clamp(self, rows: float) -> int:
+        return min(max(_quantize(rows), self.min_rows), self.max_rows, self.memory_cap)
+
+    def chunk_done(self, rows: int, stage_seconds: Optional[Dict[str, float]] = None) -> int:
+        """Record a finished chunk and return the size of the next one"""
+        now = self.clock()
+        seconds = now - (self._last_tick if self._last_tick is not None else now)
+        self._last_tick = now
+        rate = rows / seconds if seconds > 0 else 0.0
+        rss = self.rss()
+        if rss is not None and self.baseline_rss is not None:
+            self.rss_growth = max(self.rss_growth, rss - self.baseline_rss)
+            self.largest_chunk = max(self.largest_chunk, rows)
+
+        chunk_rows = self.rows
+        reason = self._next_size(rows, rate, rss)
+        decision = {
+            'chunk': len(self.decisions) + 1,
+            'rows': chunk_rows,
+            'rows_read': rows,
+            'seconds': round(seconds, 4),
+            'rows_per_sec': round(rate, 1),
+            'rss_mb': round(rss / 1024 ** 2, 1) if rss is not None else None,
+            'next_rows': self.rows,
+            'reason': reason,
+        }
+        if stage_seconds:
+            decision['stage_rows_per_sec'] = {stage: round(rows / value, 1)
+                                              for stage, value in stage_seconds.items() if value > 0}
+        if self.layout:
+            decision['layout'] = self.layout
+        self.decisions.append(decision)
+        if self.log_path:
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(decision) + '\n')
+        return self.rows
+
+    def _next_size(self, rows: int, rate: float, rss: Optional[int]) -> str:
+        if self.replay:
+            self.rows = self.replay[min(len(self.decisions) + 1, len(self.replay) - 1)]
+            return 'replay'
+        if rss is not None and rss > self.rss_budget:
+            self.rows = self.best_rows = max(self.min_rows, _quantize(self.rows / 2))
+            return 'over_budget'
+        if not self.adaptive:
+            return 'fixed'
+        if len(self.decisions) < WARMUP_CHUNKS:
+            return 'warmup'
+        if rows < self.rows * 0.9:
+            return 'short_chunk'  # End of file or quarantined lines - not a fair measurement
+        if self.converged:
+            self.rows = min(self.best_rows, self.memory_cap)
+            return 'converged'
+
+        if rate > self.best_rate * (1 + RATE_TOLERANCE):
+            self.best_rows, self.best_rate = self.rows, rate
+            reason = 'faster'
+        else:
+            self.direction = -self.direction
+            self.step = math.sqrt(self.step)
+            reason = 'slower'
+        candidate = self._clamp(self.best_rows * self.step ** self.direction)
+        if candidate == self.best_rows:  # Against a bound - search the other side
+            self.direction = -self.direction
+            candidate = self._clamp(self.best_rows * self.step ** self.direction)
+        if self.step < MIN_STEP or candidate == self.best_rows:
+            self.converged = True
+            self.rows = min(self.best_rows, self.memory_cap)
+            self.save()
+            return 'converged'
+        self.rows = candidate
+        return reason
+
+    def save(self) -> None:
+        """Remember the best size for this layout (adaptive sizers with a state file only)"""
+        if not (self.adaptive and self.layout and self.state_path and self.best_rate):
+            return
+        state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        state[self.layout] = self.best_rows
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def describe(self) -> str:
+        """Latest decision, for the per-chunk progress line"""
+        if not self.decisions:
+            return f"{self.rows:,} rows"
+        decision = self.decisions[-1]
+        return (f"{decision['rows']:,} rows at {decision['rows_per_sec']:,.0f} rows/s -> "
+                f"next {decision['next_rows']:,} ({decision['reason']})")
+
+    def summary(self) -> str:
+        if self.replay:
+            return f"replayed {len(self.decisions)} logged chunk sizes"
+        if not self.adaptive:
+            return f"fixed {self.rows:,} rows"
+        state = 'converged on' if self.converged else 'still searching, best so far'
+        cap = f", RSS cap {self.memory_cap:,} rows" if self.memory_cap < self.max_rows else ''
+        return (f"{state} {self.best_rows:,} rows ({self.best_rate:,.0f} rows/s) after "
+                f"{len(self.decisions)} chunks{cap}")
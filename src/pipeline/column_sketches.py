@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+DataNest Streaming Column Sketches
+Per-column profiles updated chunk by chunk during loading: null rate, min/max,
+HyperLogLog distinct estimate, top-k frequent values (Misra-Gries) and a length histogram.
+
+Every sketch is mergeable, so profiles from parallel workers or several delivery files
+combine exactly as if the data had been streamed through one sketch. Profiles are
+persisted next to the source file as <file>.profile.json.
+"""
+
+import base64
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+PROFILE_SUFFIX = '.profile.json'
+PROFILE_VERSION = 1
+
+# Length histogram buckets: 0, 1, 2-3, 4-7, ... (bit length of the string length), capped
+LENGTH_BUCKETS = 17
+
+
+class HyperLogLog:
+    """HyperLogLog over 64-bit hashes (2^p registers, ~1.04/sqrt(2^p) relative error)"""
+
+    def __init__(self, p: int = 12, registers: Optional[np.ndarray] = None):
+        if not 11 <= p <= 18:
+            raise ValueError(f"HyperLogLog precision must be 11-18, got {p}")
+        self.p = p
+        self.m = 1 << p
+        self.registers = registers if registers is not None else np.zeros(self.m, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        remainder = hashes & np.uint64((1 << (64 - self.p)) - 1)
+        # frexp exponent == bit length (exact: remainder < 2^53 for p >= 11)
+        bit_length = np.frexp(remainder.astype(np.float64))[1]
+        rank = ((64 - self.p) - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog p={other.p} into p={self.p}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m * self.m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            return int(round(self.m * np.log(self.m / zeros)))  # Linear counting for small sets
+        return int(round(raw))
+
+    def to_dict(self) -> Dict:
+        return {'p': self.p, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HyperLogLog':
+        registers = np.frombuffer(base64.b64decode(data['registers']), dtype=np.uint8).copy()
+        return cls(p=data['p'], registers=registers)
+
+
+class FrequentValues:
+    """Misra-Gries heavy hitters: counts are underestimated by at most `error`"""
+
+    def __init__(self, capacity: int = 64, counts: Optional[Dict[str, int]] = None, error: int = 0):
+        self.capacity = capacity
+        self.counts = counts or {}
+        self.error = error
+
+    def add_chunk(self, values: np.ndarray, counts: np.ndarray) -> None:
+        """Summarize one chunk from its distinct values and their counts, and fold it in"""
+        cut = 0
+        if len(counts) > self.capacity:
+            cut = int(np.partition(counts, len(counts) - self.capacity - 1)[len(counts) - self.capacity - 1])
+            keep = counts > cut
+            values, counts = values[keep], counts[keep]
+            self.error += cut
+        self.add_counts({str(value): int(count) - cut for value, count in zip(values, counts)})
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        for value, count in counts.items():
+            self.counts[value] = self.counts.get(value, 0) + int(count)
+        self._prune()
+
+    def merge(self, other: 'FrequentValues') -> None:
+        self.error += other.error
+        self.add_counts(other.counts)
+
+    def _prune(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        ordered = sorted(self.counts.values(), reverse=True)
+        cut = ordered[self.capacity]
+        self.error += cut
+        self.counts = {value: count - cut for value, count in self.counts.items() if count > cut}
+
+    def top(self, k: int = 10) -> List[tuple]:
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def to_dict(self) -> Dict:
+        return {'capacity': self.capacity, 'counts': self.counts, 'error': self.error}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'FrequentValues':
+        return cls(capacity=data['capacity'], counts=dict(data['counts']), error=data['error'])
+
+
+class ColumnSketch:
+    """All per-column sketches for one column"""
+
+    def __init__(self, hll_precision: int = 12, topk_capacity: int = 64):
+        self.count = 0
+        self.null_count = 0
+        self.min = None
+        self.max = None
+        self.numeric = None
+        self.hll = HyperLogLog(hll_precision)
+        self.frequent = FrequentValues(topk_capacity)
+        self.length_histogram = np.zeros(LENGTH_BUCKETS, dtype=np.int64)
+
+    def update(self, series: pd.Series) -> None:
+        """Fold in a chunk: one factorize pass over the rows, every sketch on the distinct values"""
+        self.count += len(series)
+        codes, distinct = pd.factorize(series, use_na_sentinel=True)
+        counts = np.bincount(codes[codes >= 0], minlength=len(distinct))
+        present = pd.Series(distinct)
+        if not pd.api.types.is_numeric_dtype(present.dtype):
+            keep = (present != '').to_numpy(dtype=bool)
+            present, counts = present[keep].reset_index(drop=True), counts[keep]
+        self.null_count += len(series) - int(counts.sum())
+        if len(present) == 0:
+            return
+
+        is_numeric = pd.api.types.is_numeric_dtype(present.dtype)
+        if self.numeric is None:
+            self.numeric = is_numeric
+        if is_numeric and self.numeric:
+            self._update_range(float(present.min()), float(present.max()))
+        else:
+            self.numeric = False
+            present = present.astype(str)
+            self._update_range(present.min(), present.max())
+            # Length histogram only means something for text values
+            lengths = present.str.len().to_numpy(dtype=np.float64)
+            buckets = np.minimum(np.frexp(lengths)[1], LENGTH_BUCKETS - 1)
+            self.length_histogram += np.bincount(buckets, weights=counts, minlength=LENGTH_BUCKETS).astype(np.int64)
+
+        # Duplicates never change HyperLogLog registers, so hashing the distinct values is enough
+        self.hll.add_hashes(pd.util.hash_pandas_object(present, index=False, categorize=False).to_numpy())
+        self.frequent.add_chunk(present.to_numpy(), counts)
+
+    def _update_range(self, minimum, maximum) -> None:
+        try:
+            self.min = minimum if self.min is None else min(self.min, minimum)
+            self.max = maximum if self.max is None else max(self.max, maximum)
+        except TypeError:
+            # Numeric chunks followed by text chunks - compare as text from here on
+            self.min = min(str(self.min), str(minimum))
+            self.max = max(str(self.max), str(maximum))
+
+    def merge(self, other: 'ColumnSketch') -> None:
+        self.count += other.count
+        self.null_count += other.null_count
+        if other.min is not None:
+            self._update_range(other.min, other.max)
+        if other.numeric is not None:
+            self.numeric = other.numeric if self.numeric is None else (self.numeric and other.numeric)
+        self.hll.merge(other.hll)
+        self.frequent.merge(other.frequent)
+        self.length_histogram += other.length_histogram
+
+    @property
+    def null_rate(self) -> float:
+        return self.null_count / self.count if self.count else 0.0
+
+    def summary(self, top_k: int = 5) -> Dict:
+        return {
+            'count': self.count,
+            'null_rate': round(self.null_rate, 6),
+            'min': self.min,
+            'max': self.max,
+            'distinct_estimate': self.hll.estimate(),
+            'top_values': self.frequent.top(top_k),
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'null_count': self.null_count,
+            'min': self.min,
+            'max': self.max,
+            'numeric': self.numeric,
+            'hll': self.hll.to_dict(),
+            'frequent': self.frequent.to_dict(),
+            'length_histogram': self.length_histogram.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ColumnSketch':
+        sketch = cls()
+        sketch.count = data['count']
+        sketch.null_count = data['null_count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.numeric = data['numeric']
+        sketch.hll = HyperLogLog.from_dict(data['hll'])
+        sketch.frequent = FrequentValues.from_dict(data['frequent'])
+        sketch.length_histogram = np.array(data['length_histogram'], dtype=np.int64)
+        return sketch
+
+
+class TableProfile:
+    """Column sketches for a stream of DataFrame chunks"""
+
+    def __init__(self, source: Optional[str] = None, hll_precision: int = 12, topk_capacity: int = 64):
+        self.sources = [source] if source else []
+        self.hll_precision = hll_precision
+        self.topk_capacity = topk_capacity
+        self.rows = 0
+        self.columns: Dict[str, ColumnSketch] = {}
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnSketch(self.hll_precision, self.topk_capacity)
+            self.columns[column].update(chunk[column])
+
+    def merge(self, other: 'TableProfile') -> None:
+        self.rows += other.rows
+        self.sources += other.sources
+        for column, sketch in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(sketch)
+            else:
+                self.columns[column] = sketch
+
+    def summary(self, top_k: int = 5) -> Dict[str, Dict]:
+        return {column: sketch.summary(top_k) for column, sketch in self.columns.items()}
+
+    def save(self, path: str) -> None:
+        data = {
+            'version': PROFILE_VERSION,
+            'sources': self.sources,
+            'rows': self.rows,
+            'hll_precision': self.hll_precision,
+            'topk_capacity': self.topk_capacity,
+            'columns': {column: sketch.to_dict() for column, sketch in self.columns.items()},
+        }
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, default=_json_default)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TableProfile':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        profile = cls(hll_precision=data['hll_precision'], topk_capacity=data['topk_capacity'])
+        profile.sources = data['sources']
+        profile.rows = data['rows']
+        profile.columns = {column: ColumnSketch.from_dict(sketch) for column, sketch in data['columns'].items()}
+        return profile
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Not JSON serializable: {type(value)}")
+
+
+def profile_path_for(file_path: str) -> str:
+    return file_path + PROFILE_SUFFIX
+
+
+def load_profile_for(file_path: str) -> Optional[TableProfile]:
+    """Persisted profile for a delivery file, if the loader has produced one"""
+    path = profile_path_for(file_path)
+    return TableProfile.load(path) if os.path.exists(path) else None
+
+
+def merge_profiles(paths: Iterable[str]) -> TableProfile:
+    merged = None
+    for path in paths:
+        profile = TableProfile.load(path)
+        if merged is None:
+            merged = profile
+        else:
+            merged.merge(profile)
+    return merged if merged is not None else TableProfile()
+
+
+def print_profile(profile: TableProfile, columns: Optional[Iterable[str]] = None, top_k: int = 5) -> None:
+    print(f"📊 Profile: {profile.rows:,} rows, {len(profile.columns)} columns "
+          f"from {len(profile.sources)} source(s)")
+    for column in (columns or profile.columns):
+        if column not in profile.columns:
+            print(f"   ❌ {column}: not profiled")
+            continue
+        summary = profile.columns[column].summary(top_k)
+        top = ', '.join(f"{value}={count:,}" for value, count in summary['top_values'])
+        print(f"   📋 {column}: {100 * (1 - summary['null_rate']):.1f}% populated, "
+              f"~{summary['distinct_estimate']:,} distinct, range [{summary['min']} .. {summary['max']}]")
+        if top:
+            print(f"      🔝 {top}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import csv
+
+    parser = argparse.ArgumentParser(description="Build, merge or show streaming column profiles")
+    parser.add_argument("paths", nargs='+', help="TSV file(s) to profile, or .profile.json files with --show/--merge")
+    parser.add_argument("--show", action="store_true", help="Print existing profiles")
+    parser.add_argument("--merge", help="Merge the given profiles into this output path")
+    parser.add_argument("--columns", nargs='*', help="Only print these columns")
+    parser.add_argument("--chunksize", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.merge:
+        merged = merge_profiles(args.paths)
+        merged.save(args.merge)
+        print(f"✅ Merged {len(args.paths)} profiles into {args.merge}")
+        print_profile(merged, args.columns)
+    elif args.show:
+        for path in args.paths:
+            print_profile(TableProfile.load(path), args.columns)
+    else:
+        csv.field_size_limit(2147483647)
+        for path in args.paths:
+            print(f"🔍 Profiling {os.path.basename(path)} (full pass)...")
+            profile = TableProfile(source=os.path.basename(path))
+            for chunk in pd.read_csv(path, sep='\t', dtype=str, chunksize=args.chunksize, encoding='utf-8',
+                                     engine='python', quoting=csv.QUOTE_NONE, on_bad_lines='skip'):
+                profile.update(chunk)
+            profile.save(profile_path_for(path))
+            print(f"✅ Saved {profile_path_for(path)}")
+            print_profile(profile, args.columns)
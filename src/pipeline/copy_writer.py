@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+DataNest COPY Writer
+Loads a chunk's COPY text in a savepoint and bisects it when Postgres rejects a row.
+
+A failed COPY used to cost the whole 25k-row chunk (and a recovery run). Here a failing
+batch is rolled back to its savepoint and retried in halves until only the offending rows
+are left; those go to datnest.load_rejects (migration 020) with the Postgres error.
+When the error names the failing line ("COPY properties, line N") the batch is split around
+that line instead, so each bad row costs about three extra COPYs.
+
+sort_for_locality() orders a chunk by (fips_code, apn) before its COPY text is built, so
+consecutive heap pages hold neighbouring parcels and the BRIN indexes (migration 021) stay
+narrow.
+"""
+
+import io
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+# SQLSTATE classes that mean "this row is bad": 22 data exception, 23 constraint violation.
+# Anything else (connection lost, missing table) is re-raised to the caller.
+ROW_ERROR_CLASSES = ('22', '23')
+
+DEFAULT_MAX_REJECTS = 500
+SAVEPOINT_NAME = 'copy_batch'
+LOCALITY_KEYS = ('fips_code', 'apn')
+
+_COPY_LINE = re.compile(r'COPY \S+, line (\d+)')
+
+
+class RejectedRow(NamedTuple):
+    """A line Postgres refused on its own; row_number is 1-based within the chunk"""
+    row_number: int
+    raw_row: str
+    sqlstate: Optional[str]
+    error: str
+
+
+class CopyResult(NamedTuple):
+    loaded: int
+    rejects: List[RejectedRow]
+    copies: int
+
+
+class RejectLimitExceeded(Exception):
+    """More rows rejected than max_rejects - the chunk is systematically wrong, not dirty"""
+
+
+def is_row_error(exc: Exception) -> bool:
+    """True when a COPY error is about the data (worth bisecting), not the connection or schema"""
+    pgcode = getattr(exc, 'pgcode', None)
+    return bool(pgcode) and pgcode[:2] in ROW_ERROR_CLASSES
+
+
+def error_line(exc: Exception) -> Optional[int]:
+    """1-based line of the batch named in the COPY error context, if Postgres reported one"""
+    diag = getattr(exc, 'diag', None)
+    context = getattr(diag, 'context', None) or str(exc)
+    match = _COPY_LINE.search(context)
+    return int(match.group(1)) if match else None
+
+
+def _error_text(exc: Exception) -> str:
+    diag = getattr(exc, 'diag', None)
+    primary = getattr(diag, 'message_primary', None)
+    if not primary:
+        text = str(exc).strip()
+        primary = text.splitlines()[0] if text else repr(exc)
+    return primary[:1000]
+
+
+class _Bisector:
+    def __init__(self, cursor, table: str, columns: Sequence[str], sep: str, null: str,
+                 max_rejects: Optional[int]):
+        self.cursor = cursor
+        self.table = table
+        self.columns = tuple(columns)
+        self.sep = sep
+        self.null = null
+        self.max_rejects = max_rejects
+        self.loaded = 0
+        self.copies = 0
+        self.rejects: List[RejectedRow] = []
+
+    def copy(self, text: str, rows: int) -> Optional[Exception]:
+        """One COPY inside a savepoint; returns the row error, or None on success"""
+        self.cursor.execute(f"SAVEPOINT {SAVEPOINT_NAME}")
+        self.copies += 1
+        try:
+            self.cursor.copy_from(io.StringIO(text), self.table, columns=self.columns,
+                                  sep=self.sep, null=self.null)
+        except Exception as e:
+            if not is_row_error(e):
+                raise
+            self.cursor.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT_NAME}")
+            self.cursor.execute(f"RELEASE SAVEPOINT {SAVEPOINT_NAME}")
+            return e
+        self.cursor.execute(f"RELEASE SAVEPOINT {SAVEPOINT_NAME}")
+        self.loaded += rows
+        return None
+
+    def load(self, lines: List[str], first_row: int, error: Optional[Exception] = None):
+        """Load lines (first_row = chunk row number of lines[0]); error = known failure of this batch"""
+        if not lines:
+            return
+        if error is None:
+            error = self.copy('\n'.join(lines) + '\n', len(lines))
+            if error is None:
+                return
+
+        if len(lines) == 1:
+            self.rejects.append(RejectedRow(first_row, lines[0], getattr(error, 'pgcode', None),
+                                            _error_text(error)))
+            if self.max_rejects is not None and len(self.rejects) > self.max_rejects:
+                raise RejectLimitExceeded(
+                    f"{len(self.rejects)} rows rejected from {self.table} (limit {self.max_rejects}); "
+                    f"last error: {_error_text(error)}")
+            return
+
+        line = error_line(error)
+        if line is not None and 1 <= line <= len(lines):
+            # Rows before the named line parsed and inserted fine; retry the suspect alone
+            self.load(lines[:line - 1], first_row)
+            self.load(lines[line - 1:line], first_row + line - 1)
+            self.load(lines[line:], first_row + line)
+        else:
+            middle = len(lines) // 2
+            self.load(lines[:middle], first_row)
+            self.load(lines[middle:], first_row + middle)
+
+
+def copy_with_bisection(cursor, table: str, columns: Sequence[str], text: str, sep: str = '\t',
+                        null: str = '\\N', max_rejects: Optional[int] = DEFAULT_MAX_REJECTS) -> CopyResult:
+    """COPY text (one row per line) into table, bisecting around rows Postgres rejects
+
+    Runs inside the caller's transaction - the caller commits. The happy path is a single
+    COPY plus a savepoint. Raises RejectLimitExceeded past max_rejects (None = unlimited)
+    and re-raises errors that are not about row data.
+    """
+    bisector = _Bisector(cursor, table, columns, sep, null, max_rejects)
+    row_total = text.count('\n') + (0 if not text or text.endswith('\n') else 1)
+    error = bisector.copy(text, row_total)
+    if error is not None:
+        lines = text.split('\n')
+        if lines and lines[-1] == '':
+            lines.pop()
+        bisector.load(lines, 1, error)
+    return CopyResult(bisector.loaded, bisector.rejects, bisector.copies)
+
+
+def sort_for_locality(frame, keys: Sequence[str] = LOCALITY_KEYS):
+    """The chunk's rows in key order (stable, NULL keys last) - rejects still map by position"""
+    keys = [key for key in keys if key in frame.columns]
+    if not keys or len(frame) < 2:
+        return frame
+    return frame.sort_values(keys, kind='stable', na_position='last', ignore_index=True)
+
+
+def record_rejects(cursor, rejects: Sequence[RejectedRow], table: str, source_file: Optional[str] = None,
+                   chunk_num: Optional[int] = None, audit_id: Optional[int] = None):
+    """Insert rejected rows into datnest.load_rejects (same transaction as the COPY)"""
+    if not rejects:
+        return
+    cursor.executemany("""
+        INSERT INTO datnest.load_rejects
+            (audit_id, table_name, source_file, chunk_num, row_number, sqlstate, error_message, raw_row)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """, [(audit_id, table, source_file, chunk_num, reject.row_number, reject.sqlstate,
+           reject.error, reject.raw_row) for reject in rejects])
+
+
+def describe_rejects(rejects: Sequence[RejectedRow], limit: int = 3) -> List[str]:
+    """Short printable lines for the first few rejects"""
+    return [f"row {reject.row_number}: [{reject.sqlstate}] {reject.error[:150]}" for reject in rejects[:limit]]
@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+DataNest TSV Line-Offset Index
+One pass over an OpenLien TSV records the byte offset of every K-th data row, the exact
+row count and a CRC32 of the file in a small sidecar (<file>.lineidx.npz).
+
+With the sidecar any tool can seek straight to "chunk N" or an arbitrary row range
+(at most K-1 lines are skipped after the seek) and get exact row counts without
+rescanning a multi-GB file. The sidecar is trusted only while the file's size and
+mtime match what was indexed; a stale sidecar is rebuilt.
+
+The same pass records FIPS runs: for each stretch of consecutive rows with the same
+FIPS_Code, its first row, row count and byte range. Delivery files are roughly sorted by
+FIPS, so "which files hold state X" and a state-only reload become a handful of
+byte-range reads instead of sampling or full scans (files_for_state / read_state).
+
+Rows are physical lines after the header. pandas' on_bad_lines='skip' chunking counts
+rows after dropping malformed lines, so chunk boundaries only match when none are bad.
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+import zlib
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.tsv_reader import parse_tsv_bytes
+
+INDEX_SUFFIX = '.lineidx.npz'
+INDEX_VERSION = 2
+DEFAULT_STRIDE = 10000
+SCAN_BLOCK_BYTES = 64 * 1024 * 1024
+FIPS_COLUMN = 'FIPS_Code'
+FIPS_WIDTH = 5
+
+
+def index_path_for(file_path: str) -> str:
+    return file_path + INDEX_SUFFIX
+
+
+class FipsRun(NamedTuple):
+    fips: str
+    first_row: int
+    row_count: int
+    start_byte: int
+    end_byte: int
+
+
+class LineIndex:
+    """Every-`stride`-th data row offset, FIPS runs, row count and checksum for one TSV"""
+
+    def __init__(self, path: str, offsets: np.ndarray, total_rows: int, stride: int, header: List[str],
+                 file_size: int, mtime_ns: int, crc32: int, fips_runs: Optional[List[FipsRun]] = None):
+        self.path = path
+        self.offsets = offsets
+        self.total_rows = total_rows
+        self.stride = stride
+        self.header = header
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+        self.crc32 = crc32
+        self.fips_runs = fips_runs or []
+
+    def is_current(self) -> bool:
+        """File unchanged since indexing (size and mtime)"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return False
+        return stat.st_size == self.file_size and stat.st_mtime_ns == self.mtime_ns
+
+    def verify_checksum(self) -> bool:
+        """Full re-read comparing CRC32 (for files copied with preserved mtimes)"""
+        crc = 0
+        with open(self.path, 'rb') as f:
+            for block in iter(lambda: f.read(SCAN_BLOCK_BYTES), b''):
+                crc = zlib.crc32(block, crc)
+        return crc == self.crc32
+
+    def _row_offset(self, data: mmap.mmap, row: int) -> int:
+        if row >= self.total_rows:
+            return self.file_size
+        offset = int(self.offsets[row // self.stride])
+        for _ in range(row % self.stride):
+            offset = data.find(b'\n', offset) + 1
+        return offset
+
+    def byte_range(self, start_row: int, stop_row: int) -> Tuple[int, int]:
+        """[start, end) byte range of data rows start_row..stop_row-1"""
+        if start_row < 0 or stop_row < start_row:
+            raise ValueError(f"Invalid row range {start_row}:{stop_row}")
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                start = self._row_offset(data, start_row)
+                if stop_row // self.stride == start_row // self.stride and stop_row < self.total_rows:
+                    # Same stride block: continue from start instead of re-seeking
+                    end = start
+                    for _ in range(stop_row - start_row):
+                        end = data.find(b'\n', end) + 1
+                else:
+                    end = self._row_offset(data, stop_row)
+        return start, end
+
+    def read_bytes(self, start_row: int, stop_row: int) -> bytes:
+        start, end = self.byte_range(start_row, stop_row)
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    def read_rows(self, start_row: int, stop_row: int, columns: Optional[Sequence[str]] = None,
+                  sanitizer: Optional[Callable[[bytes], bytes]] = None) -> pd.DataFrame:
+        """Data rows start_row..stop_row-1 parsed the way the loaders read TSVs"""
+        body = self.read_bytes(start_row, stop_row)
+        if sanitizer is not None:
+            body = sanitizer(body)
+        return parse_tsv_bytes(body, self.header, usecols=columns)
+
+    def read_chunk(self, chunk_num: int, chunk_size: int, columns: Optional[Sequence[str]] = None,
+                   sanitizer: Optional[Callable[[bytes], bytes]] = None) -> pd.DataFrame:
+        """1-based chunk N of chunk_size rows, as numbered by the chunked loaders"""
+        start_row = (chunk_num - 1) * chunk_size
+        return self.read_rows(start_row, min(start_row + chunk_size, self.total_rows), columns=columns,
+                              sanitizer=sanitizer)
+
+    def chunk_count(self, chunk_size: int) -> int:
+        return -(-self.total_rows // chunk_size)
+
+    def runs_for(self, fips_prefix: str) -> List[FipsRun]:
+        """FIPS runs whose code starts with a state ('01') or county ('01073') prefix"""
+        return [run for run in self.fips_runs if run.fips.startswith(fips_prefix)]
+
+    def fips_row_counts(self, width: int = 2) -> Dict[str, int]:
+        """Rows per state (width=2) or county (width=5) without reading any data"""
+        counts = {}
+        for run in self.fips_runs:
+            key = run.fips[:width]
+            counts[key] = counts.get(key, 0) + run.row_count
+        return counts
+
+    def byte_ranges_for(self, fips_prefix: str) -> List[Tuple[int, int]]:
+        """Merged [start, end) byte ranges holding every row of a state or county"""
+        ranges = []
+        for run in self.runs_for(fips_prefix):
+            if ranges and ranges[-1][1] == run.start_byte:
+                ranges[-1] = (ranges[-1][0], run.end_byte)
+            else:
+                ranges.append((run.start_byte, run.end_byte))
+        return ranges
+
+    def read_fips(self, fips_prefix: str, columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """DataFrames of the rows for a state or county, one per contiguous byte range"""
+        with open(self.path, 'rb') as f:
+            for start, end in self.byte_ranges_for(fips_prefix):
+                f.seek(start)
+                yield parse_tsv_bytes(f.read(end - start), self.header, usecols=columns)
+
+    def save(self, index_path: Optional[str] = None) -> str:
+        index_path = index_path or index_path_for(self.path)
+        meta = {
+            'version': INDEX_VERSION,
+            'total_rows': self.total_rows,
+            'stride': self.stride,
+            'header': self.header,
+            'file_size': self.file_size,
+            'mtime_ns': self.mtime_ns,
+            'crc32': self.crc32,
+        }
+        tmp_path = index_path + '.tmp.npz'
+        runs = self.fips_runs
+        np.savez(tmp_path, offsets=self.offsets, meta=np.array(json.dumps(meta)),
+                 fips_codes=np.array([run.fips for run in runs], dtype=f'U{FIPS_WIDTH}'),
+                 fips_positions=np.array([run[1:] for run in runs], dtype=np.int64).reshape(-1, 4))
+        os.replace(tmp_path, index_path)
+        return index_path
+
+    @classmethod
+    def load(cls, file_path: str, index_path: Optional[str] = None) -> 'LineIndex':
+        with np.load(index_path or index_path_for(file_path), allow_pickle=False) as npz:
+            meta = json.loads(str(npz['meta']))
+            if meta.get('version') != INDEX_VERSION:
+                raise ValueError(f"Unsupported line index version {meta.get('version')}")
+            offsets = npz['offsets']
+            runs = [FipsRun(str(code), *map(int, position))
+                    for code, position in zip(npz['fips_codes'], npz['fips_positions'])]
+        return cls(file_path, offsets, meta['total_rows'], meta['stride'], meta['header'],
+                   meta['file_size'], meta['mtime_ns'], meta['crc32'], fips_runs=runs)
+
+
+def _field_values(buffer: bytes, data: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  column: int, width: int, window: int = 64) -> np.ndarray:
+    """Column `column` of every line (first `width` bytes) as a bytes array, b'' when missing.
+
+    Only the first `window` bytes of each line are examined (the FIPS column is near the
+    front); lines whose field is not inside that window fall back to a plain split.
+    """
+    positions = starts[:, None] + np.arange(window)
+    inside = positions < ends[:, None]
+    head = np.where(inside, data[np.minimum(positions, len(data) - 1)], 0)
+    is_tab = head == 9
+    tab_rank = np.cumsum(is_tab, axis=1)
+    in_field = (tab_rank == column) & ~is_tab & inside
+    field_start = np.argmax(in_field, axis=1)
+    field_length = in_field.sum(axis=1)
+    # Field complete when the next tab or the line end falls inside the window
+    complete = (tab_rank[:, -1] > column) | ~inside[:, -1]
+
+    picks = np.minimum(field_start[:, None] + np.arange(width), window - 1)
+    values = np.take_along_axis(head, picks, axis=1)
+    values[np.arange(width)[None, :] >= np.minimum(field_length, width)[:, None]] = 0
+    values[values == 13] = 0  # Stray carriage return in a final field
+    codes = np.ascontiguousarray(values, dtype=np.uint8).view(f'S{width}').ravel()
+
+    for i in np.flatnonzero(~complete).tolist():
+        fields = buffer[int(starts[i]):int(ends[i])].split(b'\t')
+        codes[i] = fields[column][:width].rstrip(b'\r') if len(fields) > column else b''
+    return codes
+
+
+def _add_runs(runs: List[List], codes: np.ndarray, first_row: int, starts: np.ndarray, ends: np.ndarray) -> None:
+    """Append run-length FIPS runs for consecutive lines, extending the open run"""
+    if len(codes) == 0:
+        return
+    change = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    run_starts = np.r_[0, change]
+    run_ends = np.r_[change, len(codes)]
+    for begin, end in zip(run_starts.tolist(), run_ends.tolist()):
+        code = codes[begin].decode('ascii', errors='replace').strip()
+        start_byte, end_byte = int(starts[begin]), int(ends[end - 1]) + 1
+        if runs and runs[-1][0] == code and runs[-1][4] == start_byte:
+            runs[-1][2] += end - begin
+            runs[-1][4] = end_byte
+        else:
+            runs.append([code, first_row + begin, end - begin, start_byte, end_byte])
+
+
+def build_line_index(file_path: str, stride: int = DEFAULT_STRIDE) -> LineIndex:
+    """One sequential pass: newline, tab and FIPS positions found with numpy, block by block"""
+    stat = os.stat(file_path)
+    offsets = []
+    runs = []
+    crc = 0
+    header = None
+    fips_column = None
+    rows = 0
+    carry = b''
+    position = 0  # File offset of the next block
+
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(SCAN_BLOCK_BYTES), b''):
+            crc = zlib.crc32(block, crc)
+            base = position - len(carry)  # File offset of buffer[0], always a line start
+            buffer = carry + block if carry else block
+            position += len(block)
+            data = np.frombuffer(buffer, dtype=np.uint8)
+            newlines = np.flatnonzero(data == 10)
+            if len(newlines) == 0:
+                carry = buffer
+                continue
+            carry = buffer[int(newlines[-1]) + 1:]
+
+            starts = np.r_[0, newlines[:-1] + 1]
+            ends = newlines
+            if header is None:
+                header = buffer[:int(ends[0])].rstrip(b'\r').decode('utf-8', errors='replace').split('\t')
+                fips_column = header.index(FIPS_COLUMN) if FIPS_COLUMN in header else None
+                starts, ends = starts[1:], ends[1:]
+            _index_lines(buffer, data, base, starts, ends, rows, stride, fips_column, offsets, runs)
+            rows += len(starts)
+
+    if carry:
+        # Final line without a trailing newline (or a header-only file)
+        data = np.frombuffer(carry + b'\n', dtype=np.uint8)
+        if header is None:
+            header = carry.rstrip(b'\r').decode('utf-8', errors='replace').split('\t')
+        elif carry.strip(b'\r'):
+            base = stat.st_size - len(carry)
+            _index_lines(carry + b'\n', data, base, np.array([0]), np.array([len(carry)]),
+                         rows, stride, fips_column, offsets, runs)
+            if runs:
+                runs[-1][4] = min(runs[-1][4], stat.st_size)
+            rows += 1
+
+    offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64)
+    return LineIndex(file_path, offsets, rows, stride, header or [], stat.st_size, stat.st_mtime_ns, crc,
+                     fips_runs=[FipsRun(*run) for run in runs])
+
+
+def _index_lines(buffer: bytes, data: np.ndarray, base: int, starts: np.ndarray, ends: np.ndarray,
+                 first_row: int, stride: int, fips_column: Optional[int], offsets: List, runs: List) -> None:
+    """Record stride offsets and FIPS runs for complete data lines of one buffer"""
+    if len(starts) == 0:
+        return
+    row_numbers = first_row + np.arange(len(starts))
+    offsets.append(starts[row_numbers % stride == 0].astype(np.int64) + base)
+    if fips_column is None:
+        return
+    codes = _field_values(buffer, data, starts, ends, fips_column, FIPS_WIDTH)
+    _add_runs(runs, codes, first_row, starts + base, ends + base)
+
+
+def load_line_index(file_path: str, stride: int = DEFAULT_STRIDE, rebuild: bool = True,
+                    save: bool = True) -> Optional[LineIndex]:
+    """Sidecar index when current, otherwise (optionally) rebuilt and saved"""
+    index_path = index_path_for(file_path)
+    if os.path.exists(index_path):
+        try:
+            index = LineIndex.load(file_path, index_path)
+            if index.is_current():
+                return index
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️  Ignoring unreadable line index {os.path.basename(index_path)}: {e}")
+    if not rebuild:
+        return None
+
+    index = build_line_index(file_path, stride=stride)
+    if save:
+        try:
+            index.save(index_path)
+        except OSError as e:
+            # Read-only delivery directory: the in-memory index still works
+            print(f"⚠️  Could not save line index: {e}")
+    return index
+
+
+def row_count(file_path: str) -> int:
+    """Exact data row count (from the sidecar when current)"""
+    return load_line_index(file_path).total_rows
+
+
+def files_for_state(file_paths: Sequence[str], fips_prefix: str) -> Dict[str, int]:
+    """{file: rows} for every file holding the state/county prefix, from the sidecars"""
+    found = {}
+    for file_path in file_paths:
+        count = sum(run.row_count for run in load_line_index(file_path).runs_for(fips_prefix))
+        if count:
+            found[file_path] = count
+    return found
+
+
+def read_state(file_paths: Sequence[str], fips_prefix: str,
+               columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """Rows for a state/county across all files, reading only the byte ranges that hold them"""
+    for file_path in file_paths:
+        yield from load_line_index(file_path).read_fips(fips_prefix, columns=columns)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python line_index.py <file.tsv> [--rebuild] [--verify] [--rows START STOP] [--states]")
+        sys.exit(1)
+
+    tsv_path = sys.argv[1]
+    start_time = time.time()
+    if '--rebuild' in sys.argv:
+        line_index = build_line_index(tsv_path)
+        line_index.save()
+    else:
+        line_index = load_line_index(tsv_path)
+    elapsed = time.time() - start_time
+
+    print(f"📇 {os.path.basename(tsv_path)}: {line_index.total_rows:,} rows, {len(line_index.header)} columns, "
+          f"{len(line_index.offsets):,} offsets (every {line_index.stride:,} rows) in {elapsed:.1f}s")
+    if '--verify' in sys.argv:
+        print(f"🔐 CRC32 {'✅ matches' if line_index.verify_checksum() else '❌ MISMATCH'}")
+    if '--rows' in sys.argv:
+        i = sys.argv.index('--rows')
+        rows = line_index.read_rows(int(sys.argv[i + 1]), int(sys.argv[i + 2]))
+        print(rows.head(20).to_string())
+    if '--states' in sys.argv:
+        print(f"🗺️  {len(line_index.fips_runs):,} FIPS runs")
+        for state_fips, count in sorted(line_index.fips_row_counts().items()):
+            print(f"   {state_fips or '??'}: {count:,} rows in {len(line_index.byte_ranges_for(state_fips))} byte range(s)")
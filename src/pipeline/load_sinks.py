@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+DataNest Load Sinks
+Where a loader's cleaned chunks go when they should not go to the database.
+
+A dry run (enhanced_production_load(sink='null'|'copy'|'parquet')) runs the whole read,
+sanitize, clean and encode pipeline at full speed with no connection, so its telemetry
+shows the CPU side of a load on its own. Every sink records each chunk's rows, bytes
+and CRC32 of its COPY text in an <output>.json manifest: two runs (before and after
+a change, or a dry run against the COPY text of a database run) are in parity when
+compare_manifests() finds no differing chunk.
+
+    null     nothing written - manifest only
+    copy     the exact COPY text stream (tab separated, \\N for NULL) in <file>.copy;
+             replay_copy_file() loads it later with COPY ... FROM STDIN
+    parquet  one Parquet file per chunk under <file>.sink.parquet/ (pyarrow optional)
+
+The COPY file is COPY's text format, not binary: binary COPY needs every column's exact
+Postgres type (int4 vs int8, numeric), which only the live schema knows.
+"""
+
+import json
+import os
+import sys
+import time
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+# Optional pyarrow import - only needed for the Parquet sink
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+SINK_KINDS = ('null', 'copy', 'parquet')
+MANIFEST_SUFFIX = '.json'
+COPY_SUFFIX = '.copy'
+PARQUET_SUFFIX = '.sink.parquet'
+DEFAULT_TABLE = 'datnest.properties'
+
+
+def sink_output_for(file_path: str, kind: str) -> str:
+    """<file>.null (manifest only), <file>.copy or <file>.sink.parquet/"""
+    return file_path + {'null': '.null', 'copy': COPY_SUFFIX, 'parquet': PARQUET_SUFFIX}[kind]
+
+
+def manifest_path_for(output_path: str) -> str:
+    return output_path.rstrip(os.sep) + MANIFEST_SUFFIX
+
+
+def read_manifest(output_path: str) -> Dict:
+    with open(manifest_path_for(output_path), encoding='utf-8') as f:
+        return json.load(f)
+
+
+class NullSink:
+    """Accepts chunks and only counts them; base of the other sinks"""
+
+    kind = 'null'
+
+    def __init__(self, output_path: str, table: str = DEFAULT_TABLE, source: Optional[str] = None):
+        self.output_path = output_path
+        self.table = table
+        self.source = source
+        self.columns: Optional[List[str]] = None
+        self.chunks: List[Dict] = []
+        self.rows = 0
+        self.bytes = 0
+        self.started = time.time()
+
+    def write(self, chunk_num: int, frame: pd.DataFrame, copy_text: str) -> int:
+        """Take one chunk (its cleaned frame and its COPY text); returns rows written"""
+        data = copy_text.encode('utf-8')
+        if self.columns is None:
+            self.columns = [str(column) for column in frame.columns]
+        elif list(frame.columns) != self.columns:
+            raise ValueError(f"Chunk {chunk_num} columns differ from the first chunk's")
+        self._write(chunk_num, frame, data)
+        self.chunks.append({'chunk': chunk_num, 'rows': len(frame), 'bytes': len(data),
+                            'crc32': zlib.crc32(data)})
+        self.rows += len(frame)
+        self.bytes += len(data)
+        return len(frame)
+
+    def _write(self, chunk_num: int, frame: pd.DataFrame, data: bytes) -> None:
+        pass
+
+    def close(self) -> Dict:
+        """Finish the output and write the manifest; returns it"""
+        self._close()
+        manifest = {
+            'kind': self.kind,
+            'output': os.path.basename(self.output_path),
+            'source': self.source,
+            'table': self.table,
+            'columns': self.columns or [],
+            'format': 'text',
+            'null': '\\N',
+            'rows': self.rows,
+            'bytes': self.bytes,
+            'seconds': round(time.time() - self.started, 3),
+            'chunks': self.chunks,
+        }
+        path = manifest_path_for(self.output_path)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + '.tmp', path)
+        return manifest
+
+    def _close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def summary(self) -> str:
+        return (f"{self.kind} sink: {self.rows:,} rows, {self.bytes / 1024 ** 2:,.1f} MB of COPY text "
+                f"in {len(self.chunks)} chunks")
+
+
+class CopyFileSink(NullSink):
+    """The COPY text of every chunk, appended to one file"""
+
+    kind = 'copy'
+
+    def __init__(self, output_path: str, **kwargs):
+        super().__init__(output_path, **kwargs)
+        self._file = open(output_path, 'wb')
+
+    def _write(self, chunk_num: int, frame: pd.DataFrame, data: bytes) -> None:
+        self._file.write(data)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _arrow_ready(frame: pd.DataFrame) -> pd.DataFrame:
+    """Object columns as float64 when every value is numeric, else strings - never a null type"""
+    typed = {}
+    for column in frame.columns:
+        values = frame[column]
+        if values.dtype != object:
+            continue
+        kind = pd.api.types.infer_dtype(values, skipna=True)
+        if kind in ('floating', 'integer', 'mixed-integer-float', 'decimal'):
+            typed[column] = pd.to_numeric(values).astype('float64')
+        else:
+            typed[column] = values.astype('string')
+    return frame.assign(**typed) if typed else frame
+
+
+class ParquetSink(NullSink):
+    """One Parquet file per chunk - column types can differ where a chunk is all NULL"""
+
+    kind = 'parquet'
+
+    def __init__(self, output_path: str, **kwargs):
+        if not PARQUET_AVAILABLE:
+            raise ImportError("pyarrow is required for the Parquet sink (pip install pyarrow)")
+        super().__init__(output_path, **kwargs)
+        os.makedirs(output_path, exist_ok=True)
+        for name in os.listdir(output_path):
+            if name.startswith('part-') and name.endswith('.parquet'):
+                os.remove(os.path.join(output_path, name))
+
+    def _write(self, chunk_num: int, frame: pd.DataFrame, data: bytes) -> None:
+        table = pa.Table.from_pandas(_arrow_ready(frame), preserve_index=False)
+        pq.write_table(table, os.path.join(self.output_path, f"part-{chunk_num:05d}.parquet"))
+
+
+def make_sink(kind: str, file_path: str, output_path: Optional[str] = None, **kwargs) -> NullSink:
+    """Sink of the given kind writing next to the source file (or to output_path)"""
+    if kind not in SINK_KINDS:
+        raise ValueError(f"sink must be one of {SINK_KINDS}, not {kind!r}")
+    output_path = output_path or sink_output_for(file_path, kind)
+    kwargs.setdefault('source', os.path.basename(file_path))
+    sink_class = {'null': NullSink, 'copy': CopyFileSink, 'parquet': ParquetSink}[kind]
+    return sink_class(output_path, **kwargs)
+
+
+def read_parquet_sink(output_path: str, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """All chunks of a Parquet sink, in chunk order"""
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is required for the Parquet sink (pip install pyarrow)")
+    parts = sorted(name for name in os.listdir(output_path) if name.startswith('part-'))
+    frames = [pq.read_table(os.path.join(output_path, name), columns=columns).to_pandas() for name in parts]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def compare_manifests(first: Dict, second: Dict) -> List[str]:
+    """Differences between two runs' COPY text (columns, then per chunk); empty = parity"""
+    differences = []
+    if first['columns'] != second['columns']:
+        differences.append(f"columns differ: {len(first['columns'])} vs {len(second['columns'])}")
+    for a, b in zip(first['chunks'], second['chunks']):
+        if (a['rows'], a['crc32']) != (b['rows'], b['crc32']):
+            differences.append(f"chunk {a['chunk']}: {a['rows']:,} rows/{a['crc32']:08x} vs "
+                               f"{b['rows']:,} rows/{b['crc32']:08x}")
+    if len(first['chunks']) != len(second['chunks']):
+        differences.append(f"{len(first['chunks'])} chunks vs {len(second['chunks'])}")
+    return differences
+
+
+def replay_copy_file(cursor, copy_path: str, table: Optional[str] = None) -> int:
+    """COPY a copy sink's file into Postgres (same columns, text format); returns rows.
+
+    Runs in the cursor's transaction - the caller commits.
+    """
+    manifest = read_manifest(copy_path)
+    if manifest['kind'] != 'copy':
+        raise ValueError(f"{copy_path} is a {manifest['kind']} sink, not a COPY file")
+    columns = ', '.join(manifest['columns'])
+    with open(copy_path, 'rb') as f:
+        cursor.copy_expert(f"COPY {table or manifest['table']} ({columns}) FROM STDIN "
+                           f"WITH (FORMAT text, NULL '\\N')", f)
+    return manifest['rows']
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay or compare load sink output")
+    parser.add_argument("--replay", metavar="COPY_FILE", help="COPY a copy sink's file into the database")
+    parser.add_argument("--table", help="Target table (default: the one in the manifest)")
+    parser.add_argument("--compare", nargs=2, metavar=("OUTPUT_A", "OUTPUT_B"),
+                        help="Check two sink outputs for COPY text parity")
+    args = parser.parse_args()
+
+    if args.compare:
+        first, second = (read_manifest(path) for path in args.compare)
+        differences = compare_manifests(first, second)
+        if differences:
+            print(f"❌ {len(differences)} difference(s):")
+            for difference in differences[:20]:
+                print(f"   {difference}")
+            sys.exit(1)
+        print(f"✅ Parity: {first['rows']:,} rows in {len(first['chunks'])} chunks identical")
+    elif args.replay:
+        import psycopg2
+
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+        from config import get_db_config
+
+        conn = psycopg2.connect(**get_db_config())
+        cursor = conn.cursor()
+        start = time.time()
+        rows = replay_copy_file(cursor, args.replay, args.table)
+        conn.commit()
+        cursor.close()
+        conn.close()
+        print(f"✅ Replayed {rows:,} rows from {args.replay} in {time.time() - start:.1f}s")
+    else:
+        parser.print_help()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+DataNest Chunk Memory Probe
+Optional per-chunk peak memory and allocation counts for the loaders, via tracemalloc.
+
+Off by default: tracing every allocation slows a load noticeably. When enabled, each
+chunk reports the peak traced bytes while it was processed, the bytes it left behind
+and how many memory blocks it allocated (tracemalloc traces, NumPy buffers included).
+"""
+
+import tracemalloc
+from typing import Dict, List, Optional
+
+
+class MemoryProbe:
+    """probe.start_chunk() ... probe.end_chunk() around each chunk; no-ops when disabled"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.chunks: List[Dict[str, int]] = []
+        self._started_tracing = False
+        self._baseline = 0
+        self._blocks = 0
+
+    def start(self) -> None:
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self) -> 'MemoryProbe':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @staticmethod
+    def _traced_blocks() -> int:
+        return sum(stat.count for stat in tracemalloc.take_snapshot().statistics('filename'))
+
+    def start_chunk(self) -> None:
+        if not self.enabled:
+            return
+        self.start()
+        tracemalloc.reset_peak()
+        self._baseline = tracemalloc.get_traced_memory()[0]
+        self._blocks = self._traced_blocks()
+
+    def end_chunk(self) -> Optional[Dict[str, int]]:
+        """{peak_bytes, retained_bytes, blocks} for the chunk since start_chunk()"""
+        if not self.enabled:
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        stats = {
+            'peak_bytes': peak - self._baseline,
+            'retained_bytes': current - self._baseline,
+            'blocks': self._traced_blocks() - self._blocks,
+        }
+        self.chunks.append(stats)
+        return stats
+
+    @staticmethod
+    def describe(stats: Dict[str, int]) -> str:
+        return (f"peak {stats['peak_bytes'] / 1024 ** 2:,.1f} MB, "
+                f"retained {stats['retained_bytes'] / 1024 ** 2:+,.1f} MB, {stats['blocks']:+,} blocks")
+
+    def summary(self) -> str:
+        if not self.chunks:
+            return "memory probe off"
+        peak = max(stats['peak_bytes'] for stats in self.chunks)
+        mean_peak = sum(stats['peak_bytes'] for stats in self.chunks) / len(self.chunks)
+        return (f"{len(self.chunks)} chunks, peak {peak / 1024 ** 2:,.1f} MB "
+                f"(mean {mean_peak / 1024 ** 2:,.1f} MB per chunk)")
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+DataNest Parquet Conversion Cache
+One-time conversion of an OpenLien TSV (or delivery .zip) into a typed Parquet dataset,
+so schema batches, audits and reloads stop re-parsing 449 text columns every time.
+
+Columns are typed from the data dictionary (INT/BIGINT -> int64, DECIMAL/REAL -> float64,
+YYYYMMDD -> date32, everything else string). The dataset is hive-partitioned by state
+FIPS (state_fips=01/...) and rows are sorted by FIPS_Code inside each file, so row-group
+statistics prune by county too. Readers pick only the columns they need and push state
+filters down to the partition directories.
+
+A _manifest.json records the source size, mtime and CRC32 plus per-column coercion
+counts (values the type could not hold). The cache is reused while the source checksum
+matches. pyarrow is optional: without it the TSV readers are the only path.
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+import zlib
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Optional pyarrow import - only needed for the Parquet cache
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.tsv_reader import read_tsv_chunks
+from utils.data_dictionary import fields_by_header, normalize_name
+
+CACHE_SUFFIX = '.parquet'
+MANIFEST_NAME = '_manifest.json'
+CACHE_VERSION = 1
+PARTITION_COLUMN = 'state_fips'
+FIPS_COLUMN = 'FIPS_Code'
+CONVERT_CHUNK_ROWS = 100000
+ROW_GROUP_ROWS = 50000
+
+INTEGER_TYPES = {'INT', 'BIGINT'}
+FLOAT_TYPES = {'DECIMAL', 'REAL'}
+# Published as VARCHAR(10) but documented as whole dollars (format 9999999999)
+WHOLE_DOLLAR_HEADERS = {'LSale_Price', 'LValid_Price', 'PSale_Price', 'PValid_Price'}
+INT64_LIMIT = 2 ** 63 - 1024  # Stay clear of float64 rounding at the int64 edge
+
+
+def _require_pyarrow() -> None:
+    if not PARQUET_AVAILABLE:
+        raise ImportError("pyarrow is required for the Parquet cache (pip install pyarrow)")
+
+
+def cache_dir_for(source_path: str) -> str:
+    """Dataset directory next to the source: <file>.parquet/"""
+    return source_path + CACHE_SUFFIX
+
+
+def source_checksum(path: str, block_bytes: int = 64 * 1024 * 1024) -> int:
+    """CRC32 of the raw source file (the .zip itself for archives)"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_bytes), b''):
+            crc = zlib.crc32(block, crc)
+    return crc
+
+
+def column_kinds(header: Sequence[str]) -> Dict[str, str]:
+    """TSV header -> 'int', 'float', 'date' or 'string' from the data dictionary"""
+    specs = fields_by_header()
+    kinds = {}
+    for column in header:
+        spec = specs.get(normalize_name(column))
+        if spec is None:
+            kinds[column] = 'string'
+        elif spec.data_type in INTEGER_TYPES or spec.header in WHOLE_DOLLAR_HEADERS:
+            kinds[column] = 'int'
+        elif spec.data_type in FLOAT_TYPES:
+            kinds[column] = 'float'
+        elif spec.data_format == 'YYYYMMDD':
+            kinds[column] = 'date'
+        else:
+            kinds[column] = 'string'
+    return kinds
+
+
+def arrow_schema(kinds: Dict[str, str]):
+    _require_pyarrow()
+    types = {'int': pa.int64(), 'float': pa.float64(), 'date': pa.date32(), 'string': pa.string()}
+    fields = [pa.field(column, types[kind]) for column, kind in kinds.items()]
+    fields.append(pa.field(PARTITION_COLUMN, pa.string()))
+    return pa.schema(fields)
+
+
+def typed_chunk(chunk: pd.DataFrame, kinds: Dict[str, str], coerced: Dict[str, int]):
+    """Arrow table for one string chunk; values a type cannot hold become null and are counted"""
+    arrays = []
+    for column, kind in kinds.items():
+        raw = chunk[column] if column in chunk.columns else pd.Series([None] * len(chunk), dtype=object)
+        present = raw.notna().to_numpy()
+        if kind == 'string':
+            arrays.append(pa.array(raw.astype(object).where(raw.notna(), None).tolist(), type=pa.string()))
+            continue
+
+        if kind == 'date':
+            parsed = pd.to_datetime(raw, format='%Y%m%d', errors='coerce')
+            valid = parsed.notna().to_numpy()
+            array = pa.array(parsed.to_numpy(dtype='datetime64[ms]'), mask=~valid).cast(pa.date32())
+        else:
+            parsed = pd.to_numeric(raw, errors='coerce').astype('float64').to_numpy()
+            valid = ~np.isnan(parsed)
+            if kind == 'int':
+                # Same policy as the loaders: fractional values in integer fields are rounded
+                valid &= np.abs(parsed) < INT64_LIMIT
+                parsed = np.where(valid, np.round(parsed), 0).astype(np.int64)
+                array = pa.array(parsed, type=pa.int64(), mask=~valid)
+            else:
+                valid &= np.isfinite(parsed)
+                array = pa.array(parsed, type=pa.float64(), mask=~valid)
+        lost = int(np.count_nonzero(present & ~valid))
+        if lost:
+            coerced[column] = coerced.get(column, 0) + lost
+        arrays.append(array)
+
+    fips = chunk[FIPS_COLUMN] if FIPS_COLUMN in chunk.columns else pd.Series([None] * len(chunk))
+    state = fips.fillna('').astype(str).str.strip().str[:2].replace('', '00')
+    arrays.append(pa.array(state.tolist(), type=pa.string()))
+    return pa.Table.from_arrays(arrays, schema=arrow_schema(kinds))
+
+
+def read_manifest(cache_dir: str) -> Optional[Dict]:
+    try:
+        with open(os.path.join(cache_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(cache_dir: str, manifest: Dict) -> None:
+    path = os.path.join(cache_dir, MANIFEST_NAME)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def is_cache_current(source_path: str, cache_dir: Optional[str] = None) -> bool:
+    """Manifest matches the source: size+mtime shortcut, else a CRC32 comparison"""
+    cache_dir = cache_dir or cache_dir_for(source_path)
+    manifest = read_manifest(cache_dir)
+    if not manifest or manifest.get('version') != CACHE_VERSION:
+        return False
+    stat = os.stat(source_path)
+    if stat.st_size != manifest['source_size']:
+        return False
+    if stat.st_mtime_ns == manifest['source_mtime_ns']:
+        return True
+    if source_checksum(source_path) != manifest['source_crc32']:
+        return False
+    # Touched but identical (e.g. re-downloaded): remember the new mtime
+    manifest['source_mtime_ns'] = stat.st_mtime_ns
+    _write_manifest(cache_dir, manifest)
+    return True
+
+
+def convert_to_parquet(source_path: str, cache_dir: Optional[str] = None, force: bool = False,
+                       chunksize: int = CONVERT_CHUNK_ROWS) -> Dict:
+    """Convert one TSV/.zip into its Parquet dataset and return the manifest"""
+    _require_pyarrow()
+    cache_dir = cache_dir or cache_dir_for(source_path)
+    if not force and is_cache_current(source_path, cache_dir):
+        return read_manifest(cache_dir)
+
+    start = time.time()
+    stat = os.stat(source_path)
+    crc = source_checksum(source_path)
+    staging_dir = cache_dir + '.tmp'
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    kinds = None
+    coerced = {}
+    rows = 0
+    state_rows = {}
+    for part, chunk in enumerate(read_tsv_chunks(source_path, chunksize=chunksize)):
+        if kinds is None:
+            kinds = column_kinds(list(chunk.columns))
+        table = typed_chunk(chunk, kinds, coerced)
+        table = table.sort_by([(PARTITION_COLUMN, 'ascending'), (FIPS_COLUMN, 'ascending')]) \
+            if FIPS_COLUMN in kinds else table
+        rows += table.num_rows
+
+        states = table.column(PARTITION_COLUMN).to_numpy(zero_copy_only=False)
+        boundaries = np.flatnonzero(states[1:] != states[:-1]) + 1
+        for begin, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(states)]):
+            state = str(states[begin])
+            state_rows[state] = state_rows.get(state, 0) + int(end - begin)
+            partition_dir = os.path.join(staging_dir, f'{PARTITION_COLUMN}={state}')
+            os.makedirs(partition_dir, exist_ok=True)
+            piece = table.slice(begin, end - begin).drop([PARTITION_COLUMN])
+            pq.write_table(piece, os.path.join(partition_dir, f'part-{part:05d}.parquet'),
+                           row_group_size=ROW_GROUP_ROWS, compression='snappy')
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'source': os.path.basename(source_path),
+        'source_size': stat.st_size,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_crc32': crc,
+        'rows': rows,
+        'state_rows': dict(sorted(state_rows.items())),
+        'column_types': kinds or {},
+        'coerced_values': coerced,
+        'converted_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'duration_seconds': round(time.time() - start, 1),
+    }
+    _write_manifest(staging_dir, manifest)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(staging_dir, cache_dir)
+    return manifest
+
+
+def open_dataset(source_path: str, cache_dir: Optional[str] = None, convert: bool = True):
+    """pyarrow Dataset over the cache, converting first when missing or stale"""
+    _require_pyarrow()
+    cache_dir = cache_dir or cache_dir_for(source_path)
+    if not is_cache_current(source_path, cache_dir):
+        if not convert:
+            raise FileNotFoundError(f"No current Parquet cache for {os.path.basename(source_path)}")
+        convert_to_parquet(source_path, cache_dir, force=True)
+    partitioning = ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor='hive')
+    return ds.dataset(cache_dir, format='parquet', partitioning=partitioning)
+
+
+def read_cached(source_path: str, columns: Optional[Sequence[str]] = None,
+                states: Optional[Iterable[str]] = None, cache_dir: Optional[str] = None,
+                convert: bool = True) -> pd.DataFrame:
+    """Selected columns (and optionally state FIPS codes) from the cache as a DataFrame"""
+    dataset = open_dataset(source_path, cache_dir, convert=convert)
+    row_filter = None
+    if states is not None:
+        row_filter = ds.field(PARTITION_COLUMN).isin([str(state).zfill(2) for state in states])
+    table = dataset.to_table(columns=list(columns) if columns is not None else None, filter=row_filter)
+    return table.to_pandas()
+
+
+def cached_state_rows(source_path: str, cache_dir: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """State FIPS -> row count from the manifest (None without a current cache)"""
+    cache_dir = cache_dir or cache_dir_for(source_path)
+    if not PARQUET_AVAILABLE or not is_cache_current(source_path, cache_dir):
+        return None
+    return read_manifest(cache_dir)['state_rows']
+
+
+if __name__ == "__main__":
+    import glob
+
+    if len(sys.argv) < 2:
+        print("Usage: python parquet_cache.py <file.tsv|file.zip|directory> [--force]")
+        sys.exit(1)
+    if not PARQUET_AVAILABLE:
+        print("❌ pyarrow is not installed - pip install pyarrow")
+        sys.exit(1)
+
+    target = sys.argv[1]
+    if os.path.isdir(target):
+        sources = sorted(glob.glob(os.path.join(target, '*.TSV')) + glob.glob(os.path.join(target, '*.tsv'))
+                         + glob.glob(os.path.join(target, '*.zip')))
+    else:
+        sources = [target]
+
+    for source in sources:
+        print(f"📦 {os.path.basename(source)}")
+        if is_cache_current(source) and '--force' not in sys.argv:
+            print("   ✅ Cache current - skipped")
+            continue
+        result = convert_to_parquet(source, force=True)
+        print(f"   ✅ {result['rows']:,} rows, {len(result['state_rows'])} states "
+              f"in {result['duration_seconds']}s -> {cache_dir_for(source)}")
+        for column, count in sorted(result['coerced_values'].items(), key=lambda item: -item[1])[:10]:
+            print(f"   ⚠️  {column}: {count:,} values not representable as {result['column_types'][column]}")
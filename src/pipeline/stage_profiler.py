@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+DataNest Stage Profiler
+Opt-in sampling profiler that attributes a loader's stacks to its telemetry stages.
+
+A background thread samples the loading thread's stack every 10 ms. LoadTelemetry hands
+each finished stage (every lap()/add()) to stage_done(), which files the samples taken
+since the previous stage under that stage's name - so stacks line up with the
+'read'/'sanitize'/'clean'/'encode'/'copy' timings without touching the loaders' code.
+close() writes, per worker process, into <file>.stacks/ ($DATANEST_PROFILE_DIR):
+
+    <stage>.<pid>.collapsed      flamegraph-ready folded stacks (flamegraph.pl, speedscope)
+    hot_functions.<pid>.txt      top functions per stage by own and inclusive samples
+    alloc_chunk<N>.<pid>.txt     tracemalloc top allocation sites for each chosen chunk
+
+Off unless DATANEST_PROFILE=1 (sampling) or DATANEST_PROFILE_CHUNKS=1,20 (snapshots) is
+set or a loader asks for it; when off, telemetry skips it with one None check per stage.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+STACKS_SUFFIX = '.stacks'
+SAMPLE_INTERVAL_SECONDS = 0.01
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 25
+MAX_STACK_DEPTH = 128
+BETWEEN_STAGES = 'other'     # Samples after the last stage of a chunk (progress prints, bookkeeping)
+
+
+def stacks_dir_for(file_path: str) -> str:
+    directory = os.getenv('DATANEST_PROFILE_DIR')
+    if directory:
+        return os.path.join(directory, os.path.basename(file_path) + STACKS_SUFFIX)
+    return file_path + STACKS_SUFFIX
+
+
+def _parse_chunks(value: Optional[str]) -> List[int]:
+    return [int(part) for part in (value or '').replace(' ', '').split(',') if part]
+
+
+def hot_functions(stacks: Counter, top: int = TOP_FUNCTIONS) -> List[Tuple[str, int, int]]:
+    """[(function, own samples, inclusive samples)] from folded stacks, hottest (own) first"""
+    own = Counter()
+    inclusive = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')
+        own[frames[-1]] += count
+        for frame in set(frames):  # Recursion counts once per sample
+            inclusive[frame] += count
+    ranked = sorted(inclusive, key=lambda frame: (-own[frame], -inclusive[frame], frame))
+    return [(frame, own[frame], inclusive[frame]) for frame in ranked[:top]]
+
+
+class StageProfiler:
+    """Stack sampler + tracemalloc snapshots, attributed to telemetry stages"""
+
+    def __init__(self, output_dir: str, sample: bool = True, interval: float = SAMPLE_INTERVAL_SECONDS,
+                 snapshot_chunks: Iterable[int] = (), top: int = TOP_FUNCTIONS):
+        self.output_dir = output_dir
+        self.interval = interval
+        self.snapshot_chunks = set(snapshot_chunks)
+        self.top = top
+        self.pid = os.getpid()
+        self.thread_id = threading.get_ident()  # The loading thread - the one stages are timed on
+        self.stacks: Dict[str, Counter] = {}
+        self.samples = 0
+        self.snapshots: Dict[int, List[str]] = {}
+        self._pending = Counter()
+        self._names: Dict[object, str] = {}
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+        self._sampler = _StackSampler(self, interval) if sample else None
+        if self._sampler is not None:
+            self._sampler.start()
+        if 1 in self.snapshot_chunks:
+            self._start_tracemalloc()
+
+    @classmethod
+    def for_file(cls, file_path: str, sample: Optional[bool] = None,
+                 snapshot_chunks: Optional[Iterable[int]] = None, **kwargs) -> Optional['StageProfiler']:
+        """Profiler writing to <file>.stacks/, or None when neither sampling nor snapshots are on"""
+        if sample is None:
+            sample = os.getenv('DATANEST_PROFILE', '').lower() in ('1', 'true', 'yes', 'sample')
+        if snapshot_chunks is None:
+            snapshot_chunks = _parse_chunks(os.getenv('DATANEST_PROFILE_CHUNKS'))
+        if not sample and not snapshot_chunks:
+            return None
+        return cls(stacks_dir_for(file_path), sample=sample, snapshot_chunks=snapshot_chunks, **kwargs)
+
+    # ----- sampling -----
+
+    def _frame_name(self, code) -> str:
+        name = self._names.get(code)
+        if name is None:
+            name = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+            self._names[code] = name
+        return name
+
+    def sample(self) -> None:
+        """Fold the loading thread's current stack into the pending samples"""
+        frame = sys._current_frames().get(self.thread_id)
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            names.append(self._frame_name(frame.f_code))
+            frame = frame.f_back
+        if not names:
+            return
+        stack = ';'.join(reversed(names))
+        with self._lock:
+            self._pending[stack] += 1
+            self.samples += 1
+
+    def stage_done(self, stage: str) -> None:
+        """File the samples since the previous stage under `stage`"""
+        if not self._pending:
+            return
+        with self._lock:
+            self.stacks.setdefault(stage, Counter()).update(self._pending)
+            self._pending = Counter()
+
+    # ----- allocation snapshots -----
+
+    def _start_tracemalloc(self) -> None:
+        if not tracemalloc.is_tracing():  # MemoryProbe may already be tracing - leave it running
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def chunk_done(self, chunk_num: int) -> None:
+        """End of a chunk: leftover samples, and the allocation snapshot if this chunk was chosen"""
+        self.stage_done(BETWEEN_STAGES)
+        if chunk_num in self.snapshot_chunks and tracemalloc.is_tracing():
+            statistics = tracemalloc.take_snapshot().statistics('lineno')
+            self.snapshots[chunk_num] = [f"{stat.size / 1024:12,.1f} KiB {stat.count:10,} blocks  {stat.traceback}"
+                                         for stat in statistics[:TOP_ALLOCATIONS]]
+            with self._lock:
+                self._pending = Counter()  # The snapshot's own cost is nobody's stage
+            if chunk_num + 1 not in self.snapshot_chunks and self._owns_tracemalloc:
+                tracemalloc.stop()
+                self._owns_tracemalloc = False
+        if chunk_num + 1 in self.snapshot_chunks:
+            self._start_tracemalloc()
+
+    # ----- output -----
+
+    def close(self) -> List[str]:
+        """Stop sampling and write the output files; returns their paths"""
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        self.stage_done(BETWEEN_STAGES)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+        if not self.stacks and not self.snapshots:
+            return []
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+        for stage, stacks in sorted(self.stacks.items()):
+            path = os.path.join(self.output_dir, f"{stage}.{self.pid}.collapsed")
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            paths.append(path)
+        if self.stacks:
+            path = os.path.join(self.output_dir, f"hot_functions.{self.pid}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(self.hot_function_lines()) + '\n')
+            paths.append(path)
+        for chunk_num, lines in sorted(self.snapshots.items()):
+            path = os.path.join(self.output_dir, f"alloc_chunk{chunk_num}.{self.pid}.txt")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"# Top allocation sites live at the end of chunk {chunk_num} (pid {self.pid})\n")
+                f.write('\n'.join(lines) + '\n')
+            paths.append(path)
+        return paths
+
+    def hot_function_lines(self) -> List[str]:
+        lines = []
+        for stage, stacks in sorted(self.stacks.items(), key=lambda item: -sum(item[1].values())):
+            total = sum(stacks.values())
+            lines.append(f"== {stage}: {total:,} samples")  # Shares, not seconds: the GIL delays samples
+            for function, own, inclusive in hot_functions(stacks, self.top):
+                lines.append(f"   {own / total:6.1%} own {inclusive / total:6.1%} total  {function}")
+        return lines
+
+    def summary_lines(self, per_stage: int = 3) -> List[str]:
+        """Hottest own-time functions of each stage, busiest stage first"""
+        lines = []
+        for stage, stacks in sorted(self.stacks.items(), key=lambda item: -sum(item[1].values())):
+            total = sum(stacks.values())
+            hottest = ', '.join(f"{function} {own / total:.0%}"
+                                for function, own, _ in hot_functions(stacks, per_stage) if own)
+            lines.append(f"{stage} ({total:,} samples): {hottest}")
+        return lines
+
+
+class _StackSampler(threading.Thread):
+    """Calls profiler.sample() every `interval` seconds"""
+
+    def __init__(self, profiler: StageProfiler, interval: float):
+        super().__init__(daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.profiler.sample()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+DataNest Load Telemetry
+Structured per-stage timings, rows and bytes for every loader chunk - graphable, alertable.
+
+The loaders time their stages with lap(): each call closes the stage that just ran, so
+a stage is one line after it and no indentation changes. read_tsv_chunks(telemetry=...)
+reports its own 'read' and 'sanitize' stages; the loaders add 'clean', 'encode', 'copy',
+'commit' and the like. Each finished chunk is appended as one JSON line
+to <file>.telemetry.jsonl (or $DATANEST_TELEMETRY_DIR), and a background thread rewrites
+a Prometheus textfile (node_exporter textfile collector, $DATANEST_PROM_TEXTFILE_DIR)
+every 15 seconds, so a stalled 30-hour load shows up as a stale progress timestamp.
+An attached StageProfiler (pipeline.stage_profiler, opt-in) gets every finished stage and
+chunk, so its sampled stacks carry the same stage names.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.stage_profiler import StageProfiler
+
+TELEMETRY_SUFFIX = '.telemetry.jsonl'
+TEXTFILE_INTERVAL_SECONDS = 15.0
+
+METRIC_HELP = {
+    'datanest_load_stage_seconds_total': ('counter', 'Seconds spent in each loader stage'),
+    'datanest_load_stage_rows_total': ('counter', 'Rows through each loader stage'),
+    'datanest_load_stage_bytes_total': ('counter', 'Bytes through each loader stage'),
+    'datanest_load_chunks_total': ('counter', 'Chunks finished'),
+    'datanest_load_rows_total': ('counter', 'Rows finished'),
+    'datanest_load_rows_per_second': ('gauge', 'Throughput of the last finished chunk'),
+    'datanest_load_last_progress_timestamp_seconds': ('gauge', 'Unix time a stage last finished'),
+    'datanest_load_running': ('gauge', '1 while the load runs, 0 once it has finished'),
+}
+
+
+def telemetry_path_for(file_path: str) -> str:
+    directory = os.getenv('DATANEST_TELEMETRY_DIR')
+    if directory:
+        return os.path.join(directory, os.path.basename(file_path) + TELEMETRY_SUFFIX)
+    return file_path + TELEMETRY_SUFFIX
+
+
+def textfile_path_for(file_path: str) -> Optional[str]:
+    """<dir>/datanest_load_<file>.prom - one textfile per source, so workers never clash"""
+    directory = os.getenv('DATANEST_PROM_TEXTFILE_DIR')
+    if not directory:
+        return None
+    name = re.sub(r'[^A-Za-z0-9_]', '_', os.path.basename(file_path))
+    return os.path.join(directory, f"datanest_load_{name}.prom")
+
+
+def _label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class LoadTelemetry:
+    """Per-chunk stage timer with JSON-lines log and optional Prometheus textfile"""
+
+    def __init__(self, source: str, jsonl_path: Optional[str] = None, textfile_path: Optional[str] = None,
+                 interval: float = TEXTFILE_INTERVAL_SECONDS, profiler: Optional[StageProfiler] = None):
+        self.source = source
+        self.profiler = profiler
+        self.run_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.jsonl_path = jsonl_path
+        self.textfile_path = textfile_path
+        self.totals: Dict[str, List[float]] = {}   # stage -> [seconds, rows, bytes]
+        self.chunks = 0
+        self.rows = 0
+        self.last_rate = 0.0
+        self.running = True
+        self.profile_paths: List[str] = []   # Files the profiler wrote, once closed
+        self._chunk: Dict[str, List[float]] = {}
+        self._chunk_started = time.perf_counter()
+        self._lap_started = self._chunk_started
+        self._last_progress = time.time()
+        self._lock = threading.Lock()
+        self._log = open(jsonl_path, 'a', encoding='utf-8') if jsonl_path else None
+        self._exporter = None
+        if textfile_path:
+            self._exporter = _TextfileExporter(self, interval)
+            self._exporter.start()
+
+    @classmethod
+    def for_file(cls, file_path: str, **kwargs) -> 'LoadTelemetry':
+        kwargs.setdefault('jsonl_path', telemetry_path_for(file_path))
+        kwargs.setdefault('textfile_path', textfile_path_for(file_path))
+        if 'profiler' not in kwargs:  # $DATANEST_PROFILE / $DATANEST_PROFILE_CHUNKS
+            kwargs['profiler'] = StageProfiler.for_file(file_path)
+        return cls(os.path.basename(file_path), **kwargs)
+
+    def add(self, stage: str, seconds: float, rows: int = 0, nbytes: int = 0) -> None:
+        """Record a stage timed elsewhere; the next lap() starts now"""
+        with self._lock:
+            for counts in (self._chunk.setdefault(stage, [0.0, 0, 0]), self.totals.setdefault(stage, [0.0, 0, 0])):
+                counts[0] += seconds
+                counts[1] += rows
+                counts[2] += nbytes
+            self._last_progress = time.time()
+        if self.profiler is not None:
+            self.profiler.stage_done(stage)
+        self._lap_started = time.perf_counter()
+
+    def lap(self, stage: str, rows: int = 0, nbytes: int = 0) -> float:
+        """Close `stage`: the time since the previous lap/add (or the chunk start)"""
+        seconds = time.perf_counter() - self._lap_started
+        self.add(stage, seconds, rows, nbytes)
+        return seconds
+
+    def stage_seconds(self) -> Dict[str, float]:
+        """Seconds per stage of the chunk in progress"""
+        return {stage: counts[0] for stage, counts in self._chunk.items()}
+
+    def chunk_done(self, chunk_num: int, rows: int, **fields) -> Dict:
+        """Write the chunk's JSON line and start timing the next chunk"""
+        now = time.perf_counter()
+        with self._lock:
+            stages = {stage: {'seconds': round(counts[0], 6), 'rows': int(counts[1]), 'bytes': int(counts[2])}
+                      for stage, counts in self._chunk.items()}
+            seconds = now - self._chunk_started  # Includes the reader's stages - they run after the reset
+            self.chunks += 1
+            self.rows += rows
+            self.last_rate = rows / seconds if seconds > 0 else 0.0
+            record = {
+                'ts': round(time.time(), 3),
+                'run_id': self.run_id,
+                'source': self.source,
+                'chunk': chunk_num,
+                'rows': rows,
+                'bytes': max((stage['bytes'] for stage in stages.values()), default=0),
+                'seconds': round(seconds, 6),
+                'rows_per_sec': round(self.last_rate, 1),
+                'stages': stages,
+            }
+            record.update(fields)
+            self._chunk = {}
+            if self._log is not None:
+                self._log.write(json.dumps(record) + '\n')
+                self._log.flush()
+        if self.profiler is not None:
+            self.profiler.chunk_done(chunk_num)
+        self._chunk_started = self._lap_started = time.perf_counter()
+        return record
+
+    def prometheus_text(self) -> str:
+        source = _label(self.source)
+        with self._lock:
+            samples = {name: [] for name in METRIC_HELP}
+            for stage, (seconds, rows, nbytes) in sorted(self.totals.items()):
+                labels = f'source="{source}",stage="{_label(stage)}"'
+                samples['datanest_load_stage_seconds_total'].append((labels, seconds))
+                samples['datanest_load_stage_rows_total'].append((labels, rows))
+                samples['datanest_load_stage_bytes_total'].append((labels, nbytes))
+            labels = f'source="{source}"'
+            samples['datanest_load_chunks_total'].append((labels, self.chunks))
+            samples['datanest_load_rows_total'].append((labels, self.rows))
+            samples['datanest_load_rows_per_second'].append((labels, self.last_rate))
+            samples['datanest_load_last_progress_timestamp_seconds'].append((labels, self._last_progress))
+            samples['datanest_load_running'].append((labels, 1 if self.running else 0))
+
+        lines = []
+        for name, (metric_type, help_text) in METRIC_HELP.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in samples[name])
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self) -> None:
+        """Atomic rewrite - the collector must never read a half-written file"""
+        if not self.textfile_path:
+            return
+        tmp_path = self.textfile_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp_path, self.textfile_path)
+
+    def close(self) -> None:
+        self.running = False
+        if self._exporter is not None:
+            self._exporter.stop()
+            self._exporter = None
+        self.write_textfile()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        if self.profiler is not None:
+            self.profile_paths = self.profiler.close()
+
+    def __enter__(self) -> 'LoadTelemetry':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def summary_lines(self) -> List[str]:
+        """Share of time per stage, slowest first"""
+        total = sum(counts[0] for counts in self.totals.values())
+        if not total:
+            return []
+        return [f"{stage}: {seconds:,.1f}s ({seconds / total:.0%})"
+                for stage, (seconds, _, _) in sorted(self.totals.items(), key=lambda item: -item[1][0])]
+
+
+class _TextfileExporter(threading.Thread):
+    """Rewrites the telemetry's Prometheus textfile every `interval` seconds"""
+
+    def __init__(self, telemetry: LoadTelemetry, interval: float):
+        super().__init__(daemon=True)
+        self.telemetry = telemetry
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        self.telemetry.write_textfile()
+        while not self.stopped.wait(self.interval):
+            self.telemetry.write_textfile()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
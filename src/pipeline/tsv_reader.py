@@ -0,0 +1,473 @@
+#!/usr/bin/env python3
+"""
+DataNest Chunked TSV Reader
+Reads OpenLien TSVs - plain or still inside the delivery .zip - as DataFrame chunks.
+
+A background thread reads (and for .zip members, inflates) the source in large blocks
+into a small bounded queue while the main thread parses. zlib releases the GIL, so
+decompression overlaps parsing and a .zip loads about as fast as the extracted file,
+without the 100+ GB extracted-tsv staging copy. Blocks are cut into chunks of exactly
+`chunksize` physical lines and parsed with the C engine using the loaders' options.
+
+With a Quarantine, lines with more fields than the header (which on_bad_lines='skip'
+silently drops) are diverted to <file>.quarantine.tsv with their byte offset, line
+number and reason; short lines are kept (padded, as pandas does) but counted.
+`python tsv_reader.py --reprocess <file>` retries only the quarantined lines.
+"""
+
+import csv
+import io
+import os
+import queue
+import sys
+import threading
+import time
+import zipfile
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+READ_BLOCK_BYTES = 16 * 1024 * 1024
+PREFETCH_BLOCKS = 4
+
+# Rows per chunk: fixed, or a callable asked before each chunk (adaptive sizing)
+ChunkSize = Union[int, Callable[[], int]]
+
+QUARANTINE_SUFFIX = '.quarantine.tsv'
+RECOVERED_SUFFIX = '.recovered.tsv'
+QUARANTINE_HEADER = b'byte_offset\tline_number\treason\tfield_count\tmember\traw_line\n'
+
+
+def is_zip_source(path: str) -> bool:
+    return path.lower().endswith('.zip')
+
+
+def zip_tsv_members(path: str) -> List[str]:
+    """TSV members of a delivery archive, in name order"""
+    with zipfile.ZipFile(path) as archive:
+        return sorted(name for name in archive.namelist() if name.lower().endswith('.tsv'))
+
+
+def source_size(path: str) -> int:
+    """Uncompressed size in bytes (sum of TSV members for a .zip)"""
+    if not is_zip_source(path):
+        return os.path.getsize(path)
+    with zipfile.ZipFile(path) as archive:
+        return sum(info.file_size for info in archive.infolist() if info.filename.lower().endswith('.tsv'))
+
+
+class _Prefetcher(threading.Thread):
+    """Reads blocks from a stream into a bounded queue; None marks the end"""
+
+    def __init__(self, stream: BinaryIO, block_bytes: int, depth: int):
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.block_bytes = block_bytes
+        self.blocks = queue.Queue(maxsize=depth)
+        self.error = None
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self.stopped.is_set():
+                block = self.stream.read(self.block_bytes)
+                if not block:
+                    break
+                self._put(block)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(None)
+
+    def _put(self, item) -> None:
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def iter_blocks(path: str, member: Optional[str] = None, block_bytes: int = READ_BLOCK_BYTES,
+                prefetch: bool = True) -> Iterator[bytes]:
+    """Raw (decompressed) byte blocks of a TSV or one .zip member"""
+    archive = zipfile.ZipFile(path) if is_zip_source(path) else None
+    try:
+        if archive is not None:
+            if member is None:
+                members = sorted(n for n in archive.namelist() if n.lower().endswith('.tsv'))
+                if not members:
+                    raise FileNotFoundError(f"No .tsv member in {os.path.basename(path)}")
+                member = members[0]
+            stream = archive.open(member)
+        else:
+            stream = open(path, 'rb')
+
+        with stream:
+            if not prefetch:
+                for block in iter(lambda: stream.read(block_bytes), b''):
+                    yield block
+                return
+
+            reader = _Prefetcher(stream, block_bytes, PREFETCH_BLOCKS)
+            reader.start()
+            try:
+                while True:
+                    block = reader.blocks.get()
+                    if block is None:
+                        break
+                    yield block
+                if reader.error is not None:
+                    raise reader.error
+            finally:
+                reader.stopped.set()
+                reader.join()
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+def iter_line_chunks(blocks: Iterator[bytes], lines_per_chunk: ChunkSize) -> Iterator[bytes]:
+    """Regroup byte blocks into buffers of exactly lines_per_chunk lines (last may be short)
+
+    lines_per_chunk may be a callable (pipeline.chunk_sizer.ChunkSizer), asked for the
+    size of each chunk when it is cut - after the previous chunk has been consumed.
+    """
+    next_size = lines_per_chunk if callable(lines_per_chunk) else lambda: lines_per_chunk
+    size = next_size()
+    pending = []
+    pending_lines = 0
+    for block in blocks:
+        newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+        start = 0
+        used = 0
+        while pending_lines + len(newlines) - used >= size:
+            cut = int(newlines[used + size - pending_lines - 1]) + 1
+            pending.append(block[start:cut])
+            yield b''.join(pending)
+            used += size - pending_lines
+            pending, pending_lines, start = [], 0, cut
+            size = next_size()
+        if start < len(block):
+            pending.append(block[start:])
+            pending_lines += len(newlines) - used
+    if pending:
+        tail = b''.join(pending)
+        if tail.strip(b'\r\n'):
+            yield tail
+
+
+def parse_tsv_bytes(body: bytes, header: Sequence[str], usecols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Parse header-less TSV bytes with the loaders' read options (all str, '' -> NaN)"""
+    if not body.strip(b'\r\n'):
+        return pd.DataFrame({column: pd.Series(dtype=object) for column in (usecols or header)})
+    return pd.read_csv(
+        io.BytesIO(body),
+        sep='\t',
+        header=None,
+        names=list(header),
+        usecols=list(usecols) if usecols is not None else None,
+        dtype=str,
+        encoding='utf-8',
+        encoding_errors='replace',
+        quoting=csv.QUOTE_NONE,
+        on_bad_lines='skip',
+        na_values=[''],
+    )
+
+
+def split_header(blocks: Iterator[bytes]):
+    """(header columns, iterator of the blocks after the header line)"""
+    head = b''
+    for block in blocks:
+        head += block
+        end = head.find(b'\n')
+        if end != -1:
+            break
+    else:
+        end = len(head)
+    header = head[:end].rstrip(b'\r').decode('utf-8', errors='replace').split('\t') if head else []
+
+    def rest():
+        if end + 1 < len(head):
+            yield head[end + 1:]
+        yield from blocks
+
+    return header, rest()
+
+
+def quarantine_path_for(source_path: str) -> str:
+    return source_path + QUARANTINE_SUFFIX
+
+
+class Quarantine:
+    """Collects rejected lines of one source file with offsets and reasons.
+
+    Offsets and line numbers are into the decompressed member for .zip sources, and each
+    entry names its member (empty for a plain .tsv). The quarantine file is replaced on
+    every run and only created when something is rejected.
+    """
+
+    def __init__(self, source_path: str, path: Optional[str] = None):
+        self.source_path = source_path
+        self.path = path or quarantine_path_for(source_path)
+        self.counts: Dict[str, int] = {}
+        self.short_lines = 0
+        self._file = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def add(self, byte_offset: int, line_number: int, reason: str, field_count: int, raw: bytes,
+            member: Optional[str] = None) -> None:
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+            self._file.write(QUARANTINE_HEADER)
+        self._file.write(f"{byte_offset}\t{line_number}\t{reason}\t{field_count}\t{member or ''}\t".encode('utf-8'))
+        self._file.write(raw.rstrip(b'\r\n') + b'\n')
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'Quarantine':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def summary(self) -> str:
+        reasons = ', '.join(f"{reason}: {count:,}" for reason, count in sorted(self.counts.items()))
+        return (f"{self.total:,} quarantined ({reasons or 'none'}), "
+                f"{self.short_lines:,} short lines padded")
+
+
+def screen_lines(body: bytes, field_count: int, first_offset: int, first_line: int,
+                 quarantine: Quarantine, member: Optional[str] = None) -> bytes:
+    """Drop lines with too many fields into the quarantine; count short ones. Returns kept bytes."""
+    data = np.frombuffer(body, dtype=np.uint8)
+    newlines = np.flatnonzero(data == 10)
+    ends = np.r_[newlines, len(body)] if len(body) and body[-1:] != b'\n' else newlines
+    starts = np.r_[0, ends[:-1] + 1]
+    tabs = np.flatnonzero(data == 9)
+    fields = np.searchsorted(tabs, ends) - np.searchsorted(tabs, starts) + 1
+
+    quarantine.short_lines += int(np.count_nonzero(fields < field_count))
+    overlong = np.flatnonzero(fields > field_count)
+    if len(overlong) == 0:
+        return body
+
+    kept = []
+    previous = 0
+    for i in overlong.tolist():
+        start, end = int(starts[i]), int(ends[i])
+        quarantine.add(first_offset + start, first_line + i, 'too_many_fields', int(fields[i]), body[start:end],
+                       member)
+        kept.append(body[previous:start])
+        previous = end + 1
+    kept.append(body[previous:])
+    return b''.join(kept)
+
+
+def read_tsv_chunks(path: str, chunksize: ChunkSize = 25000, member: Optional[str] = None,
+                    usecols: Optional[Sequence[str]] = None, prefetch: bool = True,
+                    quarantine: Optional[Quarantine] = None,
+                    sanitizer: Optional[Callable[[bytes], bytes]] = None,
+                    rename: Optional[Dict[str, str]] = None, telemetry=None) -> Iterator[pd.DataFrame]:
+    """DataFrame chunks of `chunksize` rows (or a ChunkSizer) from a .tsv or a delivery .zip.
+
+    Drop-in for pd.read_csv(..., chunksize=...) with the loaders' options. For a .zip
+    without `member`, every TSV member is read in name order. Chunks count physical
+    lines, so a chunk is shorter by the lines the quarantine took. A sanitizer
+    (pipeline.byte_sanitizer.ByteSanitizer) cleans each chunk's bytes after screening.
+
+    Empty fields are already missing (NaN) here - the one null normalization pass.
+    With rename {header: column}, only those header columns are parsed and they come
+    back under the new names, so callers need no select-and-copy step. A telemetry
+    (pipeline.telemetry.LoadTelemetry) gets each chunk's 'read' and 'sanitize' timings.
+    """
+    members = [member]
+    if is_zip_source(path) and member is None:
+        members = zip_tsv_members(path)
+        if not members:
+            raise FileNotFoundError(f"No .tsv member in {os.path.basename(path)}")
+
+    for name in members:
+        header, blocks = split_header(iter_blocks(path, member=name, prefetch=prefetch))
+        if rename is not None and usecols is None:
+            usecols = [column for column in header if column in rename]
+        if usecols is not None:
+            missing = [column for column in usecols if column not in header]
+            if missing:
+                raise KeyError(f"Columns not in {name or os.path.basename(path)}: {missing}")
+        rows_read = 0
+        offset = None  # Byte offset of the current chunk (after the header line)
+        line_number = 2
+        started = time.perf_counter()
+        for body in iter_line_chunks(blocks, chunksize):
+            raw_bytes = len(body)
+            if quarantine is not None:
+                if offset is None:
+                    offset = len(_header_line(path, name))
+                lines = body.count(b'\n') + (0 if body.endswith(b'\n') else 1)
+                screened = screen_lines(body, len(header), offset, line_number, quarantine, name)
+                offset += len(body)
+                line_number += lines
+                body = screened
+            if sanitizer is not None:
+                sanitize_started = time.perf_counter()
+                body = sanitizer(body)
+                if telemetry is not None:
+                    # Closed in the order they ran, so a profiler on the telemetry files each one's stacks
+                    telemetry.add('read', sanitize_started - started, 0, raw_bytes)
+                    telemetry.add('sanitize', time.perf_counter() - sanitize_started, 0, raw_bytes)
+                    started, raw_bytes = time.perf_counter(), 0
+            chunk = parse_tsv_bytes(body, header, usecols)
+            if rename is not None:
+                chunk.columns = [rename.get(column, column) for column in chunk.columns]
+            # Continuous row labels, like pandas' own chunked reader
+            chunk.index = pd.RangeIndex(rows_read, rows_read + len(chunk))
+            rows_read += len(chunk)
+            if telemetry is not None:
+                telemetry.add('read', time.perf_counter() - started, len(chunk), raw_bytes)
+                if sanitizer is not None:
+                    telemetry.add('sanitize', 0.0, len(chunk))
+            yield chunk
+            started = time.perf_counter()
+
+
+def read_header(path: str, member: Optional[str] = None) -> List[str]:
+    """Header columns of a .tsv, or of a .zip's first (or given) TSV member"""
+    if is_zip_source(path) and member is None:
+        members = zip_tsv_members(path)
+        member = members[0] if members else None
+    return _header_line(path, member).rstrip(b'\r\n').decode('utf-8', errors='replace').split('\t')
+
+
+def _header_line(path: str, member: Optional[str] = None) -> bytes:
+    """The raw header line including its newline"""
+    head = b''
+    for block in iter_blocks(path, member=member, block_bytes=64 * 1024, prefetch=False):
+        head += block
+        end = head.find(b'\n')
+        if end != -1:
+            return head[:end + 1]
+    return head
+
+
+def read_quarantine(quarantine_path: str) -> List[Tuple[int, int, str, int, bytes, Optional[str]]]:
+    """[(byte_offset, line_number, reason, field_count, raw_line, member)] - member None for a plain .tsv"""
+    entries = []
+    with open(quarantine_path, 'rb') as f:
+        has_member = b'\tmember\t' in next(f, b'')  # Files from before members were recorded lack it
+        for line in f:
+            line = line.rstrip(b'\n')
+            if has_member:
+                offset, line_number, reason, field_count, member, raw = line.split(b'\t', 5)
+            else:
+                (offset, line_number, reason, field_count, raw), member = line.split(b'\t', 4), b''
+            entries.append((int(offset), int(line_number), reason.decode('ascii'), int(field_count), raw,
+                            member.decode('utf-8') or None))
+    return entries
+
+
+def trim_trailing_empty_fields(raw: bytes, field_count: int) -> bytes:
+    """Repair: drop empty fields beyond the header width (stray trailing tabs)"""
+    fields = raw.split(b'\t')
+    while len(fields) > field_count and fields[-1].strip(b'\r') == b'':
+        fields.pop()
+    return b'\t'.join(fields)
+
+
+def recovered_path_for(source_path: str, member: Optional[str] = None) -> str:
+    """<file>.recovered.tsv, or <file>.<member>.recovered.tsv for a member with its own header"""
+    if member is None:
+        return source_path + RECOVERED_SUFFIX
+    return f"{source_path}.{os.path.splitext(os.path.basename(member))[0]}{RECOVERED_SUFFIX}"
+
+
+def reprocess_quarantine(source_path: str, repair: Optional[Callable[[bytes, int], bytes]] = None,
+                         output_path: Optional[str] = None) -> Tuple[int, int]:
+    """Retry only the quarantined lines of a source after fixes.
+
+    Each line is repaired and checked against the header of the member it came from.
+    Lines that now fit go to <file>.recovered.tsv (with the header, ready for an append
+    load) - or, for a .zip member whose header differs from the first one written there,
+    to recovered_path_for(source, member). The rest stay quarantined. Returns
+    (recovered, still_quarantined).
+    """
+    quarantine_path = quarantine_path_for(source_path)
+    entries = read_quarantine(quarantine_path)
+    headers: Dict[Optional[str], bytes] = {}
+    outputs: Dict[bytes, BinaryIO] = {}
+    output_path = output_path or recovered_path_for(source_path)
+
+    recovered = 0
+    remaining = Quarantine(source_path, path=quarantine_path + '.tmp')
+    try:
+        for offset, line_number, reason, _, raw, member in entries:
+            if member not in headers:
+                headers[member] = _header_line(source_path, member).rstrip(b'\r\n')
+            header = headers[member]
+            field_count = header.count(b'\t') + 1
+            line = repair(raw, field_count) if repair is not None else raw
+            fields = line.count(b'\t') + 1
+            if fields != field_count:
+                remaining.add(offset, line_number, reason, fields, raw, member)
+                continue
+            if header not in outputs:
+                path = recovered_path_for(source_path, member) if outputs else output_path
+                outputs[header] = open(path, 'wb')
+                outputs[header].write(header + b'\n')
+            outputs[header].write(line + b'\n')
+            recovered += 1
+    finally:
+        for out in outputs.values():
+            out.close()
+        remaining.close()
+
+    if remaining.total:
+        os.replace(remaining.path, quarantine_path)
+    else:
+        os.remove(quarantine_path)
+    return recovered, remaining.total
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python tsv_reader.py <file.tsv|file.zip> [chunksize]")
+        print("       python tsv_reader.py --reprocess <file.tsv|file.zip> [--trim-trailing]")
+        sys.exit(1)
+
+    if sys.argv[1] == '--reprocess':
+        source = sys.argv[2]
+        repair = trim_trailing_empty_fields if '--trim-trailing' in sys.argv else None
+        recovered, remaining = reprocess_quarantine(source, repair=repair)
+        print(f"♻️  {recovered:,} quarantined lines recovered -> {recovered_path_for(source)}")
+        if is_zip_source(source):
+            print(f"   📦 Lines of members with a different header: {recovered_path_for(source, '<member>')}")
+        print(f"🚧 {remaining:,} lines still quarantined")
+        if recovered:
+            print("💡 Load them with enhanced_production_load(custom_file_path=..., append=True)")
+        sys.exit(0)
+
+    source = sys.argv[1]
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 25000
+    start_time = time.time()
+    rows = 0
+    quarantine = Quarantine(source)
+    for chunk_number, chunk in enumerate(read_tsv_chunks(source, chunksize=size, quarantine=quarantine), 1):
+        rows += len(chunk)
+        elapsed = time.time() - start_time
+        print(f"📦 Chunk {chunk_number}: {len(chunk):,} rows ({rows / elapsed:,.0f} rows/s)")
+    elapsed = time.time() - start_time
+    print(f"✅ {rows:,} rows from {os.path.basename(source)} in {elapsed:.1f}s "
+          f"({source_size(source) / 1024 ** 2 / elapsed:,.0f} MB/s uncompressed)")
+    quarantine.close()
+    print(f"🚧 {quarantine.summary()}")
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+DataNest Random-Access TSV Sampler
+Uniformly sampled rows from anywhere in an OpenLien TSV without reading it front to back.
+
+The delivery files are sorted by geography, so `read_csv(nrows=...)` only ever sees the
+first county. This memory-maps the file, jumps to random byte offsets and realigns to the
+start of the containing line. A random offset lands on a line with probability
+proportional to its length, so each candidate is accepted with probability
+min_length / line_length: every well-formed row has at least one byte per column (the
+tabs plus the newline), which makes the kept rows a uniform sample of the file.
+"""
+
+import mmap
+import os
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def read_header(path: str) -> List[str]:
+    """Column names from the first line of a TSV"""
+    with open(path, 'rb') as f:
+        return f.readline().rstrip(b'\r\n').decode('utf-8', errors='replace').split('\t')
+
+
+def _line_at(data: mmap.mmap, offset: int, data_start: int) -> Tuple[int, int]:
+    """(start, end) of the line containing offset; end excludes the newline"""
+    start = data.rfind(b'\n', data_start, offset) + 1
+    if start == 0:
+        start = data_start
+    end = data.find(b'\n', offset)
+    if end == -1:
+        end = len(data)
+    return start, end
+
+
+def _estimate_lines(data: mmap.mmap, data_start: int, probes: int, rng: np.random.Generator) -> int:
+    """size * mean(1 / length) over randomly probed lines estimates the line count"""
+    inverse_lengths = []
+    for offset in rng.integers(data_start, len(data), probes).tolist():
+        start, end = _line_at(data, offset, data_start)
+        inverse_lengths.append(1.0 / (end - start + 1))
+    return int(round((len(data) - data_start) * float(np.mean(inverse_lengths))))
+
+
+def _all_lines(data: mmap.mmap, data_start: int) -> List[Tuple[int, int]]:
+    spans = []
+    start = data_start
+    while start < len(data):
+        end = data.find(b'\n', start)
+        if end == -1:
+            end = len(data)
+        spans.append((start, end))
+        start = end + 1
+    return spans
+
+
+def _random_lines(data: mmap.mmap, data_start: int, n: int, min_length: int,
+                  rng: np.random.Generator, max_attempts: int) -> Tuple[List[Tuple[int, int]], Dict]:
+    """Up to n distinct (start, end) line spans chosen uniformly by rejection sampling"""
+    size = len(data)
+    chosen = {}
+    attempts = 0
+    while len(chosen) < n and attempts < max_attempts:
+        # Draw in batches: one numpy call per batch instead of per candidate
+        batch = max(64, 4 * (n - len(chosen)))
+        offsets = rng.integers(data_start, size, batch)
+        accept = rng.random(batch)
+        for offset, u in zip(offsets.tolist(), accept.tolist()):
+            attempts += 1
+            start, end = _line_at(data, offset, data_start)
+            if start in chosen:
+                continue
+            length = end - start + 1  # Including the newline the offset may have hit
+            if u * length <= min_length:
+                chosen[start] = end
+                if len(chosen) == n:
+                    break
+            if attempts >= max_attempts:
+                break
+
+    stats = {'attempts': attempts, 'accepted': len(chosen)}
+    return sorted(chosen.items()), stats
+
+
+def sample_rows(path: str, n: int = 1000, seed: Optional[int] = None,
+                columns: Optional[Sequence[str]] = None, max_attempts: Optional[int] = None) -> pd.DataFrame:
+    """n uniformly sampled data rows as a string DataFrame (empty fields -> None).
+
+    Rows come back in file order. Malformed rows (wrong field count) are dropped, the same
+    as the loaders' on_bad_lines='skip'; df.attrs records attempts and malformed counts.
+    When n is at least half the file's estimated rows the line list is read instead.
+    """
+    header = read_header(path)
+    if columns is not None:
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise KeyError(f"Columns not in {os.path.basename(path)}: {missing}")
+        keep = [header.index(column) for column in columns]
+    else:
+        keep = None
+
+    rng = np.random.default_rng(seed)
+    rows = []
+    malformed = 0
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return pd.DataFrame(columns=list(columns or header))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            data_start = data.find(b'\n') + 1
+            if data_start == 0 or data_start >= len(data):
+                return pd.DataFrame(columns=list(columns or header))
+
+            if n >= _estimate_lines(data, data_start, 256, rng) // 2:
+                # Small file relative to n: pick from the full line list instead of probing
+                spans = _all_lines(data, data_start)
+                if n < len(spans):
+                    picked = np.sort(rng.choice(len(spans), n, replace=False))
+                    spans = [spans[i] for i in picked]
+                stats = {'attempts': 0, 'accepted': len(spans)}
+            else:
+                spans, stats = _random_lines(data, data_start, n, len(header), rng,
+                                             max_attempts or 200 * n)
+            for start, end in spans:
+                fields = data[start:end].rstrip(b'\r').decode('utf-8', errors='replace').split('\t')
+                if len(fields) != len(header):
+                    malformed += 1
+                    continue
+                if keep is not None:
+                    fields = [fields[i] for i in keep]
+                rows.append([value if value != '' else None for value in fields])
+
+    df = pd.DataFrame(rows, columns=list(columns or header), dtype=object)
+    df.attrs.update(source=path, seed=seed, malformed=malformed, **stats)
+    return df
+
+
+def estimate_row_count(path: str, probes: int = 2000, seed: Optional[int] = None) -> int:
+    """Approximate data row count from random probes (no full scan).
+
+    A random byte lands on a line with probability length / size, so
+    size * mean(1 / length) over the probed lines is an unbiased line count.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            data_start = data.find(b'\n') + 1
+            if data_start == 0 or data_start >= len(data):
+                return 0
+            return _estimate_lines(data, data_start, probes, np.random.default_rng(seed))
+
+
+def sample_files(paths: Sequence[str], rows_per_file: int = 1000, seed: Optional[int] = None,
+                 columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Stratified sample: rows_per_file uniform rows from each file, tagged with source_file.
+
+    Each file gets its own seed derived from `seed`, so adding a file does not change the
+    rows sampled from the others.
+    """
+    frames = []
+    for path in paths:
+        file_seed = None
+        if seed is not None:
+            file_seed = np.random.SeedSequence([seed, *os.path.basename(path).encode('utf-8')])
+        df = sample_rows(path, rows_per_file, seed=file_seed, columns=columns)
+        df.insert(0, 'source_file', os.path.basename(path))
+        frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python tsv_sampler.py <file.tsv> [rows] [seed]")
+        sys.exit(1)
+
+    tsv_path = sys.argv[1]
+    sample_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    sample_seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    start_time = time.time()
+    sample = sample_rows(tsv_path, sample_size, seed=sample_seed)
+    elapsed = time.time() - start_time
+    print(f"🎲 Sampled {len(sample):,} rows from {os.path.basename(tsv_path)} in {elapsed * 1000:.0f} ms "
+          f"({sample.attrs.get('attempts', 0):,} probes, {sample.attrs.get('malformed', 0)} malformed)")
+    print(f"📊 Estimated rows in file: ~{estimate_row_count(tsv_path, seed=sample_seed):,}")
+    if 'FIPS_Code' in sample.columns:
+        states = sample['FIPS_Code'].fillna('??').str[:2].value_counts().head(10)
+        print("🗺️  State FIPS in sample:")
+        for state_fips, count in states.items():
+            print(f"   {state_fips}: {count:,} ({count / len(sample) * 100:.1f}%)")
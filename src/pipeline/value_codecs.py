@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+DataNest Value Codecs
+Whole-column decoders from the TSV's strings to load-ready arrays, with per-column counts.
+
+Each decoder takes a string column (NaN for missing) and returns a NumPy array plus a
+dict of outcome counts, instead of calling a cleaning function per cell and printing
+per value. A CodecReport accumulates the counts per column across chunks.
+"""
+
+import re
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Same tokens and stripping rule as robust_numeric_clean() in the MVP loaders
+NUMERIC_NULL_TOKENS = ('', 'NAN', 'NULL', 'N/A', 'NA')
+YES_NO_TOKENS = ('Y', 'N', 'YES', 'NO', 'TRUE', 'FALSE')
+NON_NUMERIC_CHARACTERS = re.compile(r'[^\d.-]')
+# What float() accepts once only digits, '.' and '-' are left
+NUMERIC_TEXT = re.compile(r'-?(?:\d+\.?\d*|\.\d+)')
+
+# Outcome codes, in the order counts are reported; valid/null/out_of_range shared by all codecs
+NUMERIC_OUTCOMES = ('valid', 'null', 'out_of_range', 'yes_no', 'non_numeric')
+VALID, NULL, OUT_OF_RANGE, YES_NO, NON_NUMERIC = range(len(NUMERIC_OUTCOMES))
+
+# Null tokens of the loaders' clean_date_value(); anything else must be 8 ASCII digits
+DATE_NULL_TOKENS = ('', '0', 'nan', 'NaN', 'null')
+DATE_OUTCOMES = ('valid', 'null', 'out_of_range', 'malformed', 'invalid_date')
+MALFORMED, INVALID_DATE = 3, 4
+DIGIT_WEIGHTS = 10 ** np.arange(7, -1, -1, dtype=np.int64)
+# Data dictionary date formats: where each YYYYMMDD digit sits in the 8 characters
+DATE_LAYOUTS = {
+    'YYYYMMDD': [0, 1, 2, 3, 4, 5, 6, 7],
+    'MMDDYYYY': [4, 5, 6, 7, 0, 1, 2, 3],  # Certification_Date
+}
+NOT_A_DATE = np.datetime64('NaT', 'D')
+
+# Postgres integer targets (information_schema data_type) and their ranges
+INTEGER_RANGES = {
+    'smallint': (-2 ** 15, 2 ** 15 - 1),
+    'integer': (-2 ** 31, 2 ** 31 - 1),
+    'bigint': (-2 ** 63, 2 ** 63 - 1),
+}
+INTEGER_OUTCOMES = ('valid', 'null', 'out_of_range', 'non_numeric')
+INTEGER_NON_NUMERIC = 3
+# What to_numeric() parsed as a number, ASCII digits only; plain integers are cast without float
+INTEGER_TEXT = re.compile(r'[+-]?[0-9]+')
+DECIMAL_TEXT = re.compile(r'[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?')
+# Significant digits that always fit int64 (10 ** 18 < 2 ** 63)
+INT64_SAFE_DIGITS = 18
+
+
+class CodecReport:
+    """Outcome counts per column (valid, null, yes_no, non_numeric, ...) summed over chunks"""
+
+    def __init__(self):
+        self.columns: Dict[str, Dict[str, int]] = {}
+
+    def add(self, column: str, counts: Dict[str, int]) -> None:
+        totals = self.columns.setdefault(column, {})
+        for outcome, count in counts.items():
+            totals[outcome] = totals.get(outcome, 0) + count
+
+    def rejected(self, column: str) -> int:
+        """Values present in the file but not loadable (everything except valid and null)"""
+        counts = self.columns.get(column, {})
+        return sum(count for outcome, count in counts.items() if outcome not in ('total', 'valid', 'null'))
+
+    def lines(self, limit: Optional[int] = None) -> List[str]:
+        """Printable lines for columns with rejects, most rejects first"""
+        columns = sorted((column for column in self.columns if self.rejected(column)),
+                         key=self.rejected, reverse=True)
+        lines = []
+        for column in columns[:limit]:
+            counts = self.columns[column]
+            details = ', '.join(f"{outcome} {count:,}" for outcome, count in counts.items()
+                                if outcome not in ('total', 'valid', 'null') and count)
+            lines.append(f"{column}: {self.rejected(column):,} of {counts.get('total', 0):,} rejected ({details})")
+        return lines
+
+
+def _decode_column(values: pd.Series, decode_distinct, outcome_names: Sequence[str],
+                   missing_value) -> Tuple[np.ndarray, Dict[str, int]]:
+    """Decode each distinct string once (pd.factorize) and broadcast back to the rows"""
+    codes, distinct = pd.factorize(values.astype(object), use_na_sentinel=True)
+    distinct_values, outcomes = decode_distinct(np.asarray(distinct, dtype=object).astype(str))
+
+    missing = codes < 0
+    if not len(distinct):
+        # Only missing cells: an empty string decodes to null in every codec and fixes the dtype
+        distinct_values = decode_distinct(np.array([''], dtype=object))[0]
+    result = distinct_values[np.where(missing, 0, codes)]
+    result[missing] = missing_value
+    tally = np.bincount(outcomes[codes[~missing]], minlength=len(outcome_names))
+    tally[NULL] += int(missing.sum())
+    counts = {'total': len(codes)}
+    counts.update({outcome: int(count) for outcome, count in zip(outcome_names, tally)})
+    return result, counts
+
+
+def _decode_numeric_text(strings: np.ndarray, bounds: Optional[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """(float64 values, outcome codes) for an object array of distinct strings"""
+    # object dtype keeps Python's re (Unicode \d, like the per-value cleaner) on pandas' str dtype too
+    strings = pd.Series(strings, dtype=object)
+    cleaned = strings.str.replace(NON_NUMERIC_CHARACTERS, '', regex=True)
+    numeric = cleaned.str.fullmatch(NUMERIC_TEXT).to_numpy(dtype=bool)
+
+    outcomes = np.full(len(strings), NON_NUMERIC, dtype=np.int8)
+    outcomes[numeric] = VALID
+    # Null and Y/N tokens hold no digits, so only non-numeric values need classifying
+    tokens = strings[~numeric].str.strip().str.upper()
+    other = np.flatnonzero(~numeric)
+    outcomes[other[tokens.isin(NUMERIC_NULL_TOKENS).to_numpy()]] = NULL
+    outcomes[other[tokens.isin(YES_NO_TOKENS).to_numpy()]] = YES_NO
+
+    values = np.full(len(strings), np.nan)
+    # numpy's object -> float64 cast is float() per element in C: identical results, no Python loop
+    values[numeric] = cleaned.to_numpy(dtype=object)[numeric].astype(np.float64)
+    if bounds is not None:
+        outside = numeric & ((values < bounds[0]) | (values > bounds[1]))
+        outcomes[outside] = OUT_OF_RANGE
+        values[outside] = np.nan
+    return values, outcomes
+
+
+def decode_numeric(values: pd.Series, bounds: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, Dict[str, int]]:
+    """float64 array (NaN = NULL) matching robust_numeric_clean() value for value.
+
+    Null tokens and missing cells count as null, Y/N-style flags as yes_no, anything that
+    is not a number after dropping non-numeric characters as non_numeric. With bounds
+    (inclusive), values outside them are nulled and counted as out_of_range. Each distinct
+    string is decoded once (pd.factorize), so repetitive columns cost a hash pass.
+    """
+    return _decode_column(values, lambda strings: _decode_numeric_text(strings, bounds), NUMERIC_OUTCOMES, np.nan)
+
+
+def _decode_yyyymmdd_text(strings: np.ndarray, bounds: Optional[Tuple[str, str]],
+                          layout: str = 'YYYYMMDD') -> Tuple[np.ndarray, np.ndarray]:
+    """(datetime64[D] values, outcome codes) for an object array of distinct strings"""
+    strings = pd.Series(strings, dtype=object).str.strip()
+    outcomes = np.full(len(strings), MALFORMED, dtype=np.int8)
+    outcomes[strings.isin(DATE_NULL_TOKENS).to_numpy()] = NULL
+    values = np.full(len(strings), NOT_A_DATE)
+
+    candidates = np.flatnonzero((strings.str.len() == 8).to_numpy() & (outcomes != NULL))
+    # 8 characters as 8 UCS-4 code points per row: digits are code points 48-57
+    digits = strings.to_numpy(dtype=object)[candidates].astype('U8').view(np.uint32).reshape(-1, 8) - 48
+    all_digits = (digits <= 9).all(axis=1)
+    candidates, digits = candidates[all_digits], digits[all_digits][:, DATE_LAYOUTS[layout]].astype(np.int64)
+
+    number = digits @ DIGIT_WEIGHTS
+    year, month, day = number // 10000, number // 100 % 100, number % 100
+    months = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype('datetime64[M]')
+    first_day = months.astype('datetime64[D]')
+    days_in_month = ((months + 1).astype('datetime64[D]') - first_day).astype(np.int64)
+    real = (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+
+    outcomes[candidates] = np.where(real, VALID, INVALID_DATE)
+    values[candidates[real]] = first_day[real] + (day[real] - 1)
+    if bounds is not None:
+        outside = (outcomes == VALID) & ((values < np.datetime64(bounds[0], 'D')) |
+                                         (values > np.datetime64(bounds[1], 'D')))
+        outcomes[outside] = OUT_OF_RANGE
+        values[outside] = NOT_A_DATE
+    return values, outcomes
+
+
+def decode_yyyymmdd(values: pd.Series, bounds: Optional[Tuple[str, str]] = None,
+                    layout: str = 'YYYYMMDD') -> Tuple[np.ndarray, Dict[str, int]]:
+    """datetime64[D] array (NaT = NULL) from YYYYMMDD strings, with calendar validation.
+
+    Accepts what the loaders' clean_date_value() passed through (8 digits after strip),
+    but also rejects impossible dates (20230231, 00000000) that used to fail the whole
+    COPY. Counts null, malformed (not 8 ASCII digits), invalid_date and - with inclusive
+    ISO date bounds - out_of_range per column. layout names another digit order from
+    DATE_LAYOUTS ('MMDDYYYY').
+    """
+    return _decode_column(values, lambda strings: _decode_yyyymmdd_text(strings, bounds, layout), DATE_OUTCOMES,
+                          NOT_A_DATE)
+
+
+def decode_date_columns(frame: pd.DataFrame, columns: Sequence[str], report: Optional[CodecReport] = None,
+                        bounds: Optional[Dict[str, Tuple[str, str]]] = None, keep_text: Sequence[str] = (),
+                        layouts: Optional[Dict[str, str]] = None) -> None:
+    """decode_yyyymmdd() each present column of frame in place.
+
+    Columns in keep_text (text_date_columns(): stored as VARCHAR(8)) are validated the
+    same way but keep their 8-digit text - a datetime64 would be COPYed as 'YYYY-MM-DD'.
+    layouts maps columns whose dictionary format is not YYYYMMDD to theirs ('MMDDYYYY').
+    """
+    for column in columns:
+        if column in frame.columns:
+            decoded, counts = decode_yyyymmdd(frame[column], (bounds or {}).get(column),
+                                              (layouts or {}).get(column, 'YYYYMMDD'))
+            if column in keep_text:
+                frame[column] = frame[column].astype(object).str.strip().where(~np.isnat(decoded))
+            else:
+                frame[column] = decoded
+            if report is not None:
+                report.add(column, counts)
+
+
+def text_date_columns(columns: Sequence[Tuple[str, str]], date_columns: Sequence[str]) -> List[str]:
+    """The date_columns the schema stores as text, from [(column_name, data_type)].
+
+    Takes fetch_columns() rows ('date', 'character varying') or migration_columns() items
+    ('DATE', 'VARCHAR(8)'); columns the schema does not declare keep their text too, as
+    the loaders always wrote them.
+    """
+    types = {name: data_type.lower() for name, data_type in columns}
+    return [column for column in date_columns
+            if not types.get(column, 'text').startswith(('date', 'timestamp'))]
+
+
+def integer_array(values: np.ndarray, target: str = 'bigint') -> Tuple[pd.arrays.IntegerArray, int]:
+    """(Int64 array, out-of-range count) from whole-number floats (NaN = NULL).
+
+    Values outside the Postgres target type become NULL instead of failing the COPY.
+    No Python object is created per cell. Integer text should go through decode_integer(),
+    which never passes through float.
+    """
+    low, high = INTEGER_RANGES[target]
+    missing = np.isnan(values)
+    # high + 1 as a float is exact (a power of two); high itself rounds up to 2 ** 63 for bigint
+    outside = ~missing & ((values < low) | (values >= high + 1))
+    missing |= outside
+    integers = np.where(missing, 0, values).astype(np.int64)
+    return pd.arrays.IntegerArray(integers, missing), int(outside.sum())
+
+
+def _round_half_even(text: str) -> Decimal:
+    """Exact value of decimal text rounded like the loaders' to_numeric(...).round(): half to even"""
+    return Decimal(text).to_integral_value(rounding=ROUND_HALF_EVEN)
+
+
+def _decode_integer_text(strings: np.ndarray, target: str) -> Tuple[pd.arrays.IntegerArray, np.ndarray]:
+    """(Int64 values, outcome codes) for an object array of distinct strings, parsed exactly"""
+    low, high = INTEGER_RANGES[target]
+    strings = pd.Series(strings, dtype=object).str.strip()
+    outcomes = np.full(len(strings), INTEGER_NON_NUMERIC, dtype=np.int8)
+    outcomes[(strings == '').to_numpy()] = NULL
+    integers = np.zeros(len(strings), dtype=np.int64)
+
+    # Plain integer text short enough for int64: numpy's object -> int64 cast is int() in C
+    plain = strings.str.fullmatch(INTEGER_TEXT).to_numpy(dtype=bool)
+    digits = strings.str.lstrip('+-').str.lstrip('0').str.len().to_numpy()
+    short = plain & (digits <= INT64_SAFE_DIGITS)
+    integers[short] = strings.to_numpy(dtype=object)[short].astype(np.int64)
+    outcomes[short] = np.where((integers[short] >= low) & (integers[short] <= high), VALID, OUT_OF_RANGE)
+
+    # Longer integers, decimals and exponents ('70.0', '1e3'): Decimal, once per distinct string
+    decimal = strings.str.fullmatch(DECIMAL_TEXT).to_numpy(dtype=bool) & ~short
+    for i in np.flatnonzero(decimal):
+        value = _round_half_even(strings.iat[i])
+        if low <= value <= high:
+            integers[i], outcomes[i] = int(value), VALID
+        else:
+            outcomes[i] = OUT_OF_RANGE
+    return pd.arrays.IntegerArray(integers, outcomes != VALID), outcomes
+
+
+def decode_integer(values: pd.Series, target: str = 'bigint') -> Tuple[pd.arrays.IntegerArray, Dict[str, int]]:
+    """Int64 array from integer strings, as the loaders' to_numeric + round() + int() did.
+
+    Integer text is parsed exactly, never through float64, so BIGINT values above 2 ** 53
+    load unchanged. Unparseable values count as non_numeric; values outside the Postgres
+    target type ('smallint', 'integer', 'bigint') are nulled and counted as out_of_range.
+    """
+    return _decode_column(values, lambda strings: _decode_integer_text(strings, target), INTEGER_OUTCOMES, pd.NA)
+
+
+def integer_targets(columns: Sequence[Tuple[str, str]]) -> Dict[str, str]:
+    """{column: 'smallint'|'integer'|'bigint'} from [(column_name, data_type)] (column_audit.fetch_columns)"""
+    return {name: data_type for name, data_type in columns if data_type in INTEGER_RANGES}
+
+
+def decode_integer_columns(frame: pd.DataFrame, columns: Sequence[str], report: Optional[CodecReport] = None,
+                           targets: Optional[Dict[str, str]] = None, default_target: str = 'bigint') -> None:
+    """decode_integer() each present column of frame in place, range-checked against its target type"""
+    for column in columns:
+        if column in frame.columns:
+            decoded, counts = decode_integer(frame[column], (targets or {}).get(column, default_target))
+            frame[column] = decoded
+            if report is not None:
+                report.add(column, counts)
+
+
+def decode_numeric_columns(frame: pd.DataFrame, columns: Sequence[str], report: Optional[CodecReport] = None,
+                           bounds: Optional[Dict[str, Tuple[float, float]]] = None) -> None:
+    """decode_numeric() each present column of frame in place"""
+    for column in columns:
+        if column in frame.columns:
+            decoded, counts = decode_numeric(frame[column], (bounds or {}).get(column))
+            frame[column] = decoded
+            if report is not None:
+                report.add(column, counts)
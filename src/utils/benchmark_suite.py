@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+DataNest Loader Benchmark Suite
+Repeatable rows/sec, MB/s and peak RSS for each loader stage, gated against stored baselines.
+
+Every case runs on a synthetic OpenLien file (utils.synthetic_openlien) of a fixed size
+and seed, so runs on the same machine are comparable: the reader, the byte sanitizer,
+each value codec, the COPY text encoder and - when initdb/pg_ctl and psycopg2 are
+available - an end-to-end load into a throwaway local Postgres with all migrations.
+Each case is run `repeat` times and the fastest run kept. --save stores the results as
+this machine's baseline in benchmark_baselines.json; later runs exit 1 when a case's
+throughput drops (or its peak RSS grows) past the threshold. Baselines from another
+generator version are refused, since the data - not the code - would explain the change.
+
+    python src/utils/benchmark_suite.py --rows 100000 --save
+    python src/utils/benchmark_suite.py --rows 100000 --threshold 0.10
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.chunk_sizer import current_rss
+from pipeline.tsv_reader import Quarantine, iter_blocks, read_tsv_chunks
+from pipeline.value_codecs import decode_date_columns, decode_integer_columns, decode_numeric_columns
+from utils.data_dictionary import load_data_dictionary
+from utils.synthetic_openlien import GENERATOR_VERSION, generate_openlien
+
+# Optional - /proc/<pid>/statm covers Linux without it
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Optional - only the end-to-end case needs a database driver
+try:
+    import psycopg2
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    PSYCOPG2_AVAILABLE = False
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+BASELINE_PATH = os.path.join(REPO_ROOT, 'tests', 'benchmark_baselines.json')
+MIGRATIONS_DIR = os.path.join(REPO_ROOT, 'database', 'migrations')
+LOADER_DIR = os.path.join(REPO_ROOT, 'src', 'loaders')
+
+DEFAULT_ROWS = 100000
+DEFAULT_SEED = 7
+DEFAULT_REPEAT = 3
+SAMPLE_ROWS = 20000          # Codec and encoder cases work on one chunk-sized frame
+DEFAULT_THRESHOLD = 0.20     # 20% slower (or 20% more peak RSS) than the baseline fails - runs vary ~10%
+RSS_SLACK_MB = 32            # Peak RSS deltas this small are allocator noise, never a regression
+RSS_SAMPLE_SECONDS = 0.005
+
+CASES = ('reader', 'sanitizer', 'decode_dates', 'decode_numeric', 'decode_integer', 'copy_encode', 'end_to_end')
+
+
+def process_rss(pid: Optional[int] = None) -> Optional[int]:
+    """RSS of a process (this one by default) in bytes, None where it cannot be read"""
+    if pid is None:
+        return current_rss()
+    if PSUTIL_AVAILABLE:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class RssSampler(threading.Thread):
+    """Samples a process's RSS in the background; peak_growth is the high-water mark over the start"""
+
+    def __init__(self, pid: Optional[int] = None, interval: float = RSS_SAMPLE_SECONDS):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.start_rss = process_rss(pid)
+        self.peak = self.start_rss
+        self.stopped = threading.Event()
+
+    def _sample(self) -> None:
+        rss = process_rss(self.pid)
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self._sample()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+        self._sample()
+
+    @property
+    def peak_growth(self) -> Optional[int]:
+        if self.peak is None:
+            return None
+        return self.peak - (self.start_rss or 0)
+
+    def __enter__(self) -> 'RssSampler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+# =====================================================
+# Cases - each returns (rows, bytes, timed seconds)
+# =====================================================
+
+def column_groups() -> Dict[str, List[str]]:
+    """Header columns per codec, from the data dictionary"""
+    groups = {'dates': [], 'numeric': [], 'integer': []}
+    for field in load_data_dictionary():
+        if field.data_format == 'YYYYMMDD':
+            groups['dates'].append(field.header)
+        elif field.data_type in ('INT', 'BIGINT'):
+            groups['integer'].append(field.header)
+        elif field.data_type in ('DECIMAL', 'REAL'):
+            groups['numeric'].append(field.header)
+    return groups
+
+
+def _timed(work: Callable[[], Tuple[int, int]]) -> Tuple[int, int, float]:
+    start = time.perf_counter()
+    rows, nbytes = work()
+    return rows, nbytes, time.perf_counter() - start
+
+
+def bench_reader(path: str) -> Tuple[int, int, float]:
+    """Parsed rows with the loaders' quarantine screen (the generated file has over-long lines)"""
+    def work():
+        with Quarantine(path) as quarantine:
+            rows = sum(len(chunk) for chunk in read_tsv_chunks(path, chunksize=25000, quarantine=quarantine))
+        return rows, os.path.getsize(path)
+    return _timed(work)
+
+
+def bench_sanitizer(path: str) -> Tuple[int, int, float]:
+    """Sanitizer calls only - the block reads are not timed"""
+    sanitizer = ByteSanitizer()
+    rows = nbytes = 0
+    seconds = 0.0
+    for block in iter_blocks(path):
+        start = time.perf_counter()
+        sanitizer(block)
+        seconds += time.perf_counter() - start
+        rows += block.count(b'\n')
+        nbytes += len(block)
+    return rows - 1, nbytes, seconds  # Minus the header line
+
+
+def _text_bytes(frame: pd.DataFrame) -> int:
+    return int(sum(frame[column].str.len().sum() for column in frame.columns))
+
+
+def bench_codec(sample: pd.DataFrame, columns: Sequence[str], decode) -> Tuple[int, int, float]:
+    frame = sample[list(columns)].copy()
+    nbytes = _text_bytes(frame)
+
+    def work():
+        decode(frame, columns)
+        return len(frame), nbytes
+    return _timed(work)
+
+
+def bench_copy_encode(sample: pd.DataFrame, groups: Dict[str, List[str]]) -> Tuple[int, int, float]:
+    """COPY text of a decoded chunk, encoded as the loaders do"""
+    frame = sample.copy()
+    decode_date_columns(frame, groups['dates'])
+    decode_numeric_columns(frame, groups['numeric'])
+    decode_integer_columns(frame, groups['integer'])
+    encoded = {}
+
+    def work():
+        encoded['text'] = frame.to_csv(sep='\t', header=False, index=False, na_rep='\\N')
+        return len(frame), len(encoded['text'])
+    return _timed(work)
+
+
+class ThrowawayPostgres:
+    """A temporary Postgres cluster on a unix socket, with every migration applied"""
+
+    def __init__(self, work_dir: str):
+        self.data_dir = os.path.join(work_dir, 'pgdata')
+        self.socket_dir = work_dir
+        self.port = _free_port()
+        self.database = 'datanest_bench'
+        self.user = 'bench'
+
+    @staticmethod
+    def available() -> bool:
+        return PSYCOPG2_AVAILABLE and bool(shutil.which('initdb')) and bool(shutil.which('pg_ctl'))
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """config.py environment variables for this cluster (trust auth ignores the password)"""
+        return {'DB_HOST': self.socket_dir, 'DB_PORT': str(self.port), 'DB_USER': self.user,
+                'DB_PASSWORD': 'bench', 'DB_NAME': self.database}
+
+    def connect(self, database: Optional[str] = None):
+        return psycopg2.connect(host=self.socket_dir, port=self.port, user=self.user,
+                                dbname=database or self.database)
+
+    def __enter__(self) -> 'ThrowawayPostgres':
+        subprocess.run(['initdb', '-D', self.data_dir, '-U', self.user, '--auth=trust', '-E', 'UTF8'],
+                       check=True, capture_output=True)
+        options = f"-p {self.port} -k {self.socket_dir} -c listen_addresses='' -c fsync=off"
+        subprocess.run(['pg_ctl', '-D', self.data_dir, '-o', options, '-w', 'start'],
+                       check=True, capture_output=True)
+        conn = self.connect('postgres')
+        conn.autocommit = True
+        conn.cursor().execute(f"CREATE DATABASE {self.database}")
+        conn.close()
+
+        conn = self.connect()
+        cursor = conn.cursor()
+        for migration in sorted(name for name in os.listdir(MIGRATIONS_DIR) if name.endswith('.sql')):
+            with open(os.path.join(MIGRATIONS_DIR, migration), encoding='utf-8') as f:
+                cursor.execute(f.read())
+        conn.commit()
+        conn.close()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        subprocess.run(['pg_ctl', '-D', self.data_dir, '-m', 'immediate', 'stop'], capture_output=True)
+
+    def truncate(self) -> None:
+        conn = self.connect()
+        conn.cursor().execute("TRUNCATE datnest.properties")
+        conn.commit()
+        conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def bench_end_to_end(path: str, rows: int, postgres: ThrowawayPostgres,
+                     log_path: str) -> Tuple[int, int, float, Optional[int]]:
+    """The batch4a loader as a separate process; peak RSS is the loader's own"""
+    postgres.truncate()
+    script = ("import sys; sys.path.insert(0, sys.argv[1]); "
+              "from enhanced_production_loader_batch4a import enhanced_production_load; "
+              "enhanced_production_load(custom_file_path=sys.argv[2], test_mode=False)")
+    env = dict(os.environ, **postgres.env)
+    with open(log_path, 'ab') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, '-c', script, LOADER_DIR, path],
+                                   env=env, stdout=log, stderr=subprocess.STDOUT)
+        sampler = RssSampler(process.pid)
+        sampler.start_rss = 0  # Whole-process peak, not growth
+        with sampler:
+            returncode = process.wait()
+        seconds = time.perf_counter() - start
+    if returncode != 0:
+        raise RuntimeError(f"Loader exited with {returncode} - see {log_path}")
+    return rows, os.path.getsize(path), seconds, sampler.peak
+
+
+# =====================================================
+# Suite, baselines and the regression gate
+# =====================================================
+
+def _result(rows: int, nbytes: int, seconds: float, peak_rss: Optional[int]) -> Dict:
+    return {
+        'rows': rows,
+        'bytes': nbytes,
+        'seconds': round(seconds, 4),
+        'rows_per_sec': round(rows / seconds, 1) if seconds > 0 else 0.0,
+        'mb_per_sec': round(nbytes / 1024 ** 2 / seconds, 2) if seconds > 0 else 0.0,
+        'peak_rss_mb': round(peak_rss / 1024 ** 2, 1) if peak_rss is not None else None,
+    }
+
+
+def _best_of(runs: List[Dict]) -> Dict:
+    """Fastest run, with the highest peak RSS seen in any run"""
+    best = dict(max(runs, key=lambda run: run['rows_per_sec']))
+    peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    best['peak_rss_mb'] = max(peaks) if peaks else None
+    return best
+
+
+def run_suite(rows: int = DEFAULT_ROWS, seed: int = DEFAULT_SEED, repeat: int = DEFAULT_REPEAT,
+              cases: Sequence[str] = CASES, sample_rows: int = SAMPLE_ROWS,
+              work_dir: Optional[str] = None, verbose: bool = True) -> Dict:
+    """Run the cases on a generated file; results keyed by case (skipped cases carry a reason)"""
+    owned_dir = None
+    if work_dir is None:
+        owned_dir = tempfile.TemporaryDirectory()
+        work_dir = owned_dir.name
+    try:
+        path = os.path.join(work_dir, f"Quantarium_OpenLien_bench_{rows}_{seed}_g{GENERATOR_VERSION}.TSV")
+        if not os.path.exists(path):
+            if verbose:
+                print(f"🧬 Generating {rows:,} synthetic rows (seed {seed})...")
+            generate_openlien(path, rows, seed=seed)
+
+        groups = column_groups()
+        sample = None
+        if {'decode_dates', 'decode_numeric', 'decode_integer', 'copy_encode'} & set(cases):
+            with Quarantine(path) as quarantine:
+                sample = next(read_tsv_chunks(path, chunksize=sample_rows, quarantine=quarantine))
+
+        runners = {
+            'reader': lambda: bench_reader(path),
+            'sanitizer': lambda: bench_sanitizer(path),
+            'decode_dates': lambda: bench_codec(sample, groups['dates'], decode_date_columns),
+            'decode_numeric': lambda: bench_codec(sample, groups['numeric'], decode_numeric_columns),
+            'decode_integer': lambda: bench_codec(sample, groups['integer'], decode_integer_columns),
+            'copy_encode': lambda: bench_copy_encode(sample, groups),
+        }
+        results = {'rows': rows, 'seed': seed, 'generator': GENERATOR_VERSION, 'repeat': repeat,
+                   'sample_rows': sample_rows, 'cases': {}}
+        for case in cases:
+            if case == 'end_to_end':
+                results['cases'][case] = _run_end_to_end(path, rows, repeat, work_dir, verbose)
+                continue
+            runs = []
+            for _ in range(repeat):
+                with RssSampler() as sampler:
+                    case_rows, nbytes, seconds = runners[case]()
+                runs.append(_result(case_rows, nbytes, seconds, sampler.peak_growth))
+            results['cases'][case] = _best_of(runs)
+            if verbose:
+                print(f"   ⏱️  {describe_result(case, results['cases'][case])}")
+        return results
+    finally:
+        if owned_dir is not None:
+            owned_dir.cleanup()
+
+
+def _run_end_to_end(path: str, rows: int, repeat: int, work_dir: str, verbose: bool) -> Dict:
+    if not ThrowawayPostgres.available():
+        reason = 'needs psycopg2 and initdb/pg_ctl on PATH'
+        if verbose:
+            print(f"   ⏭️  end_to_end skipped: {reason}")
+        return {'skipped': reason}
+    log_path = os.path.join(work_dir, 'end_to_end.log')
+    with ThrowawayPostgres(work_dir) as postgres:
+        runs = [_result(*bench_end_to_end(path, rows, postgres, log_path)) for _ in range(repeat)]
+    result = _best_of(runs)
+    if verbose:
+        print(f"   ⏱️  {describe_result('end_to_end', result)}")
+    return result
+
+
+def describe_result(case: str, result: Dict) -> str:
+    if 'skipped' in result:
+        return f"{case}: skipped ({result['skipped']})"
+    rss = f", peak RSS +{result['peak_rss_mb']:,.0f} MB" if result.get('peak_rss_mb') is not None else ''
+    return f"{case}: {result['rows_per_sec']:,.0f} rows/s, {result['mb_per_sec']:,.1f} MB/s{rss}"
+
+
+def machine_key() -> str:
+    """Baselines are per machine - throughput is not comparable across hosts"""
+    return f"{platform.node()}/{platform.machine()}/py{platform.python_version()}"
+
+
+def load_baseline(path: str = BASELINE_PATH, machine: Optional[str] = None) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f).get(machine or machine_key())
+
+
+def save_baseline(results: Dict, path: str = BASELINE_PATH, machine: Optional[str] = None) -> None:
+    baselines = {}
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            baselines = json.load(f)
+    baselines[machine or machine_key()] = dict(results, saved=time.strftime('%Y-%m-%d %H:%M:%S'))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """Regressions past the threshold, one line each; empty when the run passes"""
+    if (results['rows'], results['seed']) != (baseline['rows'], baseline['seed']):
+        raise ValueError(f"Baseline is for {baseline['rows']:,} rows, seed {baseline['seed']} - "
+                         f"rerun with those or --save a new baseline")
+    # Baselines saved before the generator was versioned came from the pooled (version 1) data
+    if results.get('generator', 1) != baseline.get('generator', 1):
+        raise ValueError(f"Baseline is for synthetic generator version {baseline.get('generator', 1)}, "
+                         f"this run used {results.get('generator', 1)} - --save a new baseline")
+    regressions = []
+    for case, result in results['cases'].items():
+        base = baseline['cases'].get(case)
+        if not base or 'skipped' in base or 'skipped' in result:
+            continue
+        floor = base['rows_per_sec'] * (1 - threshold)
+        if result['rows_per_sec'] < floor:
+            change = result['rows_per_sec'] / base['rows_per_sec'] - 1
+            regressions.append(f"{case}: {result['rows_per_sec']:,.0f} rows/s vs baseline "
+                               f"{base['rows_per_sec']:,.0f} ({change:+.0%})")
+        if result.get('peak_rss_mb') is not None and base.get('peak_rss_mb') is not None:
+            ceiling = max(base['peak_rss_mb'] * (1 + threshold), base['peak_rss_mb'] + RSS_SLACK_MB)
+            if result['peak_rss_mb'] > ceiling:
+                regressions.append(f"{case}: peak RSS +{result['peak_rss_mb']:,.0f} MB vs baseline "
+                                   f"+{base['peak_rss_mb']:,.0f} MB")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the loader stages against stored baselines")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--cases", default=','.join(CASES), help="Comma-separated subset of cases")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed throughput drop / peak RSS growth as a fraction")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="Store this run as the machine's baseline")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args()
+
+    cases = [case.strip() for case in args.cases.split(',') if case.strip()]
+    unknown = [case for case in cases if case not in CASES]
+    if unknown:
+        parser.error(f"Unknown cases {unknown}; choose from {', '.join(CASES)}")
+
+    print(f"🏁 DataNest benchmark suite on {machine_key()}")
+    results = run_suite(args.rows, args.seed, args.repeat, cases)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"💾 Baseline saved to {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"⚠️  No baseline for this machine in {args.baseline} - run with --save first")
+        sys.exit(0)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) past {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"   📉 {regression}")
+        sys.exit(1)
+    print(f"✅ Within {args.threshold:.0%} of the baseline from {baseline.get('saved', 'an earlier run')}")
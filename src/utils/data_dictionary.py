@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+DataNest OpenLien Data Dictionary
+Parses docs/specs/data_dictionary.txt into field specs and maps database columns to data categories
+"""
+
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+DATA_DICTIONARY_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'specs', 'data_dictionary.txt')
+
+CATEGORIES = [
+    'Property ID', 'Ownership', 'Property Sale', 'Property Location', 'Property Legal',
+    'County Values/Taxes', 'Parcel Ref', 'Land Characteristics', 'Building Characteristics',
+    'Financing', 'Foreclosure', 'Valuation',
+]
+
+# Field #, category, display name, header, max length, [TYPE](precision), format + description
+_FIELD_LINE = re.compile(
+    r'^\s*(\d+)\s+(.*?)\s{2,}(.*?)\s+(\S+)\s+(\d+)\s+(\[[A-Z]+\](?:\(\s*\d+(?:,\s*\d+)?\))?)\s+(.*)$'
+)
+
+# Database columns whose names drifted from the delivered header (renamed, _alt duplicates,
+# or fields added by the loader batches that are not in the published dictionary)
+CATEGORY_OVERRIDES = {
+    'apn': 'Property ID',
+    'latitude': 'Property Location',
+    'longitude': 'Property Location',
+    'flood_zone': 'Land Characteristics',
+    'land_use_code': 'Land Characteristics',
+    'view': 'Land Characteristics',
+    'view_code': 'Land Characteristics',
+    'building_area_gross': 'Building Characteristics',
+    'building_area_living': 'Building Characteristics',
+    'building_area_total': 'Building Characteristics',
+    'building_area_total_calculated': 'Building Characteristics',
+    'building_condition_code': 'Building Characteristics',
+    'building_quality_code': 'Building Characteristics',
+    'building_style': 'Building Characteristics',
+    'comments_summary_building_cards': 'Building Characteristics',
+    'floor_cover_alt': 'Building Characteristics',
+    'interior_walls_alt': 'Building Characteristics',
+    'number_of_bathrooms': 'Building Characteristics',
+    'number_of_stories': 'Building Characteristics',
+    'quality_and_condition_source': 'Building Characteristics',
+    'standardized_land_use_code_building': 'Building Characteristics',
+    'type_construction_alt': 'Building Characteristics',
+    'zoning_building': 'Building Characteristics',
+    'agricultural_exemption': 'County Values/Taxes',
+    'disability_exemption': 'County Values/Taxes',
+    'homestead_exemption': 'County Values/Taxes',
+    'senior_exemption': 'County Values/Taxes',
+    'veteran_exemption': 'County Values/Taxes',
+    'exemption_code': 'County Values/Taxes',
+    'tax_code_area': 'County Values/Taxes',
+    'property_tax_delinquent_flag': 'County Values/Taxes',
+    'assumable_loan_flag': 'Financing',
+    'bankruptcy_flag': 'Financing',
+    'cash_purchase_flag': 'Financing',
+    'construction_loan_flag': 'Financing',
+    'estate_sale_flag': 'Financing',
+    'owner_financed_flag': 'Financing',
+    'purchase_money_mortgage': 'Financing',
+    'reo_flag': 'Financing',
+    'seller_financed_flag': 'Financing',
+    'short_sale_flag': 'Financing',
+    'foreclosure_flag': 'Foreclosure',
+}
+
+
+class FieldSpec(NamedTuple):
+    number: int
+    category: str
+    display_name: str
+    header: str
+    max_length: int
+    data_type: str          # VARCHAR, INT, BIGINT, DECIMAL, REAL, CHAR
+    precision: Optional[str]
+    data_format: Optional[str]
+
+
+def normalize_name(name: str) -> str:
+    """Header/column comparison key: lowercase alphanumerics only"""
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+def _split_category(category: str, display_name: str):
+    """Recover lines where the category column ran into the display name"""
+    if category in CATEGORIES:
+        return category, display_name
+    for known in sorted(CATEGORIES, key=len, reverse=True):
+        if category.startswith(known):
+            return known, (category[len(known):] + ' ' + display_name).strip()
+    return category, display_name
+
+
+_dictionary_cache: Dict[str, List[FieldSpec]] = {}
+
+
+def load_data_dictionary(path: Optional[str] = None) -> List[FieldSpec]:
+    """Parse the data dictionary once per path (449 fields for the V2.6 spec)"""
+    path = os.path.abspath(path or DATA_DICTIONARY_PATH)
+    if path in _dictionary_cache:
+        return _dictionary_cache[path]
+
+    fields = []
+    with open(path, 'r', encoding='utf-8') as f:
+        next(f)  # Column titles
+        for line in f:
+            match = _FIELD_LINE.match(line.rstrip('\n'))
+            if not match:
+                continue
+            number, category, display_name, header, max_length, type_spec, rest = match.groups()
+            category, display_name = _split_category(category.strip(), display_name.strip())
+            type_match = re.match(r'\[([A-Z]+)\](?:\((.*)\))?', type_spec)
+            data_format = rest.split()[0] if rest.split() else None
+            fields.append(FieldSpec(
+                number=int(number),
+                category=category,
+                display_name=display_name,
+                header=header,
+                max_length=int(max_length),
+                data_type=type_match.group(1),
+                precision=type_match.group(2).replace(' ', '') if type_match.group(2) else None,
+                data_format=None if data_format == 'NaN' else data_format,
+            ))
+
+    _dictionary_cache[path] = fields
+    return fields
+
+
+_header_cache: Dict[str, Dict[str, FieldSpec]] = {}
+
+
+def fields_by_header(path: Optional[str] = None) -> Dict[str, FieldSpec]:
+    """Normalized header -> FieldSpec"""
+    path = os.path.abspath(path or DATA_DICTIONARY_PATH)
+    if path not in _header_cache:
+        _header_cache[path] = {normalize_name(field.header): field for field in load_data_dictionary(path)}
+    return _header_cache[path]
+
+
+def category_for_column(column_name: str, path: Optional[str] = None) -> str:
+    """Data category of a datnest.properties column ('Other' for loader-only columns)"""
+    if column_name in CATEGORY_OVERRIDES:
+        return CATEGORY_OVERRIDES[column_name]
+    field = fields_by_header(path).get(normalize_name(column_name))
+    return field.category if field else 'Other'
+
+
+if __name__ == "__main__":
+    from collections import Counter
+
+    fields = load_data_dictionary()
+    print(f"📖 Data dictionary: {len(fields)} fields")
+    for category, count in Counter(field.category for field in fields).items():
+        print(f"   📋 {category}: {count}")
+    print(f"🔢 Types: {dict(Counter(field.data_type for field in fields))}")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+DataNest Post-Load Finalize
+Index builds on several connections, extended statistics, ANALYZE, VACUUM (FREEZE) and an
+optional CLUSTER after a bulk load - in dependency order, with index build progress.
+
+The index definitions are the migrations' own CREATE INDEX statements on the table, so
+indexes dropped before a load (--drop-indexes) or left INVALID by a failed CONCURRENTLY
+build come back exactly as the migrations declare them. The steps form a small graph:
+
+    statistics ─┐
+    [cluster index ─> CLUSTER (fips_code, apn)] ─> ANALYZE ─> every missing index ─> VACUUM (FREEZE, ANALYZE)
+
+Each step runs as soon as the steps it follows are done, on a pool of autocommit
+connections; index builds are plain CREATE INDEX (SHARE locks, so they run side by side),
+which needs the table to be free of writers - finalize runs after the load, never during it.
+A monitor connection reports pg_stat_progress_create_index for the builds in flight.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.migration_schema import MIGRATIONS_DIR, sql_statements
+SCHEMA = 'datnest'
+TABLE = 'properties'
+CLUSTER_INDEX = 'idx_properties_fips_apn'          # (fips_code, apn) - deliveries arrive county by county
+EXTENDED_STATISTICS = {
+    'properties_state_city_zip': ('property_state', 'property_city_name', 'property_zip_code'),
+}
+DEFAULT_WORKERS = 4
+MAINTENANCE_WORK_MEM = '1GB'                        # Per connection: workers x this must fit in RAM
+PARALLEL_MAINTENANCE_WORKERS = 2
+PROGRESS_INTERVAL_SECONDS = 30.0
+
+INDEX_PATTERN = re.compile(
+    r"CREATE\s+(?P<unique>UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"(?P<name>\w+)\s+ON\s+(?:ONLY\s+)?(?:(?P<schema>\w+)\.)?(?P<table>\w+)\s*(?P<rest>.*)",
+    re.IGNORECASE | re.DOTALL)
+
+PROGRESS_QUERY = """
+    SELECT pid, phase, blocks_done, blocks_total, tuples_done, tuples_total
+    FROM pg_stat_progress_create_index
+"""
+
+
+# =====================================================
+# Index definitions from the migrations
+# =====================================================
+
+def migration_indexes(table: str = TABLE, migrations_dir: str = MIGRATIONS_DIR) -> Dict[str, Dict]:
+    """{index name: {'unique', 'sql'}} for the table, first definition winning like IF NOT EXISTS"""
+    indexes = {}
+    for path in sorted(glob.glob(os.path.join(migrations_dir, '*.sql'))):
+        with open(path, encoding='utf-8') as f:
+            statements = sql_statements(f.read())
+        for statement in statements:
+            match = INDEX_PATTERN.match(statement)
+            if not match or match.group('table').lower() != table or match.group('name') in indexes:
+                continue
+            unique = bool(match.group('unique'))
+            rest = ' '.join(match.group('rest').split())
+            indexes[match.group('name')] = {
+                'unique': unique,
+                'sql': (f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {match.group('name')} "
+                        f"ON {SCHEMA}.{table} {rest}"),
+            }
+    return indexes
+
+
+def existing_indexes(cursor, table: str = TABLE) -> Dict[str, bool]:
+    """{index name: valid} for the table's indexes"""
+    cursor.execute("""
+        SELECT c.relname, i.indisvalid
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = %s::regclass
+    """, (f"{SCHEMA}.{table}",))
+    return dict(cursor.fetchall())
+
+
+def drop_secondary_indexes(cursor, indexes: Dict[str, Dict], existing: Dict[str, bool]) -> List[str]:
+    """Drop the non-unique migration indexes before a bulk load; finalize rebuilds them"""
+    dropped = []
+    for name, index in indexes.items():
+        if not index['unique'] and name in existing:
+            cursor.execute(f"DROP INDEX IF EXISTS {SCHEMA}.{name}")
+            dropped.append(name)
+    return dropped
+
+
+# =====================================================
+# Plan: steps with dependencies
+# =====================================================
+
+def _step(name: str, statements: List[str], after: Sequence[str] = (), index: Optional[str] = None) -> Dict:
+    return {'name': name, 'statements': statements, 'after': list(after), 'index': index}
+
+
+def plan_finalize(indexes: Dict[str, Dict], existing: Dict[str, bool], table: str = TABLE,
+                  cluster: bool = False, vacuum: bool = True) -> List[Dict]:
+    """Finalize steps in dependency order; only missing or INVALID indexes are (re)built"""
+    qualified = f"{SCHEMA}.{table}"
+    steps = []
+    for name, columns in EXTENDED_STATISTICS.items():
+        steps.append(_step(f"statistics {name}", [
+            f"CREATE STATISTICS IF NOT EXISTS {SCHEMA}.{name} (ndistinct, dependencies) "
+            f"ON {', '.join(columns)} FROM {qualified}"]))
+    before_analyze = [step['name'] for step in steps]
+
+    def build(name: str, after: Sequence[str]) -> Dict:
+        statements = [indexes[name]['sql']]
+        if existing.get(name) is False:  # Left INVALID by a failed CONCURRENTLY build
+            statements.insert(0, f"DROP INDEX IF EXISTS {SCHEMA}.{name}")
+        return _step(f"index {name}", statements, after, index=name)
+
+    to_build = [name for name in indexes if not existing.get(name)]
+    if cluster:
+        after = []
+        if CLUSTER_INDEX in to_build:
+            to_build.remove(CLUSTER_INDEX)
+            steps.append(build(CLUSTER_INDEX, []))
+            after = [steps[-1]['name']]
+        elif CLUSTER_INDEX not in existing:
+            raise ValueError(f"{CLUSTER_INDEX} is neither in the migrations nor on {qualified}")
+        # Rewrites the table and every existing index - so before the other builds, not after
+        steps.append(_step('cluster', [f"CLUSTER {qualified} USING {CLUSTER_INDEX}"], after))
+        before_analyze.append('cluster')
+
+    steps.append(_step('analyze', [f"ANALYZE {qualified}"], before_analyze))
+    index_steps = [build(name, ['analyze']) for name in to_build]
+    steps.extend(index_steps)
+    if vacuum:
+        steps.append(_step('vacuum', [f"VACUUM (FREEZE, ANALYZE) {qualified}"],
+                           ['analyze'] + [step['name'] for step in index_steps]))
+    return steps
+
+
+# =====================================================
+# Runner
+# =====================================================
+
+def progress_lines(rows: Sequence[tuple], index_by_pid: Dict[int, str]) -> List[str]:
+    """pg_stat_progress_create_index rows of our builds, as one line each.
+
+    A plain CREATE INDEX reports index_relid 0, so builds are matched by backend pid.
+    """
+    lines = []
+    for pid, phase, blocks_done, blocks_total, tuples_done, tuples_total in rows:
+        name = index_by_pid.get(pid)
+        if name is None:
+            continue
+        if blocks_total:
+            done = f"{blocks_done / blocks_total:.0%} of {blocks_total:,} blocks"
+        elif tuples_total:
+            done = f"{tuples_done / tuples_total:.0%} of {tuples_total:,} tuples"
+        else:
+            done = ''
+        lines.append(f"{name}: {phase}" + (f" - {done}" if done else ''))
+    return lines
+
+
+class FinalizeRunner:
+    """Runs plan_finalize() steps on `workers` connections as their dependencies finish"""
+
+    def __init__(self, connect: Callable, workers: int = DEFAULT_WORKERS,
+                 maintenance_work_mem: str = MAINTENANCE_WORK_MEM,
+                 parallel_workers: int = PARALLEL_MAINTENANCE_WORKERS,
+                 progress_interval: float = PROGRESS_INTERVAL_SECONDS, report: Callable[[str], None] = print):
+        self.connect = connect
+        self.workers = workers
+        self.settings = [f"SET maintenance_work_mem = '{maintenance_work_mem}'",
+                         f"SET max_parallel_maintenance_workers = {int(parallel_workers)}"]
+        self.progress_interval = progress_interval
+        self.report = report
+        self.index_by_pid: Dict[int, str] = {}
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _cursor(self):
+        """This thread's autocommit connection (VACUUM cannot run in a transaction)"""
+        if getattr(self._local, 'cursor', None) is None:
+            conn = self.connect()
+            conn.autocommit = True
+            cursor = conn.cursor()
+            for statement in self.settings:
+                cursor.execute(statement)
+            cursor.execute("SELECT pg_backend_pid()")
+            self._local.pid = cursor.fetchone()[0]
+            self._local.cursor = cursor
+            with self._lock:
+                self._connections.append(conn)
+        return self._local.cursor
+
+    def _run_step(self, step: Dict) -> float:
+        cursor = self._cursor()
+        if step['index']:
+            self.index_by_pid[self._local.pid] = step['index']
+        start = time.time()
+        try:
+            for statement in step['statements']:
+                cursor.execute(statement)
+        finally:
+            self.index_by_pid.pop(self._local.pid, None)
+        return time.time() - start
+
+    def _monitor(self, stopped: threading.Event) -> None:
+        conn = None
+        try:
+            conn = self.connect()
+            conn.autocommit = True
+            cursor = conn.cursor()
+            while not stopped.wait(self.progress_interval):
+                if not self.index_by_pid:
+                    continue
+                cursor.execute(PROGRESS_QUERY)
+                for line in progress_lines(cursor.fetchall(), dict(self.index_by_pid)):
+                    self.report(f"   🔨 {line}")
+        except Exception as e:  # Progress is a nicety - never fail the finalize over it
+            self.report(f"   ⚠️  Progress monitor stopped: {e}")
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def run(self, steps: List[Dict]) -> Dict[str, Dict]:
+        """{step: {'status': done|failed|skipped, 'seconds', 'error'}}; dependents of a failure are skipped"""
+        results: Dict[str, Dict] = {}
+        pending = {step['name']: step for step in steps}
+        running = {}
+        stopped = threading.Event()
+        monitor = None
+        if self.progress_interval:
+            monitor = threading.Thread(target=self._monitor, args=(stopped,), daemon=True)
+            monitor.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while pending or running:
+                    for name, step in list(pending.items()):
+                        statuses = [results.get(dependency, {}).get('status') for dependency in step['after']]
+                        if any(status in ('failed', 'skipped') for status in statuses):
+                            results[name] = {'status': 'skipped', 'seconds': 0.0, 'error': None}
+                            self.report(f"⏭️  {name} skipped - a step it follows failed")
+                            del pending[name]
+                        elif all(status == 'done' for status in statuses):
+                            self.report(f"▶️  {name}")
+                            running[pool.submit(self._run_step, step)] = name
+                            del pending[name]
+                    if not running:
+                        for name in pending:  # Waiting on a step that is not in the plan
+                            results[name] = {'status': 'skipped', 'seconds': 0.0, 'error': 'unknown dependency'}
+                        pending.clear()
+                        continue
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name = running.pop(future)
+                        try:
+                            seconds = future.result()
+                            results[name] = {'status': 'done', 'seconds': seconds, 'error': None}
+                            self.report(f"✅ {name} ({seconds:,.1f}s)")
+                        except Exception as e:
+                            results[name] = {'status': 'failed', 'seconds': 0.0, 'error': str(e)}
+                            self.report(f"❌ {name}: {e}")
+        finally:
+            stopped.set()
+            if monitor is not None:
+                monitor.join()
+            for conn in self._connections:
+                conn.close()
+        return results
+
+
+def finalize_load(connect: Callable, table: str = TABLE, cluster: bool = False, vacuum: bool = True,
+                  workers: int = DEFAULT_WORKERS, **runner_options) -> Dict[str, Dict]:
+    """Plan against the live table and run it; returns the step results"""
+    conn = connect()
+    try:
+        cursor = conn.cursor()
+        steps = plan_finalize(migration_indexes(table), existing_indexes(cursor, table), table,
+                              cluster=cluster, vacuum=vacuum)
+        cursor.close()
+    finally:
+        conn.close()
+    return FinalizeRunner(connect, workers=workers, **runner_options).run(steps)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Post-load finalize: indexes, statistics, ANALYZE, VACUUM")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Connections building at once")
+    parser.add_argument("--cluster", action="store_true", help="CLUSTER by (fips_code, apn) first")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip VACUUM (FREEZE, ANALYZE)")
+    parser.add_argument("--maintenance-work-mem", default=MAINTENANCE_WORK_MEM)
+    parser.add_argument("--drop-indexes", action="store_true",
+                        help="Before a load: drop the non-unique migration indexes (finalize rebuilds them)")
+    parser.add_argument("--plan", action="store_true", help="Print the steps without running them")
+    args = parser.parse_args()
+
+    import psycopg2
+    from config import get_db_config
+
+    def connect():
+        return psycopg2.connect(**get_db_config())
+
+    indexes = migration_indexes()
+    conn = connect()
+    conn.autocommit = True
+    cursor = conn.cursor()
+    existing = existing_indexes(cursor)
+    if args.drop_indexes:
+        dropped = drop_secondary_indexes(cursor, indexes, existing)
+        print(f"🗑️  Dropped {len(dropped)} secondary indexes - run finalize after the load to rebuild them")
+        conn.close()
+        sys.exit(0)
+    steps = plan_finalize(indexes, existing, cluster=args.cluster, vacuum=not args.no_vacuum)
+    conn.close()
+
+    print(f"🏁 FINALIZE {SCHEMA}.{TABLE}: {len(steps)} steps on {args.workers} connections")
+    if args.plan:
+        for step in steps:
+            after = f" (after {', '.join(step['after'])})" if step['after'] else ''
+            print(f"   {step['name']}{after}")
+        sys.exit(0)
+
+    start = time.time()
+    results = FinalizeRunner(connect, workers=args.workers, maintenance_work_mem=args.maintenance_work_mem).run(steps)
+    failed = [name for name, result in results.items() if result['status'] != 'done']
+    print(f"\n{'❌' if failed else '🎉'} Finalize {'incomplete' if failed else 'complete'} "
+          f"in {(time.time() - start) / 60:.1f} minutes" + (f" - not done: {', '.join(failed)}" if failed else ''))
+    sys.exit(1 if failed else 0)
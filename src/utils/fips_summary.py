@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+DataNest FIPS Summary Tables
+Incrementally maintained per-county row counts, column completeness and value histograms.
+
+The loader calls chunk_fips_statistics() on each cleaned chunk and apply_chunk_statistics()
+inside the chunk's COPY transaction, so the summaries commit or roll back with the data.
+Audits read the summaries instead of scanning datnest.properties. Loaders finish with
+ensure_fips_summaries(), which rebuilds them when they do not account for every loaded row.
+"""
+
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.data_dictionary import category_for_column
+
+# Monetary and size columns that also get sum/min/max and a value histogram
+VALUE_COLUMNS = (
+    'estimated_value', 'total_assessed_value', 'total_market_value', 'tax_amount',
+    'lsale_price', 'lvalid_price', 'lot_size_square_feet', 'building_area_total',
+    'mtg01_loan_amount', 'mtg02_loan_amount', 'number_of_bedrooms', 'number_of_bathrooms',
+)
+
+BUCKETS_PER_DECADE = 20
+NON_POSITIVE_BUCKET = -1000
+
+STATE_FIPS = {
+    '01': 'AL', '02': 'AK', '04': 'AZ', '05': 'AR', '06': 'CA', '08': 'CO', '09': 'CT',
+    '10': 'DE', '11': 'DC', '12': 'FL', '13': 'GA', '15': 'HI', '16': 'ID', '17': 'IL',
+    '18': 'IN', '19': 'IA', '20': 'KS', '21': 'KY', '22': 'LA', '23': 'ME', '24': 'MD',
+    '25': 'MA', '26': 'MI', '27': 'MN', '28': 'MS', '29': 'MO', '30': 'MT', '31': 'NE',
+    '32': 'NV', '33': 'NH', '34': 'NJ', '35': 'NM', '36': 'NY', '37': 'NC', '38': 'ND',
+    '39': 'OH', '40': 'OK', '41': 'OR', '42': 'PA', '44': 'RI', '45': 'SC', '46': 'SD',
+    '47': 'TN', '48': 'TX', '49': 'UT', '50': 'VT', '51': 'VA', '53': 'WA', '54': 'WV',
+    '55': 'WI', '56': 'WY', '60': 'AS', '66': 'GU', '69': 'MP', '72': 'PR', '78': 'VI',
+}
+
+
+# =====================================================
+# Chunk statistics (pure pandas, no database)
+# =====================================================
+
+def histogram_buckets(values: pd.Series) -> np.ndarray:
+    """Log-scale bucket per value - must match the SQL in rebuild_fips_summaries()"""
+    values = values.astype(float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buckets = np.floor(np.log10(values.where(values > 0)) * BUCKETS_PER_DECADE)
+    return np.where(values > 0, buckets, NON_POSITIVE_BUCKET).astype(np.int64)
+
+
+def percentiles_from_histogram(histogram: Dict[int, int],
+                               percentiles: Sequence[float] = (0.25, 0.5, 0.75)) -> Dict[float, Optional[float]]:
+    """Approximate percentiles (log-interpolated within a bucket, ~6% resolution)"""
+    total = sum(histogram.values())
+    if total == 0:
+        return {p: None for p in percentiles}
+
+    ordered = sorted(histogram.items())
+    result = {}
+    for p in percentiles:
+        target = p * total
+        cumulative = 0
+        for bucket, count in ordered:
+            if cumulative + count >= target:
+                if bucket == NON_POSITIVE_BUCKET:
+                    result[p] = 0.0
+                else:
+                    fraction = (target - cumulative) / count if count else 0.0
+                    result[p] = 10 ** ((bucket + fraction) / BUCKETS_PER_DECADE)
+                break
+            cumulative += count
+    return result
+
+
+def _int_or_none(value):
+    return None if pd.isna(value) else int(value)
+
+
+def chunk_fips_statistics(clean_data: pd.DataFrame,
+                          value_columns: Iterable[str] = VALUE_COLUMNS) -> Dict[str, List[tuple]]:
+    """Per-FIPS statistics for one chunk, taken from the frame exactly as it is COPYed (NULLs as None/NaN)"""
+    fips = clean_data['fips_code'].fillna('UNKNOWN').astype(str)
+
+    pids = pd.to_numeric(clean_data['quantarium_internal_pid'], errors='coerce') \
+        if 'quantarium_internal_pid' in clean_data.columns else pd.Series(np.nan, index=clean_data.index)
+    pid_range = pids.groupby(fips).agg(['min', 'max'])
+    row_counts = fips.value_counts()
+
+    fips_rows = [
+        (code, int(row_counts[code]), _int_or_none(pid_range.at[code, 'min']),
+         _int_or_none(pid_range.at[code, 'max']))
+        for code in row_counts.index
+    ]
+
+    non_null = clean_data.notna().groupby(fips).sum()
+
+    value_stats = {}
+    histogram_rows = []
+    for column in value_columns:
+        if column not in clean_data.columns:
+            continue
+        values = pd.to_numeric(clean_data[column], errors='coerce')
+        present = values.notna()
+        value_stats[column] = values.groupby(fips).agg(['count', 'sum', 'min', 'max'])
+        if present.any():
+            buckets = pd.DataFrame({'fips': fips[present], 'bucket': histogram_buckets(values[present])})
+            for (code, bucket), count in buckets.groupby(['fips', 'bucket']).size().items():
+                histogram_rows.append((code, column, int(bucket), int(count)))
+
+    column_rows = []
+    for column in clean_data.columns:
+        category = category_for_column(column)
+        stats = value_stats.get(column)
+        for code in non_null.index:
+            if stats is not None and stats.at[code, 'count'] > 0:
+                values = (int(stats.at[code, 'count']), float(stats.at[code, 'sum']),
+                          float(stats.at[code, 'min']), float(stats.at[code, 'max']))
+            elif stats is not None:
+                values = (0, None, None, None)
+            else:
+                values = (None, None, None, None)
+            column_rows.append((code, column, category, int(non_null.at[code, column])) + values)
+
+    return {'fips': fips_rows, 'columns': column_rows, 'histogram': histogram_rows}
+
+
+# =====================================================
+# Database maintenance
+# =====================================================
+
+def apply_chunk_statistics(cursor, stats: Dict[str, List[tuple]]) -> None:
+    """Add one chunk's statistics to the summary tables (caller owns the transaction)"""
+    from psycopg2.extras import execute_values
+
+    execute_values(cursor, """
+        INSERT INTO datnest.fips_summary (fips_code, row_count, min_pid, max_pid)
+        VALUES %s
+        ON CONFLICT (fips_code) DO UPDATE SET
+            row_count = fips_summary.row_count + EXCLUDED.row_count,
+            min_pid = LEAST(fips_summary.min_pid, EXCLUDED.min_pid),
+            max_pid = GREATEST(fips_summary.max_pid, EXCLUDED.max_pid),
+            updated_at = CURRENT_TIMESTAMP
+    """, stats['fips'])
+
+    execute_values(cursor, """
+        INSERT INTO datnest.fips_column_summary
+            (fips_code, column_name, category, non_null_count, value_count, value_sum, value_min, value_max)
+        VALUES %s
+        ON CONFLICT (fips_code, column_name) DO UPDATE SET
+            non_null_count = fips_column_summary.non_null_count + EXCLUDED.non_null_count,
+            value_count = COALESCE(fips_column_summary.value_count + EXCLUDED.value_count,
+                                   fips_column_summary.value_count, EXCLUDED.value_count),
+            value_sum = COALESCE(fips_column_summary.value_sum + EXCLUDED.value_sum,
+                                 fips_column_summary.value_sum, EXCLUDED.value_sum),
+            value_min = LEAST(fips_column_summary.value_min, EXCLUDED.value_min),
+            value_max = GREATEST(fips_column_summary.value_max, EXCLUDED.value_max)
+    """, stats['columns'], page_size=1000)
+
+    if stats['histogram']:
+        execute_values(cursor, """
+            INSERT INTO datnest.fips_value_histogram (fips_code, column_name, bucket, row_count)
+            VALUES %s
+            ON CONFLICT (fips_code, column_name, bucket) DO UPDATE SET
+                row_count = fips_value_histogram.row_count + EXCLUDED.row_count
+        """, stats['histogram'], page_size=1000)
+
+
+def reset_fips_summaries(cursor) -> None:
+    """Empty the summaries - called alongside TRUNCATE properties (migration 023 also does it on any TRUNCATE)"""
+    cursor.execute("TRUNCATE datnest.fips_summary, datnest.fips_column_summary, datnest.fips_value_histogram")
+
+
+def rebuild_fips_summaries(cursor, value_columns: Iterable[str] = VALUE_COLUMNS) -> int:
+    """Recompute every summary from datnest.properties (backfill/repair - two full scans)"""
+    cursor.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'datnest' AND table_name = 'properties'
+          AND column_name NOT IN ('id', 'created_at', 'updated_at')
+        ORDER BY ordinal_position
+    """)
+    columns = [row[0] for row in cursor.fetchall()]
+    value_columns = [column for column in value_columns if column in columns]
+
+    select_list = [f'COUNT("{column}")' for column in columns]
+    for column in value_columns:
+        select_list += [f'SUM("{column}")', f'MIN("{column}")', f'MAX("{column}")']
+
+    cursor.execute(f"""
+        SELECT fips_code, COUNT(*),
+               MIN(NULLIF(regexp_replace(quantarium_internal_pid, '[^0-9]', '', 'g'), '')::bigint),
+               MAX(NULLIF(regexp_replace(quantarium_internal_pid, '[^0-9]', '', 'g'), '')::bigint),
+               {', '.join(select_list)}
+        FROM datnest.properties
+        GROUP BY fips_code
+    """)
+
+    stats = {'fips': [], 'columns': [], 'histogram': []}
+    for row in cursor.fetchall():
+        code, row_count, min_pid, max_pid = row[:4]
+        counts = row[4:4 + len(columns)]
+        aggregates = row[4 + len(columns):]
+        stats['fips'].append((code, row_count, min_pid, max_pid))
+        value_lookup = {column: aggregates[i * 3:i * 3 + 3] for i, column in enumerate(value_columns)}
+        for column, non_null_count in zip(columns, counts):
+            if column in value_lookup:
+                value_sum, value_min, value_max = value_lookup[column]
+                values = (non_null_count, value_sum, value_min, value_max)
+            else:
+                values = (None, None, None, None)
+            stats['columns'].append((code, column, category_for_column(column), non_null_count) + values)
+
+    if value_columns:
+        unpivot = ', '.join(f"('{column}', p.\"{column}\"::numeric)" for column in value_columns)
+        cursor.execute(f"""
+            SELECT p.fips_code, v.column_name,
+                   CASE WHEN v.value > 0 THEN floor(log(v.value) * {BUCKETS_PER_DECADE})::int
+                        ELSE {NON_POSITIVE_BUCKET} END AS bucket,
+                   COUNT(*)
+            FROM datnest.properties p
+            CROSS JOIN LATERAL (VALUES {unpivot}) AS v(column_name, value)
+            WHERE v.value IS NOT NULL
+            GROUP BY 1, 2, 3
+        """)
+        stats['histogram'] = cursor.fetchall()
+
+    reset_fips_summaries(cursor)
+    apply_chunk_statistics(cursor, stats)
+    return len(stats['fips'])
+
+
+# =====================================================
+# Readers for audits
+# =====================================================
+
+def _fips_filter(fips_prefix: Optional[str], alias: str = '') -> tuple:
+    if not fips_prefix:
+        return '', ()
+    return f" AND {alias}fips_code LIKE %s", (fips_prefix + '%',)
+
+
+def summaries_available(cursor) -> bool:
+    """True once migration 018 is applied and at least one county has been summarized"""
+    cursor.execute("SELECT to_regclass('datnest.fips_summary') IS NOT NULL")
+    if not cursor.fetchone()[0]:
+        return False
+    cursor.execute("SELECT EXISTS (SELECT 1 FROM datnest.fips_summary)")
+    return cursor.fetchone()[0]
+
+
+def total_rows(cursor, fips_prefix: Optional[str] = None) -> int:
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"SELECT COALESCE(SUM(row_count), 0) FROM datnest.fips_summary WHERE TRUE{where}", params)
+    return int(cursor.fetchone()[0])
+
+
+def summaries_cover(cursor, loaded_rows: int) -> bool:
+    """True when the summaries count exactly the rows a load reports in datnest.properties"""
+    if not loaded_rows:
+        return True
+    return summaries_available(cursor) and total_rows(cursor) == loaded_rows
+
+
+def ensure_fips_summaries(cursor, loaded_rows: int) -> Optional[int]:
+    """After a load: rebuild the summaries if any rows bypassed apply_chunk_statistics.
+
+    Returns the number of counties rebuilt, or None when the summaries were already complete.
+    """
+    if summaries_cover(cursor, loaded_rows):
+        return None
+    return rebuild_fips_summaries(cursor)
+
+
+def pid_range(cursor, fips_prefix: Optional[str] = None) -> tuple:
+    """(min_pid, max_pid, row_count)"""
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"""
+        SELECT MIN(min_pid), MAX(max_pid), COALESCE(SUM(row_count), 0)
+        FROM datnest.fips_summary WHERE TRUE{where}
+    """, params)
+    min_pid, max_pid, row_count = cursor.fetchone()
+    return min_pid, max_pid, int(row_count)
+
+
+def state_row_counts(cursor) -> List[tuple]:
+    """[(state, row_count)] by FIPS state prefix, largest first"""
+    cursor.execute("SELECT state_fips, row_count FROM datnest.vw_state_summary ORDER BY row_count DESC")
+    return [(STATE_FIPS.get(state_fips, state_fips), int(count)) for state_fips, count in cursor.fetchall()]
+
+
+def column_coverage(cursor, columns: Sequence[str], fips_prefix: Optional[str] = None) -> Dict[str, int]:
+    """Non-null counts per column (0 for columns never summarized)"""
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"""
+        SELECT column_name, SUM(non_null_count)
+        FROM datnest.fips_column_summary
+        WHERE column_name = ANY(%s){where}
+        GROUP BY column_name
+    """, (list(columns),) + params)
+    found = {column: int(count) for column, count in cursor.fetchall()}
+    return {column: found.get(column, 0) for column in columns}
+
+
+def value_summary(cursor, column: str, fips_prefix: Optional[str] = None) -> Dict[str, Optional[float]]:
+    """count/sum/min/max/avg for a VALUE_COLUMNS column"""
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"""
+        SELECT SUM(value_count), SUM(value_sum), MIN(value_min), MAX(value_max)
+        FROM datnest.fips_column_summary
+        WHERE column_name = %s{where}
+    """, (column,) + params)
+    count, total, minimum, maximum = cursor.fetchone()
+    return {
+        'count': int(count or 0),
+        'sum': float(total) if total is not None else None,
+        'min': float(minimum) if minimum is not None else None,
+        'max': float(maximum) if maximum is not None else None,
+        'avg': float(total) / int(count) if count else None,
+    }
+
+
+def value_percentiles(cursor, column: str, percentiles: Sequence[float] = (0.25, 0.5, 0.75),
+                      fips_prefix: Optional[str] = None) -> Dict[float, Optional[float]]:
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"""
+        SELECT bucket, SUM(row_count)
+        FROM datnest.fips_value_histogram
+        WHERE column_name = %s{where}
+        GROUP BY bucket
+    """, (column,) + params)
+    return percentiles_from_histogram({int(bucket): int(count) for bucket, count in cursor.fetchall()},
+                                      percentiles)
+
+
+def completeness_lines(cursor, categories: Sequence[str], fips_prefix: Optional[str] = None) -> List[str]:
+    """Populated-cell completeness of the given categories, for the readiness audits.
+
+    Their schema checks count columns, not how full they are; this reads the fill rates
+    from the summaries (nothing before the first summarized load).
+    """
+    if not summaries_available(cursor):
+        return []
+    lines = [f"📊 Loaded data completeness ({total_rows(cursor, fips_prefix):,} rows, from FIPS summaries):"]
+    for category, completeness in category_completeness(cursor, fips_prefix):
+        if category in categories:
+            lines.append(f"   📋 {category}: {completeness:.1f}% of cells populated")
+    return lines
+
+
+def category_completeness(cursor, fips_prefix: Optional[str] = None) -> List[tuple]:
+    """[(category, completeness_pct)] across the selected counties"""
+    where, params = _fips_filter(fips_prefix)
+    cursor.execute(f"""
+        SELECT category, ROUND(100.0 * SUM(non_null_cells) / NULLIF(SUM(total_cells), 0), 2)
+        FROM datnest.vw_fips_category_completeness
+        WHERE TRUE{where}
+        GROUP BY category
+        ORDER BY category
+    """, params)
+    return [(category, float(pct or 0)) for category, pct in cursor.fetchall()]
+
+
+if __name__ == "__main__":
+    import psycopg2
+    from config import get_db_config
+
+    conn = psycopg2.connect(**get_db_config())
+    cursor = conn.cursor()
+    if '--rebuild' in sys.argv:
+        print("🔄 Rebuilding FIPS summaries from datnest.properties...")
+        counties = rebuild_fips_summaries(cursor)
+        conn.commit()
+        print(f"✅ Summarized {counties:,} counties")
+
+    print(f"📊 Rows: {total_rows(cursor):,}")
+    for state, count in state_row_counts(cursor):
+        print(f"   📍 {state}: {count:,}")
+    for category, pct in category_completeness(cursor):
+        print(f"   📋 {category}: {pct:.1f}% complete")
+    cursor.close()
+    conn.close()
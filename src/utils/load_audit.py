@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+DataNest Load Audit
+Records file loads in datnest.data_processing_audit and bumps the load generation on completion
+"""
+
+from typing import Optional
+
+
+def start_load_audit(cursor, file_name: str, file_size_bytes: Optional[int] = None) -> int:
+    """Open an in_progress audit row for a file load and return its id"""
+    cursor.execute("""
+        INSERT INTO datnest.data_processing_audit (file_name, file_size_bytes, processing_status)
+        VALUES (%s, %s, 'in_progress')
+        RETURNING id
+    """, (file_name, file_size_bytes))
+    return cursor.fetchone()[0]
+
+
+def complete_load_audit(cursor, audit_id: int, total_records: int, successful_inserts: int,
+                        failed_inserts: int = 0, status: str = 'completed',
+                        error_message: Optional[str] = None) -> Optional[int]:
+    """Close an audit row and assign it the next load generation, which is returned
+
+    Failed loads bump the generation too: the table was already truncated or partly written.
+    """
+    cursor.execute("""
+        UPDATE datnest.data_processing_audit
+        SET processing_completed_at = CURRENT_TIMESTAMP,
+            processing_status = %s,
+            total_records_processed = %s,
+            successful_inserts = %s,
+            failed_inserts = %s,
+            error_message = %s,
+            load_generation = nextval('datnest.load_generation_seq')
+        WHERE id = %s
+        RETURNING load_generation
+    """, (status, total_records, successful_inserts, failed_inserts, error_message, audit_id))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def current_load_generation(cursor) -> int:
+    """Newest load generation (0 before the first tracked load)"""
+    cursor.execute("""
+        SELECT COALESCE(MAX(load_generation), 0)
+        FROM datnest.data_processing_audit
+        WHERE load_generation IS NOT NULL
+    """)
+    return cursor.fetchone()[0]
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+DataNest Migration Schema
+Column types of a table as database/migrations declares them, without a database.
+
+CREATE TABLE and ALTER TABLE ... ADD COLUMN statements are replayed in file order (the
+first definition wins, like ADD COLUMN IF NOT EXISTS), then ALTER COLUMN ... TYPE. Used
+where the live schema is out of reach: dry runs and tests that check what a loader
+writes against the columns it writes into.
+"""
+
+import glob
+import os
+import re
+import sys
+from typing import Dict, List
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'migrations')
+
+CREATE_PATTERN = re.compile(r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:\w+\.)?(?P<table>\w+)\s*\((?P<body>.*)\)",
+                            re.IGNORECASE | re.DOTALL)
+ALTER_PATTERN = re.compile(r"ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?(?:\w+\.)?(?P<table>\w+)\s+(?P<body>.*)",
+                           re.IGNORECASE | re.DOTALL)
+ADD_PATTERN = re.compile(r"ADD\s+(?:COLUMN\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(?P<name>\w+)\s+(?P<type>.*)",
+                         re.IGNORECASE | re.DOTALL)
+RETYPE_PATTERN = re.compile(r"ALTER\s+(?:COLUMN\s+)?(?P<name>\w+)\s+(?:SET\s+DATA\s+)?TYPE\s+(?P<type>.*)",
+                            re.IGNORECASE | re.DOTALL)
+# Where a column definition's type ends
+TYPE_END = re.compile(r"\s+(?:NOT\s+NULL|NULL|DEFAULT|PRIMARY|UNIQUE|REFERENCES|CHECK|CONSTRAINT|"
+                      r"GENERATED|COLLATE|USING)\b.*", re.IGNORECASE | re.DOTALL)
+TABLE_CONSTRAINTS = ('constraint', 'primary', 'unique', 'foreign', 'check', 'exclude')
+
+
+def sql_statements(text: str) -> List[str]:
+    """Statements of a migration with -- comments removed"""
+    text = re.sub(r'--[^\n]*', '', text)
+    return [statement.strip() for statement in text.split(';') if statement.strip()]
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses (DECIMAL(12,2) stays whole)"""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _column_type(definition: str) -> str:
+    return ' '.join(TYPE_END.sub('', definition).split()).upper()
+
+
+def migration_columns(table: str = 'properties', migrations_dir: str = MIGRATIONS_DIR) -> Dict[str, str]:
+    """{column: declared type} in declaration order, e.g. {'last_sale_date': 'DATE'}"""
+    columns: Dict[str, str] = {}
+    for path in sorted(glob.glob(os.path.join(migrations_dir, '*.sql'))):
+        with open(path, encoding='utf-8') as f:
+            statements = sql_statements(f.read())
+        for statement in statements:
+            create = CREATE_PATTERN.match(statement)
+            if create and create.group('table').lower() == table:
+                for definition in _split_top_level(create.group('body')):
+                    name = definition.split(None, 1)
+                    if len(name) == 2 and name[0].lower() not in TABLE_CONSTRAINTS:
+                        columns.setdefault(name[0].lower(), _column_type(name[1]))
+                continue
+            alter = ALTER_PATTERN.match(statement)
+            if not alter or alter.group('table').lower() != table:
+                continue
+            for clause in _split_top_level(alter.group('body')):
+                added = ADD_PATTERN.match(clause)
+                if added and added.group('name').lower() not in TABLE_CONSTRAINTS:
+                    columns.setdefault(added.group('name').lower(), _column_type(added.group('type')))
+                    continue
+                retyped = RETYPE_PATTERN.match(clause)
+                if retyped:
+                    columns[retyped.group('name').lower()] = _column_type(retyped.group('type'))
+    return columns
+
+
+def is_date_type(column_type: str) -> bool:
+    return column_type == 'DATE' or column_type.startswith('TIMESTAMP')
+
+
+def varchar_length(column_type: str):
+    """n for VARCHAR(n) / CHARACTER VARYING(n) / CHAR(n), else None"""
+    match = re.match(r"(?:VARCHAR|CHARACTER\s+VARYING|CHAR|CHARACTER)\s*\((\d+)\)", column_type)
+    return int(match.group(1)) if match else None
+
+
+if __name__ == "__main__":
+    table = sys.argv[1] if len(sys.argv) > 1 else 'properties'
+    columns = migration_columns(table)
+    print(f"📋 {table}: {len(columns)} columns from {os.path.normpath(MIGRATIONS_DIR)}")
+    for name, column_type in columns.items():
+        print(f"   {name:45s} {column_type}")
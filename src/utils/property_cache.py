@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+DataNest Property Lookup Cache
+Two-level cache for property documents keyed by PID, FIPS/APN and address key.
+
+Level 1 is an in-process LRU bounded by entry count, level 2 an optional SQLite file
+shared by every process on the host, bounded by row count (oldest writes evicted first).
+Every entry carries the load generation it was read under; when a loader completes a
+delivery it bumps the generation in datnest.data_processing_audit and all older entries
+become misses - the disk level deletes them the first time a cache sees the new generation.
+"""
+
+import os
+import pickle
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+# Add src to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.load_audit import current_load_generation
+
+DISK_MAX_ROWS = 1000000      # Shared SQLite level bound (a document is stored under up to 3 keys)
+DISK_TRIM_EVERY = 1000       # Puts between bound checks - the file may run this far over
+
+# address_key() in SQL - the expressions of idx_properties_address_key (migration 022)
+ADDRESS_KEY_SQL = (
+    r"upper(btrim(regexp_replace(property_full_street_address, '\s+', ' ', 'g')))",
+    r"left(btrim(regexp_replace(property_zip_code, '\s+', ' ', 'g')), 5)",
+)
+
+LOOKUP_QUERIES = {
+    'pid': "SELECT * FROM datnest.properties WHERE quantarium_internal_pid = %s LIMIT 1",
+    'apn': "SELECT * FROM datnest.properties WHERE fips_code = %s AND apn = %s ORDER BY id LIMIT 1",
+    'address': f"""
+        SELECT * FROM datnest.properties
+        WHERE {ADDRESS_KEY_SQL[0]} = %s AND {ADDRESS_KEY_SQL[1]} = %s
+        ORDER BY id LIMIT 1
+    """,
+}
+
+
+def _collapse_whitespace(text) -> str:
+    return re.sub(r'\s+', ' ', str(text)).strip()
+
+
+def address_key(street_address: Optional[str], zip_code: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Normalize a site address + ZIP into the cache's address key (same rules as ADDRESS_KEY_SQL)"""
+    if not street_address or not zip_code:
+        return None
+    return (_collapse_whitespace(street_address).upper(), _collapse_whitespace(zip_code)[:5])
+
+
+class DiskCache:
+    """Shared on-disk level backed by SQLite (safe across processes on one host)"""
+
+    def __init__(self, path: str, max_rows: int = DISK_MAX_ROWS, trim_every: int = DISK_TRIM_EVERY):
+        self.path = path
+        self.max_rows = max_rows
+        self.trim_every = trim_every
+        self._puts = 0
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS property_cache (
+                cache_key TEXT PRIMARY KEY,
+                generation INTEGER NOT NULL,
+                payload BLOB NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_property_cache_generation ON property_cache (generation)")
+        conn.commit()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, cache_key: str, generation: int):
+        row = self._connection().execute(
+            "SELECT payload FROM property_cache WHERE cache_key = ? AND generation = ?",
+            (cache_key, generation)
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, cache_key: str, generation: int, document) -> None:
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO property_cache (cache_key, generation, payload) VALUES (?, ?, ?)",
+            (cache_key, generation, pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL))
+        )
+        conn.commit()
+        self._puts += 1
+        if self._puts % self.trim_every == 0:
+            self.trim()
+
+    def trim(self) -> int:
+        """Evict the oldest writes beyond max_rows (REPLACE gives a rewritten key a new rowid)"""
+        conn = self._connection()
+        deleted = conn.execute(
+            "DELETE FROM property_cache WHERE rowid <= "
+            "(SELECT rowid FROM property_cache ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+            (self.max_rows,)
+        ).rowcount
+        conn.commit()
+        return deleted
+
+    def rows(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM property_cache").fetchone()[0]
+
+    def close(self) -> None:
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def purge_older_than(self, generation: int) -> int:
+        """Physically drop stale generations (they are already ignored by get)"""
+        conn = self._connection()
+        deleted = conn.execute("DELETE FROM property_cache WHERE generation < ?", (generation,)).rowcount
+        conn.commit()
+        return deleted
+
+
+class PropertyCache:
+    """LRU + optional shared disk cache for property documents with generation invalidation"""
+
+    def __init__(self, max_entries: int = 100000, disk_path: Optional[str] = None,
+                 connection_factory: Optional[Callable] = None,
+                 fetcher: Optional[Callable] = None,
+                 generation_source: Optional[Callable[[], int]] = None,
+                 generation_check_seconds: float = 30.0,
+                 disk_max_rows: int = DISK_MAX_ROWS):
+        self.max_entries = max_entries
+        self.disk = DiskCache(disk_path, max_rows=disk_max_rows) if disk_path else None
+        self.generation_check_seconds = generation_check_seconds
+        self._connection_factory = connection_factory
+        self._conn = None
+        self._fetcher = fetcher or self._fetch_from_database
+        self._generation_source = generation_source or self._generation_from_database
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._generation_checked_at = 0.0
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'not_found': 0,
+            'evictions': 0,
+            'invalidations': 0,
+            'disk_purged': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public lookups
+    # ------------------------------------------------------------------
+
+    def get_by_pid(self, pid: str) -> Optional[Dict]:
+        return self._lookup('pid', (str(pid),))
+
+    def get_by_apn(self, fips_code: str, apn: str) -> Optional[Dict]:
+        return self._lookup('apn', (str(fips_code), str(apn)))
+
+    def get_by_address(self, street_address: str, zip_code: str) -> Optional[Dict]:
+        key = address_key(street_address, zip_code)
+        return self._lookup('address', key) if key else None
+
+    def stats(self) -> Dict:
+        """Hit/miss counters plus current size and generation"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        stats['generation'] = self._generation
+        return stats
+
+    def invalidate(self) -> None:
+        """Drop the in-process level and force a generation re-check on the next lookup"""
+        with self._lock:
+            self._entries.clear()
+            self._generation_checked_at = 0.0
+            self._stats['invalidations'] += 1
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _lookup(self, kind: str, key: Tuple) -> Optional[Dict]:
+        generation = self._current_generation()
+        cache_key = self._cache_key(kind, key)
+
+        with self._lock:
+            if cache_key in self._entries:
+                self._entries.move_to_end(cache_key)
+                self._stats['memory_hits'] += 1
+                return self._entries[cache_key]
+
+        if self.disk is not None:
+            document = self.disk.get(cache_key, generation)
+            if document is not None:
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                self._remember(document, generation, extra_key=cache_key, write_disk=False)
+                return document
+
+        with self._lock:
+            self._stats['misses'] += 1
+        document = self._fetcher(kind, key)
+        if document is None:
+            with self._lock:
+                self._stats['not_found'] += 1
+            return None
+        self._remember(document, generation, extra_key=cache_key)
+        return document
+
+    def _remember(self, document: Dict, generation: int, extra_key: Optional[str] = None,
+                  write_disk: bool = True) -> None:
+        """Store a document under every key it can be looked up by"""
+        keys = {extra_key} if extra_key else set()
+        if document.get('quantarium_internal_pid'):
+            keys.add(self._cache_key('pid', (str(document['quantarium_internal_pid']),)))
+        if document.get('fips_code') and document.get('apn'):
+            keys.add(self._cache_key('apn', (str(document['fips_code']), str(document['apn']))))
+        addr = address_key(document.get('property_full_street_address'), document.get('property_zip_code'))
+        if addr:
+            keys.add(self._cache_key('address', addr))
+
+        with self._lock:
+            # A newer generation may have been observed while we were fetching
+            if generation != self._generation:
+                return
+            for cache_key in keys:
+                self._entries[cache_key] = document
+                self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+        if write_disk and self.disk is not None:
+            for cache_key in keys:
+                self.disk.put(cache_key, generation, document)
+
+    def _current_generation(self) -> int:
+        now = time.monotonic()
+        if self._generation is not None and now - self._generation_checked_at < self.generation_check_seconds:
+            return self._generation
+        generation = self._generation_source()
+        with self._lock:
+            changed = generation != self._generation
+            if changed:
+                if self._generation is not None:
+                    self._entries.clear()
+                    self._stats['invalidations'] += 1
+                self._generation = generation
+            self._generation_checked_at = now
+        if changed and self.disk is not None:
+            # Superseded generations can never be read again - free the shared file
+            purged = self.disk.purge_older_than(generation)
+            with self._lock:
+                self._stats['disk_purged'] += purged
+        return generation
+
+    @staticmethod
+    def _cache_key(kind: str, key: Tuple) -> str:
+        return kind + ':' + '\x1f'.join(key)
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            if self._connection_factory is None:
+                import psycopg2
+                from config import get_db_config
+                self._conn = psycopg2.connect(**get_db_config())
+            else:
+                self._conn = self._connection_factory()
+            self._conn.autocommit = True
+        return self._conn
+
+    def _fetch_from_database(self, kind: str, key: Tuple) -> Optional[Dict]:
+        with self._connection().cursor() as cursor:
+            cursor.execute(LOOKUP_QUERIES[kind], key)
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            columns = [desc[0] for desc in cursor.description]
+        return dict(zip(columns, row))
+
+    def _generation_from_database(self) -> int:
+        with self._connection().cursor() as cursor:
+            return current_load_generation(cursor)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python src/utils/property_cache.py <quantarium_internal_pid> [...]")
+        sys.exit(1)
+
+    cache = PropertyCache(max_entries=1000)
+    for pid in sys.argv[1:] * 2:  # Second pass demonstrates the hit path
+        start = time.perf_counter()
+        document = cache.get_by_pid(pid)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        status = "✅" if document else "❌"
+        print(f"{status} PID {pid}: {elapsed_ms:.2f} ms")
+    print(f"📊 Cache stats: {cache.stats()}")
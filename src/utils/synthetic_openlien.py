@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+DataNest Synthetic OpenLien Generator
+Deterministic, dictionary-driven OpenLien TSVs for tests and benchmarks on machines without the delivery files.
+
+Every one of the 449 columns is generated from its data dictionary spec (type, format,
+max length, name) - YYYYMMDD dates, numeric formats, flags, codes, standardized land use
+codes, names and addresses - with per-column null rates, sparse Mtg02-04 blocks and FIPS
+in contiguous county runs like the real files. Known dirty cases are injected at counted
+rates: building-area letter codes, "0" and impossible dates, NUL bytes, Y/N in numeric
+fields, over-long lines and short (key fields only) lines. High-cardinality columns are
+generated per row with vectorized NumPy formatting; only code-like columns (flags, codes,
+states, cities, lenders, names) draw from a small per-column pool. The same seed always
+writes the same bytes; counts go to <file>.manifest.json.
+
+    python src/utils/synthetic_openlien.py out.TSV --rows 1000000 --seed 7
+"""
+
+import argparse
+import functools
+import json
+import operator
+import os
+import re
+import sys
+import time
+import zipfile
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.data_dictionary import FieldSpec, load_data_dictionary
+
+LAND_USE_CODES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'docs', 'specs',
+                                   'standardized_land_use_codes.txt')
+MANIFEST_SUFFIX = '.manifest.json'
+GENERATOR_VERSION = 2        # Bumped whenever the output changes - 2: high-cardinality columns per row
+
+POOL_ROWS = 2048             # Distinct values of each low-cardinality (pooled) column
+BLOCK_ROWS = 5000            # Rows assembled and written per write() call
+DIRTY_RATE = 0.002           # Per-cell rate of each dirty case (zero dates are commoner)
+ZERO_DATE_RATE = 0.05
+MALFORMED_RATE = 0.0002      # Per-line rate of over-long and of short lines
+
+# Alabama counties (odd codes 001-133), like the first delivery file
+DEFAULT_COUNTIES = tuple(f"01{code:03d}" for code in range(1, 134, 2))
+
+BUILDING_AREA_CODES = ('B', 'G', 'P', 'A', 'D', 'C', 'S', 'L', 'BF', 'BU', 'GF', 'GU')
+STATES = ('AL', 'GA', 'FL', 'MS', 'TN', 'TX', 'CA', 'NY')
+CITIES = ('MOBILE', 'BIRMINGHAM', 'MONTGOMERY', 'HUNTSVILLE', 'TUSCALOOSA', 'HOOVER', 'DOTHAN',
+          'AUBURN', 'DECATUR', 'MADISON', 'FLORENCE', 'GADSDEN', 'VESTAVIA HILLS', 'PRATTVILLE')
+FIRST_NAMES = ('JOHN', 'MARY', 'JAMES', 'PATRICIA', 'ROBERT', 'LINDA', 'MICHAEL', 'BARBARA', 'WILLIAM',
+               'ELIZABETH', 'DAVID', 'JENNIFER', 'JOSÉ', 'MÜLLER', 'ANNA', 'THOMAS')
+LAST_NAMES = ('SMITH', 'JOHNSON', 'WILLIAMS', 'BROWN', 'JONES', 'GARCIA', 'MILLER', 'DAVIS', 'WILSON',
+              'ANDERSON', 'TAYLOR', 'MOORE', 'JACKSON', 'MARTIN', 'LEE', 'THOMPSON')
+STREET_NAMES = ('MAIN', 'OAK', 'PINE', 'MAPLE', 'CEDAR', 'ELM', 'DAUPHIN ISLAND', 'GOVERNMENT', 'AIRPORT',
+                'OLD SHELL', 'SPRINGHILL', 'CHURCH', 'LAKE', 'HILL', 'PARK', 'WASHINGTON')
+STREET_SUFFIXES = ('ST', 'AVE', 'RD', 'DR', 'LN', 'BLVD', 'CT', 'PKWY', 'WAY', 'CIR')
+LENDERS = ('WELLS FARGO BANK NA', 'REGIONS BANK', 'QUICKEN LOANS INC', 'BANK OF AMERICA NA',
+           'MORTGAGE ELECTRONIC REGISTRATION SYSTEMS INC', 'JPMORGAN CHASE BANK NA', 'PNC BANK NA')
+WORDS = ('LOT', 'BLOCK', 'UNIT', 'SUBDIVISION', 'ESTATES', 'ADDITION', 'PHASE', 'TRACT', 'SECTION', 'PARK')
+
+NUMERIC_FORMAT = re.compile(r'^-?9+(\.9+)?$')
+DIRTY_CASES = ('zero_dates', 'invalid_dates', 'area_codes', 'yes_no_numeric', 'nul_bytes')
+# Code-like columns with few distinct values in the real files - drawn from a per-column pool.
+# Everything else (prices, areas, loan amounts, dates, addresses, coordinates, legal text) is
+# generated per row, so decode costs and distinct counts scale like real data.
+POOLED_KINDS = ('flag', 'code', 'state', 'city', 'zip', 'land_use', 'lender', 'name', 'yy', 'yyyy')
+
+
+def load_land_use_codes(path: Optional[str] = None) -> List[str]:
+    """4-digit standardized land use codes ('1001: Single Family Residential' lines)"""
+    with open(path or LAND_USE_CODES_PATH, encoding='utf-8') as f:
+        return [line.split(':', 1)[0].strip() for line in f if re.match(r'^\d{4}:', line)]
+
+
+def manifest_path_for(file_path: str) -> str:
+    return file_path + MANIFEST_SUFFIX
+
+
+def column_kind(field: FieldSpec) -> str:
+    """Generator for a dictionary field, by format first, then name, then type/length"""
+    header = field.header.lower()
+    if field.data_format == 'YYYYMMDD':
+        return 'date'
+    if field.data_format in ('YYYY', 'YY', 'MMDDYYYY'):
+        return field.data_format.lower()
+    if 'latitude' in header or 'longitude' in header:
+        return 'latitude' if 'latitude' in header else 'longitude'
+    if 'land_use' in header:
+        return 'land_use'
+    if re.match(r'^building_area(_\d)?$', header):
+        return 'area'
+    if field.data_format and NUMERIC_FORMAT.match(field.data_format):
+        return 'number'
+    if field.data_type in ('INT', 'BIGINT', 'DECIMAL', 'REAL'):
+        return 'number'
+    if header.endswith('state'):
+        return 'state'
+    if 'plus4' in header:
+        return 'zip4'
+    if 'zip' in header:
+        return 'zip'
+    if 'city' in header:
+        return 'city'
+    if 'lender' in header and 'name' in header:
+        return 'lender'
+    if 'name' in header:
+        return 'name'
+    if 'address' in header:
+        return 'address'
+    if field.max_length <= 1:
+        return 'flag'
+    if field.max_length <= 4:
+        return 'code'
+    return 'text'
+
+
+FIRST_DAY, LAST_DAY = np.datetime64('1950-01-01'), np.datetime64('2025-04-14')
+# Every day of the range as YYYYMMDD / MMDDYYYY text, indexed by day offset - built once
+_DAY_TABLES: Dict[str, np.ndarray] = {}
+
+
+def _day_table(layout: str) -> np.ndarray:
+    if layout not in _DAY_TABLES:
+        days = np.arange(FIRST_DAY, LAST_DAY).astype(str)  # 'YYYY-MM-DD'
+        if layout == 'date':
+            text = [day[:4] + day[5:7] + day[8:] for day in days.tolist()]
+        else:
+            text = [day[5:7] + day[8:] + day[:4] for day in days.tolist()]
+        _DAY_TABLES[layout] = np.array(text, dtype=object)
+    return _DAY_TABLES[layout]
+
+
+def _dates(rng: np.random.Generator, n: int, layout: str = 'date') -> np.ndarray:
+    """A uniformly random day per row, as 8-digit text"""
+    table = _day_table(layout)
+    return table[rng.integers(0, len(table), n)]
+
+
+def _text(values) -> np.ndarray:
+    return np.array(list(map(str, values)), dtype=object)
+
+
+@functools.lru_cache(maxsize=None)
+def _suffixes(scale: int) -> np.ndarray:
+    """'.00' .. '.99' (for scale 2) indexed by the fraction - built once per scale"""
+    return np.array([f".{fraction:0{scale}d}" for fraction in range(10 ** scale)], dtype=object)
+
+
+def _numbers(rng: np.random.Generator, n: int, field: FieldSpec) -> np.ndarray:
+    data_format = field.data_format or '9' * min(field.max_length, 10)
+    if not NUMERIC_FORMAT.match(data_format):
+        data_format = '9' * min(field.max_length, 10)
+    integer_digits = len(data_format.lstrip('-').split('.')[0])
+    scale = len(data_format.split('.')[1]) if '.' in data_format else 0
+    # Log-uniform magnitudes: mostly small counts and prices, a long tail of large ones
+    values = np.floor(10 ** rng.uniform(0, min(integer_digits, 9), n)).astype(np.int64)
+    if scale:
+        suffixes = _suffixes(scale)
+        fractions = suffixes[rng.integers(0, len(suffixes), n)]
+        return np.array(list(map(operator.add, map(str, values.tolist()), fractions)), dtype=object)
+    if data_format.startswith('-'):
+        values = np.where(rng.random(n) < 0.1, -values, values)
+    return _text(values.tolist())
+
+
+def _phrases(rng: np.random.Generator, n: int, first: Sequence[str], second: Sequence[str],
+             numbers: np.ndarray, max_length: int, number_first: bool = False) -> np.ndarray:
+    """'<first> <second> <number>' (or '<number> <first> <second>') per row, cut to max_length"""
+    if number_first:
+        words = np.array([f" {a} {b}" for a in first for b in second], dtype=object)
+        text = list(map(operator.add, map(str, numbers.tolist()), words[rng.integers(0, len(words), n)]))
+    else:
+        words = np.array([f"{a} {b} " for a in first for b in second], dtype=object)
+        text = list(map(operator.add, words[rng.integers(0, len(words), n)], map(str, numbers.tolist())))
+    if max(map(len, text), default=0) > max_length:
+        text = [value[:max_length] for value in text]
+    return np.array(text, dtype=object)
+
+
+def column_values(rng: np.random.Generator, n: int, field: FieldSpec, kind: str,
+                  land_use_codes: Sequence[str]) -> np.ndarray:
+    """n clean values for one column (object array of str)"""
+    if kind in ('date', 'mmddyyyy'):
+        return _dates(rng, n, kind)
+    if kind == 'yyyy':
+        return _text(rng.integers(1900, 2026, n).tolist())
+    if kind == 'yy':
+        return np.array([f"{year:02d}" for year in rng.integers(0, 100, n).tolist()], dtype=object)
+    if kind == 'latitude':
+        return np.array([f"{value:.6f}" for value in rng.uniform(30.2, 35.0, n).tolist()], dtype=object)
+    if kind == 'longitude':
+        return np.array([f"{value:.6f}" for value in rng.uniform(-88.5, -84.9, n).tolist()], dtype=object)
+    if kind == 'land_use':
+        return np.array(land_use_codes, dtype=object)[rng.integers(0, len(land_use_codes), n)]
+    if kind in ('area', 'number'):
+        return _numbers(rng, n, field)
+    if kind == 'state':
+        return np.array(STATES, dtype=object)[rng.choice(len(STATES), n, p=[0.72] + [0.04] * 7)]
+    if kind == 'zip':
+        return _text(rng.integers(35004, 36926, n).tolist())
+    if kind == 'zip4':
+        return np.array([f"{value:04d}" for value in rng.integers(0, 10000, n).tolist()], dtype=object)
+    if kind == 'city':
+        return np.array(CITIES, dtype=object)[rng.integers(0, len(CITIES), n)]
+    if kind == 'lender':
+        lenders = [lender[:field.max_length] for lender in LENDERS]
+        return np.array(lenders, dtype=object)[rng.integers(0, len(lenders), n)]
+    if kind == 'name':
+        names = [f"{last} {first}"[:field.max_length] for last in LAST_NAMES for first in FIRST_NAMES]
+        return np.array(names, dtype=object)[rng.integers(0, len(names), n)]
+    if kind == 'address':
+        return _phrases(rng, n, STREET_NAMES, STREET_SUFFIXES, rng.integers(1, 20000, n), field.max_length,
+                        number_first=True)
+    if kind == 'flag':
+        return np.array(['Y', 'N', 'U'], dtype=object)[rng.choice(3, n, p=[0.35, 0.6, 0.05])]
+    if kind == 'code':
+        alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+        width = max(1, min(field.max_length, 3))
+        vocabulary = [''.join(alphabet[i] for i in rng.integers(0, len(alphabet), width).tolist()) for _ in range(12)]
+        return np.array(vocabulary, dtype=object)[rng.integers(0, len(vocabulary), n)]
+    # Legal descriptions, subdivisions, document numbers: two words and a lot/tract number
+    return _phrases(rng, n, WORDS, WORDS, rng.integers(1, 100000, n), min(field.max_length, 40))
+
+
+def null_rate(rng: np.random.Generator, field: FieldSpec) -> float:
+    """Per-column share of empty cells - the Mtg02-Mtg04 blocks are mostly empty"""
+    if field.number <= 3:
+        return 0.0
+    if re.match(r'^mtg0[234]_', field.header.lower()):
+        return float(rng.uniform(0.8, 0.98))
+    return float(rng.uniform(0.05, 0.6))
+
+
+class SyntheticOpenLien:
+    """Deterministic OpenLien row source: header(), then blocks of TSV bytes"""
+
+    def __init__(self, seed: int = 0, dirty: bool = True, counties: Sequence[str] = DEFAULT_COUNTIES,
+                 pool_rows: int = POOL_ROWS, dictionary_path: Optional[str] = None):
+        self.seed = seed
+        self.dirty = dirty
+        self.counties = list(counties)
+        self.fields = load_data_dictionary(dictionary_path)
+        self.field_count = len(self.fields)
+        self.rng = np.random.default_rng(seed)
+        self.counts = {case: 0 for case in DIRTY_CASES + ('long_lines', 'short_lines')}
+        self.land_use_codes = load_land_use_codes()
+        self.kinds = [column_kind(field) for field in self.fields[3:]]
+        self.null_rates = [null_rate(self.rng, field) for field in self.fields[3:]]
+        # Low-cardinality columns draw from a fixed pool of values; the rest are generated per row
+        self.pools = {j: column_values(self.rng, pool_rows, field, kind, self.land_use_codes)
+                      for j, (field, kind) in enumerate(zip(self.fields[3:], self.kinds)) if kind in POOLED_KINDS}
+
+    def header(self) -> bytes:
+        return ('\t'.join(field.header for field in self.fields) + '\n').encode('utf-8')
+
+    def _column(self, j: int, n: int, kept: np.ndarray) -> np.ndarray:
+        """Values of tail column j for n rows, nulls and dirty cases applied (counted where kept)"""
+        rng = self.rng
+        field, kind = self.fields[3 + j], self.kinds[j]
+        empty = rng.random(n) < self.null_rates[j]
+        present = np.flatnonzero(~empty)
+        values = np.full(n, '', dtype=object)
+        # Only the present cells are generated - the Mtg02-04 blocks are mostly empty
+        if j in self.pools:
+            pool = self.pools[j]
+            values[present] = pool[rng.integers(0, len(pool), len(present))]
+        else:
+            values[present] = column_values(rng, len(present), field, kind, self.land_use_codes)
+        draws = rng.random(n)
+        if not self.dirty:
+            return values
+        dirty = ~empty & (draws < DIRTY_RATE)
+        if kind == 'date':
+            zero = empty & (draws < ZERO_DATE_RATE)
+            values[zero] = '0'
+            values[dirty] = [value[:4] + '0231' for value in values[dirty]]  # Feb 31st
+            self.counts['zero_dates'] += int((zero & kept).sum())
+            self.counts['invalid_dates'] += int((dirty & kept).sum())
+        elif kind == 'area':
+            values[dirty] = [BUILDING_AREA_CODES[i % len(BUILDING_AREA_CODES)] for i in range(dirty.sum())]
+            self.counts['area_codes'] += int((dirty & kept).sum())
+        elif kind == 'number':
+            values[dirty] = [('N', 'Y')[i % 2] for i in range(dirty.sum())]
+            self.counts['yes_no_numeric'] += int((dirty & kept).sum())
+        elif kind in ('text', 'name', 'address', 'city'):
+            values[dirty] = [value[:2] + '\x00' + value[2:] for value in values[dirty]]
+            self.counts['nul_bytes'] += int((dirty & kept).sum())
+        return values
+
+    def _fips_schedule(self, rows: int) -> np.ndarray:
+        """County index per row: contiguous runs in FIPS order, Pareto-sized like real counties"""
+        weights = self.rng.pareto(1.2, len(self.counties)) + 0.05
+        counts = self.rng.multinomial(rows, weights / weights.sum())
+        return np.repeat(np.arange(len(self.counties), dtype=np.int32), counts)
+
+    def blocks(self, rows: int, block_rows: int = BLOCK_ROWS):
+        """TSV bytes (no header) for `rows` rows, block_rows lines at a time"""
+        rng = self.rng
+        schedule = self._fips_schedule(rows)
+        for start in range(0, rows, block_rows):
+            n = min(block_rows, rows - start)
+            parcels = rng.integers(0, 10 ** 9, n)
+            fips_block = schedule[start:start + n]
+            keys = ['%d\t%s\t%03d-%02d-%04d' % (pid, self.counties[fips], parcel // 1000000 % 1000,
+                                                 parcel // 10000 % 100, parcel % 10000)
+                    for pid, fips, parcel in zip(range(start + 1, start + n + 1), fips_block.tolist(),
+                                                 parcels.tolist())]
+            # Over-long lines (an extra field - quarantined) and short lines (the key fields only)
+            draws = rng.random(n) if self.dirty else np.ones(n)
+            long_lines, short_lines = draws < MALFORMED_RATE, (draws >= MALFORMED_RATE) & (draws < 2 * MALFORMED_RATE)
+            # A short line's tail is not in the file, so neither are its dirty cells
+            columns = [self._column(j, n, ~short_lines) for j in range(len(self.kinds))]
+            lines = ['\t'.join(row) for row in zip(keys, *columns)]
+            for row in np.flatnonzero(long_lines).tolist():
+                lines[row] += '\tEXTRA_FIELD'
+            for row in np.flatnonzero(short_lines).tolist():
+                lines[row] = keys[row]
+            self.counts['long_lines'] += int(long_lines.sum())
+            self.counts['short_lines'] += int(short_lines.sum())
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+def _write_all(f, source: SyntheticOpenLien, rows: int) -> int:
+    written = f.write(source.header())
+    for body in source.blocks(rows):
+        written += f.write(body)
+    return written
+
+
+def generate_openlien(path: str, rows: int, seed: int = 0, dirty: bool = True,
+                      counties: Sequence[str] = DEFAULT_COUNTIES, pool_rows: int = POOL_ROWS) -> Dict:
+    """Write a synthetic OpenLien .TSV (or a .zip holding one) and its manifest; returns the manifest"""
+    start = time.perf_counter()
+    source = SyntheticOpenLien(seed=seed, dirty=dirty, counties=counties, pool_rows=pool_rows)
+    if path.lower().endswith('.zip'):
+        member = os.path.splitext(os.path.basename(path))[0] + '.TSV'
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+            with archive.open(member, 'w', force_zip64=True) as f:
+                written = _write_all(f, source, rows)
+    else:
+        with open(path, 'wb') as f:
+            written = _write_all(f, source, rows)
+    seconds = time.perf_counter() - start
+
+    manifest = {
+        'rows': rows,
+        'columns': source.field_count,
+        'seed': seed,
+        'generator': GENERATOR_VERSION,
+        'dirty': dirty,
+        'bytes': written,
+        'counties': len(counties),
+        'counts': source.counts,
+        'seconds': round(seconds, 3),
+    }
+    with open(manifest_path_for(path), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic OpenLien TSV")
+    parser.add_argument("path", help="Output .TSV (or .zip)")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--clean", action="store_true", help="No dirty cases or malformed lines")
+    args = parser.parse_args()
+
+    manifest = generate_openlien(args.path, args.rows, seed=args.seed, dirty=not args.clean)
+    megabytes = manifest['bytes'] / 1024 ** 2
+    print(f"🧬 {args.path}: {manifest['rows']:,} rows x {manifest['columns']} columns, {megabytes:,.1f} MB "
+          f"in {manifest['seconds']:.1f}s ({megabytes / manifest['seconds']:,.0f} MB/s)")
+    for case, count in manifest['counts'].items():
+        print(f"   🧪 {case}: {count:,}")
+    print(f"   📄 {manifest_path_for(args.path)}")
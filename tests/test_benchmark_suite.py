@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite Tests
+Validates the per-case metrics, RSS sampling, baseline storage and the regression gate
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.benchmark_suite import (CASES, RssSampler, compare_to_baseline, describe_result, load_baseline,
+                                   run_suite, save_baseline)
+
+
+def test_suite_metrics_and_gate():
+    print("🧪 Testing benchmark cases and regression gate...")
+    cases = [case for case in CASES if case != 'end_to_end']
+    results = run_suite(rows=3000, seed=1, repeat=1, cases=cases, sample_rows=1000, verbose=False)
+    assert list(results['cases']) == cases
+    for case, result in results['cases'].items():
+        assert result['rows'] > 0 and result['bytes'] > 0 and result['rows_per_sec'] > 0, case
+        assert result['mb_per_sec'] > 0, case
+    assert 2990 <= results['cases']['reader']['rows'] <= 3000  # Minus quarantined lines
+    assert 990 <= results['cases']['copy_encode']['rows'] == results['cases']['decode_dates']['rows'] <= 1000
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'baselines.json')
+        assert load_baseline(path) is None
+        save_baseline(results, path, machine='bench-a')
+        save_baseline(results, path, machine='bench-b')
+        baseline = load_baseline(path, machine='bench-a')
+    assert baseline['cases'] == results['cases'] and 'saved' in baseline
+
+    assert compare_to_baseline(results, baseline) == []
+    faster = dict(baseline, cases={case: dict(result, rows_per_sec=result['rows_per_sec'] * 2)
+                                   for case, result in baseline['cases'].items()})
+    regressions = compare_to_baseline(results, faster, threshold=0.2)
+    assert len(regressions) == len(cases) and '(-50%)' in regressions[0]
+    assert compare_to_baseline(results, faster, threshold=0.6) == []
+
+    leaner = dict(baseline, cases={'reader': dict(baseline['cases']['reader'], peak_rss_mb=0.0)})
+    results['cases']['reader']['peak_rss_mb'] = 500.0
+    assert [line.split(':')[0] for line in compare_to_baseline(results, leaner)] == ['reader']
+
+    try:
+        compare_to_baseline(dict(results, rows=9999), baseline)
+        assert False, "Different row counts must not be compared"
+    except ValueError:
+        pass
+    pooled = {key: value for key, value in baseline.items() if key != 'generator'}
+    try:
+        compare_to_baseline(results, pooled)
+        assert False, "Baselines from the pooled generator must not be compared"
+    except ValueError as error:
+        assert 'generator version 1' in str(error)
+    print(f"  ✅ {describe_result('reader', baseline['cases']['reader'])}; gate flags 2x slowdowns")
+
+
+def test_rss_sampler():
+    print("🧪 Testing RSS sampler...")
+    with RssSampler() as sampler:
+        block = bytearray(64 * 1024 ** 2)
+        block[::4096] = b'\x01' * len(block[::4096])  # Touch every page
+        del block
+    if sampler.peak is None:
+        print("  ⚠️  RSS not readable here")
+        return
+    assert sampler.peak_growth >= 48 * 1024 ** 2
+    print(f"  ✅ Peak growth {sampler.peak_growth / 1024 ** 2:,.0f} MB for a 64 MB buffer")
+
+
+if __name__ == "__main__":
+    test_suite_metrics_and_gate()
+    test_rss_sampler()
+    print("\n🎉 Benchmark suite tests complete")
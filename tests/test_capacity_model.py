@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Capacity Model Tests
+Validates byte-offset ETAs per file and delivery, the client/database cost split and the scaling limits
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzers.capacity_model import (MB, CapacityModel, delivery_progress, eta_lines, file_progress,
+                                      prediction_lines)
+from pipeline.telemetry import LoadTelemetry
+
+
+def write_source(path, nbytes):
+    with open(path, 'wb') as f:
+        f.write(b'x' * nbytes)
+
+
+def log_chunks(path, chunks, chunk_bytes, client_seconds, db_seconds, rows=1000):
+    """A loader's telemetry for `chunks` chunks of chunk_bytes source bytes each"""
+    with LoadTelemetry.for_file(path, profiler=None) as telemetry:
+        for chunk_num in range(1, chunks + 1):
+            telemetry.add('read', client_seconds / 2, rows, chunk_bytes)
+            telemetry.add('clean', client_seconds / 2, rows)
+            telemetry.add('encode', 0.0, rows, chunk_bytes * 2)  # COPY text is not source bytes
+            telemetry.add('copy', db_seconds, rows, chunk_bytes)
+            # Chunk wall time as if the stages had really taken that long
+            telemetry._chunk_started = time.perf_counter() - client_seconds - db_seconds
+            telemetry.chunk_done(chunk_num, rows)
+    return telemetry.jsonl_path
+
+
+def test_live_eta():
+    print("🧪 Testing per-file and delivery ETA...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = [os.path.join(tmp_dir, f"Quantarium_OpenLien_2025_0000{i}.TSV") for i in (1, 2, 3)]
+        for path in paths:
+            write_source(path, 10 * MB)
+        log_chunks(paths[0], 10, MB, 0.5, 0.5)   # Finished
+        log_chunks(paths[1], 4, MB, 1.5, 0.5)    # 40% at 0.5 MB/s
+
+        first, second, third = (file_progress(path) for path in paths)
+        assert first['status'] == 'done' and first['eta_seconds'] == 0.0 and first['rows'] == 10000
+        assert second['status'] == 'running' and second['done_bytes'] == 4 * MB
+        assert abs(second['bytes_per_sec'] - MB / 2) < MB * 0.01
+        assert abs(second['eta_seconds'] - 12) < 0.5
+        assert third['status'] == 'pending' and third['eta_seconds'] is None
+
+        delivery = delivery_progress(paths)
+        assert delivery['done_bytes'] == 14 * MB and abs(delivery['eta_seconds'] - 32) < 1
+        stalled = delivery_progress(paths, workers=2, now=time.time() + 3600)
+        assert stalled['files'][1]['status'] == 'stalled'
+        assert abs(stalled['bytes_per_sec'] - MB * 0.75 * 2) < MB * 0.02  # Median of 1 and 0.5 MB/s, 2 workers
+        lines = eta_lines(delivery)
+    assert lines[1].startswith('Quantarium_OpenLien_2025_00002.TSV: running, 40.0% of 10 MB')
+    assert lines[-1].startswith('Delivery: 46.7% of 30 MB')
+    print(f"  ✅ {lines[-1]}")
+
+
+def test_model_split_and_limits():
+    print("🧪 Testing capacity model and bottlenecks...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Quantarium_OpenLien_x.TSV')
+        log_path = log_chunks(path, 5, MB, client_seconds=3.0, db_seconds=1.0, rows=600)
+        model = CapacityModel.from_telemetry([log_path])
+    assert abs(model.client_seconds_per_byte * MB - 3.0) < 1e-6
+    assert abs(model.db_seconds_per_byte * MB - 1.0) < 1e-6
+    assert abs(model.rows_per_byte * MB - 600) < 1e-6
+
+    total = 1000 * MB
+    one = model.predict(total, workers=1, client_cores=32)
+    assert one['bottleneck'] == 'workers' and abs(one['seconds'] - 4000) < 1
+    assert abs(one['rows_per_sec'] - 150) < 0.1
+    # Client CPU caps at 8 cores / 3 s per MB
+    assert model.predict(total, workers=16, client_cores=8)['bottleneck'] == 'client CPU'
+    # A 4-connection writer pool under 32 workers: 4 MB/s of COPY
+    pooled = model.predict(total, workers=32, writers=4, client_cores=64)
+    assert pooled['bottleneck'] == 'writers' and abs(pooled['bytes_per_sec'] - 4 * MB) < 1
+    # More writers than a db.r5.large has vCPUs
+    small = model.predict(total, workers=32, writers=8, instance='db.r5.large', client_cores=64)
+    assert small['bottleneck'] == 'database vCPUs' and abs(small['bytes_per_sec'] - 2 * MB) < 1
+    # A very cheap pipeline runs into the storage bandwidth
+    cheap = CapacityModel(1e-9, 1e-9, 1e-4, source='test')
+    assert cheap.predict(total, workers=64, instance='db.r5.xlarge', client_cores=64)['bottleneck'] == 'storage'
+
+    table = model.table(total, [1, 8], ['db.r5.xlarge', 'db.r5.4xlarge'], client_cores=16)
+    assert len(table) == 4 and len(prediction_lines(table)) == 5
+    print(f"  ✅ {model.summary()}")
+
+
+def test_model_from_benchmark():
+    print("🧪 Testing capacity model from benchmark results...")
+
+    def case(rows, nbytes, seconds):
+        return {'rows': rows, 'bytes': nbytes, 'seconds': seconds}
+
+    results = {'rows': 1000, 'cases': {
+        'reader': case(1000, 2 * MB, 1.0),
+        'copy_encode': case(100, MB // 10, 0.2),     # 2 ms per row on a sample frame
+        'end_to_end': case(1000, 2 * MB, 6.0),
+    }}
+    model = CapacityModel.from_benchmark(results)
+    # Reader 0.5 s/MB + encoder 2 ms/row at 500 rows/MB = 1.5 s/MB; end to end 3 s/MB
+    assert abs(model.client_seconds_per_byte * MB - 1.5) < 1e-6
+    assert abs(model.db_seconds_per_byte * MB - 1.5) < 1e-6
+    assert abs(model.rows_per_byte * MB - 500) < 1e-6
+    print(f"  ✅ {model.summary()}")
+
+
+if __name__ == "__main__":
+    test_live_eta()
+    test_model_split_and_limits()
+    test_model_from_benchmark()
+    print("\n🎉 Capacity model tests complete")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Adaptive Chunk Sizer Tests
+Validates convergence on measured throughput, the RSS budget cap, per-layout memory and log replay
+"""
+
+import math
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pipeline.chunk_sizer as chunk_sizer
+from pipeline.chunk_sizer import ChunkSizer, read_chunk_log
+from pipeline.tsv_reader import read_tsv_chunks
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def throughput(rows, best_rows):
+    """Rows/sec peaking at best_rows - small chunks pay per-COPY overhead, big ones thrash"""
+    return 100000 * math.exp(-math.log(rows / best_rows) ** 2)
+
+
+def run_load(sizer, clock, best_rows, chunks=30):
+    for _ in range(chunks):
+        rows = sizer()
+        clock.now += rows / throughput(rows, best_rows)
+        sizer.chunk_done(rows)
+
+
+def test_converges_on_fastest_size():
+    print("🧪 Testing convergence on throughput...")
+    clock = FakeClock()
+    sizer = ChunkSizer(initial_rows=10000, clock=clock, rss=lambda: None)
+    run_load(sizer, clock, best_rows=60000)
+    assert sizer.converged
+    assert 45000 <= sizer.best_rows <= 80000
+    assert sizer.decisions[-1]['reason'] == 'converged' and sizer() == sizer.best_rows
+    print(f"  ✅ {sizer.summary()}")
+
+
+def test_rss_budget_caps_size():
+    print("🧪 Testing RSS budget cap...")
+    clock = FakeClock()
+    rss = {'bytes': 10 * 1024 ** 2}
+    sizer = ChunkSizer(initial_rows=10000, rss_budget_mb=100, clock=clock, rss=lambda: rss['bytes'])
+    for _ in range(30):
+        rows = sizer()
+        rss['bytes'] = 10 * 1024 ** 2 + rows * 2000  # 2 KB of RSS per row in flight
+        clock.now += rows / throughput(rows, 400000)  # Bigger is always faster here
+        sizer.chunk_done(rows)
+
+    cap = int((100 * 1024 ** 2 * chunk_sizer.BUDGET_HEADROOM - 10 * 1024 ** 2) / 2000)
+    assert sizer.memory_cap == cap
+    assert max(decision['rows'] for decision in sizer.decisions) <= cap
+    assert sizer.rows > cap / 2
+    print(f"  ✅ Held under {cap:,} rows: {sizer.summary()}")
+
+
+def test_reader_layout_memory_and_replay():
+    print("🧪 Testing adaptive reads, remembered sizes and replay...")
+    clock = FakeClock()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'layout.TSV')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write('PID\tFIPS_Code\tCity\n')
+            for i in range(200000):
+                f.write(f"{i}\t01{i % 67:03d}\tCITY{i % 13}\n")
+
+        sizer = ChunkSizer.for_file(path, initial_rows=2000, min_rows=500, max_rows=20000,
+                                    clock=clock, rss=lambda: None)
+        total = 0
+        for chunk in read_tsv_chunks(path, chunksize=sizer):
+            assert len(chunk) == sizer.rows or total + len(chunk) == 200000
+            total += len(chunk)
+            clock.now += len(chunk) / throughput(len(chunk), 8000)
+            sizer.chunk_done(len(chunk))
+        assert total == 200000
+        assert sizer.converged
+        assert len({decision['rows'] for decision in sizer.decisions}) > 2
+
+        logged = read_chunk_log(chunk_sizer.chunk_log_path_for(path))
+        assert [decision['rows'] for decision in logged] == [d['rows'] for d in sizer.decisions]
+        assert logged[0]['layout'] in ('3cols/16B', '3cols/32B')
+
+        remembered = ChunkSizer.for_file(path, initial_rows=2000, log_path=None)
+        assert remembered.rows == sizer.best_rows and remembered.step == chunk_sizer.FINE_STEP
+
+        replay = ChunkSizer.from_log(chunk_sizer.chunk_log_path_for(path))
+        replayed = []
+        for chunk in read_tsv_chunks(path, chunksize=replay):
+            replayed.append(len(chunk))
+            replay.chunk_done(len(chunk))
+    assert replayed == [decision['rows_read'] for decision in logged]
+    print(f"  ✅ {len(logged)} chunks, best {sizer.best_rows:,} rows remembered for {logged[0]['layout']}; replay identical")
+
+
+if __name__ == "__main__":
+    test_converges_on_fastest_size()
+    test_rss_budget_caps_size()
+    test_reader_layout_memory_and_replay()
+    print("\n🎉 Chunk sizer tests complete")
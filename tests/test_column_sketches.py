@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Streaming Column Sketch Tests
+Validates HyperLogLog accuracy, top-k, merging across workers and profile persistence
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.column_sketches import TableProfile, merge_profiles, profile_path_for
+
+
+def make_chunk(rng, rows):
+    return pd.DataFrame({
+        'apn': rng.integers(0, 40000, rows).astype(str).astype(object),
+        'property_state': rng.choice(['AL', 'AK', 'AZ', None], rows, p=[0.6, 0.2, 0.1, 0.1]),
+        'estimated_value': np.where(rng.random(rows) < 0.2, np.nan, rng.lognormal(12, 1, rows)),
+    })
+
+
+def test_single_stream_profile():
+    print("🧪 Testing single-stream profile...")
+    rng = np.random.default_rng(3)
+    chunks = [make_chunk(rng, 20000) for _ in range(5)]
+    data = pd.concat(chunks, ignore_index=True)
+
+    profile = TableProfile(source='test.tsv')
+    for chunk in chunks:
+        profile.update(chunk)
+
+    apn = profile.columns['apn'].summary()
+    exact_distinct = data['apn'].nunique()
+    assert abs(apn['distinct_estimate'] - exact_distinct) / exact_distinct < 0.05
+
+    state = profile.columns['property_state'].summary(top_k=3)
+    assert [value for value, _ in state['top_values']] == ['AL', 'AK', 'AZ']
+    assert abs(state['null_rate'] - data['property_state'].isna().mean()) < 1e-9
+    assert state['min'] == 'AK' and state['max'] == 'AZ'
+
+    value = profile.columns['estimated_value']
+    assert value.numeric is True
+    assert value.max == data['estimated_value'].max()
+    print(f"  ✅ ~{apn['distinct_estimate']:,} distinct APNs (exact {exact_distinct:,})")
+
+
+def test_merge_matches_single_stream():
+    """Profiles built by separate workers merge to the same sketch state as one stream"""
+    print("🧪 Testing profile merge...")
+    rng = np.random.default_rng(5)
+    chunks = [make_chunk(rng, 10000) for _ in range(4)]
+
+    single = TableProfile()
+    for chunk in chunks:
+        single.update(chunk)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for worker, worker_chunks in enumerate([chunks[:2], chunks[2:]]):
+            profile = TableProfile(source=f'worker{worker}.tsv')
+            for chunk in worker_chunks:
+                profile.update(chunk)
+            path = profile_path_for(os.path.join(tmp_dir, f'worker{worker}.tsv'))
+            profile.save(path)
+            paths.append(path)
+        merged = merge_profiles(paths)
+
+    assert merged.rows == single.rows == 40000
+    assert merged.sources == ['worker0.tsv', 'worker1.tsv']
+    for column in single.columns:
+        a, b = single.columns[column], merged.columns[column]
+        assert a.null_count == b.null_count
+        assert np.array_equal(a.hll.registers, b.hll.registers)
+        assert np.array_equal(a.length_histogram, b.length_histogram)
+        assert a.min == b.min and a.max == b.max
+    print("  ✅ Merged registers, nulls and ranges identical to a single stream")
+
+
+if __name__ == "__main__":
+    test_single_stream_profile()
+    test_merge_matches_single_stream()
+    print("\n🎉 Column sketch tests complete")
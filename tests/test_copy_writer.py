@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+COPY Bisection Tests
+Validates that bad rows are isolated with their errors while every good row still loads, and locality sorting
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.copy_writer import copy_with_bisection, record_rejects, sort_for_locality, RejectLimitExceeded
+
+
+class FakeCopyError(Exception):
+    def __init__(self, message, pgcode='22P02'):
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+class FakeCursor:
+    """Postgres stand-in: rows whose value is not an integer fail, savepoints roll back"""
+
+    def __init__(self, report_line=True, pgcode='22P02'):
+        self.report_line = report_line
+        self.pgcode = pgcode
+        self.table = []
+        self.pending = []
+        self.copies = 0
+        self.inserted = []
+
+    def execute(self, sql, params=None):
+        if sql.startswith('SAVEPOINT'):
+            self.pending = []
+        elif sql.startswith('ROLLBACK TO SAVEPOINT'):
+            self.pending = []
+        elif sql.startswith('RELEASE SAVEPOINT'):
+            self.table.extend(self.pending)
+            self.pending = []
+
+    def copy_from(self, f, table, columns, sep, null):
+        self.copies += 1
+        for number, line in enumerate(f.read().splitlines(), start=1):
+            key, value = line.split(sep)
+            if not value.lstrip('-').isdigit():
+                context = f"\nCONTEXT:  COPY {table}, line {number}" if self.report_line else ''
+                raise FakeCopyError(f'invalid input syntax for type integer: "{value}"{context}', self.pgcode)
+            self.pending.append((key, int(value)))
+
+    def executemany(self, sql, rows):
+        self.inserted.extend(rows)
+
+
+def copy_text(values):
+    return ''.join(f"k{i}\t{value}\n" for i, value in enumerate(values))
+
+
+def test_bad_rows_isolated():
+    print("🧪 Testing bisection around bad rows...")
+    values = [str(i) for i in range(1000)]
+    for bad in (3, 400, 401, 999):
+        values[bad] = 'N/A'
+
+    for report_line in (True, False):
+        cursor = FakeCursor(report_line=report_line)
+        result = copy_with_bisection(cursor, 'properties', ('key', 'value'), copy_text(values))
+        assert result.loaded == 996 and len(cursor.table) == 996
+        assert [reject.row_number for reject in result.rejects] == [4, 401, 402, 1000]
+        assert result.rejects[0].raw_row == 'k3\tN/A' and result.rejects[0].sqlstate == '22P02'
+        assert result.rejects[0].error.startswith('invalid input syntax')
+        assert result.copies == cursor.copies
+        assert result.copies < 60  # Not one COPY per row
+
+    record_rejects(cursor, result.rejects, 'properties', 'file.TSV', chunk_num=8, audit_id=42)
+    assert cursor.inserted[0] == (42, 'properties', 'file.TSV', 8, 4, '22P02', result.rejects[0].error, 'k3\tN/A')
+    print(f"  ✅ 4 bad rows rejected, 996 loaded in {result.copies} COPYs")
+
+
+def test_clean_chunk_single_copy_and_limits():
+    print("🧪 Testing happy path and error limits...")
+    cursor = FakeCursor()
+    result = copy_with_bisection(cursor, 'properties', ('key', 'value'), copy_text(range(500)))
+    assert (result.loaded, result.rejects, result.copies) == (500, [], 1)
+
+    with pytest.raises(RejectLimitExceeded):
+        copy_with_bisection(FakeCursor(), 'properties', ('key', 'value'), copy_text(['x'] * 50), max_rejects=10)
+
+    with pytest.raises(FakeCopyError):  # Not a data error - no bisection
+        copy_with_bisection(FakeCursor(pgcode='08006'), 'properties', ('key', 'value'), copy_text(['x', '1']))
+    print("  ✅ One COPY for clean chunks, systematic and connection errors re-raised")
+
+
+def test_sort_for_locality():
+    print("🧪 Testing (fips_code, apn) chunk order...")
+    chunk = pd.DataFrame({
+        'fips_code': ['06037', '01001', None, '06037', '01001'],
+        'apn': ['200', '9', '1', '100', '10'],
+        'value': [1, 2, 3, 4, 5],
+    }, index=[40, 41, 42, 43, 44])
+    ordered = sort_for_locality(chunk)
+    assert ordered['value'].tolist() == [5, 2, 4, 1, 3]  # String apn order, NULL FIPS last
+    assert ordered.index.tolist() == [0, 1, 2, 3, 4]      # Positions match the COPY lines for rejects
+    assert chunk['value'].tolist() == [1, 2, 3, 4, 5]
+    no_keys = pd.DataFrame({'value': [2, 1]})
+    assert sort_for_locality(no_keys) is no_keys
+    print("  ✅ Sorted by FIPS then APN, stable, renumbered")
+
+
+if __name__ == "__main__":
+    test_bad_rows_isolated()
+    test_clean_chunk_single_copy_and_limits()
+    test_sort_for_locality()
+    print("\n🎉 COPY writer tests complete")
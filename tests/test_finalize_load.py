@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Finalize Load Tests
+Validates migration index parsing, step dependency order, parallel index builds, failure skipping and progress lines
+"""
+
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.finalize_load import (CLUSTER_INDEX, FinalizeRunner, migration_indexes, plan_finalize,
+                                 progress_lines)
+
+
+class FakeServer:
+    """Shared by every fake connection: a statement log, concurrency and failures"""
+
+    def __init__(self, seconds=0.05, fail=()):
+        self.seconds = seconds
+        self.fail = fail
+        self.log = []
+        self.active = 0
+        self.peak = 0
+        self.pids = 1000
+        self.lock = threading.Lock()
+
+
+class FakeCursor:
+    def __init__(self, server, pid):
+        self.server = server
+        self.pid = pid
+        self.result = None
+
+    def execute(self, sql, params=None):
+        server = self.server
+        if sql.startswith('SELECT pg_backend_pid'):
+            self.result = (self.pid,)
+            return
+        if sql.startswith('SET'):
+            return
+        if any(name in sql for name in server.fail):
+            raise RuntimeError(f"could not run {sql.split()[0]}")
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.log.append(sql)
+        time.sleep(server.seconds)
+        with server.lock:
+            server.active -= 1
+
+    def fetchone(self):
+        return self.result
+
+
+class FakeConnection:
+    def __init__(self, server):
+        with server.lock:
+            server.pids += 1
+            self.pid = server.pids
+        self.server = server
+        self.autocommit = False
+        self.closed = False
+
+    def cursor(self):
+        assert self.autocommit, "VACUUM and the builds need autocommit"
+        return FakeCursor(self.server, self.pid)
+
+    def close(self):
+        self.closed = True
+
+
+def test_migration_indexes():
+    print("🧪 Testing index definitions from the migrations...")
+    indexes = migration_indexes()
+    assert indexes[CLUSTER_INDEX]['sql'] == \
+        'CREATE INDEX IF NOT EXISTS idx_properties_fips_apn ON datnest.properties (fips_code, apn)'
+    assert indexes['idx_properties_quantarium_pid']['unique']
+    assert 'CONCURRENTLY' not in indexes['idx_properties_qvm_date']['sql']
+    assert indexes['idx_properties_qvm_date']['sql'].endswith('WHERE qvm_asof_date IS NOT NULL')
+    assert 'USING gin(property_full_street_address gin_trgm_ops)' in indexes['idx_properties_address_gin']['sql']
+    assert 'idx_land_use_codes_category' not in indexes and 'idx_audit_file_name' not in indexes
+    print(f"  ✅ {len(indexes)} datnest.properties indexes")
+
+
+def test_plan_order():
+    print("🧪 Testing finalize plan dependencies...")
+    indexes = migration_indexes()
+    existing = {name: True for name in indexes}
+    existing.update({'idx_properties_qvm_date': False, CLUSTER_INDEX: True})
+    del existing['idx_properties_lot_size']
+
+    steps = plan_finalize(indexes, existing, cluster=True)
+    names = [step['name'] for step in steps]
+    by_name = {step['name']: step for step in steps}
+    assert names[0].startswith('statistics') and 'property_state, property_city_name, property_zip_code' in \
+        steps[0]['statements'][0]
+    assert by_name['cluster']['after'] == [] and 'USING idx_properties_fips_apn' in by_name['cluster']['statements'][0]
+    assert set(by_name['analyze']['after']) == {names[0], 'cluster'}
+    assert sorted(step['index'] for step in steps if step['index']) == ['idx_properties_lot_size',
+                                                                        'idx_properties_qvm_date']
+    assert by_name['index idx_properties_qvm_date']['statements'][0].startswith('DROP INDEX')  # Was INVALID
+    assert by_name['vacuum']['statements'] == ['VACUUM (FREEZE, ANALYZE) datnest.properties']
+    assert 'index idx_properties_lot_size' in by_name['vacuum']['after']
+
+    # A missing clustering index is built before the CLUSTER, not with the others
+    del existing[CLUSTER_INDEX]
+    by_name = {step['name']: step for step in plan_finalize(indexes, existing, cluster=True, vacuum=False)}
+    assert by_name['cluster']['after'] == [f"index {CLUSTER_INDEX}"]
+    assert by_name[f"index {CLUSTER_INDEX}"]['after'] == [] and 'vacuum' not in by_name
+    print(f"  ✅ {len(steps)} steps: {' -> '.join(names[:3])} -> indexes -> vacuum")
+
+
+def test_parallel_builds_and_failures():
+    print("🧪 Testing parallel index builds and skipped dependents...")
+    indexes = migration_indexes()
+    existing = {name: True for name in indexes}
+    missing = ['idx_properties_lot_size', 'idx_properties_qvm_date', 'idx_properties_coords',
+               'idx_properties_location']
+    for name in missing:
+        del existing[name]
+    steps = plan_finalize(indexes, existing)
+
+    server = FakeServer(seconds=0.1)
+    messages = []
+    connections = []
+
+    def connect():
+        connections.append(FakeConnection(server))
+        return connections[-1]
+
+    start = time.time()
+    results = FinalizeRunner(connect, workers=4, progress_interval=0, report=messages.append).run(steps)
+    elapsed = time.time() - start
+    assert all(result['status'] == 'done' for result in results.values())
+    assert server.peak == 4 and elapsed < 0.1 * 7  # Four builds at once: ~4 rounds of 0.1s, not 7
+    assert server.log[0].startswith('CREATE STATISTICS') and server.log[1] == 'ANALYZE datnest.properties'
+    assert server.log[-1].startswith('VACUUM') and all(connection.closed for connection in connections)
+
+    server = FakeServer(seconds=0.01, fail=('idx_properties_coords',))
+    results = FinalizeRunner(lambda: FakeConnection(server), workers=2, progress_interval=0,
+                             report=messages.append).run(steps)
+    assert results['index idx_properties_coords']['status'] == 'failed'
+    assert results['vacuum']['status'] == 'skipped' and results['index idx_properties_lot_size']['status'] == 'done'
+    assert not any(sql.startswith('VACUUM') for sql in server.log)
+    print(f"  ✅ {len(missing)} builds on 4 connections in {elapsed:.2f}s; failed build skips VACUUM")
+
+
+def test_progress_lines():
+    print("🧪 Testing index build progress lines...")
+    rows = [(1001, 'building index: scanning table', 250, 1000, 0, 0),
+            (1002, 'building index: loading tuples in tree', 0, 0, 30, 120),
+            (1003, 'waiting for writers before build', 0, 0, 0, 0),
+            (4242, 'building index: scanning table', 1, 2, 0, 0)]  # Someone else's build
+    lines = progress_lines(rows, {1001: 'idx_a', 1002: 'idx_b', 1003: 'idx_c'})
+    assert lines == ['idx_a: building index: scanning table - 25% of 1,000 blocks',
+                     'idx_b: building index: loading tuples in tree - 25% of 120 tuples',
+                     'idx_c: waiting for writers before build']
+    print(f"  ✅ {lines[0]}")
+
+
+if __name__ == "__main__":
+    test_migration_indexes()
+    test_plan_order()
+    test_parallel_builds_and_failures()
+    test_progress_lines()
+    print("\n🎉 Finalize load tests complete")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+TSV Line-Offset Index Tests
+Validates row counts, arbitrary row-range reads, sidecar persistence and staleness checks
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pipeline.line_index as line_index_module
+from pipeline.line_index import (build_line_index, load_line_index, index_path_for, row_count,
+                                 files_for_state, read_state)
+
+HEADER = ['FIPS_Code', 'APN', 'LSale_Price']
+
+
+def write_tsv(path, rows, trailing_newline=True):
+    lines = ['\t'.join(HEADER)] + [f"01{i % 100:03d}\t{i:08d}\t{'' if i % 3 else i * 7}" for i in range(rows)]
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\n'.join(lines) + ('\n' if trailing_newline else ''))
+
+
+def test_counts_and_ranges():
+    print("🧪 Testing row counts and range reads...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'file.tsv')
+        write_tsv(path, 2537)
+        index = build_line_index(path, stride=100)
+
+        assert index.total_rows == 2537
+        assert index.header == HEADER
+        assert len(index.offsets) == 26
+
+        rows = index.read_rows(1234, 1300)
+        assert len(rows) == 66
+        assert rows['APN'].iloc[0] == '00001234' and rows['APN'].iloc[-1] == '00001299'
+        assert rows['LSale_Price'].isna().sum() == 44
+
+        chunk = index.read_chunk(26, 100)  # Last, partial chunk
+        assert len(chunk) == 37 and chunk['APN'].iloc[-1] == '00002536'
+        assert index.chunk_count(100) == 26
+        assert index.read_bytes(5, 5) == b''
+
+        no_newline = os.path.join(tmp_dir, 'tail.tsv')
+        write_tsv(no_newline, 250, trailing_newline=False)
+        tail_index = build_line_index(no_newline, stride=100)
+        assert tail_index.total_rows == 250
+        assert tail_index.read_rows(249, 250)['APN'].tolist() == ['00000249']
+    print("  ✅ Exact counts and row ranges from offsets")
+
+
+def test_sidecar_reuse_and_staleness():
+    print("🧪 Testing sidecar persistence...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'file.tsv')
+        write_tsv(path, 500)
+        first = load_line_index(path, stride=50)
+        assert os.path.exists(index_path_for(path))
+
+        reloaded = load_line_index(path, rebuild=False)
+        assert reloaded is not None and reloaded.total_rows == 500 and reloaded.stride == 50
+        assert reloaded.crc32 == first.crc32 and reloaded.verify_checksum()
+
+        write_tsv(path, 600)  # Changes size: sidecar is stale
+        assert load_line_index(path, rebuild=False) is None
+        assert row_count(path) == 600
+    print("  ✅ Sidecar reused while current, rebuilt after the file changed")
+
+
+def write_fips_file(path, fips_rows, line_end='\n'):
+    """fips_rows: [(fips, count)] in file order; PID padded past the 64-byte window sometimes"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('Quantarium_Internal_PID\tFIPS_Code\tLSale_Price' + line_end)
+        row = 0
+        for fips, count in fips_rows:
+            for _ in range(count):
+                pid = str(row) if row % 50 else 'X' * 80 + str(row)
+                f.write(f"{pid}\t{fips}\t{row}{line_end}")
+                row += 1
+
+
+def test_fips_runs_and_state_reads():
+    print("🧪 Testing FIPS run index...")
+    block_bytes = line_index_module.SCAN_BLOCK_BYTES
+    line_index_module.SCAN_BLOCK_BYTES = 997  # Runs cross block boundaries
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = os.path.join(tmp_dir, 'file1.tsv')
+            second = os.path.join(tmp_dir, 'file2.tsv')
+            write_fips_file(first, [('01001', 300), ('01003', 200), ('02013', 120), ('01003', 5)])
+            write_fips_file(second, [('02013', 80), ('02020', 150), ('04001', 400)], line_end='\r\n')
+
+            index = load_line_index(first)
+            assert [(run.fips, run.first_row, run.row_count) for run in index.fips_runs] == [
+                ('01001', 0, 300), ('01003', 300, 200), ('02013', 500, 120), ('01003', 620, 5)]
+            assert index.fips_row_counts() == {'01': 505, '02': 120}
+            assert len(index.byte_ranges_for('01')) == 2  # Stray rows after Alaska
+
+            assert files_for_state([first, second], '02') == {first: 120, second: 230}
+            assert files_for_state([first, second], '04') == {second: 400}
+            alaska = list(read_state([first, second], '02', columns=['FIPS_Code', 'LSale_Price']))
+            reloaded = load_line_index(second, rebuild=False)
+            assert reloaded.fips_runs[0].fips == '02013'
+    finally:
+        line_index_module.SCAN_BLOCK_BYTES = block_bytes
+
+    assert sum(len(df) for df in alaska) == 350
+    assert all(set(df['FIPS_Code']) <= {'02013', '02020'} for df in alaska)
+    assert alaska[0]['LSale_Price'].astype(int).tolist() == list(range(500, 620))
+    print("  ✅ Runs, per-state counts and byte-range reads across two files")
+
+
+if __name__ == "__main__":
+    test_counts_and_ranges()
+    test_sidecar_reuse_and_staleness()
+    test_fips_runs_and_state_reads()
+    print("\n🎉 Line index tests complete")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load Sink Tests
+Validates dry-run sinks: identical manifests across sinks, the COPY file and its replay, and Parquet output
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.load_sinks import (PARQUET_AVAILABLE, compare_manifests, make_sink, read_manifest,
+                                 read_parquet_sink, replay_copy_file)
+
+
+class FakeCursor:
+    """Records what COPY ... FROM STDIN received"""
+
+    def __init__(self):
+        self.sql = None
+        self.data = None
+
+    def copy_expert(self, sql, f):
+        self.sql = sql
+        self.data = f.read()
+
+
+def cleaned_chunk(start, rows):
+    """A loader-shaped cleaned chunk: strings with NaN, Int64, dates, object floats with None"""
+    index = np.arange(start, start + rows)
+    frame = pd.DataFrame({
+        'quantarium_internal_pid': [str(i) for i in index],
+        'property_city_name': [None if i % 3 == 0 else f"CITY {i % 7}" for i in index],
+        'year_built': pd.array([None if i % 4 == 0 else 1900 + i % 120 for i in index], dtype='Int64'),
+        'mtg01_recording_date': np.where(index % 5 == 0, np.datetime64('NaT', 'D'),
+                                         np.datetime64('2020-01-01', 'D') + index % 365),
+        'lot_size_acres': pd.Series([None if i % 2 else i / 8 for i in index], dtype=object),
+    })
+    return frame, frame.to_csv(sep='\t', header=False, index=False, na_rep='\\N')
+
+
+def run_sink(kind, file_path, chunks):
+    with make_sink(kind, file_path) as sink:
+        for chunk_num, (frame, text) in enumerate(chunks, 1):
+            assert sink.write(chunk_num, frame, text) == len(frame)
+    return sink
+
+
+def test_null_and_copy_sinks_in_parity():
+    print("🧪 Testing null/copy sink parity and COPY replay...")
+    chunks = [cleaned_chunk(0, 500), cleaned_chunk(500, 500), cleaned_chunk(1000, 123)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'Quantarium_OpenLien_test.TSV')
+        null_sink = run_sink('null', file_path, chunks)
+        copy_sink = run_sink('copy', file_path, chunks)
+        assert not os.path.exists(null_sink.output_path)
+
+        null_manifest, copy_manifest = read_manifest(null_sink.output_path), read_manifest(copy_sink.output_path)
+        assert compare_manifests(null_manifest, copy_manifest) == []
+        assert copy_manifest['rows'] == 1123 and len(copy_manifest['chunks']) == 3
+        assert copy_manifest['columns'] == list(chunks[0][0].columns)
+        with open(copy_sink.output_path, 'rb') as f:
+            assert f.read() == ''.join(text for _, text in chunks).encode('utf-8')
+
+        cursor = FakeCursor()
+        assert replay_copy_file(cursor, copy_sink.output_path) == 1123
+        assert cursor.sql.startswith('COPY datnest.properties (quantarium_internal_pid, property_city_name,')
+        assert "NULL '\\N'" in cursor.sql
+        assert cursor.data.count(b'\n') == 1123
+        with pytest.raises(ValueError):
+            replay_copy_file(cursor, null_sink.output_path)
+
+        # One changed value in chunk 2 is found, and only there
+        changed = chunks[1][0].copy()
+        changed.loc[changed.index[7], 'property_city_name'] = 'ELSEWHERE'
+        drifted = [chunks[0], (changed, changed.to_csv(sep='\t', header=False, index=False, na_rep='\\N')),
+                   chunks[2]]
+        drift_sink = run_sink('null', os.path.join(tmp_dir, 'drift.TSV'), drifted)
+        differences = compare_manifests(null_manifest, read_manifest(drift_sink.output_path))
+    assert len(differences) == 1 and differences[0].startswith('chunk 2:')
+    print(f"  ✅ {copy_sink.summary()}; replayed into COPY; drift found in chunk 2")
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow not installed")
+def test_parquet_sink():
+    print("🧪 Testing Parquet sink...")
+    chunks = [cleaned_chunk(0, 300), cleaned_chunk(300, 200)]
+    all_null = chunks[1][0].assign(lot_size_acres=pd.Series([None] * 200, dtype=object))
+    chunks[1] = (all_null, all_null.to_csv(sep='\t', header=False, index=False, na_rep='\\N'))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sink = run_sink('parquet', os.path.join(tmp_dir, 'Quantarium_OpenLien_test.TSV'), chunks)
+        frame = read_parquet_sink(sink.output_path)
+        manifest = read_manifest(sink.output_path)
+    assert len(frame) == 500 and list(frame.columns) == manifest['columns']
+    assert frame['year_built'].isna().sum() == 125
+    assert frame['lot_size_acres'].iloc[:300].notna().sum() == 150
+    assert frame['lot_size_acres'].iloc[300:].isna().all()
+    assert frame['quantarium_internal_pid'].tolist() == [str(i) for i in range(500)]
+    print(f"  ✅ {sink.summary()}")
+
+
+if __name__ == "__main__":
+    test_null_and_copy_sinks_in_parity()
+    if PARQUET_AVAILABLE:
+        test_parquet_sink()
+    print("\n🎉 Load sink tests complete")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Migration Schema Tests
+Validates column types replayed from CREATE/ALTER statements and the shipped migrations
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.migration_schema import is_date_type, migration_columns, varchar_length
+
+MIGRATIONS = {
+    '001_create.sql': """
+        -- properties table
+        CREATE TABLE IF NOT EXISTS datnest.properties (
+            id BIGSERIAL PRIMARY KEY,
+            apn VARCHAR(50) NOT NULL,
+            price DECIMAL(12, 2),
+            sale_date DATE,
+            CONSTRAINT uq_apn UNIQUE (apn)
+        );
+        CREATE TABLE other (sale_date VARCHAR(8));
+    """,
+    '002_alter.sql': """
+        ALTER TABLE properties ADD COLUMN IF NOT EXISTS sale_date VARCHAR(8),
+            ADD COLUMN recording_date VARCHAR(8) DEFAULT NULL;
+        ALTER TABLE properties ALTER COLUMN apn TYPE VARCHAR(64);
+    """,
+}
+
+
+def test_replayed_column_types():
+    print("🧪 Testing CREATE/ALTER replay...")
+    with tempfile.TemporaryDirectory() as migrations_dir:
+        for name, text in MIGRATIONS.items():
+            with open(os.path.join(migrations_dir, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        columns = migration_columns('properties', migrations_dir)
+    assert columns == {'id': 'BIGSERIAL', 'apn': 'VARCHAR(64)', 'price': 'DECIMAL(12, 2)',
+                       'sale_date': 'DATE', 'recording_date': 'VARCHAR(8)'}
+    assert is_date_type('DATE') and is_date_type('TIMESTAMP WITH TIME ZONE')
+    assert not is_date_type('VARCHAR(8)')
+    assert varchar_length('VARCHAR(8)') == 8 and varchar_length('DATE') is None
+    print("  ✅ First definition wins, ALTER COLUMN TYPE applies, constraints skipped")
+
+
+def test_shipped_date_columns():
+    print("🧪 Testing date column types in database/migrations...")
+    columns = migration_columns()
+    assert columns['last_sale_date'] == 'DATE' and columns['prior_sale_date'] == 'DATE'
+    for name in ('lsale_recording_date', 'last_transfer_date', 'recording_date_from_assessment'):
+        assert columns[name] == 'VARCHAR(8)', name
+    print(f"  ✅ {len(columns)} properties columns, sale dates DATE, recording dates VARCHAR(8)")
+
+
+if __name__ == "__main__":
+    test_replayed_column_types()
+    test_shipped_date_columns()
+    print("\n🎉 Migration schema tests complete")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Null Normalization Tests
+Validates that reader-side renaming and null handling give the same COPY text as the old
+copy + fillna('') + replace('', None) cleaning, with less cleaning-stage memory per chunk
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.memory_probe import MemoryProbe
+from pipeline.tsv_reader import read_tsv_chunks, read_header
+
+FIELD_MAPPING = {f'Source_Field_{i}': f'field_{i}' for i in range(60)}
+FIELD_MAPPING['Legacy_Field_3'] = 'field_3'  # Two TSV columns, one db column - last one wins
+
+
+def write_tsv(path, rows):
+    header = list(FIELD_MAPPING) + ['Unmapped_Column']
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\t'.join(header) + '\n')
+        for i in range(rows):
+            f.write('\t'.join('' if (i + j) % 3 == 0 else f'V{i % 97}_{j}' for j in range(len(header))) + '\n')
+
+
+def old_copy_texts(path, chunksize, probe):
+    texts = []
+    for chunk in read_tsv_chunks(path, chunksize=chunksize):
+        probe.start_chunk()
+        available_mapping = {db_col: tsv_col for tsv_col, db_col in FIELD_MAPPING.items()
+                             if tsv_col in chunk.columns}
+        clean_data = chunk[list(available_mapping.values())].copy()
+        clean_data.columns = list(available_mapping.keys())
+        for field in clean_data.columns:
+            clean_data[field] = clean_data[field].fillna('')
+        clean_data = clean_data.replace('', None)
+        probe.end_chunk()
+        texts.append(clean_data.to_csv(sep='\t', header=False, index=False, na_rep='\\N'))
+    return texts
+
+
+def new_copy_texts(path, chunksize, probe):
+    header_columns = set(read_header(path))
+    available_mapping = {db_col: tsv_col for tsv_col, db_col in FIELD_MAPPING.items()
+                         if tsv_col in header_columns}
+    rename = {tsv_col: db_col for db_col, tsv_col in available_mapping.items()}
+    texts = []
+    for chunk in read_tsv_chunks(path, chunksize=chunksize, rename=rename):
+        probe.start_chunk()
+        clean_data = chunk
+        probe.end_chunk()
+        # Old column order, for a byte-for-byte comparison
+        texts.append(clean_data.to_csv(sep='\t', header=False, index=False, na_rep='\\N',
+                                       columns=list(available_mapping)))
+    return texts
+
+
+def test_same_copy_text_less_memory():
+    print("🧪 Testing single-pass null normalization...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'nulls.TSV')
+        write_tsv(path, 6000)
+
+        assert read_header(path)[:2] == ['Source_Field_0', 'Source_Field_1']
+        renamed = next(read_tsv_chunks(path, chunksize=10, rename={'Legacy_Field_3': 'field_3'}))
+        assert list(renamed.columns) == ['field_3']
+
+        with MemoryProbe(enabled=True) as old_probe:
+            old = old_copy_texts(path, 2000, old_probe)
+        with MemoryProbe(enabled=True) as new_probe:
+            new = new_copy_texts(path, 2000, new_probe)
+
+    assert old == new
+    assert '\t\\N\t' in new[0]
+    old_peak = max(stats['peak_bytes'] for stats in old_probe.chunks)
+    new_peak = max(stats['peak_bytes'] for stats in new_probe.chunks)
+    assert new_peak < old_peak
+    assert sum(stats['blocks'] for stats in new_probe.chunks) < sum(stats['blocks'] for stats in old_probe.chunks)
+    print(f"  ✅ Identical COPY text; peak {old_peak / 1024 ** 2:.1f} MB -> {new_peak / 1024 ** 2:.1f} MB per chunk")
+    print(f"  ✅ Old: {old_probe.summary()}; new: {new_probe.summary()}")
+
+
+def test_probe_disabled_is_free():
+    print("🧪 Testing disabled memory probe...")
+    probe = MemoryProbe()
+    probe.start_chunk()
+    assert probe.end_chunk() is None
+    assert probe.summary() == "memory probe off"
+    print("  ✅ No tracing unless asked for")
+
+
+if __name__ == "__main__":
+    test_same_copy_text_less_memory()
+    test_probe_disabled_is_free()
+    print("\n🎉 Null normalization tests complete")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Parquet Conversion Cache Tests
+Validates data-dictionary typing, state partition pruning and checksum invalidation
+"""
+
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+pytest.importorskip('pyarrow')
+
+from pipeline.parquet_cache import (convert_to_parquet, read_cached, is_cache_current,
+                                    cache_dir_for, cached_state_rows)
+
+HEADER = ['Quantarium_Internal_PID', 'FIPS_Code', 'Property_City_Name', 'LSale_Price',
+          'LSale_Recording_Date', 'PA_Latitude']
+
+
+def write_tsv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\t'.join(HEADER) + '\n')
+        for i in range(rows):
+            fips = ['04013', '01001', '02020'][i % 3]
+            price = '30.6' if i == 4 else ('Y' if i == 5 else str(i * 100))
+            date = '20240131' if i % 2 else '20230000'
+            f.write(f"{i}\t{fips}\tCITY{i % 7}\t{price}\t{date}\t33.{i:05d}\n")
+
+
+def test_typed_partitioned_cache():
+    print("🧪 Testing typed conversion and state pushdown...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'openlien.TSV')
+        write_tsv(path, 3000)
+        manifest = convert_to_parquet(path, chunksize=1000)
+
+        assert manifest['rows'] == 3000
+        assert manifest['state_rows'] == {'01': 1000, '02': 1000, '04': 1000}
+        assert manifest['column_types']['LSale_Price'] == 'int'
+        assert manifest['column_types']['LSale_Recording_Date'] == 'date'
+        assert manifest['coerced_values']['LSale_Price'] == 1  # 'Y'
+        assert manifest['coerced_values']['LSale_Recording_Date'] == 1500  # 20230000
+        assert sorted(os.listdir(cache_dir_for(path)))[:3] == ['_manifest.json', 'state_fips=01', 'state_fips=02']
+
+        alaska = read_cached(path, columns=['FIPS_Code', 'LSale_Price', 'LSale_Recording_Date'], states=['2'])
+        assert len(alaska) == 1000 and set(alaska['FIPS_Code']) == {'02020'}
+        assert list(alaska.columns) == ['FIPS_Code', 'LSale_Price', 'LSale_Recording_Date']
+
+        everything = read_cached(path, columns=['Quantarium_Internal_PID', 'LSale_Price', 'LSale_Recording_Date'])
+        row = everything.set_index('Quantarium_Internal_PID')
+        assert row.loc[4, 'LSale_Price'] == 31  # Rounded like the loaders
+        assert row.loc[3, 'LSale_Recording_Date'] == datetime.date(2024, 1, 31)
+        assert cached_state_rows(path)['04'] == 1000
+    print("  ✅ Typed columns, 3 state partitions, Alaska read alone")
+
+
+def test_checksum_invalidation():
+    print("🧪 Testing cache invalidation...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'openlien.TSV')
+        write_tsv(path, 300)
+        convert_to_parquet(path)
+        assert is_cache_current(path)
+
+        # Same bytes, new mtime: still current after the checksum check
+        later = time.time() + 60
+        os.utime(path, (later, later))
+        assert is_cache_current(path)
+
+        with open(path, 'r+b') as f:  # Same size, different content
+            f.seek(os.path.getsize(path) - 3)
+            f.write(b'77\n')
+        os.utime(path, (later + 60, later + 60))
+        assert not is_cache_current(path)
+        assert len(read_cached(path, columns=['FIPS_Code'])) == 300  # Reconverted on read
+        assert is_cache_current(path)
+    print("  ✅ Touched copy reused, changed content reconverted")
+
+
+if __name__ == "__main__":
+    test_typed_partitioned_cache()
+    test_checksum_invalidation()
+    print("\n🎉 Parquet cache tests complete")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Property Lookup Cache Tests
+Validates LRU eviction, shared disk level and load-generation invalidation without a database
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.property_cache import ADDRESS_KEY_SQL, LOOKUP_QUERIES, DiskCache, PropertyCache, address_key
+
+MIGRATION_022 = os.path.join(os.path.dirname(__file__), '..', 'database', 'migrations',
+                             '022_property_address_lookup_index.sql')
+
+DOCUMENTS = {
+    ('pid', ('1001',)): {'quantarium_internal_pid': '1001', 'fips_code': '01001', 'apn': 'A-1',
+                         'property_full_street_address': '12  Main st', 'property_zip_code': '36067'},
+    ('pid', ('1002',)): {'quantarium_internal_pid': '1002', 'fips_code': '01001', 'apn': 'A-2',
+                         'property_full_street_address': '14 Main St', 'property_zip_code': '36067'},
+    ('pid', ('1003',)): {'quantarium_internal_pid': '1003', 'fips_code': '01003', 'apn': 'B-1',
+                         'property_full_street_address': None, 'property_zip_code': None},
+}
+
+
+class FakeSource:
+    """Stands in for Postgres: counts fetches and exposes a settable load generation"""
+
+    def __init__(self):
+        self.fetches = 0
+        self.generation = 1
+
+    def fetch(self, kind, key):
+        self.fetches += 1
+        if kind == 'pid':
+            return DOCUMENTS.get((kind, key))
+        for doc in DOCUMENTS.values():
+            if kind == 'apn' and (doc['fips_code'], doc['apn']) == key:
+                return doc
+            if kind == 'address' and address_key(doc['property_full_street_address'],
+                                                 doc['property_zip_code']) == key:
+                return doc
+        return None
+
+    def current_generation(self):
+        return self.generation
+
+
+def make_cache(source, **kwargs):
+    return PropertyCache(fetcher=source.fetch, generation_source=source.current_generation,
+                         generation_check_seconds=0, **kwargs)
+
+
+def test_hits_across_key_types():
+    """A PID fetch also serves APN and address lookups from memory"""
+    print("🧪 Testing cross-key hits...")
+    source = FakeSource()
+    cache = make_cache(source)
+
+    assert cache.get_by_pid('1001')['apn'] == 'A-1'
+    assert cache.get_by_apn('01001', 'A-1')['quantarium_internal_pid'] == '1001'
+    assert cache.get_by_address('12 MAIN ST', '36067-1234')['quantarium_internal_pid'] == '1001'
+    assert source.fetches == 1
+
+    stats = cache.stats()
+    assert stats['misses'] == 1 and stats['memory_hits'] == 2
+    print(f"  ✅ {stats}")
+
+
+def test_lru_eviction():
+    """Least recently used keys are evicted once max_entries is exceeded"""
+    print("🧪 Testing LRU eviction...")
+    source = FakeSource()
+    cache = make_cache(source, max_entries=3)
+
+    cache.get_by_pid('1001')  # 3 keys: pid, apn, address
+    cache.get_by_pid('1003')  # 2 keys: pid, apn -> evicts two of 1001's keys
+    assert cache.stats()['evictions'] == 2
+    assert cache.stats()['entries'] == 3
+
+    cache.get_by_pid('1003')
+    assert source.fetches == 2
+    print("  ✅ Eviction bounded the cache at 3 entries")
+
+
+def test_generation_bump_invalidates():
+    """A new load generation turns every cached document into a miss"""
+    print("🧪 Testing generation invalidation...")
+    source = FakeSource()
+    cache = make_cache(source)
+
+    cache.get_by_pid('1002')
+    cache.get_by_pid('1002')
+    assert source.fetches == 1
+
+    source.generation = 2
+    cache.get_by_pid('1002')
+    assert source.fetches == 2
+    assert cache.stats()['invalidations'] == 1
+    assert cache.stats()['generation'] == 2
+    print("  ✅ Generation bump forced a refetch")
+
+
+def test_disk_level_shared_between_instances():
+    """A second cache instance (another process in production) reads the shared disk level"""
+    print("🧪 Testing shared disk level...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        disk_path = os.path.join(tmp_dir, 'property_cache.sqlite')
+        source = FakeSource()
+
+        first = make_cache(source, disk_path=disk_path)
+        first.get_by_pid('1001')
+        second = make_cache(source, disk_path=disk_path)
+        assert second.get_by_pid('1001')['apn'] == 'A-1'
+        assert source.fetches == 1
+        assert second.stats()['disk_hits'] == 1
+
+        source.generation = 5
+        second.get_by_pid('1001')
+        assert source.fetches == 2
+        first.close()
+        second.close()
+    print("  ✅ Disk level shared and generation-tagged")
+
+
+def test_address_key_matches_sql_index():
+    """The lookup query and migration 022's index use the same normalization as address_key()"""
+    print("🧪 Testing address key normalization...")
+    assert address_key(' 12  Main\tst ', '36067-1234 ') == ('12 MAIN ST', '36067')
+    assert address_key('12 Main St', None) is None
+    with open(MIGRATION_022, encoding='utf-8') as f:
+        migration = ' '.join(f.read().split())
+    for expression in ADDRESS_KEY_SQL:
+        assert f"({expression})" in migration
+        assert f"{expression} = %s" in LOOKUP_QUERIES['address']
+    assert 'upper(property_full_street_address) =' not in LOOKUP_QUERIES['address']
+    print("  ✅ Query predicates match idx_properties_address_key")
+
+
+def test_disk_level_purged_and_bounded():
+    """Old-generation rows are deleted when a new generation is seen; writes stay under the row bound"""
+    print("🧪 Testing disk purge and row bound...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        disk_path = os.path.join(tmp_dir, 'property_cache.sqlite')
+        source = FakeSource()
+        cache = make_cache(source, disk_path=disk_path)
+        cache.get_by_pid('1001')
+        cache.get_by_pid('1002')
+        assert cache.disk.rows() == 6
+
+        source.generation = 2
+        cache.get_by_pid('1003')
+        assert cache.stats()['disk_purged'] == 6
+        assert cache.disk.rows() == 2  # Only 1003's pid and apn keys, at generation 2
+        cache.close()
+
+        disk = DiskCache(disk_path, max_rows=3, trim_every=2)
+        for n in range(10):
+            disk.put(f'pid:{n}', 2, {'n': n})
+        assert disk.rows() == 3
+        assert disk.get('pid:9', 2) == {'n': 9} and disk.get('pid:0', 2) is None
+        disk.close()
+    print("  ✅ Superseded generation deleted, oldest writes evicted past max_rows")
+
+
+def test_not_found_is_not_cached():
+    print("🧪 Testing unknown PID...")
+    source = FakeSource()
+    cache = make_cache(source)
+    assert cache.get_by_pid('9999') is None
+    assert cache.get_by_pid('9999') is None
+    assert source.fetches == 2
+    assert cache.stats()['not_found'] == 2
+    print("  ✅ Unknown PIDs always go to the source")
+
+
+if __name__ == "__main__":
+    test_hits_across_key_types()
+    test_lru_eviction()
+    test_generation_bump_invalidates()
+    test_disk_level_shared_between_instances()
+    test_address_key_matches_sql_index()
+    test_disk_level_purged_and_bounded()
+    test_not_found_is_not_cached()
+    print("\n🎉 Property cache tests complete")
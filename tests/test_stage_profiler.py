@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Stage Profiler Tests
+Validates per-stage stack attribution, collapsed-stack output, hot functions, allocation snapshots and opt-in
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.stage_profiler import StageProfiler, hot_functions
+from pipeline.telemetry import LoadTelemetry
+from pipeline.tsv_reader import read_tsv_chunks
+
+
+def busy_clean(seconds):
+    """Pure-Python work the sampler should find in 'clean'"""
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def allocate_rows(rows):
+    return [f"row {i}" * 4 for i in range(rows)]
+
+
+def test_stage_attribution_and_outputs():
+    print("🧪 Testing per-stage sampling, collapsed stacks and snapshots...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Quantarium_OpenLien_test.TSV')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write('PID\tFIPS_Code\tCity\n')
+            for i in range(6000):
+                f.write(f"{i}\t01{i % 67:03d}\tCITY{i % 13}\n")
+
+        profiler = StageProfiler(os.path.join(tmp_dir, 'stacks'), interval=0.002, snapshot_chunks=[2])
+        kept = []
+        with LoadTelemetry(os.path.basename(path), profiler=profiler) as telemetry:
+            for chunk_num, chunk in enumerate(read_tsv_chunks(path, chunksize=2000, sanitizer=ByteSanitizer(),
+                                                               telemetry=telemetry), 1):
+                busy_clean(0.1)
+                telemetry.lap('clean', rows=len(chunk))
+                kept.append(allocate_rows(20000))
+                telemetry.lap('encode', rows=len(chunk))
+                telemetry.chunk_done(chunk_num, len(chunk))
+        assert not tracemalloc.is_tracing()
+
+        paths = [os.path.basename(path) for path in telemetry.profile_paths]
+        pid = os.getpid()
+        assert f"clean.{pid}.collapsed" in paths and f"hot_functions.{pid}.txt" in paths
+        assert paths.count(f"alloc_chunk2.{pid}.txt") == 1 and f"alloc_chunk1.{pid}.txt" not in paths
+
+        with open(os.path.join(tmp_dir, 'stacks', f"clean.{pid}.collapsed"), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        with open(os.path.join(tmp_dir, 'stacks', f"alloc_chunk2.{pid}.txt"), encoding='utf-8') as f:
+            allocations = f.read()
+
+    # Folded format: outermost;...;innermost <count>
+    stacks = Counter()
+    for line in lines:
+        stack, count = line.rsplit(' ', 1)
+        stacks[stack] += int(count)
+        assert ';' in stack and int(count) > 0
+    assert all('test_stage_profiler.py:busy_clean' in stack for stack in stacks)
+    hottest = hot_functions(stacks, top=3)
+    assert any(function == 'test_stage_profiler.py:busy_clean' for function, _, _ in hottest)
+    assert sum(profiler.stacks['clean'].values()) > sum(profiler.stacks.get('encode', Counter()).values())
+    assert 'test_stage_profiler.py' in allocations.splitlines()[1]
+    print(f"  ✅ {profiler.samples:,} samples; {profiler.summary_lines()[0]}")
+
+
+def test_hot_functions_counts_recursion_once():
+    print("🧪 Testing hot function ranking...")
+    stacks = Counter({'a.py:main;a.py:walk;a.py:walk;a.py:leaf': 3, 'a.py:main;a.py:walk': 1})
+    ranked = {function: (own, inclusive) for function, own, inclusive in hot_functions(stacks)}
+    assert ranked['a.py:leaf'] == (3, 3) and ranked['a.py:walk'] == (1, 4) and ranked['a.py:main'] == (0, 4)
+    assert hot_functions(stacks, top=1)[0][0] == 'a.py:leaf'
+    print("  ✅ Own and inclusive samples, hottest first")
+
+
+def test_opt_in_and_overhead_when_off():
+    print("🧪 Testing opt-in and overhead when off...")
+    os.environ.pop('DATANEST_PROFILE', None)
+    os.environ.pop('DATANEST_PROFILE_CHUNKS', None)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Quantarium_OpenLien_test.TSV')
+        assert StageProfiler.for_file(path) is None
+        os.environ['DATANEST_PROFILE_CHUNKS'] = '3, 5'
+        try:
+            profiler = StageProfiler.for_file(path)
+            assert profiler.snapshot_chunks == {3, 5} and profiler._sampler is None
+            assert profiler.output_dir == path + '.stacks' and profiler.close() == []
+        finally:
+            del os.environ['DATANEST_PROFILE_CHUNKS']
+
+        telemetry = LoadTelemetry.for_file(path, jsonl_path=None)
+        assert telemetry.profiler is None
+        laps = 100000
+        start = time.perf_counter()
+        for _ in range(laps):
+            telemetry.lap('clean')
+        per_lap = (time.perf_counter() - start) / laps
+        telemetry.close()
+    assert per_lap < 20e-6
+    print(f"  ✅ Off by default; {per_lap * 1e6:.2f} µs per lap without a profiler")
+
+
+if __name__ == "__main__":
+    test_stage_attribution_and_outputs()
+    test_hot_functions_counts_recursion_once()
+    test_opt_in_and_overhead_when_off()
+    print("\n🎉 Stage profiler tests complete")
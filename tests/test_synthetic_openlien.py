@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Synthetic OpenLien Generator Tests
+Validates determinism, the dictionary header, counted dirty cases through the reader and codecs, and throughput
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.tsv_reader import Quarantine, read_header, read_quarantine, read_tsv_chunks
+from pipeline.value_codecs import CodecReport, decode_date_columns
+from utils.data_dictionary import load_data_dictionary
+from utils.synthetic_openlien import (POOLED_KINDS, SyntheticOpenLien, column_kind, generate_openlien,
+                                      manifest_path_for)
+
+ROWS = 30000
+
+
+def test_deterministic_and_dictionary_header():
+    print("🧪 Testing determinism and header...")
+    first = SyntheticOpenLien(seed=7, pool_rows=256)
+    second = SyntheticOpenLien(seed=7, pool_rows=256)
+    other = SyntheticOpenLien(seed=8, pool_rows=256)
+    body = b''.join(first.blocks(5000, block_rows=1500))
+    assert body == b''.join(second.blocks(5000, block_rows=1500))
+    assert body != b''.join(other.blocks(5000, block_rows=1500))
+    assert first.counts == second.counts
+
+    fields = load_data_dictionary()
+    assert first.header().decode('utf-8').rstrip('\n').split('\t') == [field.header for field in fields]
+    lines = body.split(b'\n')[:-1]
+    assert len(lines) == 5000 and lines[0].startswith(b'1\t01')
+    widths = {line.count(b'\t') + 1 for line in lines}
+    assert len(fields) in widths
+    print(f"  ✅ Same seed, same {len(body):,} bytes; {len(fields)} dictionary columns")
+
+
+def test_per_row_cardinality():
+    print("🧪 Testing column cardinality beyond the pool...")
+    source = SyntheticOpenLien(seed=5, pool_rows=256)
+    lines = [line.split(b'\t') for line in b''.join(source.blocks(5000)).split(b'\n')[:-1]]
+    rows = [line for line in lines if len(line) == len(source.fields)]
+    distinct = {}
+    for j, kind in enumerate(source.kinds):
+        values = {row[3 + j] for row in rows} - {b''}
+        distinct.setdefault(kind, []).append(len(values))
+    for kind in ('number', 'area', 'date', 'address', 'latitude'):
+        assert max(distinct[kind]) > 1000, (kind, distinct[kind])
+    for kind in POOLED_KINDS:
+        assert max(distinct.get(kind, [0])) <= 256 + 4, (kind, distinct[kind])
+    print(f"  ✅ {len(rows):,} rows; per-row kinds up to {max(distinct['number']):,} distinct, pooled ≤ 256")
+
+
+def test_dirty_cases_through_reader():
+    print("🧪 Testing counted dirty cases through reader and codecs...")
+    fields = load_data_dictionary()
+    date_columns = [field.header for field in fields if column_kind(field) == 'date']
+    date_indexes = [field.number - 1 for field in fields if column_kind(field) == 'date']
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'synthetic.TSV')
+        manifest = generate_openlien(path, ROWS, seed=3, pool_rows=512)
+        with open(manifest_path_for(path), encoding='utf-8') as f:
+            assert json.load(f) == manifest
+        counts = manifest['counts']
+        assert all(counts[case] > 0 for case in counts)
+        assert read_header(path) == [field.header for field in fields]
+        with open(path, 'rb') as f:
+            assert os.path.getsize(path) == manifest['bytes']
+            assert f.read().count(b'\x00') == counts['nul_bytes']
+
+        sanitizer = ByteSanitizer()
+        report = CodecReport()
+        rows = zero_dates = 0
+        with Quarantine(path) as quarantine:
+            for chunk in read_tsv_chunks(path, chunksize=7000, quarantine=quarantine, sanitizer=sanitizer):
+                zero_dates += int((chunk[date_columns] == '0').sum().sum())
+                decode_date_columns(chunk, date_columns, report)
+                rows += len(chunk)
+        quarantined = [entry[4].split(b'\t') for entry in read_quarantine(quarantine.path)]
+
+    # Quarantined (over-long) lines never reach the sanitizer or the codecs
+    in_quarantine = {
+        'nul_bytes': sum(field.count(b'\x00') for line in quarantined for field in line),
+        'zero_dates': sum(line[i] == b'0' for line in quarantined for i in date_indexes),
+        'invalid_dates': sum(line[i][4:] == b'0231' for line in quarantined for i in date_indexes),
+    }
+    assert quarantine.total == counts['long_lines'] == len(quarantined)
+    assert quarantine.short_lines == counts['short_lines']
+    assert rows == ROWS - counts['long_lines']
+    assert sanitizer.control_bytes == counts['nul_bytes'] - in_quarantine['nul_bytes']
+    # "0" dates decode as NULL (a null token); only the impossible ones are rejected
+    assert zero_dates == counts['zero_dates'] - in_quarantine['zero_dates']
+    assert sum(report.columns[column]['malformed'] for column in report.columns) == 0
+    invalid = sum(report.columns[column]['invalid_date'] for column in report.columns)
+    assert invalid == counts['invalid_dates'] - in_quarantine['invalid_dates']
+    print(f"  ✅ {quarantine.summary()}; {sanitizer.control_bytes:,} NULs removed, {zero_dates:,} zero dates "
+          f"nulled, {invalid:,} impossible dates rejected")
+
+
+def test_throughput():
+    print("🧪 Testing generator throughput...")
+    source = SyntheticOpenLien(seed=1, pool_rows=256)
+    start = time.perf_counter()
+    written = sum(len(body) for body in source.blocks(50000))
+    seconds = time.perf_counter() - start
+    megabytes = written / 1024 ** 2
+    assert megabytes > 50
+    print(f"  ✅ {megabytes:,.0f} MB in {seconds:.2f}s ({megabytes / seconds:,.0f} MB/s)")
+
+
+if __name__ == "__main__":
+    test_deterministic_and_dictionary_header()
+    test_per_row_cardinality()
+    test_dirty_cases_through_reader()
+    test_throughput()
+    print("\n🎉 Synthetic OpenLien tests complete")
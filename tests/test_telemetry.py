@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Load Telemetry Tests
+Validates per-chunk JSON lines, reader stage timings, the Prometheus textfile and timer overhead
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.byte_sanitizer import ByteSanitizer
+from pipeline.telemetry import LoadTelemetry
+from pipeline.tsv_reader import read_tsv_chunks
+
+
+def test_chunk_records_and_textfile():
+    print("🧪 Testing JSON lines and Prometheus textfile...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Quantarium "OpenLien".TSV')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write('PID\tFIPS_Code\tCity\n')
+            for i in range(5000):
+                f.write(f"{i}\t01{i % 67:03d}\tCITY{i % 13}\n")
+        textfile_path = os.path.join(tmp_dir, 'datanest_load.prom')
+
+        with LoadTelemetry.for_file(path, textfile_path=textfile_path, interval=0.05) as telemetry:
+            for chunk_num, chunk in enumerate(read_tsv_chunks(path, chunksize=2000, sanitizer=ByteSanitizer(),
+                                                               telemetry=telemetry), 1):
+                time.sleep(0.01)
+                telemetry.lap('clean', rows=len(chunk))
+                telemetry.lap('copy', rows=len(chunk), nbytes=123)
+                assert set(telemetry.stage_seconds()) == {'read', 'sanitize', 'clean', 'copy'}
+                telemetry.chunk_done(chunk_num, len(chunk), failed=0)
+            time.sleep(0.1)
+            with open(textfile_path, encoding='utf-8') as f:
+                assert 'datanest_load_running{source="Quantarium \\"OpenLien\\".TSV"} 1' in f.read()
+
+        with open(telemetry.jsonl_path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        with open(textfile_path, encoding='utf-8') as f:
+            prom = f.read()
+
+    assert [record['rows'] for record in records] == [2000, 2000, 1000]
+    first = records[0]
+    assert first['stages']['read']['bytes'] == first['stages']['sanitize']['bytes'] == first['bytes'] > 0
+    assert first['stages']['clean']['seconds'] >= 0.01 and first['stages']['copy']['bytes'] == 123
+    assert first['seconds'] >= sum(stage['seconds'] for stage in first['stages'].values()) * 0.99
+    assert first['failed'] == 0 and first['run_id'] == records[-1]['run_id']
+
+    samples = {line.rsplit(' ', 1)[0]: float(line.rsplit(' ', 1)[1])
+               for line in prom.splitlines() if not line.startswith('#')}
+    source = 'source="Quantarium \\"OpenLien\\".TSV"'
+    assert samples[f'datanest_load_rows_total{{{source}}}'] == 5000
+    assert samples[f'datanest_load_stage_rows_total{{{source},stage="clean"}}'] == 5000
+    assert samples[f'datanest_load_stage_bytes_total{{{source},stage="copy"}}'] == 369
+    assert samples[f'datanest_load_running{{{source}}}'] == 0
+    assert '# TYPE datanest_load_stage_seconds_total counter' in prom
+    print(f"  ✅ {len(records)} chunk records; stages {', '.join(telemetry.summary_lines())}")
+
+
+def test_lap_overhead():
+    print("🧪 Testing timer overhead...")
+    telemetry = LoadTelemetry('overhead')
+    laps = 20000
+    start = time.perf_counter()
+    for _ in range(laps):
+        telemetry.lap('clean', rows=1)
+    per_lap = (time.perf_counter() - start) / laps
+    telemetry.close()
+    assert per_lap < 20e-6
+    print(f"  ✅ {per_lap * 1e6:.2f} µs per lap")
+
+
+if __name__ == "__main__":
+    test_chunk_records_and_textfile()
+    test_lap_overhead()
+    print("\n🎉 Telemetry tests complete")
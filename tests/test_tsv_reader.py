@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Chunked TSV Reader Tests
+Validates .zip streaming and line-aligned chunking against pandas' own chunked reader
+"""
+
+import csv
+import os
+import sys
+import tempfile
+import zipfile
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.tsv_reader import (read_tsv_chunks, iter_line_chunks, source_size, Quarantine, read_quarantine,
+                                 recovered_path_for, reprocess_quarantine, trim_trailing_empty_fields)
+
+HEADER = ['Quantarium_Internal_PID', 'FIPS_Code', 'Property_City_Name', 'LSale_Price']
+
+
+def write_tsv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\t'.join(HEADER) + '\n')
+        for i in range(rows):
+            city = '' if i % 5 == 0 else f'CITY "{i % 17}"'
+            f.write(f"{i}\t01{i % 67:03d}\t{city}\t{i * 3 if i % 2 else ''}\n")
+
+
+def pandas_chunks(path, chunksize):
+    return list(pd.read_csv(path, sep='\t', chunksize=chunksize, dtype=str, encoding='utf-8',
+                            engine='python', quoting=csv.QUOTE_NONE, on_bad_lines='skip', na_values=['']))
+
+
+def test_matches_pandas_reader():
+    print("🧪 Testing plain and .zip sources against pandas...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'Quantarium_OpenLien_00001.TSV')
+        write_tsv(path, 10500)
+        zip_path = os.path.join(tmp_dir, 'Quantarium_OpenLien_00001.zip')
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            archive.write(path, arcname=os.path.basename(path))
+
+        expected = pandas_chunks(path, 2500)
+        plain = list(read_tsv_chunks(path, chunksize=2500))
+        zipped = list(read_tsv_chunks(zip_path, chunksize=2500))
+        subset = next(read_tsv_chunks(zip_path, chunksize=2500, usecols=['FIPS_Code']))
+        uncompressed = source_size(zip_path)
+        assert uncompressed == os.path.getsize(path)
+
+    assert [len(chunk) for chunk in plain] == [2500, 2500, 2500, 2500, 500]
+    for ours, theirs, from_zip in zip(plain, expected, zipped):
+        pd.testing.assert_frame_equal(ours, theirs)
+        pd.testing.assert_frame_equal(from_zip, ours)
+    assert list(subset.columns) == ['FIPS_Code']
+    print(f"  ✅ {len(plain)} chunks identical from .TSV and .zip")
+
+
+def test_line_chunks_across_block_boundaries():
+    print("🧪 Testing line-aligned regrouping...")
+    data = b''.join(f"row{i}\tvalue{i}\n".encode() for i in range(103))
+    blocks = [data[i:i + 7] for i in range(0, len(data), 7)]  # Cuts through lines
+    chunks = list(iter_line_chunks(iter(blocks), 25))
+
+    assert b''.join(chunks) == data
+    assert [chunk.count(b'\n') for chunk in chunks] == [25, 25, 25, 25, 3]
+    assert all(chunk.endswith(b'\n') for chunk in chunks)
+    print("  ✅ Chunks hold whole lines only")
+
+
+def test_bad_lines_quarantined_and_reprocessed():
+    print("🧪 Testing bad-line quarantine...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'openlien.TSV')
+        lines = ['\t'.join(HEADER)]
+        for i in range(100):
+            if i == 10:
+                lines.append(f"{i}\t01001\tCITY\t100\t\t")       # Stray trailing tabs
+            elif i == 55:
+                lines.append(f"{i}\t01001\tCITY\tEXTRA\t100")     # Embedded tab
+            elif i == 70:
+                lines.append(f"{i}\t01001")                        # Short: kept, padded
+            else:
+                lines.append(f"{i}\t01001\tCITY\t{i}")
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        expected = pandas_chunks(path, 40)
+        with Quarantine(path) as quarantine:
+            chunks = list(read_tsv_chunks(path, chunksize=40, quarantine=quarantine))
+        entries = read_quarantine(quarantine.path)
+
+        # Same rows pandas keeps, but the dropped ones are on record
+        assert [len(chunk) for chunk in chunks] == [len(chunk) for chunk in expected] == [39, 39, 20]
+        assert quarantine.counts == {'too_many_fields': 2} and quarantine.short_lines == 1
+        assert [(line_number, field_count) for _, line_number, _, field_count, _, _ in entries] == [(12, 6), (57, 5)]
+        with open(path, 'rb') as f:
+            f.seek(entries[1][0])
+            assert f.readline().rstrip(b'\n') == entries[1][4]
+
+        recovered, remaining = reprocess_quarantine(path, repair=trim_trailing_empty_fields)
+        assert (recovered, remaining) == (1, 1)
+        retried = next(read_tsv_chunks(path + '.recovered.tsv'))
+        assert retried['Quantarium_Internal_PID'].tolist() == ['10']
+        assert [entry[1] for entry in read_quarantine(quarantine.path)] == [57]
+    print("  ✅ 2 lines quarantined with offsets, 1 recovered on reprocess")
+
+
+def test_zip_quarantine_keeps_member_header():
+    print("🧪 Testing quarantine across .zip members...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_path = os.path.join(tmp_dir, 'Quantarium_OpenLien_00001.zip')
+        wide = HEADER + ['View_Code']
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.writestr('part_a.tsv', '\t'.join(HEADER) + '\n1\t01001\tA\t10\n2\t01001\tA\t20\t\n')
+            archive.writestr('part_b.tsv', '\t'.join(wide) + '\n3\t01003\tB\t30\tV\n4\t01003\tB\t40\tV\t\n')
+
+        with Quarantine(zip_path) as quarantine:
+            rows = sum(len(chunk) for chunk in read_tsv_chunks(zip_path, chunksize=10, quarantine=quarantine))
+        entries = read_quarantine(quarantine.path)
+        assert rows == 2
+        assert [(entry[1], entry[3], entry[5]) for entry in entries] == [(3, 5, 'part_a.tsv'), (3, 6, 'part_b.tsv')]
+
+        # Each line is trimmed to its own member's width (4 and 5 fields), not the first member's
+        assert reprocess_quarantine(zip_path, repair=trim_trailing_empty_fields) == (2, 0)
+        first = next(read_tsv_chunks(zip_path + '.recovered.tsv'))
+        second = next(read_tsv_chunks(recovered_path_for(zip_path, 'part_b.tsv')))
+        assert list(first.columns) == HEADER and first['LSale_Price'].tolist() == ['20']
+        assert list(second.columns) == wide and second['View_Code'].tolist() == ['V']
+        assert not os.path.exists(quarantine.path)
+    print("  ✅ Member recorded per entry and reparsed with its own header")
+
+
+if __name__ == "__main__":
+    test_matches_pandas_reader()
+    test_line_chunks_across_block_boundaries()
+    test_bad_lines_quarantined_and_reprocessed()
+    test_zip_quarantine_keeps_member_header()
+    print("\n🎉 TSV reader tests complete")
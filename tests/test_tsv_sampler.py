@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Random-Access TSV Sampler Tests
+Validates uniformity despite variable line lengths, seed reproducibility and per-file strata
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.tsv_sampler import sample_rows, sample_files, estimate_row_count
+
+HEADER = ['FIPS_Code', 'APN', 'Legal_Description', 'Estimated_Value']
+
+
+def write_tsv(path, rows, fips='01001', long_every=4):
+    """Every long_every-th row carries a long legal description (length-biased bait)"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('\t'.join(HEADER) + '\n')
+        for i in range(rows):
+            legal = 'LOT 1 BLK 2 ' * 40 if i % long_every == 0 else ''
+            f.write(f"{fips}\t{i:08d}\t{legal}\t{i * 10}\n")
+
+
+def test_sample_is_uniform():
+    print("🧪 Testing length-bias correction...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sample.tsv')
+        write_tsv(path, 20000)
+        sample = sample_rows(path, 2000, seed=7)
+
+    assert len(sample) == 2000
+    assert sample['APN'].is_unique
+    assert list(sample.columns) == HEADER
+    # 25% of rows are long but they hold ~90% of the bytes
+    long_share = sample['Legal_Description'].notna().mean()
+    assert abs(long_share - 0.25) < 0.04
+    # Spread across the whole file, not just the top
+    positions = sample['APN'].astype(int)
+    assert positions.min() < 2000 and positions.max() > 18000
+    print(f"  ✅ Long rows {long_share:.1%} of sample (population 25%)")
+
+
+def test_seed_reproducible_and_columns():
+    print("🧪 Testing seeds and column selection...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'sample.tsv')
+        write_tsv(path, 5000)
+        a = sample_rows(path, 100, seed=11, columns=['APN', 'FIPS_Code'])
+        b = sample_rows(path, 100, seed=11, columns=['APN', 'FIPS_Code'])
+        c = sample_rows(path, 100, seed=12, columns=['APN', 'FIPS_Code'])
+        everything = sample_rows(path, 10000, seed=1)
+        estimate = estimate_row_count(path, seed=3)
+
+    assert list(a.columns) == ['APN', 'FIPS_Code']
+    assert a.equals(b) and not a.equals(c)
+    assert len(everything) == 5000  # Asking for more rows than exist returns the file
+    assert abs(estimate - 5000) / 5000 < 0.1
+    print(f"  ✅ Same seed, same rows; estimated {estimate:,} of 5,000 rows")
+
+
+def test_stratified_files():
+    print("🧪 Testing per-file stratification...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i, fips in enumerate(['01001', '02013', '04001']):
+            path = os.path.join(tmp_dir, f'file{i}.tsv')
+            write_tsv(path, 1000 * (i + 1), fips=fips)
+            paths.append(path)
+        sample = sample_files(paths, rows_per_file=50, seed=5)
+        again = sample_files(paths[1:], rows_per_file=50, seed=5)
+
+    assert sample.groupby('source_file').size().tolist() == [50, 50, 50]
+    assert sorted(sample['FIPS_Code'].unique()) == ['01001', '02013', '04001']
+    # A file's sample does not depend on which other files are in the set
+    second = sample[sample['source_file'] == 'file1.tsv'].reset_index(drop=True)
+    assert np.array_equal(second['APN'], again[again['source_file'] == 'file1.tsv']['APN'])
+    print("  ✅ 50 rows from each of 3 files")
+
+
+if __name__ == "__main__":
+    test_sample_is_uniform()
+    test_seed_reproducible_and_columns()
+    test_stratified_files()
+    print("\n🎉 TSV sampler tests complete")
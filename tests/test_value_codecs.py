@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Value Codec Tests
+Validates the whole-column decoders against the per-value cleaning functions they replace
+"""
+
+import os
+import re
+import sys
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline.value_codecs import (CodecReport, decode_numeric, decode_numeric_columns, decode_yyyymmdd,
+                                   decode_date_columns, decode_integer, decode_integer_columns, integer_array,
+                                   integer_targets, text_date_columns)
+from utils.migration_schema import is_date_type, migration_columns, varchar_length
+from utils.data_dictionary import load_data_dictionary
+from loaders.enhanced_production_loader_batch4a import DATE_FIELD_LAYOUTS, DATE_FIELDS
+
+
+def robust_numeric_clean(value):
+    """The per-value cleaner from mvp_recovery_loader.py (minus its per-value print)"""
+    if pd.isna(value) or value is None:
+        return None
+    value_str = str(value).strip().upper()
+    if value_str in ['', 'NAN', 'NULL', 'N/A', 'NA']:
+        return None
+    if value_str in ['Y', 'N', 'YES', 'NO', 'TRUE', 'FALSE']:
+        return None
+    try:
+        cleaned = re.sub(r'[^\d.-]', '', value_str)
+        if cleaned and cleaned not in ['-', '.', '-.']:
+            return float(cleaned)
+        return None
+    except (ValueError, TypeError):
+        return None
+
+
+NUMERIC_SAMPLES = ['1234', ' 56.75 ', '-12', '-.5', '7.', '$1,250,000', '12 SQFT', 'Y', 'n', ' yes ',
+                   'TRUE', 'NULL', 'n/a', 'nan', '', '-', '.', '-.', '1.2.3', '1-2', 'ABC', '1e5',
+                   '٣٤', '00042', '3.14159265358979323846', None, np.nan]
+
+
+def test_numeric_matches_per_value_cleaner():
+    print("🧪 Testing numeric codec parity...")
+    rng = np.random.default_rng(7)
+    values = pd.Series(rng.choice(np.array(NUMERIC_SAMPLES, dtype=object), 5000), dtype=object)
+    decoded, counts = decode_numeric(values)
+
+    expected = [robust_numeric_clean(value) for value in values]
+    assert decoded.dtype == np.float64
+    assert [None if np.isnan(v) else v for v in decoded] == expected
+    assert counts['valid'] == sum(v is not None for v in expected)
+    assert counts['total'] == counts['valid'] + counts['null'] + counts['yes_no'] + counts['non_numeric']
+    flags = values.map(lambda v: isinstance(v, str) and v.strip().upper() in ('Y', 'N', 'YES', 'NO', 'TRUE', 'FALSE'))
+    assert counts['yes_no'] == int(flags.sum())
+    print(f"  ✅ 5,000 values identical: {counts}")
+
+
+def test_bounds_and_report():
+    print("🧪 Testing range checks and per-column report...")
+    frame = pd.DataFrame({'latitude': ['33.5', '95.1', 'Y', None], 'year_built': ['1999', '', 'N/A', 'OLD']})
+    report = CodecReport()
+    decode_numeric_columns(frame, ['latitude', 'year_built', 'not_loaded'], report, bounds={'latitude': (-90, 90)})
+    decode_numeric_columns(pd.DataFrame({'latitude': ['Y']}), ['latitude'], report)
+
+    assert frame['latitude'].tolist()[0] == 33.5 and frame['latitude'].isna().tolist() == [False, True, True, True]
+    assert report.columns['latitude'] == {'total': 5, 'valid': 1, 'null': 1, 'yes_no': 2, 'non_numeric': 0,
+                                          'out_of_range': 1}
+    assert report.rejected('year_built') == 1
+    assert report.lines()[0].startswith('latitude: 3 of 5 rejected')
+    print("  ✅ Out-of-range values nulled and counted, report summed across chunks")
+
+
+def clean_date_value(x):
+    """The per-value date cleaner from the batch4a loader"""
+    if pd.isna(x) or x is None:
+        return None
+    x_str = str(x).strip()
+    if x_str in ['', '0', 'nan', 'NaN', 'null']:
+        return None
+    if not x_str.isdigit() or len(x_str) != 8:
+        return None
+    return x_str
+
+
+def python_date(text):
+    try:
+        return date(int(text[:4]), int(text[4:6]), int(text[6:]))
+    except ValueError:
+        return None
+
+
+def test_dates_validated_against_calendar():
+    print("🧪 Testing YYYYMMDD date codec...")
+    rng = np.random.default_rng(11)
+    random_digits = [f"{y:04d}{m:02d}{d:02d}" for y, m, d in
+                     zip(rng.integers(0, 2100, 3000), rng.integers(0, 14, 3000), rng.integers(0, 33, 3000))]
+    samples = random_digits + ['20240229', '20230229', '19000229', '20000229', ' 20230105 ', '0', '', 'null',
+                               '2023-01-05', '202301', 'ABCDEFGH', None, np.nan]
+    values = pd.Series(samples, dtype=object)
+    decoded, counts = decode_yyyymmdd(values)
+
+    assert decoded.dtype == np.dtype('datetime64[D]')
+    for value, result in zip(samples, decoded):
+        passed = clean_date_value(value)
+        expected = python_date(passed) if passed else None
+        assert (None if np.isnat(result) else result.astype(object)) == expected, value
+    assert counts['invalid_date'] == sum(1 for v in samples if clean_date_value(v) and not python_date(clean_date_value(v)))
+    assert counts['malformed'] == 3 and counts['null'] == 5
+
+    frame = pd.DataFrame({'mtg01_due_date': ['20301301', '20300115', '1'], 'apn': ['1', '2', '3']})
+    report = CodecReport()
+    decode_date_columns(frame, ['mtg01_due_date'], report, bounds={'mtg01_due_date': ('1900-01-01', '2025-12-31')})
+    assert frame['mtg01_due_date'].isna().all()
+    assert report.columns['mtg01_due_date'] == {'total': 3, 'valid': 0, 'null': 0, 'out_of_range': 1,
+                                                'malformed': 1, 'invalid_date': 1}
+    print(f"  ✅ {len(samples):,} values match clean_date_value + calendar: {counts}")
+
+
+def test_date_copy_text_fits_column_types():
+    """The batch4a date fields, decoded as the loader does, COPY as text their migration types accept"""
+    print("🧪 Testing date COPY text against the schema...")
+    columns = migration_columns()
+    keep_text = text_date_columns(columns.items(), DATE_FIELDS)
+    assert {'lsale_recording_date', 'last_transfer_date', 'recording_date_from_assessment'} <= set(keep_text)
+    assert 'last_sale_date' not in keep_text and 'prior_sale_date' not in keep_text
+
+    frame = pd.DataFrame({field: [' 20230115', '20230231', None] for field in DATE_FIELDS})
+    decode_date_columns(frame, DATE_FIELDS, keep_text=keep_text)
+    copy_text = frame.to_csv(sep='\t', header=False, index=False, na_rep='\\N')
+    rows = [line.split('\t') for line in copy_text.splitlines()]
+
+    declared = [field for field in DATE_FIELDS if field in columns]
+    for field in declared:
+        value = rows[0][DATE_FIELDS.index(field)]
+        if is_date_type(columns[field]):
+            assert value == '2023-01-15', (field, value)
+        else:
+            assert value == '20230115' and len(value) <= varchar_length(columns[field]), (field, columns[field])
+        assert rows[1][DATE_FIELDS.index(field)] == rows[2][DATE_FIELDS.index(field)] == '\\N'
+    print(f"  ✅ {len(declared)} declared date columns, {len(keep_text)} kept as YYYYMMDD text")
+
+
+def test_dates_read_in_dictionary_format():
+    print("🧪 Testing non-YYYYMMDD dictionary date formats...")
+    # Every batch4a date field is read in the format the data dictionary gives it
+    formats = {field.header.lower().replace('_', ''): field.data_format for field in load_data_dictionary()}
+    for field in DATE_FIELDS:
+        assert formats[field.replace('_', '')] == DATE_FIELD_LAYOUTS.get(field, 'YYYYMMDD'), field
+    # Certification_Date is MMDDYYYY; not declared by the migrations, so it keeps its text
+    assert text_date_columns(migration_columns().items(), ['certification_date']) == ['certification_date']
+
+    values = ['04152023', ' 12312019', '20230415', '02302023', '0']
+    frame = pd.DataFrame({'certification_date': values})
+    report = CodecReport()
+    decode_date_columns(frame, ['certification_date'], report, keep_text=['certification_date'],
+                        layouts=DATE_FIELD_LAYOUTS)
+    assert frame['certification_date'].tolist()[:2] == ['04152023', '12312019']
+    assert frame['certification_date'].iloc[2:].isna().all()
+    assert report.columns['certification_date'] == {'total': 5, 'valid': 2, 'null': 1, 'out_of_range': 0,
+                                                    'malformed': 0, 'invalid_date': 2}
+    decoded, _ = decode_yyyymmdd(pd.Series(values), layout='MMDDYYYY')
+    assert decoded[0] == np.datetime64('2023-04-15') and decoded[1] == np.datetime64('2019-12-31')
+    print(f"  ✅ {len(DATE_FIELDS)} date fields match the dictionary, MMDDYYYY 04152023 kept")
+
+
+def loader_integers(series):
+    """The batch4a integer stage: to_numeric, round, then int() per value"""
+    numbers = pd.to_numeric(series.replace('', pd.NA), errors='coerce').round()
+    converted = numbers.apply(lambda x: int(x) if pd.notna(x) else None)
+    return [None if pd.isna(v) else int(v) for v in converted]  # apply() may re-infer float64
+
+
+def test_integers_stay_int64():
+    print("🧪 Testing nullable integer codec...")
+    rng = np.random.default_rng(5)
+    pool = np.array(['1999', '70.0', '2.5', '3.5', '-4', ' 12 ', '1e3', '250000', 'ABC', '', None,
+                     '40000', '2147483648'], dtype=object)
+    values = pd.Series(rng.choice(pool, 4000), dtype=object)
+    decoded, counts = decode_integer(values)
+
+    assert decoded.dtype == 'Int64'
+    assert [None if pd.isna(v) else int(v) for v in decoded] == loader_integers(values)
+
+    small, small_counts = decode_integer(values, 'smallint')
+    too_big = values.isin(['250000', '40000', '2147483648']).sum()
+    assert small_counts['out_of_range'] == too_big and small.isna().sum() == decoded.isna().sum() + too_big
+    assert decode_integer(values, 'integer')[1]['out_of_range'] == (values == '2147483648').sum()
+
+    targets = integer_targets([('year_built', 'integer'), ('apn', 'character varying'), ('stories', 'smallint')])
+    frame = pd.DataFrame({'year_built': ['1999', '20231'], 'stories': ['2', '99999']})
+    report = CodecReport()
+    decode_integer_columns(frame, ['year_built', 'stories'], report, targets=targets)
+    assert targets == {'year_built': 'integer', 'stories': 'smallint'}
+    assert frame['stories'].tolist()[0] == 2 and pd.isna(frame['stories'].tolist()[1])
+    assert report.rejected('stories') == 1 and report.rejected('year_built') == 0
+    print(f"  ✅ Int64 end to end, identical to the per-value path: {counts}")
+
+
+def test_bigint_text_parsed_exactly():
+    print("🧪 Testing BIGINT text beyond float precision...")
+    values = pd.Series(['9007199254740993', '-9223372036854775808', '9223372036854775807', '9223372036854775808',
+                        '000000000000000000042', '12345678901234567.0', '1e30', 'ABC', '', None], dtype=object)
+    decoded, counts = decode_integer(values)
+    assert decoded.tolist()[:3] == [2 ** 53 + 1, -2 ** 63, 2 ** 63 - 1]
+    assert decoded.tolist()[4:6] == [42, 12345678901234567] and decoded[3] is pd.NA
+    assert counts == {'total': 10, 'valid': 5, 'null': 2, 'out_of_range': 2, 'non_numeric': 1}
+    assert counts['valid'] == (~decoded.isna()).sum()
+
+    integers, out_of_range = integer_array(np.array([2.0 ** 62, 2.0 ** 63, -2.0 ** 63, np.nan]))
+    assert integers.tolist()[0] == 2 ** 62 and integers[1] is pd.NA and integers.tolist()[2] == -2 ** 63
+    assert out_of_range == 1
+    print(f"  ✅ 2**53 + 1 and the int64 limits load unchanged: {counts}")
+
+
+if __name__ == "__main__":
+    test_numeric_matches_per_value_cleaner()
+    test_bounds_and_report()
+    test_dates_validated_against_calendar()
+    test_date_copy_text_fits_column_types()
+    test_dates_read_in_dictionary_format()
+    test_integers_stay_int64()
+    test_bigint_text_parsed_exactly()
+    print("\n🎉 Value codec tests complete")